@@ -1,6 +1,4 @@
 import sqlite3
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional, Any
 import os
@@ -90,7 +88,7 @@ class AnalyticsManager:
             WHERE download_date >= ?
             """
             
-            result = self.db_manager.execute_query(query, (start_date_str,))
+            result = self.db_manager.query_rows(query, (start_date_str,))
             
             if result:
                 stats = result[0]
@@ -157,7 +155,7 @@ class AnalyticsManager:
             ORDER BY count DESC
             """
             
-            results = self.db_manager.execute_query(query, (start_date_str,))
+            results = self.db_manager.query_rows(query, (start_date_str,))
             
             distribution = {}
             if results:
@@ -200,7 +198,7 @@ class AnalyticsManager:
             ORDER BY date
             """
             
-            results = self.db_manager.execute_query(query, (start_date_str,))
+            results = self.db_manager.query_rows(query, (start_date_str,))
             
             dates = []
             counts = []
@@ -251,7 +249,7 @@ class AnalyticsManager:
             LIMIT ?
             """
             
-            results = self.db_manager.execute_query(query, (start_date_str, limit))
+            results = self.db_manager.query_rows(query, (start_date_str, limit))
             
             top_channels = []
             if results:
@@ -294,7 +292,7 @@ class AnalyticsManager:
             ORDER BY hour
             """
             
-            results = self.db_manager.execute_query(query, (start_date_str,))
+            results = self.db_manager.query_rows(query, (start_date_str,))
             
             # Inicializar todas as horas com 0
             distribution = {hour: 0 for hour in range(24)}
@@ -337,7 +335,7 @@ class AnalyticsManager:
             ORDER BY total_size DESC
             """
             
-            resolution_results = self.db_manager.execute_query(query_resolution)
+            resolution_results = self.db_manager.query_rows(query_resolution)
             
             # Análise por tipo (áudio/vídeo)
             query_type = """
@@ -350,7 +348,7 @@ class AnalyticsManager:
             GROUP BY (CASE WHEN resolution LIKE '%music%' THEN 'Áudio' ELSE 'Vídeo' END)
             """
             
-            type_results = self.db_manager.execute_query(query_type)
+            type_results = self.db_manager.query_rows(query_type)
             
             analysis = {
                 'by_resolution': [],
@@ -414,6 +412,45 @@ class AnalyticsManager:
         self.last_cache_update.clear()
         self.log_manager.log_info("Cache de análise limpo")
 
+    def get_hourly_throughput(self, period_days: int = 30) -> Dict[int, Dict[str, float]]:
+        """
+        Obtém a velocidade média medida em cada hora do dia (hora local)
+        
+        Args:
+            period_days: Período em dias para análise
+            
+        Returns:
+            Dict com hora (0-23) -> {'avg_speed_mbps', 'downloads'}; só horas com medições
+        """
+        cache_key = f"hourly_throughput_{period_days}"
+        
+        if self._is_cache_valid(cache_key):
+            return self.cache[cache_key]
+        
+        try:
+            start_date = datetime.utcnow() - timedelta(days=period_days)
+            start_date_str = start_date.strftime('%Y-%m-%d %H:%M:%S')
+            
+            query = """
+            SELECT CAST(strftime('%H', download_date, 'localtime') AS INTEGER) as hour,
+                   AVG(avg_speed_mbps) as avg_speed, COUNT(*) as count
+            FROM downloads 
+            WHERE download_date >= ? AND avg_speed_mbps IS NOT NULL AND avg_speed_mbps > 0
+            GROUP BY hour
+            """
+            
+            throughput = {
+                row['hour']: {'avg_speed_mbps': row['avg_speed'], 'downloads': row['count']}
+                for row in self.db_manager.query_rows(query, (start_date_str,))
+            }
+            
+            self._update_cache(cache_key, throughput)
+            return throughput
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao obter velocidade por hora: {e}")
+            return {}
+    
 class RecommendationEngine:
     """
     Motor de recomendações baseado no histórico de downloads
@@ -509,6 +546,33 @@ class RecommendationEngine:
                 'peak_hour': 20
             }
     
+    def get_download_window_hours(self, count: int = 6, min_samples: int = 3) -> List[int]:
+        """
+        Horas recomendadas para liberar downloads agendados
+        
+        Usa as horas com maior velocidade média medida (avg_speed_mbps); sem
+        medições suficientes, usa os horários de get_optimal_download_time.
+        
+        Args:
+            count: Quantidade de horas
+            min_samples: Downloads medidos necessários para considerar uma hora
+            
+        Returns:
+            List com as horas (0-23), da mais rápida para a mais lenta
+        """
+        try:
+            throughput = self.analytics.get_hourly_throughput(period_days=30)
+            medidas = [
+                (dados['avg_speed_mbps'], hora) for hora, dados in throughput.items()
+                if dados['downloads'] >= min_samples
+            ]
+            if len(medidas) >= count:
+                return [hora for _, hora in sorted(medidas, reverse=True)[:count]]
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao calcular janelas de download: {e}")
+        
+        return self.get_optimal_download_time()['recommended_hours'][:count]
+    
     def get_storage_recommendations(self) -> List[Dict[str, Any]]:
         """
         Gera recomendações de gerenciamento de armazenamento
@@ -0,0 +1,114 @@
+import threading
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor, CancelledError
+
+
+class TaskCancelled(Exception):
+    """Levantada dentro de uma tarefa quando um pedido mais novo a substituiu"""
+
+
+class BackgroundTasks:
+    """
+    Executa tarefas pesadas (consultas SQL, renderização de gráficos) fora da
+    thread principal do Tk e entrega os resultados de volta via `after`.
+
+    Cada tarefa tem uma chave (ex.: 'dashboard', 'grafico'). Um novo pedido
+    com a mesma chave torna o anterior obsoleto: se ainda estiver na fila ele
+    é cancelado, se já estiver rodando ele pode abortar consultando
+    `check()`, e em qualquer caso o seu resultado é descartado.
+    """
+
+    def __init__(self, widget, log_manager, max_workers=1, thread_name_prefix="Analytics"):
+        """
+        Args:
+            widget: Widget Tk usado para agendar as entregas na thread principal
+            log_manager: Instância do LogManager
+            max_workers (int): Threads de trabalho (1 = tarefas executadas em ordem)
+            thread_name_prefix (str): Prefixo do nome das threads
+        """
+        self.widget = widget
+        self.log_manager = log_manager
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._generations = {}
+        self._futures = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def submit(self, key, func, callback=None, error_callback=None):
+        """
+        Agenda `func(check)` em segundo plano
+
+        `check()` levanta TaskCancelled se o pedido ficou obsoleto; tarefas
+        longas devem chamá-la entre as etapas. O callback recebe o resultado na
+        thread principal, e só é chamado se este ainda for o pedido mais recente
+        de `key`.
+
+        Args:
+            key (str): Identificador da tarefa
+            func: Função func(check) executada na thread de trabalho
+            callback: Função callback(resultado) executada na thread principal
+            error_callback: Função error_callback(erro) executada na thread principal
+        """
+        if self._closed:
+            return
+        with self._lock:
+            geracao = self._generations.get(key, 0) + 1
+            self._generations[key] = geracao
+            anterior = self._futures.get(key)
+        if anterior is not None:
+            anterior.cancel()
+
+        def check():
+            if self._closed or not self.is_current(key, geracao):
+                raise TaskCancelled(key)
+
+        future = self._executor.submit(func, check)
+        with self._lock:
+            self._futures[key] = future
+        future.add_done_callback(lambda f: self._schedule_delivery(key, geracao, f, callback, error_callback))
+        return future
+
+    def cancel(self, key):
+        """Torna obsoleto qualquer pedido em andamento de `key`"""
+        with self._lock:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            future = self._futures.pop(key, None)
+        if future is not None:
+            future.cancel()
+
+    def is_current(self, key, geracao):
+        with self._lock:
+            return self._generations.get(key) == geracao
+
+    def shutdown(self):
+        """Descarta os pedidos pendentes e encerra as threads"""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _schedule_delivery(self, key, geracao, future, callback, error_callback):
+        if self._closed or future.cancelled():
+            return
+        try:
+            self.widget.after(0, lambda: self._deliver(key, geracao, future, callback, error_callback))
+        except (RuntimeError, tk.TclError):
+            # Janela já destruída
+            pass
+
+    def _deliver(self, key, geracao, future, callback, error_callback):
+        """Thread principal: entrega o resultado se o pedido ainda for o mais recente"""
+        if not self.is_current(key, geracao):
+            return
+        with self._lock:
+            if self._futures.get(key) is future:
+                del self._futures[key]
+        try:
+            resultado = future.result()
+        except (TaskCancelled, CancelledError):
+            return
+        except Exception as e:
+            self.log_manager.log_error(e, f"Erro na tarefa em segundo plano '{key}'")
+            if error_callback:
+                error_callback(e)
+            return
+        if callback:
+            callback(resultado)
@@ -1,4 +1,3 @@
-from doctest import debug
 import time
 import threading
 from typing import Dict, List, Optional, Union
@@ -11,8 +10,15 @@ class BandwidthTracker:
     Classe para rastrear e armazenar dados de velocidade de download
     """
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, write_buffer=None):
+        """
+        Args:
+            db_manager: Instância do DatabaseManager
+            write_buffer: HistoryWriteBuffer opcional; com ele as estatísticas
+                são gravadas em lote junto com as demais gravações do histórico
+        """
         self.db_manager = db_manager
+        self.write_buffer = write_buffer
         self.current_download_data = {}
         self.speed_samples = []
         self.download_start_time = None
@@ -200,38 +206,18 @@ class BandwidthTracker:
             duration: Duração do download em segundos
         """
         try:
-            logging.debug(f"_save_bandwidth_data: Iniciando salvamento para download_id={download_id}")
-            logging.debug(f"Valores a serem salvos: avg_speed={avg_speed:.2f}, peak_speed={peak_speed:.2f}, duration={duration:.2f}")
-            
-            import sqlite3
-            conn = sqlite3.connect(self.db_manager.db_path)
-            cursor = conn.cursor()
+            logging.debug(f"_save_bandwidth_data: download_id={download_id}, avg_speed={avg_speed:.2f}, "
+                          f"peak_speed={peak_speed:.2f}, duration={duration:.2f}")
             
-            cursor.execute("""
-                UPDATE downloads 
-                SET avg_speed_mbps = ?, 
-                    peak_speed_mbps = ?, 
-                    download_duration_seconds = ?,
-                    download_speed_mbps = ?
-                WHERE id = ?
-            """, (avg_speed, peak_speed, int(duration), avg_speed, download_id))
+            if self.write_buffer is not None:
+                # Gravado no próximo lote do histórico
+                self.write_buffer.update_speed(download_id, avg_speed, peak_speed, duration)
+            elif not self.db_manager.update_download_speed(download_id, avg_speed, peak_speed, duration):
+                logging.error(f"Download {download_id} não encontrado ao salvar dados de largura de banda")
+                return
             
-            rows_affected = cursor.rowcount
-            logging.debug(f"Linhas afetadas pela atualização: {rows_affected}")
-            
-            conn.commit()
             logging.info(f"Dados de largura de banda salvos para download {download_id}: avg={avg_speed:.2f} Mbps, peak={peak_speed:.2f} Mbps, duration={duration:.2f}s")
             
-            # Verificar se os dados foram realmente salvos
-            cursor.execute("SELECT avg_speed_mbps, peak_speed_mbps, download_duration_seconds, download_speed_mbps FROM downloads WHERE id = ?", (download_id,))
-            result = cursor.fetchone()
-            if result:
-                logging.debug(f"Verificação pós-salvamento: avg_speed_mbps={result[0]}, peak_speed_mbps={result[1]}, download_duration_seconds={result[2]}, download_speed_mbps={result[3]}")
-            else:
-                logging.error(f"Download {download_id} não encontrado após tentativa de salvamento")
-            
-            conn.close()
-            
         except Exception as e:
             logging.error(f"Erro ao salvar dados de largura de banda: {e}")
             import traceback
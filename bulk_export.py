@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exportação em massa do banco de downloads para ferramentas externas.
+
+Formatos:
+    - jsonl   JSON Lines em fluxo contínuo (gzip se o arquivo terminar em .gz)
+    - parquet Colunar comprimido (zstd), requer pyarrow
+    - arrow   Arrow IPC comprimido (zstd), requer pyarrow
+
+Uso:
+    python bulk_export.py historico.parquet
+    python bulk_export.py novos.jsonl.gz --since-last noturno
+"""
+
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+import importlib.util
+import sqlite3
+
+# Linhas lidas do banco (e gravadas como um row group / record batch) por vez
+BULK_EXPORT_CHUNK_SIZE = 10000
+
+# Tabelas que podem ser exportadas
+EXPORTABLE_TABLES = ('downloads', 'downloads_archive', 'download_sessions')
+
+# Prefixo das configurações que guardam a marca d'água de cada exportação incremental
+WATERMARK_SETTING_PREFIX = 'bulk_export_watermark'
+
+BULK_EXPORT_FORMATS = {
+    '.parquet': 'parquet',
+    '.arrow': 'arrow',
+    '.feather': 'arrow',
+    '.ipc': 'arrow',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+class BulkExportCancelled(Exception):
+    """Exportação interrompida"""
+
+
+class BulkExporter:
+    """
+    Exporta tabelas inteiras do banco (todas as colunas, inclusive as de
+    velocidade) em blocos lidos do cursor.
+
+    Exportações incrementais usam uma marca d'água nomeada (o maior `id` já
+    exportado), guardada na tabela de configurações: com `since_last`, apenas
+    linhas novas são exportadas, e a marca só avança depois que o arquivo foi
+    gravado por completo.
+    """
+
+    def __init__(self, db_manager, log_manager=None, chunk_size=BULK_EXPORT_CHUNK_SIZE):
+        """
+        Args:
+            db_manager: Instância do DatabaseManager
+            log_manager: Instância do LogManager (opcional)
+            chunk_size (int): Linhas por bloco
+        """
+        self.db_manager = db_manager
+        self.log_manager = log_manager
+        self.chunk_size = chunk_size
+
+    @staticmethod
+    def available_formats():
+        """Formatos suportados com os pacotes instalados"""
+        formatos = ['jsonl']
+        if importlib.util.find_spec('pyarrow') is not None:
+            formatos += ['parquet', 'arrow']
+        return formatos
+
+    @staticmethod
+    def format_for_path(path):
+        """Formato deduzido pela extensão do arquivo (ignorando .gz)"""
+        nome = path[:-3] if path.lower().endswith('.gz') else path
+        return BULK_EXPORT_FORMATS.get(os.path.splitext(nome)[1].lower())
+
+    def export(self, output, fmt=None, table='downloads', since_last=None, progress=None, cancel_event=None):
+        """
+        Exporta uma tabela
+
+        Args:
+            output (str): Arquivo de destino
+            fmt (str): 'jsonl', 'parquet' ou 'arrow' (padrão: pela extensão)
+            table (str): Tabela a exportar
+            since_last (str): Nome da marca d'água; exporta só linhas novas desde a última vez
+            progress: Função progress(exportadas, total)
+            cancel_event (threading.Event): Interrompe a exportação quando sinalizado
+
+        Returns:
+            tuple: (sucesso, estatísticas ou mensagem de erro). As estatísticas
+            trazem rows, since_id, until_id, format, path e seconds.
+        """
+        inicio = time.perf_counter()
+        temporario = f"{output}.part"
+        try:
+            if table not in EXPORTABLE_TABLES:
+                raise ValueError(f"Tabela não exportável: {table}")
+            fmt = fmt or self.format_for_path(output)
+            if fmt not in ('jsonl', 'parquet', 'arrow'):
+                raise ValueError(f"Formato não suportado: {output}")
+            if fmt != 'jsonl' and fmt not in self.available_formats():
+                raise RuntimeError("Exportação em Parquet/Arrow requer o pacote pyarrow (pip install pyarrow)")
+
+            desde = self.get_watermark(since_last, table) if since_last else 0
+            colunas = self._columns(table)
+            total = self._count(table, desde)
+
+            estado = {'rows': 0, 'until_id': desde}
+
+            def chunks():
+                for linhas in self._iter_chunks(table, desde):
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise BulkExportCancelled()
+                    yield linhas
+                    estado['rows'] += len(linhas)
+                    estado['until_id'] = linhas[-1][0]
+                    if progress:
+                        progress(estado['rows'], max(total, estado['rows']))
+
+            if fmt == 'jsonl':
+                self._write_jsonl(temporario, output.lower().endswith('.gz'), colunas, chunks())
+            else:
+                self._write_arrow(temporario, fmt, colunas, chunks())
+
+            os.replace(temporario, output)
+            if since_last and estado['rows']:
+                self.set_watermark(since_last, table, estado['until_id'])
+
+            stats = {
+                'rows': estado['rows'],
+                'since_id': desde,
+                'until_id': estado['until_id'],
+                'format': fmt,
+                'path': output,
+                'seconds': time.perf_counter() - inicio
+            }
+            if self.log_manager:
+                self.log_manager.log_event(
+                    'exportacao_em_massa', tabela=table, formato=fmt, linhas=stats['rows'],
+                    desde_id=desde, ate_id=stats['until_id'], segundos=f"{stats['seconds']:.2f}"
+                )
+            return True, stats
+
+        except BulkExportCancelled:
+            self._remove(temporario)
+            return False, "Exportação cancelada"
+        except Exception as e:
+            self._remove(temporario)
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro na exportação em massa")
+            return False, f"Erro na exportação: {e}"
+
+    # ------------------------------------------------------------------
+    # Marcas d'água
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _watermark_key(name, table):
+        return f"{WATERMARK_SETTING_PREFIX}_{table}_{name}"
+
+    def get_watermark(self, name, table='downloads'):
+        """Maior id já exportado pela exportação incremental `name` (0 se nunca exportou)"""
+        valor = self.db_manager.get_setting(self._watermark_key(name, table), '0')
+        try:
+            return int(valor)
+        except (TypeError, ValueError):
+            return 0
+
+    def set_watermark(self, name, table, last_id):
+        """Registra o maior id exportado pela exportação incremental `name`"""
+        self.db_manager.set_setting(self._watermark_key(name, table), str(int(last_id)))
+
+    def reset_watermark(self, name, table='downloads'):
+        """Faz a próxima exportação incremental `name` recomeçar do início"""
+        self.set_watermark(name, table, 0)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+
+    def _columns(self, table):
+        """Colunas da tabela com o tipo declarado: [(nome, tipo), ...]"""
+        conn = sqlite3.connect(self.db_manager.db_path)
+        try:
+            return [(row[1], (row[2] or '').upper()) for row in conn.execute(f"PRAGMA table_info({table})")]
+        finally:
+            conn.close()
+
+    def _count(self, table, since_id):
+        conn = sqlite3.connect(self.db_manager.db_path)
+        try:
+            return conn.execute(f"SELECT COUNT(*) FROM {table} WHERE id > ?", (since_id,)).fetchone()[0]
+        finally:
+            conn.close()
+
+    def _iter_chunks(self, table, since_id):
+        """Blocos de linhas (tuplas, com o id na primeira coluna) em ordem de id"""
+        conn = sqlite3.connect(self.db_manager.db_path)
+        try:
+            nomes = ", ".join(nome for nome, _ in self._columns(table))
+            cursor = conn.execute(f"SELECT {nomes} FROM {table} WHERE id > ? ORDER BY id", (since_id,))
+            while True:
+                linhas = cursor.fetchmany(self.chunk_size)
+                if not linhas:
+                    break
+                yield linhas
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _write_jsonl(path, compress, colunas, chunks):
+        nomes = [nome for nome, _ in colunas]
+        abrir = gzip.open if compress else open
+        with abrir(path, 'wt', encoding='utf-8', newline='\n') as f:
+            for linhas in chunks:
+                f.writelines(
+                    json.dumps(dict(zip(nomes, linha)), ensure_ascii=False, default=str) + '\n'
+                    for linha in linhas
+                )
+
+    @staticmethod
+    def _arrow_type(pa, declarado):
+        """Tipo Arrow a partir do tipo declarado no SQLite (mesma regra de afinidade do SQLite)"""
+        if 'INT' in declarado:
+            return pa.int64()
+        if any(t in declarado for t in ('REAL', 'FLOA', 'DOUB')):
+            return pa.float64()
+        return pa.string()
+
+    @staticmethod
+    def _coerce(valores, tipo, pa):
+        """
+        Converte os valores de uma coluna para o tipo Arrow
+
+        O SQLite aceita qualquer valor em qualquer coluna; valores que não
+        podem ser convertidos viram nulos em vez de interromper a exportação.
+        """
+        if tipo == pa.string():
+            return [None if v is None else str(v) for v in valores]
+        conversor = int if tipo == pa.int64() else float
+        convertidos = []
+        for v in valores:
+            try:
+                convertidos.append(None if v is None or v == '' else conversor(v))
+            except (TypeError, ValueError):
+                convertidos.append(None)
+        return convertidos
+
+    def _write_arrow(self, path, fmt, colunas, chunks):
+        import pyarrow as pa
+
+        tipos = [self._arrow_type(pa, declarado) for _, declarado in colunas]
+        schema = pa.schema([(nome, tipo) for (nome, _), tipo in zip(colunas, tipos)])
+
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            writer = pq.ParquetWriter(path, schema, compression='zstd')
+            write = writer.write_batch
+        else:
+            sink = pa.OSFile(path, 'wb')
+            writer = pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression='zstd'))
+            write = writer.write_batch
+
+        try:
+            for linhas in chunks:
+                colunas_bloco = zip(*linhas)
+                arrays = [
+                    pa.array(self._coerce(valores, tipo, pa), type=tipo)
+                    for valores, tipo in zip(colunas_bloco, tipos)
+                ]
+                write(pa.RecordBatch.from_arrays(arrays, schema=schema))
+        finally:
+            writer.close()
+            if fmt != 'parquet':
+                sink.close()
+
+    @staticmethod
+    def _remove(caminho):
+        try:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+        except OSError:
+            pass
+
+
+def main(argv=None):
+    """Linha de comando para jobs agendados"""
+    parser = argparse.ArgumentParser(description="Exportação em massa do histórico de downloads")
+    parser.add_argument('output', help="Arquivo de destino (.parquet, .arrow, .jsonl ou .jsonl.gz)")
+    parser.add_argument('--format', choices=['jsonl', 'parquet', 'arrow'], help="Formato (padrão: pela extensão)")
+    parser.add_argument('--table', default='downloads', choices=EXPORTABLE_TABLES, help="Tabela a exportar")
+    parser.add_argument('--since-last', metavar='NOME', help="Exportar só linhas novas desde a última exportação NOME")
+    parser.add_argument('--reset-watermark', action='store_true', help="Recomeçar a exportação NOME do início")
+    parser.add_argument('--db', default="youtube_downloader.db", help="Caminho do banco de dados")
+    parser.add_argument('--chunk-size', type=int, default=BULK_EXPORT_CHUNK_SIZE, help="Linhas por bloco")
+    args = parser.parse_args(argv)
+
+    from database_manager import DatabaseManager
+
+    exporter = BulkExporter(DatabaseManager(args.db), chunk_size=args.chunk_size)
+    if args.reset_watermark:
+        if not args.since_last:
+            parser.error("--reset-watermark requer --since-last")
+        exporter.reset_watermark(args.since_last, args.table)
+
+    sucesso, resultado = exporter.export(args.output, args.format, args.table, args.since_last)
+    if not sucesso:
+        print(resultado, file=sys.stderr)
+        return 1
+
+    print(f"{resultado['rows']} linha(s) exportada(s) para {resultado['path']} "
+          f"(ids {resultado['since_id'] + 1}-{resultado['until_id']}, {resultado['seconds']:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import os
 import json
 from database_manager import DatabaseManager
+from settings_store import SettingsStore
 from utils import UIConstants, AppConstants
 
 class ConfigManager:
@@ -14,6 +15,11 @@ class ConfigManager:
             db_manager: Instância do DatabaseManager (opcional)
         """
         self.db_manager = db_manager or DatabaseManager()
+        
+        # Configurações em memória; gravações vão para o banco em lote
+        self.settings = SettingsStore(self.db_manager)
+        self.settings.subscribe(self._on_setting_changed)
+        
         self.current_theme = 'light'
         self.current_resolution = AppConstants.DEFAULT_RESOLUTION
         self.auto_open_folder = False
@@ -24,17 +30,17 @@ class ConfigManager:
     def load_settings(self):
         """Carrega configurações salvas do banco de dados"""
         try:
+            # Ler a tabela de configurações inteira uma única vez
+            self.settings.load()
+            
             # Carregar tema
-            theme_setting = self.db_manager.get_setting('theme', 'light')
-            self.current_theme = theme_setting
+            self.current_theme = self.settings.get('theme', 'light')
             
             # Carregar resolução padrão
-            resolution_setting = self.db_manager.get_setting('default_resolution', AppConstants.DEFAULT_RESOLUTION)
-            self.current_resolution = resolution_setting
+            self.current_resolution = self.settings.get('default_resolution', AppConstants.DEFAULT_RESOLUTION)
             
             # Carregar configuração de auto-abertura de pasta
-            auto_open_setting = self.db_manager.get_setting('auto_open_folder', 'false')
-            self.auto_open_folder = auto_open_setting.lower() == 'true'
+            self.auto_open_folder = self.settings.get('auto_open_folder', 'false').lower() == 'true'
             
         except Exception as e:
             print(f"Erro ao carregar configurações: {e}")
@@ -55,8 +61,7 @@ class ConfigManager:
         """
         try:
             if theme in ['light', 'dark']:
-                self.db_manager.set_setting('theme', theme)
-                self.current_theme = theme
+                self.settings.set('theme', theme)
                 return True
             return False
         except Exception as e:
@@ -74,8 +79,7 @@ class ConfigManager:
             bool: Sucesso da operação
         """
         try:
-            self.db_manager.set_setting('default_resolution', resolution)
-            self.current_resolution = resolution
+            self.settings.set('default_resolution', resolution)
             return True
         except Exception as e:
             print(f"Erro ao salvar resolução: {e}")
@@ -92,14 +96,55 @@ class ConfigManager:
             bool: Sucesso da operação
         """
         try:
-            value = 'true' if auto_open else 'false'
-            self.db_manager.set_setting('auto_open_folder', value)
-            self.auto_open_folder = auto_open
+            self.settings.set('auto_open_folder', 'true' if auto_open else 'false')
             return True
         except Exception as e:
             print(f"Erro ao salvar configuração de auto-abertura: {e}")
             return False
     
+    def _on_setting_changed(self, key, value, old_value):
+        """Mantém os atributos em sincronia com as configurações"""
+        if key == 'theme':
+            self.current_theme = value
+        elif key == 'default_resolution':
+            self.current_resolution = value
+        elif key == 'auto_open_folder':
+            self.auto_open_folder = value.lower() == 'true'
+    
+    def get_setting(self, key, default=None):
+        """
+        Retorna uma configuração qualquer (lida da memória)
+        
+        Args:
+            key (str): Chave da configuração
+            default: Valor se a configuração não existir
+        """
+        return self.settings.get(key, default)
+    
+    def set_setting(self, key, value):
+        """
+        Altera uma configuração qualquer; a gravação no banco é feita em lote
+        
+        Args:
+            key (str): Chave da configuração
+            value: Novo valor (armazenado como texto)
+        """
+        self.settings.set(key, value)
+    
+    def subscribe(self, callback, key=None):
+        """
+        Registra um observador de mudanças de configuração
+        
+        Args:
+            callback: Função callback(key, value, old_value)
+            key (str): Só avisar sobre esta chave (padrão: todas)
+        """
+        return self.settings.subscribe(callback, key)
+    
+    def close(self):
+        """Grava as configurações pendentes (chamar ao encerrar a aplicação)"""
+        self.settings.close()
+    
     def get_theme(self):
         """Retorna tema atual"""
         return self.current_theme
@@ -130,62 +175,6 @@ class ConfigManager:
         else:
             return UIConstants.THEME_LIGHT.copy()
     
-    def apply_theme_to_widget(self, widget, theme=None):
-        """
-        Aplica tema a um widget específico
-        
-        Args:
-            widget: Widget tkinter
-            theme (str): Tema a aplicar (opcional)
-        """
-        colors = self.get_theme_colors(theme)
-        widget_class = "Unknown"
-        
-        try:
-            # Obter classe do widget
-            widget_class = widget.__class__.__name__
-            
-            # Aplicar cores básicas
-            widget.config(
-                bg=colors['bg'],
-                fg=colors['fg']
-            )
-            
-            # Configurações específicas para alguns tipos de widget
-            if widget_class in ['Listbox', 'Text']:
-                widget.config(
-                    selectbackground=colors['select_bg'],
-                    selectforeground=colors['select_fg']
-                )
-            
-        except Exception as e:
-            # Alguns widgets podem não suportar todas as configurações
-            print(f"Aviso ao aplicar tema ao widget {widget_class}: {e}")
-    
-    def apply_theme_to_children(self, parent_widget, theme=None):
-        """
-        Aplica tema recursivamente a todos os widgets filhos
-        
-        Args:
-            parent_widget: Widget pai
-            theme (str): Tema a aplicar (opcional)
-        """
-        colors = self.get_theme_colors(theme)
-        
-        def update_widget_recursive(widget):
-            try:
-                # Aplicar tema ao widget atual
-                self.apply_theme_to_widget(widget, theme)
-                
-                # Aplicar recursivamente aos filhos
-                for child in widget.winfo_children():
-                    update_widget_recursive(child)
-                    
-            except Exception as e:
-                print(f"Erro ao aplicar tema recursivamente: {e}")
-        
-        update_widget_recursive(parent_widget)
-    
     def get_all_settings(self):
         """
         Retorna todas as configurações atuais
@@ -0,0 +1,486 @@
+import os
+import time
+import sqlite3
+import threading
+from datetime import datetime
+
+# Páginas copiadas por etapa do backup; entre etapas o banco fica livre para escrita
+BACKUP_PAGES_PER_STEP = 256
+
+# Pausa entre etapas do backup (s)
+BACKUP_STEP_SLEEP = 0.005
+
+# Backups mantidos na pasta de backups (os mais antigos são removidos)
+BACKUP_KEEP = 5
+
+# Páginas liberadas por etapa da compactação incremental
+VACUUM_PAGES_PER_STEP = 500
+
+# Intervalo da manutenção automática e espera após a inicialização (s)
+MAINTENANCE_INTERVAL_HOURS = 24
+MAINTENANCE_STARTUP_DELAY = 120
+
+# Configuração com a data da última manutenção automática
+MAINTENANCE_LAST_RUN_SETTING = 'maintenance_last_run'
+
+# Configuração com a idade (dias) a partir da qual downloads vão para o arquivo (0 = nunca)
+ARCHIVE_AFTER_DAYS_SETTING = 'archive_after_days'
+
+# Downloads movidos para o arquivo por transação
+ARCHIVE_BATCH_SIZE = 500
+
+AUTO_VACUUM_MODES = {0: 'none', 1: 'full', 2: 'incremental'}
+
+
+class MaintenanceCancelled(Exception):
+    """Operação de manutenção interrompida"""
+
+
+def online_backup(db_path, dest_path, progress=None, cancel_event=None, pages=BACKUP_PAGES_PER_STEP):
+    """
+    Copia o banco com a API de backup do SQLite
+
+    A cópia é feita em etapas de `pages` páginas; entre as etapas outras
+    conexões podem gravar normalmente, e o SQLite recomeça as páginas que
+    mudaram. O destino é gravado como `.part` e renomeado ao final.
+
+    Args:
+        db_path (str): Banco de origem
+        dest_path (str): Arquivo de destino
+        progress: Função progress(copiadas, total) chamada a cada etapa
+        cancel_event (threading.Event): Interrompe o backup quando sinalizado
+        pages (int): Páginas por etapa
+    """
+    temporario = f"{dest_path}.part"
+
+    def on_step(status, restantes, total):
+        if cancel_event is not None and cancel_event.is_set():
+            raise MaintenanceCancelled()
+        if progress:
+            progress(total - restantes, total)
+
+    origem = sqlite3.connect(db_path)
+    destino = sqlite3.connect(temporario)
+    try:
+        origem.backup(destino, pages=pages, progress=on_step, sleep=BACKUP_STEP_SLEEP)
+        destino.close()
+        os.replace(temporario, dest_path)
+    except BaseException:
+        destino.close()
+        if os.path.exists(temporario):
+            os.remove(temporario)
+        raise
+    finally:
+        origem.close()
+
+
+class DatabaseMaintenance:
+    """
+    Manutenção do banco de dados: backup online, arquivamento de downloads
+    antigos, compactação incremental e verificação de integridade.
+
+    Todas as operações podem rodar fora da thread principal e aceitam
+    `progress(feitas, total)` e `cancel_event`, no mesmo formato das
+    exportações, e retornam (sucesso, mensagem).
+    """
+
+    def __init__(self, db_manager, log_manager=None, backup_dir=None):
+        """
+        Args:
+            db_manager: Instância do DatabaseManager
+            log_manager: Instância do LogManager (opcional)
+            backup_dir (str): Pasta dos backups (padrão: 'backups' ao lado do banco)
+        """
+        self.db_manager = db_manager
+        self.log_manager = log_manager
+        self.backup_dir = backup_dir or os.path.join(os.path.dirname(os.path.abspath(db_manager.db_path)), 'backups')
+
+    def _connect(self):
+        # Sem transação implícita: VACUUM e incremental_vacuum não rodam dentro de uma
+        return sqlite3.connect(self.db_manager.db_path, isolation_level=None, timeout=30)
+
+    # ------------------------------------------------------------------
+    # Estatísticas
+    # ------------------------------------------------------------------
+
+    def get_stats(self):
+        """
+        Tamanho e fragmentação do banco
+
+        Returns:
+            dict: page_size, page_count, freelist_count, size_bytes,
+            free_bytes, fragmentation_pct e auto_vacuum
+        """
+        conn = self._connect()
+        try:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            freelist = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            'page_size': page_size,
+            'page_count': page_count,
+            'freelist_count': freelist,
+            'size_bytes': page_size * page_count,
+            'free_bytes': page_size * freelist,
+            'fragmentation_pct': (freelist / page_count * 100) if page_count else 0.0,
+            'auto_vacuum': AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum))
+        }
+
+    # ------------------------------------------------------------------
+    # Backup
+    # ------------------------------------------------------------------
+
+    def backup(self, dest_path=None, progress=None, cancel_event=None):
+        """
+        Backup online do banco
+
+        Args:
+            dest_path (str): Arquivo de destino (padrão: pasta de backups, com data e hora)
+            progress: Função progress(páginas_copiadas, total)
+            cancel_event (threading.Event): Interrompe o backup quando sinalizado
+
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        inicio = time.perf_counter()
+        try:
+            rotacionar = dest_path is None
+            if dest_path is None:
+                os.makedirs(self.backup_dir, exist_ok=True)
+                dest_path = os.path.join(self.backup_dir, f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db")
+
+            online_backup(self.db_manager.db_path, dest_path, progress, cancel_event)
+            if rotacionar:
+                self._rotate_backups()
+
+            tamanho = os.path.getsize(dest_path)
+            self._log('backup_banco', arquivo=dest_path, bytes=tamanho, segundos=f"{time.perf_counter() - inicio:.2f}")
+            return True, f"Backup criado em:\n{dest_path}"
+
+        except MaintenanceCancelled:
+            return False, "Backup cancelado"
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro no backup do banco de dados")
+            return False, f"Erro no backup: {e}"
+
+    def list_backups(self):
+        """Backups da pasta de backups, do mais novo para o mais antigo"""
+        if not os.path.isdir(self.backup_dir):
+            return []
+        arquivos = [
+            os.path.join(self.backup_dir, nome) for nome in os.listdir(self.backup_dir)
+            if nome.startswith('backup_') and nome.endswith('.db')
+        ]
+        return sorted(arquivos, reverse=True)
+
+    def _rotate_backups(self):
+        for antigo in self.list_backups()[BACKUP_KEEP:]:
+            try:
+                os.remove(antigo)
+            except OSError:
+                pass
+
+    # ------------------------------------------------------------------
+    # Arquivamento
+    # ------------------------------------------------------------------
+
+    def get_archive_after_days(self):
+        """Idade de arquivamento configurada (0 = desativado)"""
+        try:
+            return max(0, int(self.db_manager.get_setting(ARCHIVE_AFTER_DAYS_SETTING, 0) or 0))
+        except (TypeError, ValueError):
+            return 0
+
+    def archive_old_downloads(self, older_than_days=None, progress=None, cancel_event=None):
+        """
+        Move os downloads antigos da tabela principal para downloads_archive
+
+        A movimentação é feita em lotes de ARCHIVE_BATCH_SIZE, cada um na sua
+        transação, então o histórico continua utilizável durante o processo.
+
+        Args:
+            older_than_days (int): Idade mínima (padrão: configuração archive_after_days)
+            progress: Função progress(movidos, total)
+            cancel_event (threading.Event): Interrompe entre lotes quando sinalizado
+
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        if older_than_days is None:
+            older_than_days = self.get_archive_after_days()
+        try:
+            dias = int(older_than_days)
+        except (TypeError, ValueError):
+            dias = 0
+        if dias <= 0:
+            return True, "Arquivamento desativado"
+
+        inicio = time.perf_counter()
+        try:
+            total = self.db_manager.count_archivable_downloads(dias)
+            movidos = 0
+            while movidos < total:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise MaintenanceCancelled()
+                lote = self.db_manager.archive_downloads(dias, ARCHIVE_BATCH_SIZE)
+                if not lote:
+                    break
+                movidos += lote
+                if progress:
+                    progress(movidos, total)
+
+            self._log('arquivamento_downloads', dias=dias, movidos=movidos,
+                      segundos=f"{time.perf_counter() - inicio:.2f}")
+            return True, f"{movidos} download(s) com mais de {dias} dias arquivado(s)"
+
+        except MaintenanceCancelled:
+            return False, "Arquivamento cancelado"
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro ao arquivar downloads")
+            return False, f"Erro no arquivamento: {e}"
+
+    # ------------------------------------------------------------------
+    # Compactação
+    # ------------------------------------------------------------------
+
+    def is_incremental_vacuum(self):
+        """Indica se o banco já está em auto_vacuum=INCREMENTAL"""
+        conn = self._connect()
+        try:
+            return conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+        finally:
+            conn.close()
+
+    def enable_incremental_vacuum(self):
+        """
+        Ativa auto_vacuum=INCREMENTAL
+
+        Em um banco existente a mudança só vale depois de um VACUUM completo:
+        o arquivo inteiro é reescrito com trava exclusiva e precisa de espaço
+        livre em disco equivalente ao tamanho do banco. Por isso só é feita a
+        pedido do usuário (bancos novos já são criados no modo incremental).
+
+        Returns:
+            bool: True se o modo foi alterado agora
+        """
+        conn = self._connect()
+        try:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+                return False
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+            return True
+        finally:
+            conn.close()
+
+    def compact(self, progress=None, cancel_event=None, convert=False):
+        """
+        Devolve ao sistema as páginas livres deixadas por exclusões
+
+        Usa incremental_vacuum em etapas curtas (cada uma uma transação
+        rápida), sem reescrever o banco inteiro como o VACUUM. Em bancos que
+        ainda não estão no modo incremental nada é feito, a menos que
+        `convert` peça a conversão única (VACUUM completo).
+
+        Args:
+            convert (bool): Converte o banco para auto_vacuum=INCREMENTAL se preciso
+
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        inicio = time.perf_counter()
+        try:
+            convertido = False
+            if not self.is_incremental_vacuum():
+                if not convert:
+                    self._log('compactacao_banco', paginas=0, convertido=False, motivo='auto_vacuum_desativado')
+                    return True, "Compactação ignorada: o banco ainda não está no modo incremental"
+                convertido = self.enable_incremental_vacuum()
+
+            conn = self._connect()
+            try:
+                livres = total = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                while livres > 0:
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise MaintenanceCancelled()
+                    conn.execute(f"PRAGMA incremental_vacuum({VACUUM_PAGES_PER_STEP})").fetchall()
+                    restantes = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                    if restantes >= livres:
+                        break
+                    livres = restantes
+                    if progress:
+                        progress(total - livres, total)
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            finally:
+                conn.close()
+
+            liberados = (total - livres) * page_size
+            self._log('compactacao_banco', paginas=total - livres, bytes=liberados,
+                      convertido=convertido, segundos=f"{time.perf_counter() - inicio:.2f}")
+            return True, f"Banco compactado: {liberados / 1024 / 1024:.1f} MB liberados"
+
+        except MaintenanceCancelled:
+            return False, "Compactação cancelada"
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro ao compactar o banco de dados")
+            return False, f"Erro na compactação: {e}"
+
+    # ------------------------------------------------------------------
+    # Integridade
+    # ------------------------------------------------------------------
+
+    def integrity_check(self, quick=True):
+        """
+        Verifica a integridade do banco
+
+        Args:
+            quick (bool): quick_check (mais rápido, não confere índices) ou integrity_check
+
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        try:
+            conn = self._connect()
+            try:
+                pragma = 'quick_check' if quick else 'integrity_check'
+                problemas = [row[0] for row in conn.execute(f"PRAGMA {pragma}") if row[0] != 'ok']
+            finally:
+                conn.close()
+
+            self._log('integridade_banco', completa=not quick, problemas=len(problemas))
+            if problemas:
+                return False, "Problemas encontrados no banco:\n" + "\n".join(problemas[:20])
+            return True, "Banco de dados íntegro"
+
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro na verificação de integridade")
+            return False, f"Erro na verificação: {e}"
+
+    # ------------------------------------------------------------------
+    # Manutenção completa
+    # ------------------------------------------------------------------
+
+    def run_maintenance(self, progress=None, cancel_event=None, archive_after_days=None):
+        """
+        Verificação rápida, backup, arquivamento, compactação e atualização de estatísticas
+
+        O backup só é feito se o banco estiver íntegro, para não substituir
+        backups bons por uma cópia corrompida. O arquivamento vem antes da
+        compactação, que devolve o espaço liberado na tabela principal; a
+        compactação nunca converte o banco (só roda se ele já for incremental).
+
+        Args:
+            archive_after_days (int): Idade de arquivamento (padrão: configuração do banco)
+
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        etapas = []
+
+        sucesso, mensagem = self.integrity_check(quick=True)
+        etapas.append(mensagem)
+        if not sucesso:
+            return False, mensagem
+
+        def arquivar(progress=None, cancel_event=None):
+            return self.archive_old_downloads(archive_after_days, progress, cancel_event)
+
+        for etapa in (self.backup, arquivar, self.compact):
+            if cancel_event is not None and cancel_event.is_set():
+                return False, "Manutenção cancelada"
+            sucesso, mensagem = etapa(progress=progress, cancel_event=cancel_event)
+            etapas.append(mensagem)
+            if not sucesso:
+                return False, mensagem
+
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("PRAGMA optimize")
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro ao otimizar o banco de dados")
+
+        return True, "\n".join(etapas)
+
+    def _log(self, evento, **campos):
+        if self.log_manager:
+            self.log_manager.log_event(evento, **campos)
+
+
+class MaintenanceScheduler:
+    """
+    Executa a manutenção do banco periodicamente em uma thread de fundo.
+
+    A primeira execução espera MAINTENANCE_STARTUP_DELAY após a inicialização
+    e só acontece se a última manutenção (registrada nas configurações) tiver
+    sido há mais de `interval_hours`.
+    """
+
+    def __init__(self, maintenance, config_manager, log_manager=None, interval_hours=MAINTENANCE_INTERVAL_HOURS,
+                 startup_delay=MAINTENANCE_STARTUP_DELAY):
+        """
+        Args:
+            maintenance: Instância do DatabaseMaintenance
+            config_manager: Instância do ConfigManager (guarda a data da última execução)
+            log_manager: Instância do LogManager (opcional)
+            interval_hours (float): Intervalo entre manutenções
+            startup_delay (float): Espera antes da primeira verificação (s)
+        """
+        self.maintenance = maintenance
+        self.config_manager = config_manager
+        self.log_manager = log_manager
+        self.interval = interval_hours * 3600
+        self.startup_delay = startup_delay
+        self.cancel_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread de agendamento"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="DatabaseMaintenance", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Interrompe a manutenção em andamento e encerra o agendamento"""
+        self.cancel_event.set()
+
+    def seconds_until_due(self):
+        """Segundos até a próxima manutenção (0 se já estiver atrasada)"""
+        ultima = self.config_manager.get_setting(MAINTENANCE_LAST_RUN_SETTING)
+        try:
+            decorrido = time.time() - float(ultima)
+        except (TypeError, ValueError):
+            return 0
+        return max(0, self.interval - decorrido)
+
+    def _run(self):
+        if self.cancel_event.wait(self.startup_delay):
+            return
+        while not self.cancel_event.is_set():
+            espera = self.seconds_until_due()
+            if espera > 0:
+                if self.cancel_event.wait(espera):
+                    return
+                continue
+
+            sucesso, mensagem = self.maintenance.run_maintenance(
+                cancel_event=self.cancel_event,
+                archive_after_days=self.config_manager.get_setting(ARCHIVE_AFTER_DAYS_SETTING)
+            )
+            if self.cancel_event.is_set():
+                return
+            if self.log_manager:
+                registro = self.log_manager.log_info if sucesso else self.log_manager.log_warning
+                registro(f"Manutenção automática do banco: {mensagem}")
+            # Registrar mesmo em caso de falha, para não repetir a cada inicialização
+            self.config_manager.set_setting(MAINTENANCE_LAST_RUN_SETTING, str(time.time()))
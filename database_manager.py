@@ -1,46 +1,120 @@
 import sqlite3
 import logging
-from datetime import datetime
-from database_schema import DatabaseSchema
+from datetime import datetime, timedelta, timezone
+from database_schema import DatabaseSchema, DOWNLOADS_COLUMNS, compress_text, decompress_text
+from download_record import DownloadRecord
 
 class DatabaseManager:
+    # Campos que podem ser pedidos nas consultas de downloads -> expressão SQL
+    # (d = downloads ou downloads_all; dd = download_details, incluída só se pedida)
+    DOWNLOAD_FIELDS = dict(
+        {coluna: f"d.{coluna}" for coluna in DOWNLOADS_COLUMNS},
+        timestamp="d.download_date",
+        file_path="d.download_path",
+        description="descompactar(dd.description)",
+        thumbnail_url="dd.thumbnail_url"
+    )
+    DETAIL_FIELDS = ('description', 'thumbnail_url')
+    
+    # Projeções usadas pela interface
+    HISTORY_LIST_FIELDS = ('id', 'title', 'resolution', 'timestamp', 'status')
+    EXPORT_FIELDS = ('id', 'url', 'title', 'resolution', 'file_path', 'file_size', 'timestamp', 'status')
+    PERIOD_FIELDS = tuple(c for c in DOWNLOADS_COLUMNS if c not in ('description', 'thumbnail_url'))
+    
     def __init__(self, db_path="youtube_downloader.db"):
         self.db_path = db_path
         self.schema = DatabaseSchema(db_path)
+        # Incrementado a cada gravação no histórico (invalida resultados guardados em memória)
+        self.data_version = 0
+        
+    def _mark_changed(self):
+        """Registra que o histórico mudou"""
+        self.data_version += 1
         
     def initialize(self):
         """Inicializa o banco de dados com schema atualizado"""
         self.schema.initialize_database()
     
+    # Descrição e thumbnail ficam em download_details (descrição compactada),
+    # fora da tabela principal, que é a lida pelas listagens e estatísticas
+    INSERT_DOWNLOAD_SQL = """
+        INSERT INTO downloads (
+            url, title, duration, resolution, file_size, 
+            download_path, status, uploader, 
+            view_count, like_count
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    
+    INSERT_DETAILS_SQL = """
+        INSERT OR REPLACE INTO download_details (download_id, description, thumbnail_url)
+        VALUES (?, ?, ?)
+    """
+    
+    UPDATE_SPEED_SQL = """
+        UPDATE downloads 
+        SET avg_speed_mbps = ?, 
+            peak_speed_mbps = ?, 
+            download_duration_seconds = ?,
+            download_speed_mbps = ?
+        WHERE id = ?
+    """
+    
+    @staticmethod
+    def _download_values(download_data):
+        """Parâmetros do INSERT de um download"""
+        return (
+            download_data.get('url'),
+            download_data.get('title'),
+            download_data.get('duration'),
+            download_data.get('resolution'),
+            download_data.get('file_size'),
+            download_data.get('download_path'),
+            download_data.get('status', 'completed'),
+            download_data.get('uploader'),
+            download_data.get('view_count'),
+            download_data.get('like_count')
+        )
+    
+    @staticmethod
+    def _details_values(download_id, download_data):
+        """Parâmetros do INSERT em download_details (None se não houver detalhes)"""
+        description = download_data.get('description')
+        thumbnail_url = download_data.get('thumbnail_url')
+        if not description and not thumbnail_url:
+            return None
+        return (download_id, compress_text(description), thumbnail_url)
+    
+    def _insert_download(self, cursor, download_data):
+        """Insere um download e seus detalhes; retorna o ID"""
+        cursor.execute(self.INSERT_DOWNLOAD_SQL, self._download_values(download_data))
+        download_id = cursor.lastrowid
+        detalhes = self._details_values(download_id, download_data)
+        if detalhes:
+            cursor.execute(self.INSERT_DETAILS_SQL, detalhes)
+        return download_id
+    
+    @staticmethod
+    def _downloads_source(filters=None, include_archive=False):
+        """Tabela consultada: só a principal ou, se pedido, a visão com o arquivo"""
+        if include_archive or (filters and filters.get('include_archive')):
+            return "downloads_all"
+        return "downloads"
+    
+    @staticmethod
+    def _speed_values(download_id, avg_speed, peak_speed, duration):
+        """Parâmetros do UPDATE de velocidade de um download"""
+        return (avg_speed, peak_speed, int(duration), avg_speed, download_id)
+    
     def add_download(self, download_data):
         """Adiciona um download ao histórico"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
-            cursor.execute("""
-                INSERT INTO downloads (
-                    url, title, duration, resolution, file_size, 
-                    download_path, status, thumbnail_url, uploader, 
-                    view_count, like_count, description
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                download_data.get('url'),
-                download_data.get('title'),
-                download_data.get('duration'),
-                download_data.get('resolution'),
-                download_data.get('file_size'),
-                download_data.get('download_path'),
-                download_data.get('status', 'completed'),
-                download_data.get('thumbnail_url'),
-                download_data.get('uploader'),
-                download_data.get('view_count'),
-                download_data.get('like_count'),
-                download_data.get('description')
-            ))
+            download_id = self._insert_download(cursor, download_data)
             
             conn.commit()
-            download_id = cursor.lastrowid
+            self._mark_changed()
             logging.info(f"Download adicionado ao histórico: ID {download_id}")
             return download_id
             
@@ -51,70 +125,190 @@ class DatabaseManager:
         finally:
             conn.close()
     
-    def get_recent_downloads(self, limit=50):
-        """Obtém downloads recentes para o histórico (método legado)"""
-        return self.get_downloads_paginated(page=1, per_page=limit)['downloads']
-    
-    def get_downloads_paginated(self, page=1, per_page=50, filters=None):
-        """Obtém downloads com paginação e filtros opcionais"""
-        conn = sqlite3.connect(self.db_path)
+    def add_downloads_bulk(self, downloads, speed_updates=None):
+        """
+        Adiciona vários downloads (e atualizações de velocidade) em uma única transação
+        
+        Args:
+            downloads (list): Dicionários no formato de add_download
+            speed_updates (list): Tuplas (download_id, avg_speed, peak_speed, duration),
+                aplicadas depois das inserções
+            
+        Returns:
+            list: IDs dos downloads inseridos, na mesma ordem
+        """
+        # Espera pelo lock em vez de falhar logo (manutenção e arquivamento gravam em segundo plano)
+        conn = sqlite3.connect(self.db_path, timeout=30)
         cursor = conn.cursor()
         
         try:
-            # Construir query base
-            base_query = """
-                SELECT id, url, title, duration, resolution, file_size, 
-                       download_path, status, thumbnail_url, uploader, 
-                       view_count, like_count, description, download_date as timestamp
-                FROM downloads
-            """
+            ids = []
+            for download_data in downloads:
+                ids.append(self._insert_download(cursor, download_data))
             
-            # Construir condições WHERE se houver filtros
-            where_conditions = []
-            params = []
+            if speed_updates:
+                cursor.executemany(
+                    self.UPDATE_SPEED_SQL,
+                    [self._speed_values(*update) for update in speed_updates]
+                )
             
-            if filters:
-                if filters.get('search_query'):
-                    where_conditions.append("title LIKE ?")
-                    params.append(f"%{filters['search_query']}%")
-                
-                if filters.get('resolution'):
-                    where_conditions.append("resolution = ?")
-                    params.append(filters['resolution'])
-                
-                if filters.get('status'):
-                    where_conditions.append("status = ?")
-                    params.append(filters['status'])
-                
-                if filters.get('date_from'):
-                    where_conditions.append("download_date >= ?")
-                    params.append(filters['date_from'])
-                
-                if filters.get('date_to'):
-                    where_conditions.append("download_date <= ?")
-                    params.append(filters['date_to'])
+            conn.commit()
+            self._mark_changed()
+            logging.info(f"Lote gravado no histórico: {len(ids)} download(s), "
+                         f"{len(speed_updates or [])} atualização(ões) de velocidade")
+            return ids
             
-            # Montar query completa
-            if where_conditions:
-                base_query += " WHERE " + " AND ".join(where_conditions)
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Erro ao gravar lote de downloads: {e}")
+            raise
+        finally:
+            conn.close()
+    
+    def update_download_speed(self, download_id, avg_speed, peak_speed, duration):
+        """
+        Salva as estatísticas de velocidade de um download
+        
+        Returns:
+            bool: True se o download existia e foi atualizado
+        """
+        conn = sqlite3.connect(self.db_path)
+        
+        try:
+            cursor = conn.execute(self.UPDATE_SPEED_SQL, self._speed_values(download_id, avg_speed, peak_speed, duration))
+            conn.commit()
+            self._mark_changed()
+            return cursor.rowcount > 0
             
-            # Adicionar ordenação e paginação
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Erro ao salvar velocidade do download {download_id}: {e}")
+            raise
+        finally:
+            conn.close()
+    
+    def _connect_rows(self):
+        """Conexão que devolve sqlite3.Row (acesso por nome, sem montar dicionários)"""
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.create_function('descompactar', 1, decompress_text, deterministic=True)
+        return conn
+    
+    def _select_downloads_sql(self, fields, filters=None, search_url=False, after=None,
+                              order_by="download_date DESC, id DESC"):
+        """
+        Monta o SELECT de downloads só com os campos pedidos
+        
+        Returns:
+            tuple: (sql, parâmetros)
+        """
+        desconhecidos = [campo for campo in fields if campo not in self.DOWNLOAD_FIELDS]
+        if desconhecidos:
+            raise ValueError(f"Campos desconhecidos: {', '.join(desconhecidos)}")
+        
+        colunas = ", ".join(f"{self.DOWNLOAD_FIELDS[campo]} AS {campo}" for campo in fields)
+        query = f"SELECT {colunas} FROM {self._downloads_source(filters)} d"
+        if any(campo in self.DETAIL_FIELDS for campo in fields):
+            query += " LEFT JOIN download_details dd ON dd.download_id = d.id"
+        
+        conditions, params = self._build_filter_conditions(filters, search_url)
+        if after is not None:
+            conditions.append("(d.download_date < ? OR (d.download_date = ? AND d.id < ?))")
+            params.extend([after[0], after[0], after[1]])
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if order_by:
+            query += f" ORDER BY {order_by}"
+        return query, params
+    
+    def select_downloads(self, fields, filters=None, search_url=False, limit=None, offset=0, after=None,
+                         order_by="download_date DESC, id DESC"):
+        """
+        Consulta downloads lendo apenas os campos pedidos
+        
+        Descrição e thumbnail só são lidas (de download_details) quando
+        fazem parte de `fields`.
+        
+        Args:
+            fields (tuple): Nomes dos campos (chaves de DOWNLOAD_FIELDS)
+            filters (dict): Filtros já processados (inclusive include_archive)
+            search_url (bool): Se True, a busca também procura na URL
+            limit (int): Máximo de linhas (padrão: todas)
+            offset (int): Deslocamento (ignorado se `after` for informado)
+            after (tuple): (download_date, id) da última linha já lida (paginação por chave)
+            order_by (str): Ordenação
+        
+        Returns:
+            list: sqlite3.Row com os campos pedidos
+        """
+        query, params = self._select_downloads_sql(fields, filters, search_url, after, order_by)
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+            if after is None and offset:
+                query += " OFFSET ?"
+                params.append(offset)
+        
+        conn = self._connect_rows()
+        try:
+            return conn.execute(query, params).fetchall()
+        except Exception as e:
+            logging.error(f"Erro ao consultar downloads: {e}")
+            return []
+        finally:
+            conn.close()
+    
+    def iter_downloads(self, fields, filters=None, search_url=False, chunk_size=1000,
+                       order_by="download_date DESC, id DESC"):
+        """
+        Percorre os downloads linha a linha, lendo o cursor em blocos
+        
+        Mesmos argumentos de select_downloads; a conexão fica aberta enquanto
+        o gerador estiver em uso. Erros do banco no meio da leitura são
+        repassados a quem percorre o gerador.
+        
+        Yields:
+            sqlite3.Row: Um download com os campos pedidos
+        """
+        for chunk in self._iter_download_chunks(fields, filters, search_url, chunk_size, order_by):
+            yield from chunk
+    
+    def _iter_download_chunks(self, fields, filters, search_url, chunk_size, order_by):
+        query, params = self._select_downloads_sql(fields, filters, search_url, None, order_by)
+        conn = self._connect_rows()
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        except Exception as e:
+            # Repassa o erro: parar o gerador em silêncio entregaria um resultado truncado
+            logging.error(f"Erro ao percorrer downloads: {e}")
+            raise
+        finally:
+            conn.close()
+    
+    def get_recent_downloads(self, limit=50):
+        """Obtém downloads recentes para o histórico (método legado)"""
+        return self.get_downloads_paginated(page=1, per_page=limit)['downloads']
+    
+    def get_downloads_paginated(self, page=1, per_page=50, filters=None, fields=None):
+        """
+        Obtém downloads com paginação e filtros opcionais
+        
+        Args:
+            page (int): Página (começando em 1)
+            per_page (int): Itens por página
+            filters (dict): Filtros já processados
+            fields (tuple): Campos lidos (padrão: HISTORY_LIST_FIELDS, os exibidos na lista)
+        """
+        try:
             offset = (page - 1) * per_page
-            query = base_query + " ORDER BY download_date DESC LIMIT ? OFFSET ?"
-            params.extend([per_page, offset])
-            
-            # Executar query principal
-            cursor.execute(query, params)
-            columns = [description[0] for description in cursor.description]
-            downloads = [dict(zip(columns, row)) for row in cursor.fetchall()]
-            
-            # Obter contagem total
-            count_query = "SELECT COUNT(*) FROM downloads"
-            if where_conditions:
-                count_query += " WHERE " + " AND ".join(where_conditions)
-            
-            cursor.execute(count_query, params[:-2])  # Remover LIMIT e OFFSET dos parâmetros
-            total_count = cursor.fetchone()[0]
+            downloads = self.select_downloads(fields or self.HISTORY_LIST_FIELDS, filters,
+                                              limit=per_page, offset=offset)
+            total_count = self.get_total_downloads_count(filters)
             
             # Calcular informações de paginação
             total_pages = (total_count + per_page - 1) // per_page  # Ceiling division
@@ -144,35 +338,17 @@ class DatabaseManager:
                     'has_next': False
                 }
             }
-        finally:
-            conn.close()
     
-    def get_total_downloads_count(self, filters=None):
+    def get_total_downloads_count(self, filters=None, search_url=False):
         """Obtém contagem total de downloads com filtros opcionais"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
         try:
-            query = "SELECT COUNT(*) FROM downloads"
-            params = []
-            
-            if filters:
-                where_conditions = []
-                
-                if filters.get('search_query'):
-                    where_conditions.append("title LIKE ?")
-                    params.append(f"%{filters['search_query']}%")
-                
-                if filters.get('resolution'):
-                    where_conditions.append("resolution = ?")
-                    params.append(filters['resolution'])
-                
-                if filters.get('status'):
-                    where_conditions.append("status = ?")
-                    params.append(filters['status'])
-                
-                if where_conditions:
-                    query += " WHERE " + " AND ".join(where_conditions)
+            query = f"SELECT COUNT(*) FROM {self._downloads_source(filters)}"
+            conditions, params = self._build_filter_conditions(filters, search_url)
+            if conditions:
+                query += " WHERE " + " AND ".join(conditions)
             
             cursor.execute(query, params)
             return cursor.fetchone()[0]
@@ -183,6 +359,73 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def get_downloads_window(self, filters=None, limit=200, after=None, offset=0):
+        """
+        Obtém um bloco de linhas do histórico para a lista virtualizada
+        
+        Usa paginação por chave (keyset): com `after` = (download_date, id) da
+        última linha já carregada, o SQLite continua a varredura do índice de
+        data a partir dali, sem percorrer as linhas anteriores como o OFFSET.
+        O `offset` só é usado para saltos (ex.: arrastar a barra de rolagem).
+        
+        Args:
+            filters (dict): Filtros já processados (search_query, resolution, status, date_from,
+                date_to, include_archive)
+            limit (int): Quantidade de linhas do bloco
+            after (tuple): (download_date, id) da última linha do bloco anterior
+            offset (int): Deslocamento a partir do início (ignorado se `after` for informado)
+        
+        Returns:
+            list: sqlite3.Row com id, title, resolution, timestamp e status
+        """
+        return self.select_downloads(self.HISTORY_LIST_FIELDS, filters, limit=limit, offset=offset, after=after)
+    
+    @staticmethod
+    def _escape_like(text):
+        """Escapa os curingas do LIKE (usado com ESCAPE '\\')"""
+        return str(text).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    
+    @staticmethod
+    def _build_filter_conditions(filters, search_url=False):
+        """
+        Monta as condições WHERE (e parâmetros) dos filtros do histórico
+        
+        Args:
+            filters (dict): Filtros já processados
+            search_url (bool): Se True, a busca também procura na URL (exportação)
+        """
+        conditions = []
+        params = []
+        
+        if filters:
+            if filters.get('search_query'):
+                # % e _ digitados pelo usuário são procurados literalmente
+                search_term = "%" + DatabaseManager._escape_like(filters['search_query']) + "%"
+                if search_url:
+                    conditions.append("(title LIKE ? ESCAPE '\\' OR url LIKE ? ESCAPE '\\')")
+                    params.extend([search_term, search_term])
+                else:
+                    conditions.append("title LIKE ? ESCAPE '\\'")
+                    params.append(search_term)
+            
+            if filters.get('resolution'):
+                conditions.append("resolution = ?")
+                params.append(filters['resolution'])
+            
+            if filters.get('status'):
+                conditions.append("status = ?")
+                params.append(filters['status'])
+            
+            if filters.get('date_from'):
+                conditions.append("download_date >= ?")
+                params.append(filters['date_from'])
+            
+            if filters.get('date_to'):
+                conditions.append("download_date <= ?")
+                params.append(filters['date_to'])
+        
+        return conditions, params
+    
     def clear_history(self):
         """Limpa todo o histórico de downloads"""
         conn = sqlite3.connect(self.db_path)
@@ -190,7 +433,10 @@ class DatabaseManager:
         
         try:
             cursor.execute("DELETE FROM downloads")
+            cursor.execute("DELETE FROM downloads_archive")
+            cursor.execute("DELETE FROM download_details")
             conn.commit()
+            self._mark_changed()
             logging.info("Histórico de downloads limpo")
             return True
             
@@ -202,7 +448,7 @@ class DatabaseManager:
             conn.close()
     
     def get_download_by_id(self, download_id):
-        """Obtém dados de um download específico pelo ID"""
+        """Obtém dados de um download específico pelo ID (também no arquivo)"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
         
@@ -210,7 +456,7 @@ class DatabaseManager:
             cursor.execute("""
                 SELECT id, url, title, resolution, download_path, file_size, 
                        download_date as timestamp, status
-                FROM downloads 
+                FROM downloads_all 
                 WHERE id = ?
             """, (download_id,))
             
@@ -240,7 +486,10 @@ class DatabaseManager:
         
         try:
             cursor.execute("DELETE FROM downloads WHERE id = ?", (download_id,))
+            cursor.execute("DELETE FROM downloads_archive WHERE id = ?", (download_id,))
+            cursor.execute("DELETE FROM download_details WHERE download_id = ?", (download_id,))
             conn.commit()
+            self._mark_changed()
             logging.info(f"Download removido: ID {download_id}")
             return True
         except Exception as e:
@@ -251,94 +500,107 @@ class DatabaseManager:
     
     def get_all_downloads_filtered(self, filters=None):
         """Obtém todos os downloads filtrados (sem paginação) para exportação"""
+        downloads = []
+        for chunk in self.iter_downloads_filtered(filters):
+            downloads.extend(chunk)
+        return downloads
+    
+    def iter_downloads_filtered(self, filters=None, chunk_size=1000):
+        """
+        Percorre os downloads filtrados em blocos, sem carregar tudo na memória
+        
+        O cursor é lido com fetchmany; a conexão fica aberta enquanto o
+        gerador estiver em uso e é fechada ao final (ou se ele for descartado).
+        
+        Args:
+            filters (dict): Filtros já processados
+            chunk_size (int): Linhas por bloco
+        
+        Yields:
+            list: Blocos de sqlite3.Row (EXPORT_FIELDS: id, url, title, resolution,
+            file_path, file_size, timestamp, status)
+        
+        Raises:
+            sqlite3.Error: Se a leitura falhar no meio do percurso
+        """
+        yield from self._iter_download_chunks(self.EXPORT_FIELDS, filters, True, chunk_size,
+                                              "download_date DESC, id DESC")
+    
+    def get_downloads_by_period(self, period_days=30, include_archive=False, fields=None):
+        """
+        Obtém downloads de um período específico
+        
+        Args:
+            period_days (int): Dias para trás a partir de agora
+            include_archive (bool): Incluir os downloads arquivados
+            fields (tuple): Campos lidos (padrão: PERIOD_FIELDS, sem descrição e thumbnail)
+        
+        Returns:
+            list: DownloadRecord com os campos pedidos
+        """
+        inicio = datetime.now(timezone.utc) - timedelta(days=int(period_days))
+        filters = {
+            'date_from': inicio.strftime('%Y-%m-%d %H:%M:%S'),
+            'include_archive': include_archive
+        }
+        return [DownloadRecord.from_row(row) for row in self.select_downloads(fields or self.PERIOD_FIELDS, filters)]
+    
+    def count_archivable_downloads(self, older_than_days):
+        """Quantidade de downloads com mais de `older_than_days` dias na tabela principal"""
         conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         
         try:
-            # Query base
-            query = """
-                SELECT id, url, title, resolution, download_path, file_size, 
-                       download_date as timestamp, status
-                FROM downloads
-            """
-            
-            params = []
-            conditions = []
-            
-            # Aplicar filtros se fornecidos
-            if filters:
-                if 'search_query' in filters:
-                    conditions.append("(title LIKE ? OR url LIKE ?)")
-                    search_term = f"%{filters['search_query']}%"
-                    params.extend([search_term, search_term])
-                
-                if 'resolution' in filters:
-                    conditions.append("resolution = ?")
-                    params.append(filters['resolution'])
-                
-                if 'status' in filters:
-                    conditions.append("status = ?")
-                    params.append(filters['status'])
-                
-                if 'date_from' in filters:
-                    conditions.append("download_date >= ?")
-                    params.append(filters['date_from'])
-                
-                if 'date_to' in filters:
-                    conditions.append("download_date <= ?")
-                    params.append(filters['date_to'])
-            
-            # Adicionar condições WHERE se existirem
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            
-            # Ordenar por data de download (mais recente primeiro)
-            query += " ORDER BY download_date DESC"
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            # Converter para lista de dicionários
-            downloads = []
-            for row in rows:
-                downloads.append({
-                    'id': row[0],
-                    'url': row[1],
-                    'title': row[2],
-                    'resolution': row[3],
-                    'file_path': row[4],
-                    'file_size': row[5],
-                    'timestamp': row[6],
-                    'status': row[7]
-                })
-            
-            return downloads
-            
+            return conn.execute(
+                "SELECT COUNT(*) FROM downloads WHERE download_date < datetime('now', ?) AND status != 'downloading'",
+                (f"-{int(older_than_days)} days",)
+            ).fetchone()[0]
         except Exception as e:
-            logging.error(f"Erro ao obter downloads filtrados: {e}")
-            return []
+            logging.error(f"Erro ao contar downloads arquiváveis: {e}")
+            return 0
         finally:
             conn.close()
     
-    def get_downloads_by_period(self, period_days=30):
-        """Obtém downloads de um período específico"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def archive_downloads(self, older_than_days, limit=500):
+        """
+        Move um lote de downloads antigos para downloads_archive
+        
+        Os IDs são mantidos (a tabela principal usa AUTOINCREMENT, então não
+        há colisão), e os detalhes continuam em download_details.
+        
+        Args:
+            older_than_days (int): Idade mínima dos downloads movidos
+            limit (int): Máximo de downloads movidos nesta transação
+        
+        Returns:
+            int: Quantidade de downloads movidos (0 quando não há mais)
+        """
+        conn = sqlite3.connect(self.db_path, timeout=30)
         
         try:
-            query = """
-                SELECT * FROM downloads 
-                WHERE download_date >= datetime('now', '-{} days')
-                ORDER BY download_date DESC
-            """.format(period_days)
-            
-            cursor.execute(query)
-            columns = [description[0] for description in cursor.description]
-            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+            ids = [row[0] for row in conn.execute("""
+                SELECT id FROM downloads
+                WHERE download_date < datetime('now', ?) AND status != 'downloading'
+                ORDER BY id LIMIT ?
+            """, (f"-{int(older_than_days)} days", limit))]
+            if not ids:
+                return 0
+            
+            colunas = ", ".join(DOWNLOADS_COLUMNS)
+            marcadores = ",".join("?" * len(ids))
+            conn.execute(
+                f"INSERT OR REPLACE INTO downloads_archive ({colunas}) "
+                f"SELECT {colunas} FROM downloads WHERE id IN ({marcadores})",
+                ids
+            )
+            conn.execute(f"DELETE FROM downloads WHERE id IN ({marcadores})", ids)
+            conn.commit()
+            self._mark_changed()
+            return len(ids)
             
         except Exception as e:
-            logging.error(f"Erro ao obter downloads por período: {e}")
-            return []
+            conn.rollback()
+            logging.error(f"Erro ao arquivar downloads: {e}")
+            raise
         finally:
             conn.close()
     
@@ -596,6 +858,68 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    def get_all_settings(self):
+        """Obtém todas as configurações como dicionário {chave: valor}"""
+        conn = sqlite3.connect(self.db_path)
+        
+        try:
+            return dict(conn.execute("SELECT key, value FROM settings").fetchall())
+        except Exception as e:
+            logging.error(f"Erro ao obter configurações: {e}")
+            return {}
+        finally:
+            conn.close()
+    
+    def set_settings(self, values):
+        """Define várias configurações em uma única transação"""
+        conn = sqlite3.connect(self.db_path)
+        
+        try:
+            conn.executemany("""
+                INSERT OR REPLACE INTO settings (key, value, updated_at) 
+                VALUES (?, ?, CURRENT_TIMESTAMP)
+            """, list(values.items()))
+            conn.commit()
+            logging.info(f"Configurações salvas: {', '.join(values)}")
+        except Exception as e:
+            conn.rollback()
+            logging.error(f"Erro ao salvar configurações: {e}")
+            raise
+        finally:
+            conn.close()
+    
+    def query_rows(self, query, params=None):
+        """
+        Executa um SELECT e retorna sqlite3.Row (acesso por nome, como dicionário)
+        
+        Mais leve que execute_query, que monta um dicionário por linha.
+        """
+        conn = self._connect_rows()
+        
+        try:
+            return conn.execute(query, params or ()).fetchall()
+        except Exception as e:
+            logging.error(f"Erro ao executar consulta: {e}")
+            raise
+        finally:
+            conn.close()
+    
+    def iter_query(self, query, params=None, chunk_size=1000):
+        """
+        Executa um SELECT e percorre as linhas (sqlite3.Row) sem carregar tudo na memória
+        """
+        conn = self._connect_rows()
+        
+        try:
+            cursor = conn.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+    
     def execute_query(self, query, params=None):
         """Executa uma consulta SQL customizada e retorna os resultados"""
         conn = sqlite3.connect(self.db_path)
@@ -615,6 +939,7 @@ class DatabaseManager:
             else:
                 # Para INSERT, UPDATE, DELETE
                 conn.commit()
+                self._mark_changed()
                 return cursor.rowcount
                 
         except Exception as e:
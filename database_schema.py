@@ -1,65 +1,254 @@
 import sqlite3
 import os
+import time
+import zlib
 import logging
 from datetime import datetime
 
+# Linhas atualizadas por transação nos backfills
+BACKFILL_BATCH_SIZE = 1000
+
+# Colunas de `downloads`, repetidas em `downloads_archive` e na visão
+# `downloads_all`; uma coluna nova precisa ser adicionada nas duas tabelas
+DOWNLOADS_COLUMNS = (
+    'id', 'url', 'title', 'duration', 'resolution', 'file_size', 'download_path',
+    'status', 'download_date', 'thumbnail_url', 'uploader', 'view_count', 'like_count',
+    'description', 'error_message', 'retry_count', 'download_speed_mbps',
+    'download_duration_seconds', 'peak_speed_mbps', 'avg_speed_mbps'
+)
+
+
+def compress_text(text):
+    """Compacta um texto longo (descrição) para gravar como BLOB"""
+    if not text:
+        return None
+    return zlib.compress(text.encode('utf-8'))
+
+
+def decompress_text(value):
+    """Inverso de compress_text; textos gravados antes da compactação voltam como estão"""
+    if value is None or isinstance(value, str):
+        return value
+    return zlib.decompress(value).decode('utf-8')
+
+
+class Backfill:
+    """
+    Passo de migração que atualiza uma tabela grande em lotes.
+
+    Cada lote (faixa de ids) é gravado em uma transação própria junto com o
+    ponto em que parou, em `migration_progress`. Se a aplicação for fechada no
+    meio, a próxima inicialização continua do último lote gravado.
+    """
+
+    def __init__(self, name, table, step, batch_size=BACKFILL_BATCH_SIZE):
+        """
+        Args:
+            name (str): Nome do backfill (usado no progresso e nos logs)
+            table (str): Tabela percorrida, em ordem de id
+            step: SQL com dois parâmetros (primeiro_id, ultimo_id) ou função
+                step(conn, primeiro_id, ultimo_id) que atualiza as linhas da faixa
+            batch_size (int): Linhas por lote
+        """
+        self.name = name
+        self.table = table
+        self.step = step
+        self.batch_size = batch_size
+
+    def run_batch(self, conn, primeiro_id, ultimo_id):
+        if callable(self.step):
+            self.step(conn, primeiro_id, ultimo_id)
+        else:
+            conn.execute(self.step, (primeiro_id, ultimo_id))
+
+
 class DatabaseSchema:
     def __init__(self, db_path="youtube_downloader.db"):
         self.db_path = db_path
-        self.current_version = 4  # Versão atual do schema
+        self.current_version = 5  # Versão atual do schema
+    
+    def get_migrations(self):
+        """
+        Migrações conhecidas, em ordem
         
-    def get_db_version(self):
+        Returns:
+            list: Tuplas (versão, descrição, passos); cada passo é um comando SQL ou um Backfill
+        """
+        return [
+            (1, "Criação das tabelas básicas", self.migrate_to_version_1()),
+            (2, "Adição da tabela de configurações", self.migrate_to_version_2()),
+            (3, "Adição de índices e campos de erro", self.migrate_to_version_3()),
+            (4, "Adição de campos para análise de velocidade", self.migrate_to_version_4()),
+            (5, "Detalhes compactados e arquivo de downloads antigos", self.migrate_to_version_5()),
+        ]
+    
+    def _connect(self):
+        """Conexão em modo autocommit: as transações são abertas explicitamente"""
+        return sqlite3.connect(self.db_path, isolation_level=None)
+    
+    def get_db_version(self, conn=None):
         """Obtém a versão atual do banco de dados"""
+        propria = conn is None
+        conn = conn or self._connect()
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT version FROM schema_version ORDER BY id DESC LIMIT 1")
-            result = cursor.fetchone()
-            conn.close()
-            return result[0] if result else 0
+            result = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+            return result[0] or 0
         except sqlite3.OperationalError:
             return 0
+        finally:
+            if propria:
+                conn.close()
     
-    def create_schema_version_table(self):
-        """Cria tabela de controle de versão do schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS schema_version (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                version INTEGER NOT NULL,
-                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                description TEXT
-            )
-        """)
-        conn.commit()
-        conn.close()
-    
-    def apply_migration(self, version, description, sql_commands):
-        """Aplica uma migração específica"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def create_schema_version_table(self, conn=None):
+        """Cria as tabelas de controle de versão e de progresso das migrações"""
+        propria = conn is None
+        conn = conn or self._connect()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS schema_version (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    version INTEGER NOT NULL,
+                    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    description TEXT,
+                    duration_ms REAL
+                )
+            """)
+            colunas = [row[1] for row in conn.execute("PRAGMA table_info(schema_version)")]
+            if 'duration_ms' not in colunas:
+                conn.execute("ALTER TABLE schema_version ADD COLUMN duration_ms REAL")
+            
+            # Passos concluídos de migrações em andamento (e onde cada backfill parou)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS migration_progress (
+                    version INTEGER NOT NULL,
+                    step INTEGER NOT NULL,
+                    last_id INTEGER DEFAULT 0,
+                    done INTEGER DEFAULT 0,
+                    duration_ms REAL DEFAULT 0,
+                    PRIMARY KEY (version, step)
+                )
+            """)
+        finally:
+            if propria:
+                conn.close()
+    
+    def apply_migration(self, version, description, steps, conn=None):
+        """
+        Aplica uma migração específica
+        
+        Comandos SQL consecutivos rodam em uma única transação; backfills
+        rodam em lotes, cada um na sua transação. Passos concluídos ficam
+        registrados, então uma migração interrompida continua de onde parou.
+        A versão é registrada com a duração total ao final.
+        """
+        propria = conn is None
+        conn = conn or self._connect()
+        inicio = time.perf_counter()
         
         try:
-            # Executa os comandos SQL da migração
-            for command in sql_commands:
-                cursor.execute(command)
+            progresso = {
+                step: (last_id, done, duration_ms)
+                for step, last_id, done, duration_ms in conn.execute(
+                    "SELECT step, last_id, done, duration_ms FROM migration_progress WHERE version = ?", (version,)
+                )
+            }
+            duracao_anterior = sum(d for _, _, d in progresso.values())
             
-            # Registra a versão aplicada
-            cursor.execute(
-                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
-                (version, description)
-            )
+            # Agrupar comandos SQL consecutivos
+            grupos = []
+            for indice, passo in enumerate(steps):
+                if isinstance(passo, Backfill):
+                    grupos.append((indice, passo))
+                elif grupos and isinstance(grupos[-1][1], list):
+                    grupos[-1][1].append(passo)
+                else:
+                    grupos.append((indice, [passo]))
+            
+            for indice, grupo in grupos:
+                if progresso.get(indice, (0, 0, 0))[1]:
+                    continue
+                if isinstance(grupo, Backfill):
+                    self._run_backfill(conn, version, indice, grupo, progresso.get(indice, (0, 0, 0))[0])
+                else:
+                    self._run_commands(conn, version, indice, grupo)
+            
+            duracao = duracao_anterior + (time.perf_counter() - inicio) * 1000
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO schema_version (version, description, duration_ms) VALUES (?, ?, ?)",
+                    (version, description, duracao)
+                )
+                conn.execute("DELETE FROM migration_progress WHERE version = ?", (version,))
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
             
-            conn.commit()
-            logging.info(f"Migração v{version} aplicada: {description}")
+            logging.info(f"Migração v{version} aplicada: {description} ({duracao:.0f} ms)")
             
         except Exception as e:
-            conn.rollback()
             logging.error(f"Erro ao aplicar migração v{version}: {e}")
             raise
         finally:
-            conn.close()
+            if propria:
+                conn.close()
+    
+    def _run_commands(self, conn, version, indice, comandos):
+        """Executa comandos SQL em uma transação e marca o passo como concluído"""
+        inicio = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for comando in comandos:
+                conn.execute(comando)
+            self._save_progress(conn, version, indice, 0, True, (time.perf_counter() - inicio) * 1000)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logging.info(f"Migração v{version}, passo {indice}: {len(comandos)} comando(s) em "
+                     f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+    
+    def _run_backfill(self, conn, version, indice, backfill, ultimo_id):
+        """Executa um backfill em lotes, continuando de `ultimo_id`"""
+        inicio = time.perf_counter()
+        maximo = conn.execute(f"SELECT MAX(id) FROM {backfill.table}").fetchone()[0] or 0
+        lotes = 0
+        
+        while ultimo_id < maximo:
+            fim = min(ultimo_id + backfill.batch_size, maximo)
+            inicio_lote = time.perf_counter()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                backfill.run_batch(conn, ultimo_id + 1, fim)
+                self._save_progress(conn, version, indice, fim, False, (time.perf_counter() - inicio_lote) * 1000)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            ultimo_id = fim
+            lotes += 1
+        
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._save_progress(conn, version, indice, ultimo_id, True, 0)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logging.info(f"Backfill '{backfill.name}' (v{version}): {lotes} lote(s) até o id {ultimo_id} em "
+                     f"{(time.perf_counter() - inicio) * 1000:.0f} ms")
+    
+    @staticmethod
+    def _save_progress(conn, version, indice, last_id, done, duration_ms):
+        conn.execute("""
+            INSERT INTO migration_progress (version, step, last_id, done, duration_ms)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(version, step) DO UPDATE SET
+                last_id = excluded.last_id,
+                done = excluded.done,
+                duration_ms = migration_progress.duration_ms + excluded.duration_ms
+        """, (version, indice, last_id, 1 if done else 0, duration_ms))
     
     def migrate_to_version_1(self):
         """Migração v1: Tabelas básicas"""
@@ -93,7 +282,7 @@ class DatabaseSchema:
             )
             """
         ]
-        self.apply_migration(1, "Criação das tabelas básicas", commands)
+        return commands
     
     def migrate_to_version_2(self):
         """Migração v2: Tabela de configurações"""
@@ -110,13 +299,12 @@ class DatabaseSchema:
             """
             INSERT OR IGNORE INTO settings (key, value, description) VALUES 
             ('default_download_path', '', 'Diretório padrão para downloads'),
-            # Modificar linha 113 para usar 1080p como padrão
             ('default_resolution', '1080p', 'Resolução padrão para downloads'),
             ('auto_open_folder', 'false', 'Abrir pasta após download'),
             ('theme', 'light', 'Tema da interface')
             """
         ]
-        self.apply_migration(2, "Adição da tabela de configurações", commands)
+        return commands
     
     def migrate_to_version_3(self):
         """Migração v3: Índices e otimizações"""
@@ -131,7 +319,7 @@ class DatabaseSchema:
             ALTER TABLE downloads ADD COLUMN retry_count INTEGER DEFAULT 0
             """
         ]
-        self.apply_migration(3, "Adição de índices e campos de erro", commands)
+        return commands
     
     def migrate_to_version_4(self):
         """Migração v4: Campos para análise de velocidade de download"""
@@ -151,32 +339,108 @@ class DatabaseSchema:
             "CREATE INDEX IF NOT EXISTS idx_downloads_speed ON downloads(download_speed_mbps)",
             "CREATE INDEX IF NOT EXISTS idx_downloads_duration ON downloads(download_duration_seconds)"
         ]
-        self.apply_migration(4, "Adição de campos para análise de velocidade", commands)
+        return commands
+    
+    def migrate_to_version_5(self):
+        """
+        Migração v5: Camadas de armazenamento dos downloads
+        
+        Descrição e thumbnail (colunas grandes e raramente lidas) passam para
+        `download_details`, com a descrição compactada em zlib. Downloads
+        antigos podem ser movidos para `downloads_archive`; a visão
+        `downloads_all` junta as duas tabelas para as consultas que pedem o
+        histórico completo.
+        """
+        colunas = ", ".join(DOWNLOADS_COLUMNS)
+        commands = [
+            """
+            CREATE TABLE IF NOT EXISTS download_details (
+                download_id INTEGER PRIMARY KEY,
+                description BLOB,
+                thumbnail_url TEXT
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS downloads_archive (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                title TEXT,
+                duration TEXT,
+                resolution TEXT,
+                file_size TEXT,
+                download_path TEXT,
+                status TEXT,
+                download_date TIMESTAMP,
+                thumbnail_url TEXT,
+                uploader TEXT,
+                view_count INTEGER,
+                like_count INTEGER,
+                description TEXT,
+                error_message TEXT,
+                retry_count INTEGER,
+                download_speed_mbps REAL,
+                download_duration_seconds INTEGER,
+                peak_speed_mbps REAL,
+                avg_speed_mbps REAL,
+                archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_downloads_archive_date ON downloads_archive(download_date)",
+            f"""
+            CREATE VIEW IF NOT EXISTS downloads_all AS
+                SELECT {colunas} FROM downloads
+                UNION ALL
+                SELECT {colunas} FROM downloads_archive
+            """,
+            """
+            INSERT OR IGNORE INTO settings (key, value, description) VALUES 
+            ('archive_after_days', '0', 'Arquivar downloads com mais de N dias (0 = nunca)')
+            """,
+            Backfill("download_details", "downloads", self._move_download_details)
+        ]
+        return commands
+    
+    @staticmethod
+    def _move_download_details(conn, primeiro_id, ultimo_id):
+        """Backfill da v5: copia descrição (compactada) e thumbnail para download_details"""
+        linhas = conn.execute("""
+            SELECT id, description, thumbnail_url FROM downloads
+            WHERE id BETWEEN ? AND ? AND (description IS NOT NULL OR thumbnail_url IS NOT NULL)
+        """, (primeiro_id, ultimo_id)).fetchall()
+        conn.executemany(
+            "INSERT OR REPLACE INTO download_details (download_id, description, thumbnail_url) VALUES (?, ?, ?)",
+            [(download_id, compress_text(descricao), thumbnail) for download_id, descricao, thumbnail in linhas]
+        )
+        conn.execute(
+            "UPDATE downloads SET description = NULL, thumbnail_url = NULL WHERE id BETWEEN ? AND ?",
+            (primeiro_id, ultimo_id)
+        )
     
     def initialize_database(self):
         """Inicializa e atualiza o banco de dados automaticamente"""
         logging.info("Iniciando verificação do schema do banco de dados...")
         
-        # Cria tabela de controle de versão
-        self.create_schema_version_table()
-        
-        # Obtém versão atual
-        current_db_version = self.get_db_version()
-        logging.info(f"Versão atual do banco: v{current_db_version}")
-        logging.info(f"Versão alvo do schema: v{self.current_version}")
-        
-        # Aplica migrações necessárias
-        if current_db_version < 1:
-            self.migrate_to_version_1()
-        
-        if current_db_version < 2:
-            self.migrate_to_version_2()
-        
-        if current_db_version < 3:
-            self.migrate_to_version_3()
-        
-        if current_db_version < 4:
-            self.migrate_to_version_4()
+        # Todas as migrações pendentes usam a mesma conexão
+        conn = self._connect()
+        try:
+            # Só vale em um arquivo ainda sem tabelas: bancos novos já nascem no modo
+            # incremental e nunca precisam do VACUUM completo da conversão
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            
+            # Cria tabela de controle de versão
+            self.create_schema_version_table(conn)
+            
+            # Obtém versão atual
+            current_db_version = self.get_db_version(conn)
+            logging.info(f"Versão atual do banco: v{current_db_version}")
+            logging.info(f"Versão alvo do schema: v{self.current_version}")
+            
+            # Aplica migrações necessárias
+            for version, description, steps in self.get_migrations():
+                if current_db_version < version <= self.current_version:
+                    self.apply_migration(version, description, steps, conn)
+        finally:
+            conn.close()
         
         if current_db_version < self.current_version:
             logging.info(f"Banco de dados atualizado para v{self.current_version}")
@@ -190,11 +454,11 @@ class DatabaseSchema:
             logging.info("Banco de dados removido")
     
     def backup_database(self):
-        """Cria backup do banco de dados"""
+        """Cria backup do banco de dados (backup online, seguro durante gravações)"""
         if os.path.exists(self.db_path):
+            from database_maintenance import online_backup
             backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-            import shutil
-            shutil.copy2(self.db_path, backup_name)
+            online_backup(self.db_path, backup_name)
             logging.info(f"Backup criado: {backup_name}")
             return backup_name
-        return None
\ No newline at end of file
+        return None
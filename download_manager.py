@@ -1,12 +1,24 @@
-import yt_dlp
 import threading
 import os
+import time
 from utils import AppUtils, AppConstants
+from format_index import FormatIndex
+from format_policy import (
+    FormatPolicyEngine, POSTPROCESS_NONE, POSTPROCESS_TRANSCODE, POSTPROCESS_EXTRACT_AUDIO
+)
+from postprocess_pool import PostprocessPool
+
+
+def _youtube_dl(options):
+    """Cria um YoutubeDL; o yt-dlp (importação pesada) só é carregado no primeiro uso"""
+    import yt_dlp
+    return yt_dlp.YoutubeDL(options)
+
 
 class DownloadManager:
     """Gerenciador de downloads de vídeos do YouTube"""
     
-    def __init__(self, log_manager, progress_callback=None, postprocessor_callback=None):
+    def __init__(self, log_manager, progress_callback=None, postprocessor_callback=None, decision_callback=None):
         """
         Inicializa o gerenciador de downloads
         
@@ -14,15 +26,32 @@ class DownloadManager:
             log_manager: Instância do LogManager para logging
             progress_callback: Função callback para progresso do download
             postprocessor_callback: Função callback para pós-processamento
+            decision_callback: Função chamada com a FormatDecision antes de cada download
         """
         self.log_manager = log_manager
         self.progress_callback = progress_callback
         self.postprocessor_callback = postprocessor_callback
+        self.decision_callback = decision_callback
+        
+        # Política de seleção de formato (tamanho, vazão e espaço em disco)
+        self.policy_engine = FormatPolicyEngine(log_manager)
+        self.last_decision = None
+        
+        # Tempo de pós-processamento por vídeo (parede e CPU do ffmpeg)
+        self.postprocess_stats = {}
+        self._postprocess_started = {}
+        self._postprocess_lock = threading.Lock()
+        
+        # Playlists: baixar e pós-processar em estágios separados (ffmpeg em paralelo)
+        self.parallel_postprocessing = True
+        self.postprocess_workers = None  # None = número de núcleos
         
         # Estado do download
         self.is_downloading = False
         self.download_thread = None
         self.current_info = None
+        self.format_index = None
+        self.last_extraction_stats = {}
         
         # Configurações
         self.download_directory = ""
@@ -58,7 +87,8 @@ class DownloadManager:
             return False, error_msg, []
         
         try:
-            self.log_manager.log_info(f"Iniciando extração de informações: {url}")
+            self.log_manager.log_debug(f"Iniciando extração de informações: {url}")
+            inicio = time.perf_counter()
             
             ydl_opts = {
                 'quiet': True,
@@ -66,7 +96,7 @@ class DownloadManager:
                 'extractflat': False
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with _youtube_dl(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
             
             self.current_info = info
@@ -74,8 +104,15 @@ class DownloadManager:
             # Extrair resoluções disponíveis
             resolutions = self._extract_resolutions(info)
             
-            self.log_manager.log_info(
-                f"Informações extraídas com sucesso: {info.get('title', 'N/A')}"
+            # Um único evento de resumo por vídeo; o detalhe por formato fica em DEBUG
+            self.log_manager.log_event(
+                'extracao_concluida',
+                video_id=info.get('id', 'N/A'),
+                titulo=info.get('title', 'N/A'),
+                formatos=len(info.get('formats') or []),
+                formatos_validos=self.last_extraction_stats.get('formatos_validos', 0),
+                resolucoes=len(resolutions),
+                duracao_ms=int((time.perf_counter() - inicio) * 1000)
             )
             
             return True, info, resolutions
@@ -85,82 +122,30 @@ class DownloadManager:
             return False, error_msg, []
     
     def _extract_resolutions(self, info):
-        """Extrai e ordena resoluções disponíveis do vídeo"""
-        resolutions = set()  # Usar set para evitar duplicatas
-        valid_formats = []
-        
-        if 'formats' in info and info['formats']:
-            for format_info in info['formats']:
-                resolution = format_info.get('resolution')
-                vcodec = format_info.get('vcodec', 'none')
-                height = format_info.get('height')
-                
-                # Log para debug
-                self.log_manager.log_info(
+        """Constrói o índice de formatos do vídeo e retorna as resoluções ordenadas"""
+        self.format_index = FormatIndex(info.get('formats'), info.get('duration'))
+        
+        # Detalhe por formato apenas em DEBUG (evita montar a mensagem à toa)
+        if self.log_manager.is_debug_enabled():
+            for format_info in info.get('formats') or []:
+                self.log_manager.log_debug(
                     f"Formato encontrado: {format_info.get('format_id')} - "
-                    f"Resolução: {resolution} - Vcodec: {vcodec} - Altura: {height}"
+                    f"Resolução: {format_info.get('resolution')} - "
+                    f"Vcodec: {format_info.get('vcodec', 'none')} - Altura: {format_info.get('height')}"
                 )
-                
-                # Filtrar apenas formatos de vídeo válidos
-                if (resolution and 
-                    resolution != 'audio only' and 
-                    vcodec != 'none' and 
-                    height is not None):
-                    
-                    resolutions.add(resolution)
-                    valid_formats.append(format_info)
         
-        # Converter set para lista e ordenar
-        resolutions_list = list(resolutions)
+        resolutions_list = list(self.format_index.resolutions)
         
         if resolutions_list:
-            resolutions_list = AppUtils.sort_resolutions(resolutions_list)
-            self.log_manager.log_info(f"Resoluções extraídas: {resolutions_list}")
+            self.log_manager.log_debug(f"Resoluções extraídas: {resolutions_list}")
         else:
             resolutions_list = ['Melhor qualidade disponível']
             self.log_manager.log_warning("Nenhuma resolução válida encontrada, usando fallback")
         
-        self.log_manager.log_info(f"Total de formatos válidos: {len(valid_formats)}")
+        self.last_extraction_stats = {'formatos_validos': self.format_index.video_format_count}
+        self.log_manager.log_debug(f"Total de formatos válidos: {self.format_index.video_format_count}")
         return resolutions_list
     
-    def find_format_id(self, selected_resolution):
-        """
-        Encontra o format_id adequado para a resolução selecionada
-        
-        Args:
-            selected_resolution (str): Resolução selecionada
-            
-        Returns:
-            str or None: format_id encontrado
-        """
-        if not self.current_info or 'formats' not in self.current_info:
-            return None
-        
-        # Tentar encontrar um stream de vídeo puro primeiro
-        for fmt_obj in self.current_info['formats']:
-            if (fmt_obj.get('resolution') == selected_resolution and 
-                fmt_obj.get('vcodec') != 'none' and 
-                fmt_obj.get('acodec') == 'none'):
-                
-                format_id = fmt_obj['format_id']
-                self.log_manager.log_info(
-                    f"Formato de vídeo puro selecionado: {format_id} para resolução {selected_resolution}"
-                )
-                return format_id
-        
-        # Se não encontrar, pegar qualquer stream de vídeo da resolução
-        for fmt_obj in self.current_info['formats']:
-            if (fmt_obj.get('resolution') == selected_resolution and 
-                fmt_obj.get('vcodec') != 'none'):
-                
-                format_id = fmt_obj['format_id']
-                self.log_manager.log_info(
-                    f"Formato de vídeo selecionado: {format_id} para resolução {selected_resolution}"
-                )
-                return format_id
-        
-        return None
-    
     def start_download(self, url, selected_resolution, success_callback=None, error_callback=None, audio_only=False, audio_quality='best'):
         """
         Inicia o download do vídeo ou áudio em thread separada
@@ -185,30 +170,68 @@ class DownloadManager:
         if not self.download_directory:
             return False, "Selecione um diretório de destino."
         
-        # Determinar formato baseado no tipo de download
+        if not self.format_index:
+            return False, "Extraia as informações do vídeo primeiro."
+        
+        # Decidir formato (política ativa) antes de iniciar o download
+        decision = self.policy_engine.decide(
+            self.format_index, selected_resolution, self.download_directory, audio_only
+        )
         if audio_only:
-            format_id = 'bestaudio'
             download_type = f"áudio ({audio_quality})"
         else:
-            # Encontrar format_id para vídeo
-            video_format_id = self.find_format_id(selected_resolution)
-            if not video_format_id:
+            if not decision.video_format:
                 return False, f"Não foi possível encontrar formato adequado para {selected_resolution}"
-            format_id = video_format_id
             download_type = f"vídeo ({selected_resolution})"
         
+        self._report_decision(decision, self.current_info)
+        if not decision.fits_disk:
+            return False, (
+                f"Espaço insuficiente no destino: necessário ~{AppUtils.format_bytes(decision.expected_bytes)}, "
+                f"disponível {AppUtils.format_bytes(decision.free_bytes)}"
+            )
+        
         # Iniciar download em thread separada
         self.is_downloading = True
+        self._reset_postprocess_stats()
         self.download_thread = threading.Thread(
             target=self._download_worker,
-            args=(url, format_id, download_type, success_callback, error_callback, audio_only, audio_quality),
+            args=(url, decision.selector, download_type, success_callback, error_callback, audio_only, audio_quality),
             daemon=True
         )
         self.download_thread.start()
         
         return True, f"Download de {download_type} iniciado"
     
-    def _download_worker(self, url, format_id, download_type, success_callback, error_callback, audio_only=False, audio_quality='best'):
+    def set_format_policy(self, policy):
+        """
+        Define a política de seleção de formato
+        
+        Args:
+            policy (FormatPolicy): ResolutionPolicy, SizeBudgetPolicy, ThroughputPolicy ou personalizada
+        """
+        self.policy_engine.set_policy(policy)
+    
+    def _report_decision(self, decision, video_info=None):
+        """Registra a decisão de formato e a repassa ao callback antes do download"""
+        self.last_decision = decision
+        self.log_manager.log_event(
+            'decisao_formato',
+            video_id=(video_info or {}).get('id', 'N/A'),
+            politica=decision.policy,
+            formatos='+'.join(decision.format_ids) or 'auto',
+            bytes_esperados=decision.expected_bytes if decision.expected_bytes is not None else 'N/A',
+            eta_s=decision.eta_seconds if decision.eta_seconds is not None else 'N/A',
+            cabe_no_disco=decision.fits_disk,
+            motivo=decision.reason
+        )
+        if self.decision_callback:
+            try:
+                self.decision_callback(decision)
+            except Exception as e:
+                self.log_manager.log_error(e, "Erro no callback de decisão de formato")
+    
+    def _download_worker(self, url, format_selector, download_type, success_callback, error_callback, audio_only=False, audio_quality='best'):
         """Worker thread para executar o download de vídeo ou áudio"""
         try:
             self.log_manager.log_info(
@@ -220,10 +243,10 @@ class DownloadManager:
             self.log_manager.log_info(f"Usando ffmpeg em: {ffmpeg_path}")
             
             # Configurar opções do yt-dlp
-            ydl_opts = self._get_download_options(format_id, ffmpeg_path, audio_only, audio_quality)
+            ydl_opts = self._get_download_options(format_selector, ffmpeg_path, audio_only, audio_quality)
             
             # Executar download
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with _youtube_dl(ydl_opts) as ydl:
                 ydl.download([url])
             
             # Sucesso
@@ -238,7 +261,7 @@ class DownloadManager:
         finally:
             self.is_downloading = False
     
-    def _get_download_options(self, format_id, ffmpeg_path, audio_only=False, audio_quality='best'):
+    def _get_download_options(self, format_selector, ffmpeg_path, audio_only=False, audio_quality='best'):
         """Configura opções do yt-dlp para download de vídeo ou áudio"""
         if audio_only:
             # Configurações para download apenas de áudio
@@ -250,7 +273,7 @@ class DownloadManager:
                 'ignoreerrors': False,
                 'ffmpeg_location': ffmpeg_path,
                 'progress_hooks': [self._progress_hook] if self.progress_callback else [],
-                'postprocessor_hooks': [self._postprocessor_hook] if self.postprocessor_callback else [],
+                'postprocessor_hooks': [self._postprocessor_hook],
                 'windowsfilenames': True,
                 'quiet': False,
                 'retries': AppConstants.MAX_RETRIES,
@@ -269,9 +292,8 @@ class DownloadManager:
                 }]
             }
         else:
-            # Configurações para download de vídeo com fallback robusto
-            # Usar estratégia de fallback para evitar erros de formato
-            format_selector = f"{format_id}+bestaudio/best[height<={self._extract_height_from_resolution(format_id)}]/best"
+            # Configurações para download de vídeo; o seletor vem da FormatDecision
+            # e já inclui o fallback por altura para evitar erros de formato
             options = {
                 'format': format_selector,
                 'outtmpl': f"{self.download_directory}/%(title).200s.%(ext)s",
@@ -281,7 +303,7 @@ class DownloadManager:
                 'merge_output_format': AppConstants.SUPPORTED_OUTPUT_FORMAT,
                 'ffmpeg_location': ffmpeg_path,
                 'progress_hooks': [self._progress_hook] if self.progress_callback else [],
-                'postprocessor_hooks': [self._postprocessor_hook] if self.postprocessor_callback else [],
+                'postprocessor_hooks': [self._postprocessor_hook],
                 'windowsfilenames': True,
                 'quiet': False,
                 'retries': AppConstants.MAX_RETRIES,
@@ -297,27 +319,154 @@ class DownloadManager:
         
         return options
     
-    def _extract_height_from_resolution(self, format_id):
-        """Extrai altura da resolução para fallback"""
-        if not self.current_info or 'formats' not in self.current_info:
-            return 1080  # fallback padrão
-        
-        for fmt_obj in self.current_info['formats']:
-            if fmt_obj.get('format_id') == format_id:
-                return fmt_obj.get('height', 1080)
-        
-        return 1080  # fallback padrão
-    
     def _progress_hook(self, d):
         """Hook para progresso do download"""
+        if d.get('status') == 'downloading' and isinstance(d.get('speed'), (int, float)):
+            self.policy_engine.update_throughput(d['speed'])
         if self.progress_callback:
             self.progress_callback(d)
     
     def _postprocessor_hook(self, d):
         """Hook para pós-processamento"""
+        self._record_postprocess_timing(d)
         if self.postprocessor_callback:
             self.postprocessor_callback(d)
     
+    def _record_postprocess_timing(self, d):
+        """
+        Mede o tempo de parede e de CPU de cada etapa de pós-processamento
+        
+        Eventos do PostprocessPool já trazem `stage_timing` medido no próprio
+        subprocesso. Para as etapas executadas pelo yt-dlp, o CPU é medido pelos
+        tempos acumulados dos processos filhos (ffmpeg), que o sistema
+        contabiliza quando o subprocesso termina. Esse contador é do processo
+        inteiro e não existe no Windows: o CPU fica None (N/A no log) nesse
+        caso ou quando outra etapa rodou ao mesmo tempo, em vez de um valor
+        enganoso.
+        """
+        status = d.get('status')
+        if status not in ('started', 'finished'):
+            return
+        
+        info = d.get('info_dict') or {}
+        video_id = info.get('id', 'N/A')
+        etapa = d.get('postprocessor', 'N/A')
+        timing = d.get('stage_timing') or {}
+        cpu = self._children_cpu_seconds()
+        agora = time.perf_counter()
+        
+        with self._postprocess_lock:
+            if status == 'started':
+                # Etapas simultâneas somam no mesmo contador de processos filhos
+                sobreposta = bool(self._postprocess_started)
+                for ativa in self._postprocess_started.values():
+                    ativa[2] = True
+                self._postprocess_started[(video_id, etapa)] = [agora, cpu, sobreposta]
+                return
+            
+            inicio = self._postprocess_started.pop((video_id, etapa), None)
+            if timing.get('postprocess_seconds') is not None:
+                parede = timing['postprocess_seconds']
+                cpu_gasto = timing.get('cpu_seconds')
+            elif inicio is not None:
+                parede = agora - inicio[0]
+                if cpu is None or inicio[1] is None or inicio[2]:
+                    cpu_gasto = None
+                else:
+                    cpu_gasto = max(0.0, cpu - inicio[1])
+            else:
+                return
+            stats = self.postprocess_stats.setdefault(
+                video_id, {'wall_seconds': 0.0, 'cpu_seconds': None, 'etapas': []}
+            )
+            stats['wall_seconds'] += parede
+            if cpu_gasto is not None:
+                stats['cpu_seconds'] = (stats['cpu_seconds'] or 0.0) + cpu_gasto
+            stats['etapas'].append({
+                'etapa': etapa,
+                'wall_seconds': parede,
+                'cpu_seconds': cpu_gasto,
+                'download_seconds': timing.get('download_seconds'),
+                'queue_seconds': timing.get('queue_seconds')
+            })
+        
+        campos = {
+            'video_id': video_id,
+            'etapa': etapa,
+            'arquivo': os.path.basename(info.get('filepath') or info.get('_filename') or '') or 'N/A',
+            'parede_s': f"{parede:.2f}",
+            'cpu_s': f"{cpu_gasto:.2f}" if cpu_gasto is not None else 'N/A'
+        }
+        if timing:
+            campos['download_s'] = f"{timing.get('download_seconds') or 0:.2f}"
+            campos['fila_s'] = f"{timing.get('queue_seconds') or 0:.2f}"
+        self.log_manager.log_event('pos_processamento', **campos)
+    
+    @staticmethod
+    def _children_cpu_seconds():
+        """CPU acumulado dos processos filhos já encerrados (None onde o sistema não informa)"""
+        if os.name == 'nt':
+            # os.times() devolve children_user/children_system sempre zerados no Windows
+            return None
+        tempos = os.times()
+        return tempos.children_user + tempos.children_system
+    
+    def _reset_postprocess_stats(self):
+        """Descarta as medições de pós-processamento do download anterior"""
+        with self._postprocess_lock:
+            self.postprocess_stats.clear()
+            self._postprocess_started.clear()
+    
+    def get_postprocess_stats(self, video_id=None):
+        """
+        Retorna o tempo gasto em pós-processamento
+        
+        Args:
+            video_id (str): Vídeo específico; None retorna todos
+            
+        Returns:
+            dict: wall_seconds, cpu_seconds (None se nenhuma etapa pôde ser medida) e etapas (por vídeo)
+        """
+        with self._postprocess_lock:
+            if video_id is not None:
+                return dict(self.postprocess_stats.get(video_id, {}))
+            return {vid: dict(stats) for vid, stats in self.postprocess_stats.items()}
+    
+    def _playlist_postprocess_options(self, decision, audio_quality='best'):
+        """
+        Opções de pós-processamento para um vídeo da playlist
+        
+        Prioriza remux (cópia de streams) e só recodifica quando os codecs
+        escolhidos não cabem em mp4.
+        
+        Returns:
+            tuple: (opções extras do yt-dlp, lista de postprocessors)
+        """
+        formato_saida = AppConstants.SUPPORTED_OUTPUT_FORMAT
+        
+        if decision.postprocess == POSTPROCESS_EXTRACT_AUDIO:
+            return {}, [{
+                'key': 'FFmpegExtractAudio',
+                'preferredcodec': AppConstants.SUPPORTED_AUDIO_FORMAT,
+                'preferredquality': audio_quality if audio_quality != 'best' else '192',
+            }]
+        
+        if decision.postprocess == POSTPROCESS_TRANSCODE:
+            # Merge em mkv (aceita qualquer codec) e uma única recodificação para mp4
+            return {'merge_output_format': 'mkv'}, [{
+                'key': 'FFmpegVideoConvertor',
+                'preferedformat': formato_saida,
+            }]
+        
+        if decision.postprocess == POSTPROCESS_NONE:
+            return {'merge_output_format': formato_saida}, []
+        
+        # Merge/remux: cópia de streams; o remuxer não faz nada se já estiver em mp4
+        return {'merge_output_format': formato_saida}, [{
+            'key': 'FFmpegVideoRemuxer',
+            'preferedformat': formato_saida,
+        }]
+    
     def stop_download(self):
         """Para o download atual (se possível)"""
         if self.is_downloading:
@@ -359,6 +508,7 @@ class DownloadManager:
     def clear_current_info(self):
         """Limpa as informações do vídeo atual"""
         self.current_info = None
+        self.format_index = None
         self.log_manager.log_info("Informações do vídeo atual limpas")
     
     def is_playlist_url(self, url):
@@ -409,7 +559,7 @@ class DownloadManager:
                 'playlistend': 50,  # Limitar a 50 vídeos para performance
             }
             
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with _youtube_dl(ydl_opts) as ydl:
                 info = ydl.extract_info(url, download=False)
                 
                 # Verificar se é realmente uma playlist
@@ -443,6 +593,7 @@ class DownloadManager:
                 }
                 
                 self.current_info = playlist_info
+                self.format_index = None
                 self.log_manager.log_info(f"Informações da playlist extraídas: {playlist_info['title']} ({playlist_info['video_count']} vídeos)")
                 
                 return True, playlist_info, None
@@ -485,6 +636,7 @@ class DownloadManager:
         
         # Iniciar download em thread separada
         self.is_downloading = True
+        self._reset_postprocess_stats()
         self.download_thread = threading.Thread(
             target=self._playlist_download_worker,
             args=(url, selected_resolution, download_type, success_callback, error_callback, audio_only, audio_quality, video_callback),
@@ -498,6 +650,10 @@ class DownloadManager:
         """
         Worker thread para download de playlist com processamento individual de cada vídeo
         
+        Com `parallel_postprocessing` ativo, este worker é apenas o estágio de rede:
+        cada vídeo é baixado sem pós-processamento e entregue ao PostprocessPool,
+        de modo que o ffmpeg de um vídeo roda enquanto o próximo é baixado.
+        
         Args:
             url (str): URL da playlist
             selected_resolution (str): Resolução selecionada
@@ -508,6 +664,7 @@ class DownloadManager:
             audio_quality (str): Qualidade do áudio
             video_callback: Função chamada para cada vídeo processado (video_info, index, total)
         """
+        pool = None
         try:
             # Criar subpasta para a playlist
             playlist_title = self.current_info.get('title', 'Playlist')
@@ -521,8 +678,19 @@ class DownloadManager:
             # Obter lista de vídeos da playlist
             playlist_entries = self.current_info.get('entries', [])
             total_videos = len(playlist_entries)
+            ffmpeg_path = AppUtils.get_ffmpeg_path()
             
-            self.log_manager.log_info(f"Iniciando download de playlist: {total_videos} vídeos")
+            if self.parallel_postprocessing:
+                pool = PostprocessPool(
+                    self.log_manager, ffmpeg_path,
+                    hook=self._postprocessor_hook,
+                    max_workers=self.postprocess_workers
+                )
+            
+            self.log_manager.log_info(
+                f"Iniciando download de playlist: {total_videos} vídeos"
+                + (f" (pós-processamento paralelo: {pool.max_workers} processos)" if pool else "")
+            )
             
             # Processar cada vídeo individualmente
             for index, entry in enumerate(playlist_entries, 1):
@@ -547,81 +715,67 @@ class DownloadManager:
                         'extractflat': False
                     }
                     
-                    with yt_dlp.YoutubeDL(ydl_opts_info) as ydl:
+                    with _youtube_dl(ydl_opts_info) as ydl:
                         video_info = ydl.extract_info(video_url, download=False)
                     
-                    # Atualizar current_info temporariamente para este vídeo
-                    original_info = self.current_info
-                    self.current_info = video_info
+                    # Decidir formato deste vídeo e reportar antes do download
+                    video_index = FormatIndex(video_info.get('formats'), video_info.get('duration'))
+                    decision = self.policy_engine.decide(video_index, selected_resolution, playlist_folder, audio_only)
+                    self._report_decision(decision, video_info)
+                    if not decision.fits_disk:
+                        raise OSError(
+                            f"Espaço insuficiente: necessário ~{AppUtils.format_bytes(decision.expected_bytes)}, "
+                            f"disponível {AppUtils.format_bytes(decision.free_bytes)}"
+                        )
                     
-                    # Configurar opções de download para o vídeo individual
-                    if audio_only:
-                        format_selector = 'bestaudio/best'
-                        outtmpl = os.path.join(playlist_folder, f'{index:02d} - %(title)s.%(ext)s')
-                        postprocessors = [{
-                            'key': 'FFmpegExtractAudio',
-                            'preferredcodec': AppConstants.SUPPORTED_AUDIO_FORMAT,
-                            'preferredquality': audio_quality if audio_quality != 'best' else '192',
-                        }]
-                    else:
-                        # Para vídeo, usar formato específico baseado na resolução
-                        height = self._extract_height_from_resolution(selected_resolution)
-                        if height:
-                            format_selector = f'best[height<={height}]/best'
-                        else:
-                            format_selector = 'best'
-                        
-                        outtmpl = os.path.join(playlist_folder, f'{index:02d} - %(title)s.%(ext)s')
-                        postprocessors = [{
-                            'key': 'FFmpegVideoConvertor',
-                            'preferedformat': AppConstants.SUPPORTED_OUTPUT_FORMAT,
-                        }]
-                    
-                    ydl_opts = {
-                        'format': format_selector,
-                        'outtmpl': outtmpl,
-                        'ffmpeg_location': AppUtils.get_ffmpeg_path(),
-                        'postprocessors': postprocessors,
-                        'progress_hooks': [self._progress_hook],
-                        'postprocessor_hooks': [self._postprocessor_hook],
-                        'retries': AppConstants.MAX_RETRIES,
-                        'fragment_retries': AppConstants.FRAGMENT_RETRIES,
-                        'socket_timeout': AppConstants.SOCKET_TIMEOUT,
-                        'http_chunk_size': AppConstants.HTTP_CHUNK_SIZE,
-                        'noplaylist': True,  # Download individual
+                    # Dados do vídeo para callback de sucesso
+                    video_success_data = {
+                        'video_info': video_info,
+                        'index': index,
+                        'total': total_videos,
+                        'resolution': selected_resolution if not audio_only else 'music',
+                        'audio_only': audio_only,
+                        'playlist_folder': playlist_folder
                     }
                     
-                    # Executar download do vídeo individual
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([video_url])
-                    
-                    self.log_manager.log_info(f"Vídeo {index}/{total_videos} baixado com sucesso: {video_title}")
-                    
-                    # Chamar callback de sucesso para este vídeo específico se fornecido
-                    if video_callback:
-                        # Criar dados do vídeo para callback de sucesso
-                        video_success_data = {
-                            'video_info': video_info,
-                            'index': index,
-                            'total': total_videos,
-                            'resolution': selected_resolution if not audio_only else 'music',
-                            'audio_only': audio_only,
-                            'playlist_folder': playlist_folder
-                        }
-                        try:
-                            # Chamar callback adicional para sucesso do vídeo individual
-                            video_callback(video_success_data, 'success')
-                        except Exception as callback_error:
-                            self.log_manager.log_error(f"Erro no callback de sucesso do vídeo: {str(callback_error)}")
-                    
-                    # Restaurar informações originais da playlist
-                    self.current_info = original_info
+                    if pool:
+                        # Estágio de rede: baixar os streams e entregar ao pool
+                        inicio = time.perf_counter()
+                        arquivos, format_id = self._download_playlist_streams(
+                            video_url, decision, playlist_folder, index, ffmpeg_path
+                        )
+                        tempo_download = time.perf_counter() - inicio
+                        self.log_manager.log_info(
+                            f"Vídeo {index}/{total_videos} baixado, enviado para pós-processamento: {video_title}"
+                        )
+                        future = pool.submit(
+                            arquivos,
+                            self._final_output_path(arquivos[0], format_id, decision),
+                            decision.postprocess,
+                            info_dict=video_info,
+                            audio_quality=audio_quality,
+                            download_seconds=tempo_download
+                        )
+                        future.add_done_callback(
+                            lambda f, dados=video_success_data: self._on_playlist_video_postprocessed(f, dados, video_callback)
+                        )
+                    else:
+                        self._download_playlist_video_inline(
+                            video_url, decision, playlist_folder, index, audio_quality, ffmpeg_path
+                        )
+                        self.log_manager.log_info(f"Vídeo {index}/{total_videos} baixado com sucesso: {video_title}")
+                        self._notify_playlist_video_success(video_success_data, video_callback)
                     
                 except Exception as video_error:
                     self.log_manager.log_error(f"Erro ao baixar vídeo {index}: {str(video_error)}")
                     # Continuar com próximo vídeo mesmo se um falhar
                     continue
             
+            # Aguardar o estágio de pós-processamento terminar
+            if pool:
+                pool.shutdown(wait=True)
+                pool = None
+            
             self.log_manager.log_info(f"Download de {download_type} concluído com sucesso")
             
             if success_callback:
@@ -635,4 +789,103 @@ class DownloadManager:
                 error_callback(error_msg)
         
         finally:
-            self.is_downloading = False
\ No newline at end of file
+            if pool:
+                pool.shutdown(wait=True)
+            self.is_downloading = False
+    
+    def _playlist_ydl_options(self, format_selector, outtmpl, ffmpeg_path):
+        """Opções do yt-dlp comuns aos vídeos da playlist"""
+        return {
+            'format': format_selector,
+            'outtmpl': outtmpl,
+            'ffmpeg_location': ffmpeg_path,
+            'progress_hooks': [self._progress_hook],
+            'postprocessor_hooks': [self._postprocessor_hook],
+            'retries': AppConstants.MAX_RETRIES,
+            'fragment_retries': AppConstants.FRAGMENT_RETRIES,
+            'socket_timeout': AppConstants.SOCKET_TIMEOUT,
+            'http_chunk_size': AppConstants.HTTP_CHUNK_SIZE,
+            'noplaylist': True,  # Download individual
+        }
+    
+    def _download_playlist_video_inline(self, video_url, decision, playlist_folder, index, audio_quality, ffmpeg_path):
+        """Baixa e pós-processa um vídeo da playlist na mesma thread (sem pool)"""
+        # Configurar opções de download para o vídeo individual (remux antes de recodificar)
+        outtmpl = os.path.join(playlist_folder, f'{index:02d} - %(title)s.%(ext)s')
+        opcoes_extras, postprocessors = self._playlist_postprocess_options(decision, audio_quality)
+        
+        ydl_opts = self._playlist_ydl_options(decision.selector, outtmpl, ffmpeg_path)
+        ydl_opts['postprocessors'] = postprocessors
+        ydl_opts.update(opcoes_extras)
+        
+        with _youtube_dl(ydl_opts) as ydl:
+            ydl.download([video_url])
+    
+    def _download_playlist_streams(self, video_url, decision, playlist_folder, index, ffmpeg_path):
+        """
+        Estágio de rede: baixa os streams escolhidos sem pós-processamento
+        
+        Quando a decisão traz vídeo e áudio separados, os dois são baixados como
+        arquivos independentes (seletor com vírgula), deixando o merge para o pool.
+        
+        Returns:
+            tuple: (lista de arquivos baixados, format_id usado no nome dos arquivos)
+        """
+        if decision.format_ids and (decision.audio_format or not FormatIndex.is_video_only(decision.video_format or {})):
+            format_selector = ','.join(decision.format_ids)
+        else:
+            # Seletor genérico: o yt-dlp escolhe (e, se preciso, junta) os streams
+            format_selector = decision.selector
+        
+        outtmpl = os.path.join(playlist_folder, f'{index:02d} - %(title)s.f%(format_id)s.%(ext)s')
+        ydl_opts = self._playlist_ydl_options(format_selector, outtmpl, ffmpeg_path)
+        ydl_opts['merge_output_format'] = AppConstants.SUPPORTED_OUTPUT_FORMAT
+        
+        with _youtube_dl(ydl_opts) as ydl:
+            info = ydl.extract_info(video_url, download=True)
+        
+        downloads = info.get('requested_downloads') or []
+        arquivos = [d['filepath'] for d in downloads if d.get('filepath')]
+        if not arquivos:
+            raise RuntimeError("Nenhum arquivo foi baixado")
+        return arquivos, downloads[0].get('format_id', '')
+    
+    @staticmethod
+    def _final_output_path(arquivo, format_id, decision):
+        """Nome do arquivo final: remove o sufixo .f<format_id> e aplica a extensão de saída"""
+        base = os.path.splitext(arquivo)[0]
+        prefixo, separador, sufixo = base.rpartition('.f')
+        if separador and sufixo == str(format_id):
+            base = prefixo
+        
+        if decision.postprocess == POSTPROCESS_EXTRACT_AUDIO:
+            return f"{base}.{AppConstants.SUPPORTED_AUDIO_FORMAT}"
+        return f"{base}.{AppConstants.SUPPORTED_OUTPUT_FORMAT}"
+    
+    def _on_playlist_video_postprocessed(self, future, video_success_data, video_callback):
+        """Chamado pelo pool quando o pós-processamento de um vídeo termina"""
+        index = video_success_data['index']
+        total = video_success_data['total']
+        try:
+            video_success_data['file_path'] = future.result()
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao pós-processar vídeo {index}: {str(e)}")
+            return
+        
+        self.log_manager.log_info(
+            f"Vídeo {index}/{total} pós-processado com sucesso: "
+            f"{video_success_data['video_info'].get('title', 'N/A')}"
+        )
+        self._notify_playlist_video_success(video_success_data, video_callback)
+    
+    def _notify_playlist_video_success(self, video_success_data, video_callback):
+        """Repassa o sucesso de um vídeo da playlist ao callback"""
+        if not video_callback:
+            return
+        
+        video_success_data['postprocess'] = self.get_postprocess_stats(video_success_data['video_info'].get('id'))
+        try:
+            # Chamar callback adicional para sucesso do vídeo individual
+            video_callback(video_success_data, 'success')
+        except Exception as callback_error:
+            self.log_manager.log_error(f"Erro no callback de sucesso do vídeo: {str(callback_error)}")
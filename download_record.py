@@ -0,0 +1,106 @@
+import formatting
+
+# Campos de um download carregado do banco (nomes das projeções do DatabaseManager)
+RECORD_FIELDS = (
+    'id', 'url', 'title', 'duration', 'resolution', 'file_size', 'file_path', 'timestamp',
+    'status', 'uploader', 'view_count', 'like_count', 'description', 'thumbnail_url',
+    'error_message', 'retry_count', 'download_speed_mbps', 'download_duration_seconds',
+    'peak_speed_mbps', 'avg_speed_mbps'
+)
+
+# Nomes das colunas da tabela que correspondem a outro campo do registro
+RECORD_ALIASES = {
+    'download_date': 'timestamp',
+    'download_path': 'file_path',
+}
+
+# Campos formatados para exibição, calculados na primeira leitura
+FORMATTED_FIELDS = ('title_short', 'date_formatted', 'duration_formatted', 'view_count_formatted')
+
+_KEYS = frozenset(RECORD_FIELDS + FORMATTED_FIELDS + tuple(RECORD_ALIASES))
+
+
+class DownloadRecord:
+    """
+    Download do histórico em formato compacto.
+
+    Usa __slots__ (sem dicionário por instância) e calcula os campos
+    formatados só quando são lidos, guardando o resultado. Também aceita o
+    acesso como dicionário (`record['title']`, `record.get('title_short')`)
+    usado pelas telas e exportações.
+    """
+
+    __slots__ = RECORD_FIELDS + tuple(f"_{campo}" for campo in FORMATTED_FIELDS)
+
+    def __init__(self, **campos):
+        for campo in self.__slots__:
+            object.__setattr__(self, campo, None)
+        for campo, valor in campos.items():
+            setattr(self, RECORD_ALIASES.get(campo, campo), valor)
+
+    @classmethod
+    def from_row(cls, row):
+        """Cria o registro a partir de um sqlite3.Row, dicionário ou outro registro"""
+        if isinstance(row, cls):
+            return row
+        chaves = row.keys()
+        return cls(**{chave: row[chave] for chave in chaves if RECORD_ALIASES.get(chave, chave) in RECORD_FIELDS})
+
+    # ------------------------------------------------------------------
+    # Campos formatados
+    # ------------------------------------------------------------------
+
+    @property
+    def title_short(self):
+        if self._title_short is None:
+            self._title_short = formatting.truncate_text(self.title, 50)
+        return self._title_short
+
+    @property
+    def date_formatted(self):
+        if self._date_formatted is None:
+            self._date_formatted = formatting.format_timestamp(self.timestamp)
+        return self._date_formatted
+
+    @property
+    def duration_formatted(self):
+        if self._duration_formatted is None:
+            self._duration_formatted = formatting.format_duration(self.duration)
+        return self._duration_formatted
+
+    @property
+    def view_count_formatted(self):
+        if self._view_count_formatted is None:
+            self._view_count_formatted = formatting.format_view_count(self.view_count)
+        return self._view_count_formatted
+
+    # ------------------------------------------------------------------
+    # Acesso como dicionário
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key):
+        if key not in _KEYS:
+            raise KeyError(key)
+        return getattr(self, RECORD_ALIASES.get(key, key))
+
+    def get(self, key, default=None):
+        if key not in _KEYS:
+            return default
+        return getattr(self, RECORD_ALIASES.get(key, key))
+
+    def keys(self):
+        return RECORD_FIELDS
+
+    def to_dict(self):
+        """Dicionário com os campos carregados (os que não são None)"""
+        return {campo: getattr(self, campo) for campo in RECORD_FIELDS if getattr(self, campo) is not None}
+
+    def __eq__(self, other):
+        if not isinstance(other, DownloadRecord):
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(other, campo) for campo in RECORD_FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"DownloadRecord(id={self.id!r}, title={self.title!r}, status={self.status!r})"
@@ -0,0 +1,292 @@
+import threading
+import itertools
+from collections import deque
+from datetime import datetime, timedelta
+
+# Configuração com as horas em que downloads agendados podem começar
+# (ex.: "22-6, 13"); vazia = a qualquer hora
+DOWNLOAD_WINDOWS_SETTING = 'download_windows'
+
+# Configuração que liga o ajuste automático das janelas pela velocidade medida
+DOWNLOAD_WINDOWS_ADAPTIVE_SETTING = 'download_windows_adaptive'
+
+# Intervalo máximo entre verificações da fila (s)
+SCHEDULER_CHECK_INTERVAL = 30
+
+# Intervalo entre recálculos das janelas no modo automático (s)
+SCHEDULER_ADAPT_INTERVAL = 6 * 3600
+
+
+def parse_hours(text):
+    """
+    Converte a descrição das janelas em um conjunto de horas (0-23)
+
+    Aceita horas isoladas e faixas separadas por vírgula. Faixas têm fim
+    exclusivo e podem passar da meia-noite: "22-6" = 22h às 6h.
+
+    Raises:
+        ValueError: Se a descrição for inválida
+    """
+    horas = set()
+    for parte in (text or '').split(','):
+        parte = parte.strip()
+        if not parte:
+            continue
+        if '-' in parte:
+            inicio, fim = (int(valor) for valor in parte.split('-', 1))
+            if not (0 <= inicio <= 23 and 0 <= fim <= 24) or inicio == fim:
+                raise ValueError(f"Faixa de horas inválida: {parte}")
+            tamanho = (fim - inicio) % 24 or 24
+            horas.update((inicio + i) % 24 for i in range(tamanho))
+        else:
+            hora = int(parte)
+            if not 0 <= hora <= 23:
+                raise ValueError(f"Hora inválida: {parte}")
+            horas.add(hora)
+    return horas
+
+
+def format_hours(hours):
+    """Inverso de parse_hours: {22, 23, 0, 1} -> "22-2" """
+    horas = sorted(set(hours))
+    if not horas or len(horas) == 24:
+        return ''
+
+    faixas = []
+    inicio = anterior = horas[0]
+    for hora in horas[1:]:
+        if hora != anterior + 1:
+            faixas.append((inicio, anterior + 1))
+            inicio = hora
+        anterior = hora
+    faixas.append((inicio, anterior + 1))
+
+    # Juntar a faixa que termina à meia-noite com a que começa nela
+    if len(faixas) > 1 and faixas[0][0] == 0 and faixas[-1][1] == 24:
+        faixas[0] = (faixas.pop()[0], faixas[0][1])
+
+    return ", ".join(
+        str(inicio) if fim - inicio == 1 else f"{inicio}-{fim % 24}"
+        for inicio, fim in faixas
+    )
+
+
+class ScheduledJob:
+    """Download aguardando na fila do agendador"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, label, payload):
+        """
+        Args:
+            label (str): Descrição exibida (título do vídeo)
+            payload: Dados usados para iniciar o download
+        """
+        self.id = next(self._ids)
+        self.label = label
+        self.payload = payload
+        self.enqueued_at = datetime.now()
+        self.status = 'pendente'
+
+    def __repr__(self):
+        return f"ScheduledJob(id={self.id}, label={self.label!r}, status={self.status!r})"
+
+
+class DownloadScheduler:
+    """
+    Fila de downloads liberados só dentro de janelas de horário.
+
+    Uma thread de fundo entrega um trabalho por vez a `launcher(job)` quando
+    a hora atual está em uma das janelas permitidas; o próximo só é
+    liberado depois de job_finished. Com `hours_provider`, as janelas são
+    recalculadas periodicamente (ex.: horas em que a conexão é mais rápida).
+    """
+
+    def __init__(self, launcher, log_manager=None, hours=None, hours_provider=None,
+                 check_interval=SCHEDULER_CHECK_INTERVAL, adapt_interval=SCHEDULER_ADAPT_INTERVAL, clock=None):
+        """
+        Args:
+            launcher: Função launcher(job) que inicia o download (chamada na thread do agendador)
+            log_manager: Instância do LogManager (opcional)
+            hours: Horas permitidas (padrão: qualquer hora)
+            hours_provider: Função sem argumentos que devolve as horas permitidas (modo automático)
+            check_interval (float): Intervalo máximo entre verificações (s)
+            adapt_interval (float): Intervalo entre recálculos com hours_provider (s)
+            clock: Função que devolve a hora atual (padrão: datetime.now)
+        """
+        self.launcher = launcher
+        self.log_manager = log_manager
+        self.hours_provider = hours_provider
+        self.check_interval = check_interval
+        self.adapt_interval = adapt_interval
+        self.clock = clock or datetime.now
+        self._hours = set(hours or ())
+        self._jobs = deque()
+        self._running = None
+        self._adapted_at = None
+        self._stopped = False
+        self._thread = None
+        self._cond = threading.Condition()
+
+    # ------------------------------------------------------------------
+    # Janelas
+    # ------------------------------------------------------------------
+
+    @property
+    def hours(self):
+        """Horas permitidas (conjunto vazio = qualquer hora)"""
+        with self._cond:
+            return set(self._hours)
+
+    def set_hours(self, hours):
+        """Troca as janelas permitidas"""
+        with self._cond:
+            self._hours = set(hours or ())
+            self._cond.notify_all()
+        self._log('janelas_download', horas=format_hours(hours or ()) or 'qualquer')
+
+    def set_hours_provider(self, hours_provider):
+        """Liga (função) ou desliga (None) o recálculo automático das janelas"""
+        with self._cond:
+            self.hours_provider = hours_provider
+            self._adapted_at = None
+            self._cond.notify_all()
+
+    def is_open(self, now=None):
+        """True se downloads podem começar agora"""
+        now = now or self.clock()
+        with self._cond:
+            return not self._hours or now.hour in self._hours
+
+    def seconds_until_open(self, now=None):
+        """Segundos até a próxima janela (0 se já estiver aberta)"""
+        now = now or self.clock()
+        with self._cond:
+            horas = set(self._hours)
+        if not horas or now.hour in horas:
+            return 0
+        inicio_hora = now.replace(minute=0, second=0, microsecond=0)
+        for adiante in range(1, 25):
+            if (now.hour + adiante) % 24 in horas:
+                return ((inicio_hora + timedelta(hours=adiante)) - now).total_seconds()
+        return 0
+
+    # ------------------------------------------------------------------
+    # Fila
+    # ------------------------------------------------------------------
+
+    def enqueue(self, label, payload):
+        """
+        Coloca um download na fila
+
+        Returns:
+            ScheduledJob: Trabalho criado
+        """
+        job = ScheduledJob(label, payload)
+        with self._cond:
+            self._jobs.append(job)
+            self._cond.notify_all()
+        self._log('download_agendado', id=job.id, titulo=label)
+        return job
+
+    def cancel(self, job_id):
+        """Remove da fila um download ainda não iniciado"""
+        with self._cond:
+            for job in self._jobs:
+                if job.id == job_id:
+                    self._jobs.remove(job)
+                    job.status = 'cancelado'
+                    return True
+        return False
+
+    def pending(self):
+        """Downloads aguardando, na ordem em que serão liberados"""
+        with self._cond:
+            return list(self._jobs)
+
+    @property
+    def running(self):
+        """Download liberado que ainda não terminou (ou None)"""
+        with self._cond:
+            return self._running
+
+    def job_finished(self, success=True, retry=False):
+        """
+        Informa que o download liberado terminou
+
+        Args:
+            success (bool): Resultado do download
+            retry (bool): Devolver o trabalho ao início da fila (ex.: não pôde começar)
+        """
+        with self._cond:
+            job, self._running = self._running, None
+            if job is not None:
+                if retry:
+                    job.status = 'pendente'
+                    self._jobs.appendleft(job)
+                else:
+                    job.status = 'concluido' if success else 'erro'
+            self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # Thread
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Inicia a thread do agendador"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="DownloadScheduler", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Encerra o agendador (downloads pendentes continuam na fila)"""
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            self._adapt_hours()
+            with self._cond:
+                if self._stopped:
+                    return
+                if self._running is not None or not self._jobs:
+                    self._cond.wait(self.check_interval)
+                    continue
+                espera = self.seconds_until_open()
+                if espera > 0:
+                    self._cond.wait(min(espera, self.check_interval))
+                    continue
+                job = self._jobs.popleft()
+                job.status = 'em andamento'
+                self._running = job
+
+            self._log('download_liberado', id=job.id, titulo=job.label, hora=self.clock().strftime('%H:%M'))
+            try:
+                self.launcher(job)
+            except Exception as e:
+                if self.log_manager:
+                    self.log_manager.log_error(e, f"Erro ao iniciar download agendado '{job.label}'")
+                self.job_finished(success=False)
+
+    def _adapt_hours(self):
+        with self._cond:
+            provider = self.hours_provider
+            if provider is None:
+                return
+            agora = self.clock()
+            if self._adapted_at is not None and (agora - self._adapted_at).total_seconds() < self.adapt_interval:
+                return
+            self._adapted_at = agora
+        try:
+            horas = provider()
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro ao recalcular janelas de download")
+            return
+        if horas:
+            self.set_hours(horas)
+
+    def _log(self, evento, **campos):
+        if self.log_manager:
+            self.log_manager.log_event(evento, **campos)
@@ -0,0 +1,267 @@
+from utils import AppUtils
+
+# Famílias de codec de vídeo reconhecidas (prefixo do vcodec -> família)
+CODEC_FAMILIES = {
+    'av01': 'av1',
+    'av1': 'av1',
+    'vp09': 'vp9',
+    'vp9': 'vp9',
+    'vp8': 'vp8',
+    'hev1': 'hevc',
+    'hvc1': 'hevc',
+    'h265': 'hevc',
+    'avc1': 'h264',
+    'avc3': 'h264',
+    'h264': 'h264',
+}
+
+# Ordem padrão: compatibilidade (h264 toca em qualquer lugar e faz remux direto para mp4)
+COMPATIBILITY_ORDER = ('h264', 'vp9', 'av1', 'hevc', 'vp8')
+
+# Ordem por eficiência de compressão: menor arquivo para a mesma qualidade
+EFFICIENCY_ORDER = ('av1', 'vp9', 'hevc', 'h264', 'vp8')
+
+# Codecs que entram em um contêiner mp4 por remux (cópia de streams, sem recodificar)
+MP4_VIDEO_FAMILIES = ('h264', 'hevc', 'av1')
+MP4_AUDIO_PREFIXES = ('mp4a', 'aac')
+
+
+class FormatIndex:
+    """
+    Índice dos formatos de um vídeo, construído uma única vez na extração.
+
+    Agrupa os formatos de vídeo por resolução e por altura, cada grupo já
+    ordenado (vídeo puro antes de muxado, codec, bitrate e tamanho), de modo
+    que toda seleção de formato seja uma consulta ao índice em vez de uma
+    nova varredura de `info['formats']`.
+    """
+
+    def __init__(self, formats, duration=None):
+        """
+        Constrói o índice
+
+        Args:
+            formats (list): Lista `formats` retornada pelo yt-dlp
+            duration (float): Duração do vídeo em segundos (para estimar tamanhos)
+        """
+        self.duration = duration or 0
+        self.by_id = {}
+        self.by_resolution = {}
+        self.by_height = {}
+        self.audio_formats = []
+        self.total_formats = 0
+
+        for fmt in formats or []:
+            self.total_formats += 1
+            format_id = fmt.get('format_id')
+            if format_id is not None:
+                self.by_id[str(format_id)] = fmt
+
+            vcodec = fmt.get('vcodec') or 'none'
+            acodec = fmt.get('acodec') or 'none'
+            resolution = fmt.get('resolution')
+            height = fmt.get('height')
+
+            if (resolution and resolution != 'audio only' and
+                    vcodec != 'none' and height is not None):
+                self.by_resolution.setdefault(resolution, []).append(fmt)
+                self.by_height.setdefault(height, []).append(fmt)
+            elif vcodec == 'none' and acodec != 'none':
+                self.audio_formats.append(fmt)
+
+        for grupo in self.by_resolution.values():
+            grupo.sort(key=self._rank_key)
+        for grupo in self.by_height.values():
+            grupo.sort(key=self._rank_key)
+        self.audio_formats.sort(
+            key=lambda f: (-(f.get('abr') or f.get('tbr') or 0), self.estimated_size(f) or 0)
+        )
+
+        self.resolutions = AppUtils.sort_resolutions(list(self.by_resolution))
+        self.heights = sorted(self.by_height)
+
+    # ------------------------------------------------------------------
+    # Classificação
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def codec_family(vcodec):
+        """Retorna a família do codec (h264, vp9, av1, ...) a partir do vcodec do yt-dlp"""
+        if not vcodec or vcodec == 'none':
+            return None
+        prefixo = vcodec.split('.')[0].lower()
+        return CODEC_FAMILIES.get(prefixo, prefixo)
+
+    @staticmethod
+    def is_video_only(fmt):
+        """Indica se o formato traz apenas vídeo (precisa de merge com áudio)"""
+        return (fmt.get('vcodec') or 'none') != 'none' and (fmt.get('acodec') or 'none') == 'none'
+
+    @staticmethod
+    def is_mp4_compatible(fmt):
+        """
+        Indica se todos os streams do formato podem ir para mp4 sem recodificar
+
+        Streams ausentes ('none') não contam contra a compatibilidade.
+        """
+        if not fmt:
+            return False
+        vcodec = fmt.get('vcodec') or 'none'
+        acodec = fmt.get('acodec') or 'none'
+        if vcodec != 'none' and FormatIndex.codec_family(vcodec) not in MP4_VIDEO_FAMILIES:
+            return False
+        if acodec != 'none' and not acodec.lower().startswith(MP4_AUDIO_PREFIXES):
+            return False
+        return True
+
+    @staticmethod
+    def _codec_rank(fmt, codec_order):
+        familia = FormatIndex.codec_family(fmt.get('vcodec'))
+        try:
+            return codec_order.index(familia)
+        except ValueError:
+            return len(codec_order)
+
+    def _rank_key(self, fmt, codec_order=COMPATIBILITY_ORDER):
+        return (
+            0 if self.is_video_only(fmt) else 1,
+            self._codec_rank(fmt, codec_order),
+            -(fmt.get('tbr') or 0),
+            self.estimated_size(fmt) or 0,
+        )
+
+    def estimated_size(self, fmt):
+        """
+        Tamanho esperado do formato em bytes
+
+        Usa `filesize`, depois `filesize_approx` e, por fim, tbr x duração.
+
+        Returns:
+            int or None: Tamanho em bytes, ou None se não houver como estimar
+        """
+        if not fmt:
+            return None
+        tamanho = fmt.get('filesize') or fmt.get('filesize_approx')
+        if tamanho:
+            return int(tamanho)
+        tbr = fmt.get('tbr')
+        if tbr and self.duration:
+            return int(tbr * 1000 / 8 * self.duration)
+        return None
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+
+    @property
+    def video_format_count(self):
+        """Quantidade de formatos de vídeo válidos"""
+        return sum(len(grupo) for grupo in self.by_resolution.values())
+
+    def get(self, format_id):
+        """Retorna o formato pelo format_id"""
+        return self.by_id.get(str(format_id))
+
+    def candidates(self, resolution=None, height=None, codec_order=None):
+        """
+        Formatos candidatos para uma resolução ou altura, já ordenados
+
+        Args:
+            resolution (str): Resolução (ex.: '1920x1080')
+            height (int): Altura em pixels (usada se resolution não for informada)
+            codec_order (tuple): Ordem de preferência de codecs (padrão: compatibilidade)
+        """
+        if resolution is not None:
+            grupo = self.by_resolution.get(resolution, [])
+        else:
+            grupo = self.by_height.get(height, [])
+        if codec_order is not None and codec_order != COMPATIBILITY_ORDER:
+            return sorted(grupo, key=lambda f: self._rank_key(f, codec_order))
+        return grupo
+
+    def best_for_resolution(self, resolution, codec_order=None):
+        """Melhor formato para a resolução, ou None se não existir"""
+        grupo = self.candidates(resolution=resolution, codec_order=codec_order)
+        return grupo[0] if grupo else None
+
+    def best_audio(self, mp4_only=False):
+        """
+        Melhor formato de áudio puro, ou None
+
+        Args:
+            mp4_only (bool): Considerar apenas áudio que entra em mp4 sem recodificar (m4a/aac)
+        """
+        if mp4_only:
+            for fmt in self.audio_formats:
+                if self.is_mp4_compatible(fmt):
+                    return fmt
+            return None
+        return self.audio_formats[0] if self.audio_formats else None
+
+    def mp4_alternative(self, fmt):
+        """
+        Formato compatível com mp4 na mesma altura de `fmt`, se existir
+
+        Usado para trocar um vp9/vp8 por h264/av1 equivalente e evitar transcodificação.
+        """
+        if not fmt or self.is_mp4_compatible(fmt):
+            return fmt
+        for candidato in self.candidates(height=fmt.get('height')):
+            if self.is_mp4_compatible(candidato) and self.is_video_only(candidato) == self.is_video_only(fmt):
+                return candidato
+        return None
+
+    def height_for(self, key, default=1080):
+        """
+        Altura associada a um format_id ou a uma string de resolução
+
+        Args:
+            key (str|int): format_id (ex.: '137' ou 137) ou resolução (ex.: '1920x1080')
+            default (int): Valor retornado quando não há correspondência
+        """
+        if key is None:
+            return default
+        fmt = self.by_id.get(str(key))
+        if fmt and fmt.get('height'):
+            return fmt['height']
+        grupo = self.by_resolution.get(key)
+        if grupo:
+            return grupo[0].get('height') or default
+        # Último recurso: resolução no formato 'LxA' ou '720p'
+        if not isinstance(key, str):
+            return default
+        try:
+            if 'x' in key:
+                return int(key.split('x')[1])
+            if key.endswith('p'):
+                return int(key[:-1])
+        except (ValueError, IndexError):
+            pass
+        return default
+
+    def best_under_size(self, max_bytes, max_height=None, codec_order=EFFICIENCY_ORDER, include_audio=True):
+        """
+        Maior resolução cujo tamanho estimado cabe no orçamento
+
+        Percorre as alturas da maior para a menor e, em cada uma, os codecs na
+        ordem de eficiência (av1/vp9/h264 por padrão), retornando o primeiro
+        formato que cabe em `max_bytes` somado ao melhor áudio.
+
+        Returns:
+            tuple: (formato_video, formato_audio, bytes_estimados) ou (None, None, None)
+        """
+        audio = self.best_audio() if include_audio else None
+        tamanho_audio = self.estimated_size(audio) or 0
+
+        for height in reversed(self.heights):
+            if max_height is not None and height > max_height:
+                continue
+            for fmt in self.candidates(height=height, codec_order=codec_order):
+                tamanho = self.estimated_size(fmt)
+                if tamanho is None:
+                    continue
+                # Formatos muxados já incluem o áudio
+                total = tamanho + (tamanho_audio if self.is_video_only(fmt) else 0)
+                if total <= max_bytes:
+                    return fmt, (audio if self.is_video_only(fmt) else None), total
+        return None, None, None
@@ -0,0 +1,323 @@
+import os
+import shutil
+from abc import ABC, abstractmethod
+from utils import AppUtils
+from format_index import FormatIndex, EFFICIENCY_ORDER
+
+# Peso das novas amostras na média móvel da vazão (bytes/s)
+THROUGHPUT_SMOOTHING = 0.3
+
+# Folga exigida no disco além do tamanho esperado (arquivos temporários do merge)
+DISK_SAFETY_MARGIN = 1.1
+
+# Configurações da política de formato: nome da política e os limites de cada uma
+FORMAT_POLICY_SETTING = 'format_policy'
+FORMAT_POLICY_MAX_MB_SETTING = 'format_policy_max_mb'
+FORMAT_POLICY_MAX_MINUTES_SETTING = 'format_policy_max_minutes'
+
+# Modos de pós-processamento, do mais barato ao mais caro
+POSTPROCESS_NONE = 'nenhum'            # arquivo já sai em mp4
+POSTPROCESS_MERGE = 'merge'            # vídeo + áudio copiados para mp4
+POSTPROCESS_REMUX = 'remux'            # troca de contêiner sem recodificar
+POSTPROCESS_TRANSCODE = 'transcodificar'  # codecs incompatíveis com mp4
+POSTPROCESS_EXTRACT_AUDIO = 'extrair_audio'
+
+
+class FormatDecision:
+    """Resultado de uma decisão de formato, reportado antes do download começar"""
+
+    def __init__(self, selector, policy, video_format=None, audio_format=None,
+                 expected_bytes=None, eta_seconds=None, free_bytes=None, reason="",
+                 postprocess=POSTPROCESS_MERGE):
+        self.selector = selector
+        self.policy = policy
+        self.video_format = video_format
+        self.audio_format = audio_format
+        self.expected_bytes = expected_bytes
+        self.eta_seconds = eta_seconds
+        self.free_bytes = free_bytes
+        self.reason = reason
+        self.postprocess = postprocess
+
+    @property
+    def fits_disk(self):
+        """Indica se o tamanho esperado cabe no espaço livre do destino"""
+        if self.expected_bytes is None or self.free_bytes is None:
+            return True
+        return self.expected_bytes * DISK_SAFETY_MARGIN <= self.free_bytes
+
+    @property
+    def format_ids(self):
+        """format_ids escolhidos (vídeo e/ou áudio)"""
+        return [f['format_id'] for f in (self.video_format, self.audio_format) if f]
+
+    def summary(self):
+        """Texto curto para exibição na interface"""
+        partes = []
+        if self.video_format:
+            codec = FormatIndex.codec_family(self.video_format.get('vcodec')) or '?'
+            partes.append(f"{self.video_format.get('resolution', '?')} {codec}")
+        elif self.audio_format:
+            partes.append(f"áudio {self.audio_format.get('acodec', '?')}")
+        partes.append(f"~{AppUtils.format_bytes(self.expected_bytes)}")
+        if self.eta_seconds is not None:
+            partes.append(f"ETA {AppUtils.format_duration(self.eta_seconds)}")
+        return " | ".join(partes)
+
+    def to_dict(self):
+        """Representação em dicionário (para logs e callbacks)"""
+        return {
+            'selector': self.selector,
+            'policy': self.policy,
+            'format_ids': self.format_ids,
+            'expected_bytes': self.expected_bytes,
+            'eta_seconds': self.eta_seconds,
+            'free_bytes': self.free_bytes,
+            'fits_disk': self.fits_disk,
+            'reason': self.reason,
+            'postprocess': self.postprocess
+        }
+
+
+class FormatPolicy(ABC):
+    """
+    Política base de seleção de formato.
+
+    Subclasses implementam `select`, que recebe o índice de formatos do vídeo,
+    a resolução pedida pelo usuário e a vazão estimada (bytes/s, pode ser None)
+    e retorna (formato_video, formato_audio, motivo).
+    """
+
+    name = "base"
+    # Permite trocar o codec de vídeo por um equivalente compatível com mp4
+    allow_codec_swap = True
+
+    @abstractmethod
+    def select(self, index, resolution, throughput_bps=None):
+        """Escolhe os formatos: retorna (formato_video, formato_audio, motivo)"""
+
+
+class ResolutionPolicy(FormatPolicy):
+    """Respeita a resolução escolhida; usa a maior altura inferior se ela não existir"""
+
+    name = "resolucao"
+
+    def select(self, index, resolution, throughput_bps=None):
+        video = index.best_for_resolution(resolution)
+        motivo = "resolução selecionada"
+        if not video:
+            altura = index.height_for(resolution)
+            for height in reversed(index.heights):
+                if height <= altura:
+                    video = index.candidates(height=height)[0]
+                    motivo = f"resolução indisponível, usando {height}p"
+                    break
+        audio = index.best_audio() if video and FormatIndex.is_video_only(video) else None
+        return video, audio, motivo
+
+
+class SizeBudgetPolicy(FormatPolicy):
+    """Maior qualidade (até a resolução pedida) que cabe em um orçamento de bytes por vídeo"""
+
+    name = "orcamento"
+    # A troca por h264 aumentaria o arquivo e poderia estourar o orçamento
+    allow_codec_swap = False
+
+    def __init__(self, max_bytes, codec_order=EFFICIENCY_ORDER):
+        self.max_bytes = max_bytes
+        self.codec_order = codec_order
+
+    def _budget(self, throughput_bps):
+        return self.max_bytes
+
+    def select(self, index, resolution, throughput_bps=None):
+        orcamento = self._budget(throughput_bps)
+        if orcamento is None:
+            return ResolutionPolicy().select(index, resolution)
+
+        video, audio, _ = index.best_under_size(
+            orcamento,
+            max_height=index.height_for(resolution),
+            codec_order=self.codec_order
+        )
+        if video:
+            return video, audio, f"cabe no orçamento de {AppUtils.format_bytes(orcamento)}"
+
+        # Nada cabe: manter a resolução pedida e deixar a decisão sinalizar o excesso
+        video, audio, _ = ResolutionPolicy().select(index, resolution)
+        return video, audio, f"nenhum formato cabe em {AppUtils.format_bytes(orcamento)}"
+
+
+class ThroughputPolicy(SizeBudgetPolicy):
+    """Maior qualidade que termina dentro de uma janela de tempo, dada a vazão observada"""
+
+    name = "vazao"
+
+    def __init__(self, max_seconds, default_throughput_bps=None, codec_order=EFFICIENCY_ORDER):
+        super().__init__(None, codec_order)
+        self.max_seconds = max_seconds
+        self.default_throughput_bps = default_throughput_bps
+
+    def _budget(self, throughput_bps):
+        vazao = throughput_bps or self.default_throughput_bps
+        if not vazao:
+            return None
+        return int(vazao * self.max_seconds)
+
+
+def policy_from_settings(name, max_mb=None, max_minutes=None):
+    """
+    Cria a política de formato descrita pelas configurações
+
+    Args:
+        name (str): "resolucao", "orcamento" ou "vazao" (vazio = resolucao)
+        max_mb: Orçamento por vídeo em MB (política "orcamento")
+        max_minutes: Janela de tempo por vídeo em minutos (política "vazao")
+
+    Returns:
+        FormatPolicy: Política correspondente
+
+    Raises:
+        ValueError: Se a política for desconhecida ou o limite dela for inválido
+    """
+    def limite(valor, unidade):
+        try:
+            numero = float(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"Limite inválido: {valor!r} {unidade}")
+        if numero <= 0:
+            raise ValueError(f"O limite deve ser maior que zero: {valor!r} {unidade}")
+        return numero
+
+    if not name or name == ResolutionPolicy.name:
+        return ResolutionPolicy()
+    if name == SizeBudgetPolicy.name:
+        return SizeBudgetPolicy(int(limite(max_mb, "MB") * 1024 * 1024))
+    if name == ThroughputPolicy.name:
+        return ThroughputPolicy(limite(max_minutes, "minutos") * 60)
+    raise ValueError(f"Política de formato desconhecida: {name}")
+
+
+class FormatPolicyEngine:
+    """
+    Motor de decisão de formato com políticas plugáveis.
+
+    Mantém a vazão observada (média móvel dos hooks de progresso) para estimar
+    o ETA e verifica o espaço livre no destino antes de cada download.
+    """
+
+    def __init__(self, log_manager, policy=None, prefer_remux=True):
+        self.log_manager = log_manager
+        self.policy = policy or ResolutionPolicy()
+        self.throughput_bps = None
+        # Preferir pares de streams que entram em mp4 sem recodificar
+        self.prefer_remux = prefer_remux
+
+    def set_policy(self, policy):
+        """Troca a política ativa"""
+        self.policy = policy or ResolutionPolicy()
+        self.log_manager.log_info(f"Política de formato definida: {self.policy.name}")
+
+    def update_throughput(self, speed_bps):
+        """Atualiza a vazão estimada com uma amostra de velocidade (bytes/s)"""
+        if not speed_bps or speed_bps <= 0:
+            return
+        if self.throughput_bps is None:
+            self.throughput_bps = float(speed_bps)
+        else:
+            self.throughput_bps += THROUGHPUT_SMOOTHING * (speed_bps - self.throughput_bps)
+
+    def decide(self, index, resolution, destination=None, audio_only=False):
+        """
+        Decide o formato de um vídeo
+
+        Args:
+            index (FormatIndex): Índice de formatos do vídeo
+            resolution (str): Resolução pedida (ignorada em áudio)
+            destination (str): Diretório de destino (para checar espaço livre)
+            audio_only (bool): Se True, decide apenas o áudio
+
+        Returns:
+            FormatDecision: Decisão com seletor, bytes esperados e ETA
+        """
+        if audio_only:
+            video, audio, motivo = None, index.best_audio(), "apenas áudio"
+            selector = 'bestaudio/best'
+            politica = 'audio'
+            postprocess = POSTPROCESS_EXTRACT_AUDIO
+        else:
+            video, audio, motivo = self.policy.select(index, resolution, self.throughput_bps)
+            if self.prefer_remux:
+                video, audio = self._prefer_mp4_pair(index, video, audio, self.policy.allow_codec_swap)
+            selector = self._build_selector(index, video, audio, resolution)
+            politica = self.policy.name
+            postprocess = self._postprocess_mode(video, audio)
+
+        esperado = self._expected_bytes(index, video, audio)
+        eta = int(esperado / self.throughput_bps) if esperado and self.throughput_bps else None
+
+        return FormatDecision(
+            selector,
+            politica,
+            video_format=video,
+            audio_format=audio,
+            expected_bytes=esperado,
+            eta_seconds=eta,
+            free_bytes=self._free_bytes(destination),
+            reason=motivo,
+            postprocess=postprocess
+        )
+
+    @staticmethod
+    def _prefer_mp4_pair(index, video, audio, allow_codec_swap=True):
+        """Troca os streams escolhidos por equivalentes compatíveis com mp4, quando existirem"""
+        if not video:
+            return video, audio
+        if allow_codec_swap:
+            alternativa = index.mp4_alternative(video)
+            if alternativa is not None:
+                video = alternativa
+        if FormatIndex.is_video_only(video) and FormatIndex.is_mp4_compatible(video):
+            audio = index.best_audio(mp4_only=True) or audio
+        return video, audio
+
+    @staticmethod
+    def _postprocess_mode(video, audio):
+        """Pós-processamento necessário para entregar mp4 com os streams escolhidos"""
+        if not video:
+            # Seletor genérico: o merge para mp4 copia os streams sempre que possível
+            return POSTPROCESS_MERGE
+        if FormatIndex.is_video_only(video):
+            if FormatIndex.is_mp4_compatible(video) and (audio is None or FormatIndex.is_mp4_compatible(audio)):
+                return POSTPROCESS_MERGE
+            return POSTPROCESS_TRANSCODE
+        if not FormatIndex.is_mp4_compatible(video):
+            return POSTPROCESS_TRANSCODE
+        return POSTPROCESS_NONE if video.get('ext') == 'mp4' else POSTPROCESS_REMUX
+
+    @staticmethod
+    def _build_selector(index, video, audio, resolution):
+        altura = index.height_for(video['format_id'] if video else resolution)
+        fallback = f"best[height<={altura}]/best"
+        if not video:
+            return fallback
+        if FormatIndex.is_video_only(video):
+            audio_id = audio['format_id'] if audio else 'bestaudio'
+            return f"{video['format_id']}+{audio_id}/{video['format_id']}+bestaudio/{fallback}"
+        return f"{video['format_id']}/{fallback}"
+
+    @staticmethod
+    def _expected_bytes(index, video, audio):
+        tamanhos = [index.estimated_size(f) for f in (video, audio) if f]
+        if not tamanhos or any(t is None for t in tamanhos):
+            return None
+        return sum(tamanhos)
+
+    @staticmethod
+    def _free_bytes(destination):
+        if not destination or not os.path.isdir(destination):
+            return None
+        try:
+            return shutil.disk_usage(destination).free
+        except OSError:
+            return None
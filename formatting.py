@@ -0,0 +1,121 @@
+from datetime import datetime
+from functools import lru_cache
+
+# Valores distintos guardados por formatador; datas são guardadas por minuto,
+# então alguns milhares cobrem o histórico inteiro na maioria dos casos
+FORMAT_CACHE_SIZE = 4096
+
+# Textos maiores que isso são truncados sem passar pelo cache (descrições)
+TRUNCATE_CACHE_MAX_LENGTH = 1000
+
+NOT_AVAILABLE = "Não disponível"
+
+
+def _is_sqlite_timestamp(value):
+    """'AAAA-MM-DD HH:MM...' (formato do CURRENT_TIMESTAMP do SQLite e ISO 8601)"""
+    return (
+        len(value) >= 16 and value[4] == '-' and value[7] == '-'
+        and value[10] in ' T' and value[13] == ':'
+    )
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_minute(minuto):
+    """'AAAA-MM-DD HH:MM' -> 'DD/MM/AAAA HH:MM'"""
+    try:
+        return datetime.strptime(minuto.replace('T', ' '), '%Y-%m-%d %H:%M').strftime('%d/%m/%Y %H:%M')
+    except ValueError:
+        return None
+
+
+def format_timestamp(value, default='N/A'):
+    """
+    Formata um timestamp do banco como 'DD/MM/AAAA HH:MM'
+
+    Só o minuto importa para o resultado, então o cache é indexado pelos
+    16 primeiros caracteres: todas as linhas do mesmo minuto reaproveitam a
+    mesma string. Outros formatos ISO passam pelo fromisoformat (sem cache);
+    valores que não são datas são devolvidos como estão.
+    """
+    if not value:
+        return default
+    if not isinstance(value, str):
+        return str(value)
+    if _is_sqlite_timestamp(value):
+        formatado = _format_minute(value[:16])
+        if formatado is not None:
+            return formatado
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).strftime('%d/%m/%Y %H:%M')
+    except ValueError:
+        return value
+
+
+def format_timestamps(values, default='N/A'):
+    """Formata uma sequência de timestamps (ex.: uma coluna inteira de exportação)"""
+    return [format_timestamp(value, default) for value in values]
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_duration(duration_seconds):
+    """Formata duração em segundos para formato MM:SS"""
+    if not duration_seconds or duration_seconds == 'N/A':
+        return NOT_AVAILABLE
+
+    try:
+        minutes = int(duration_seconds) // 60
+        seconds = int(duration_seconds) % 60
+        return f"{minutes}:{seconds:02d}"
+    except (ValueError, TypeError):
+        return str(duration_seconds)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_view_count(view_count):
+    """Formata número de visualizações com separadores de milhares"""
+    if not view_count or view_count == 'N/A':
+        return NOT_AVAILABLE
+
+    try:
+        return f"{int(view_count):,}"
+    except (ValueError, TypeError):
+        return str(view_count)
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _truncate_cached(text, max_length):
+    return _truncate(text, max_length)
+
+
+def _truncate(text, max_length):
+    if not text or text == 'N/A':
+        return NOT_AVAILABLE
+
+    text_str = str(text)
+    if len(text_str) > max_length:
+        return text_str[:max_length] + "..."
+
+    return text_str
+
+
+def truncate_text(text, max_length=50000):
+    """Trunca texto se exceder o tamanho máximo"""
+    if isinstance(text, str) and len(text) <= TRUNCATE_CACHE_MAX_LENGTH:
+        return _truncate_cached(text, max_length)
+    return _truncate(text, max_length)
+
+
+def cache_info():
+    """Acertos e faltas de cada cache de formatação (para diagnóstico)"""
+    return {
+        'timestamp': _format_minute.cache_info(),
+        'duration': format_duration.cache_info(),
+        'view_count': format_view_count.cache_info(),
+        'truncate': _truncate_cached.cache_info(),
+    }
+
+
+def clear_caches():
+    """Esvazia os caches de formatação"""
+    for funcao in (_format_minute, format_duration, format_view_count, _truncate_cached):
+        funcao.cache_clear()
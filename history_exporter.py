@@ -0,0 +1,262 @@
+import os
+import csv
+from datetime import datetime
+from xml.sax.saxutils import escape
+
+# Linhas lidas do banco por vez
+EXPORT_CHUNK_SIZE = 1000
+
+# Altura fixa das linhas da tabela do PDF (pontos); com ela cada página
+# recebe um número conhecido de linhas e só uma página fica em memória
+PDF_ROW_HEIGHT = 14
+
+# Largura das colunas do PDF (polegadas): ID, Título, Resolução, Data, Status
+PDF_COLUMN_WIDTHS = (0.8, 3.5, 1.0, 1.2, 1.0)
+
+CSV_HEADER = ['ID', 'Título', 'URL', 'Resolução', 'Data', 'Status', 'Caminho do Arquivo']
+PDF_HEADER = ['ID', 'Título', 'Resolução', 'Data', 'Status']
+
+
+class ExportCancelled(Exception):
+    """Exportação interrompida pelo usuário"""
+
+
+class HistoryExporter:
+    """
+    Exportação do histórico em fluxo contínuo.
+
+    As linhas são lidas do cursor em blocos e gravadas à medida que chegam:
+    o CSV é escrito linha a linha e o PDF é desenhado página por página, então
+    a memória usada não depende do tamanho do histórico. O arquivo é gerado
+    com a extensão `.part` e só substitui o destino ao final, de modo que uma
+    exportação cancelada ou com erro não deixa um arquivo incompleto.
+    """
+
+    def __init__(self, history_manager, log_manager=None, chunk_size=EXPORT_CHUNK_SIZE):
+        """
+        Args:
+            history_manager: Instância do HistoryManager
+            log_manager: Instância do LogManager (opcional)
+            chunk_size (int): Linhas lidas do banco por vez
+        """
+        self.history_manager = history_manager
+        self.log_manager = log_manager
+        self.chunk_size = chunk_size
+
+    def count(self, filters=None):
+        """Quantidade de linhas que a exportação vai gerar"""
+        return self.history_manager.get_total_downloads_count(filters, search_url=True)
+
+    def export_csv(self, filename, filters=None, progress=None, cancel_event=None):
+        """
+        Exporta os downloads filtrados para CSV
+
+        Args:
+            filename (str): Arquivo de destino
+            filters (dict): Filtros do histórico
+            progress: Função progress(exportadas, total) chamada a cada bloco
+            cancel_event (threading.Event): Interrompe a exportação quando sinalizado
+
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        def write(temporario, total):
+            exportadas = 0
+            with open(temporario, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(CSV_HEADER)
+                for chunk in self._chunks(filters, cancel_event):
+                    writer.writerows(
+                        [
+                            download['id'],
+                            download['title'],
+                            download['url'],
+                            download['resolution'],
+                            download['timestamp'],
+                            download['status'],
+                            download['file_path'] or ''
+                        ]
+                        for download in chunk
+                    )
+                    exportadas += len(chunk)
+                    self._report(progress, exportadas, total)
+            return exportadas
+
+        return self._export(filename, filters, write, "CSV")
+
+    def export_pdf(self, filename, filters=None, progress=None, cancel_event=None):
+        """
+        Exporta os downloads filtrados para PDF, uma página de tabela por vez
+
+        Args:
+            filename (str): Arquivo de destino
+            filters (dict): Filtros do histórico
+            progress: Função progress(exportadas, total) chamada a cada página
+            cancel_event (threading.Event): Interrompe a exportação quando sinalizado
+
+        Returns:
+            tuple: (sucesso, mensagem)
+        """
+        def write(temporario, total):
+            return self._write_pdf(temporario, filters, total, progress, cancel_event)
+
+        return self._export(filename, filters, write, "PDF")
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _export(self, filename, filters, write, formato):
+        temporario = f"{filename}.part"
+        try:
+            total = self.count(filters)
+            exportadas = write(temporario, total)
+            os.replace(temporario, filename)
+            if self.log_manager:
+                self.log_manager.log_event('exportacao_historico', formato=formato, linhas=exportadas, arquivo=filename)
+            return True, f"{exportadas} registro(s) exportado(s) para:\n{filename}"
+        except ExportCancelled:
+            self._remove(temporario)
+            return False, "Exportação cancelada"
+        except Exception as e:
+            self._remove(temporario)
+            if self.log_manager:
+                self.log_manager.log_error(e, f"Erro ao exportar histórico para {formato}")
+            return False, f"Erro ao exportar para {formato}: {e}"
+
+    def _chunks(self, filters, cancel_event):
+        for chunk in self.history_manager.iter_downloads_filtered(filters, self.chunk_size):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ExportCancelled()
+            yield chunk
+
+    @staticmethod
+    def _report(progress, exportadas, total):
+        if progress:
+            progress(exportadas, max(total, exportadas))
+
+    @staticmethod
+    def _remove(caminho):
+        try:
+            if os.path.exists(caminho):
+                os.remove(caminho)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _pdf_row(download):
+        """Linha da tabela do PDF (título truncado e data formatada)"""
+        title = download.title or ''
+        if len(title) > 50:
+            title = title[:47] + "..."
+        return [str(download.id), title, download.resolution or '', download.date_formatted, download.status or '']
+
+    def _write_pdf(self, temporario, filters, total, progress, cancel_event):
+        # reportlab só é carregado quando o usuário exporta um PDF
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib import colors
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+        from reportlab.pdfgen import canvas
+        from reportlab.platypus import Table, TableStyle, Paragraph
+
+        largura, altura = A4
+        margem = 0.5 * inch
+        largura_util = largura - 2 * margem
+        colunas = [w * inch for w in PDF_COLUMN_WIDTHS]
+
+        styles = getSampleStyleSheet()
+        title_style = ParagraphStyle('CustomTitle', parent=styles['Heading1'], fontSize=16, alignment=1)
+        date_style = ParagraphStyle('DateStyle', parent=styles['Normal'], fontSize=10, alignment=1)
+        table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
+        ])
+
+        pdf = canvas.Canvas(temporario, pagesize=A4)
+        pagina = [1]
+
+        def draw_paragraph(texto, style, topo):
+            paragrafo = Paragraph(texto, style)
+            _, h = paragrafo.wrapOn(pdf, largura_util, altura)
+            paragrafo.drawOn(pdf, margem, topo - h)
+            return topo - h
+
+        def draw_page_number():
+            pdf.setFont('Helvetica', 8)
+            pdf.drawRightString(largura - margem, margem / 2, f"Página {pagina[0]}")
+
+        def new_page():
+            draw_page_number()
+            pdf.showPage()
+            pagina[0] += 1
+            return altura - margem
+
+        def rows_that_fit(topo):
+            # Descontar a linha de cabeçalho da tabela
+            return max(1, int((topo - margem) // PDF_ROW_HEIGHT) - 1)
+
+        def draw_table(linhas, topo):
+            tabela = Table([PDF_HEADER] + linhas, colWidths=colunas, rowHeights=[PDF_ROW_HEIGHT] * (len(linhas) + 1))
+            tabela.setStyle(table_style)
+            _, h = tabela.wrapOn(pdf, largura_util, topo - margem)
+            tabela.drawOn(pdf, margem, topo - h)
+            return topo - h
+
+        # Cabeçalho da primeira página
+        topo = altura - margem
+        topo = draw_paragraph("Relatório de Downloads - YouTube Downloader", title_style, topo) - 20
+        topo = draw_paragraph(f"Gerado em: {datetime.now().strftime('%d/%m/%Y %H:%M:%S')}", date_style, topo) - 20
+        descricao_filtros = self._describe_filters(filters)
+        if descricao_filtros:
+            topo = draw_paragraph(descricao_filtros, styles['Normal'], topo) - 12
+
+        exportadas = 0
+        linhas = []
+        for chunk in self._chunks(filters, cancel_event):
+            for download in chunk:
+                linhas.append(self._pdf_row(download))
+                if len(linhas) >= rows_that_fit(topo):
+                    draw_table(linhas, topo)
+                    exportadas += len(linhas)
+                    linhas = []
+                    topo = new_page()
+                    self._report(progress, exportadas, total)
+
+        if linhas:
+            topo = draw_table(linhas, topo)
+            exportadas += len(linhas)
+            self._report(progress, exportadas, total)
+
+        # Rodapé com total de registros
+        if topo - 20 - PDF_ROW_HEIGHT < margem:
+            topo = new_page()
+        draw_paragraph(f"Total de registros: {exportadas}", styles['Normal'], topo - 20)
+        draw_page_number()
+        pdf.save()
+        return exportadas
+
+    @staticmethod
+    def _describe_filters(filters):
+        """Texto com os filtros aplicados (cabeçalho do PDF)"""
+        if not filters:
+            return ""
+        partes = []
+        if 'search_query' in filters:
+            partes.append(f"Busca: '{filters['search_query']}'")
+        if 'resolution' in filters:
+            partes.append(f"Resolução: {filters['resolution']}")
+        if 'status' in filters:
+            partes.append(f"Status: {filters['status']}")
+        if 'period' in filters:
+            partes.append(f"Período: {filters['period']}")
+        # O texto vira um Paragraph do reportlab, que interpreta marcação
+        return escape("Filtros aplicados: " + "; ".join(partes)) if partes else ""
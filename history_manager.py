@@ -1,6 +1,8 @@
 import os
 from datetime import datetime, timedelta
 from database_manager import DatabaseManager
+from history_writer import HistoryWriteBuffer
+from download_record import DownloadRecord
 from utils import AppUtils, AppConstants
 
 class HistoryManager:
@@ -17,6 +19,9 @@ class HistoryManager:
         self.db_manager = db_manager or DatabaseManager()
         self.log_manager = log_manager
         
+        # Fila de gravação em lote, criada no primeiro uso
+        self._write_buffer = None
+        
         # Estrutura padrão de paginação
         self.DEFAULT_PAGINATION = {
             'current_page': 1,
@@ -80,6 +85,9 @@ class HistoryManager:
             # Preparar dados com valores padrão
             prepared_data = self._prepare_download_data(download_data)
             
+            # Gravar antes o que estiver na fila, mantendo os IDs em ordem cronológica
+            self.flush_pending_writes()
+            
             # Adicionar ao banco
             download_id = self.db_manager.add_download(prepared_data)
             
@@ -99,6 +107,90 @@ class HistoryManager:
                 self.log_manager.log_error(e, "Histórico")
             return False, error_msg
     
+    def add_downloads_bulk(self, downloads):
+        """
+        Adiciona vários downloads ao histórico em uma única transação
+        
+        Args:
+            downloads (list): Dicionários com os dados de cada download
+            
+        Returns:
+            tuple: (sucesso, lista_de_ids_ou_erro)
+        """
+        try:
+            if any(not download_data.get('url') for download_data in downloads):
+                return False, "URL é obrigatória"
+            
+            self.flush_pending_writes()
+            ids = self.db_manager.add_downloads_bulk(
+                [self._prepare_download_data(download_data) for download_data in downloads]
+            )
+            if ids:
+                self._last_download_id = ids[-1]
+            
+            if self.log_manager:
+                self.log_manager.log_info(f"{len(ids)} download(s) adicionado(s) ao histórico em lote")
+            
+            return True, ids
+            
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Histórico")
+            return False, f"Erro ao adicionar downloads ao histórico: {str(e)}"
+    
+    @property
+    def write_buffer(self):
+        """Fila de gravação em lote do histórico (inserções e velocidades)"""
+        if self._write_buffer is None:
+            self._write_buffer = HistoryWriteBuffer(self.db_manager, self.log_manager)
+        return self._write_buffer
+    
+    def queue_download_to_history(self, download_data):
+        """
+        Agenda a inclusão de um download no histórico, gravada em lote
+        
+        Usado durante playlists, em que cada vídeo concluído geraria uma
+        transação própria.
+        
+        Args:
+            download_data (dict): Dados do download
+            
+        Returns:
+            tuple: (sucesso, Future_com_o_id_ou_erro)
+        """
+        try:
+            if not download_data.get('url'):
+                return False, "URL é obrigatória"
+            
+            future = self.write_buffer.add_download(self._prepare_download_data(download_data))
+            future.add_done_callback(self._remember_last_id)
+            return True, future
+            
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Histórico")
+            return False, f"Erro ao agendar download no histórico: {str(e)}"
+    
+    def _remember_last_id(self, future):
+        if future.exception() is None:
+            self._last_download_id = future.result()
+    
+    def flush_pending_writes(self, timeout=None):
+        """Grava imediatamente as inclusões agendadas com queue_download_to_history"""
+        if self._write_buffer is not None:
+            self._write_buffer.flush(timeout)
+    
+    def close(self):
+        """Grava o que estiver pendente e encerra a fila de gravação"""
+        if self._write_buffer is not None:
+            self._write_buffer.close()
+            self._write_buffer = None
+    
+    @property
+    def data_version(self):
+        """Muda a cada gravação no histórico (inclusive as feitas pela fila em lote)"""
+        return self.db_manager.data_version
+    
     def get_last_download_id(self):
         """
         Obtém o ID do último download adicionado ao histórico
@@ -231,12 +323,13 @@ class HistoryManager:
                 'pagination': self.DEFAULT_PAGINATION.copy()
             })
     
-    def get_total_downloads_count(self, filters=None):
+    def get_total_downloads_count(self, filters=None, search_url=False):
         """
         Obtém contagem total de downloads com filtros opcionais
         
         Args:
             filters (dict): Filtros opcionais
+            search_url (bool): Se True, a busca também procura na URL (como na exportação)
             
         Returns:
             int: Número total de downloads
@@ -244,12 +337,32 @@ class HistoryManager:
         try:
             # Processar filtros e converter período em datas
             processed_filters = self._process_filters(filters) if filters else None
-            return self.db_manager.get_total_downloads_count(processed_filters)
+            return self.db_manager.get_total_downloads_count(processed_filters, search_url)
         except Exception as e:
             if self.log_manager:
                 self.log_manager.log_error(e, "Erro ao obter contagem de downloads")
             return 0
     
+    def get_downloads_window(self, filters=None, limit=200, after=None, offset=0):
+        """
+        Obtém um bloco de downloads já formatados para a lista virtualizada
+        
+        Args:
+            filters (dict): Filtros opcionais (search_query, resolution, status, period)
+            limit (int): Quantidade de linhas do bloco
+            after (tuple): (timestamp, id) da última linha já carregada
+            offset (int): Deslocamento usado quando não há `after` (saltos)
+            
+        Returns:
+            list: Downloads formatados para exibição
+        """
+        try:
+            processed_filters = self._process_filters(filters) if filters else None
+            downloads = self.db_manager.get_downloads_window(processed_filters, limit, after, offset)
+            return [self._format_download_for_display(download) for download in downloads]
+        except Exception as e:
+            return self._handle_exception(e, "obter bloco do histórico", [])
+    
     def search_downloads(self, search_query, page=1, per_page=50):
         """
         Busca downloads por termo de pesquisa
@@ -295,6 +408,24 @@ class HistoryManager:
                 self.log_manager.log_error(e, "Erro ao obter downloads filtrados para exportação")
             return []
     
+    def iter_downloads_filtered(self, filters=None, chunk_size=1000):
+        """
+        Percorre os downloads filtrados em blocos para exportação
+        
+        Diferente de get_all_downloads_filtered, não monta a lista completa:
+        cada bloco lido do cursor vira uma lista de DownloadRecord.
+        
+        Args:
+            filters (dict): Filtros a serem aplicados
+            chunk_size (int): Linhas por bloco
+            
+        Yields:
+            list: Blocos de DownloadRecord
+        """
+        processed_filters = self._process_filters(filters) if filters else None
+        for chunk in self.db_manager.iter_downloads_filtered(processed_filters, chunk_size):
+            yield [DownloadRecord.from_row(row) for row in chunk]
+    
     def _process_filters(self, filters):
         """
         Processa filtros e converte período em datas específicas
@@ -372,31 +503,13 @@ class HistoryManager:
         return None
     
     def _format_download_for_display(self, download):
-        """Formata dados do download para exibição na interface"""
-        formatted = download.copy()
-        
-        # Formatar duração
-        if 'duration' in formatted:
-            formatted['duration_formatted'] = AppUtils.format_duration(formatted['duration'])
-        
-        # Formatar visualizações
-        if 'view_count' in formatted:
-            formatted['view_count_formatted'] = AppUtils.format_view_count(formatted['view_count'])
-        
-        # Formatar data
-        if 'timestamp' in formatted:
-            try:
-                # Assumindo que timestamp está em formato ISO
-                dt = datetime.fromisoformat(formatted['timestamp'].replace('Z', '+00:00'))
-                formatted['date_formatted'] = dt.strftime('%d/%m/%Y %H:%M')
-            except:
-                formatted['date_formatted'] = formatted.get('timestamp', 'N/A')
-        
-        # Truncar título se muito longo
-        if 'title' in formatted:
-            formatted['title_short'] = AppUtils.truncate_text(formatted['title'], 50)
+        """
+        Converte uma linha do banco em DownloadRecord para exibição
         
-        return formatted
+        Os campos formatados (title_short, date_formatted, duration_formatted,
+        view_count_formatted) são calculados quando lidos pela interface.
+        """
+        return DownloadRecord.from_row(download)
     
     def clear_history(self):
         """
@@ -589,7 +702,11 @@ class HistoryManager:
             dict: Estatísticas do histórico
         """
         try:
-            downloads = self.get_recent_downloads(limit=1000)  # Pegar mais para estatísticas
+            # Só os campos usados nas estatísticas
+            downloads = [
+                DownloadRecord.from_row(row)
+                for row in self.db_manager.select_downloads(('resolution', 'file_path'), limit=1000)
+            ]
             
             total_downloads = len(downloads)
             total_size_mb = 0
@@ -597,12 +714,12 @@ class HistoryManager:
             
             for download in downloads:
                 # Contar tamanho total (se disponível)
-                file_path = download.get('download_path', '')
+                file_path = download.file_path
                 if file_path and os.path.exists(file_path):
                     total_size_mb += AppUtils.get_file_size_mb(file_path)
                 
                 # Contar resoluções
-                resolution = download.get('resolution', 'N/A')
+                resolution = download.resolution or 'N/A'
                 resolutions[resolution] = resolutions.get(resolution, 0) + 1
             
             return {
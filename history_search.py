@@ -0,0 +1,187 @@
+import time
+import threading
+from collections import OrderedDict, deque
+
+# Resultados com até esta quantidade de linhas ficam inteiros em memória e
+# servem de base para buscas mais restritas (o usuário continuando a digitar)
+SEARCH_MATERIALIZE_LIMIT = 5000
+
+# Buscas anteriores mantidas para reaproveitamento
+SEARCH_CACHE_ENTRIES = 8
+
+# Latências guardadas para as estatísticas
+SEARCH_LATENCY_SAMPLES = 200
+
+# LIKE do SQLite ignora maiúsculas/minúsculas apenas em ASCII; a filtragem em
+# memória precisa se comportar igual para devolver exatamente as mesmas linhas
+_ASCII_LOWER = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def like_contains(text, query):
+    """Equivalente em Python de `text LIKE '%query%'` no SQLite"""
+    if not query:
+        return True
+    if text is None:
+        return False
+    return query.translate(_ASCII_LOWER) in str(text).translate(_ASCII_LOWER)
+
+
+class SearchResult:
+    """Resultado de uma busca no histórico"""
+
+    def __init__(self, query, filters, total, rows=None, page_rows=None, latency_ms=0.0, source='banco'):
+        self.query = query
+        self.filters = filters
+        self.total = total
+        # Todas as linhas do resultado (None se o resultado for grande demais)
+        self.rows = rows
+        # Linhas da página pedida (modo paginado)
+        self.page_rows = page_rows
+        self.latency_ms = latency_ms
+        # 'cache' quando reaproveitou uma busca anterior, 'banco' caso contrário
+        self.source = source
+
+
+class HistorySearch:
+    """
+    Busca do histórico usada pela busca conforme o usuário digita.
+
+    Resultados pequenos (até SEARCH_MATERIALIZE_LIMIT linhas) ficam em memória.
+    Quando a nova consulta contém a anterior (ex.: "gat" -> "gato") com os
+    mesmos filtros, o resultado é obtido filtrando essas linhas, sem ir ao
+    banco. Qualquer gravação no histórico (data_version) descarta os
+    resultados guardados. A latência de cada busca é registrada para
+    acompanhamento.
+    """
+
+    def __init__(self, history_manager, log_manager=None, materialize_limit=SEARCH_MATERIALIZE_LIMIT):
+        """
+        Args:
+            history_manager: Instância do HistoryManager
+            log_manager: Instância do LogManager (opcional)
+            materialize_limit (int): Máximo de linhas mantidas em memória por busca
+        """
+        self.history_manager = history_manager
+        self.log_manager = log_manager
+        self.materialize_limit = materialize_limit
+        self._cache = OrderedDict()
+        self._data_version = None
+        self._latencies = deque(maxlen=SEARCH_LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def search(self, filters=None, page=1, per_page=None, check=None):
+        """
+        Executa uma busca
+
+        Args:
+            filters (dict): Filtros do histórico (search_query, resolution, status, period)
+            page (int): Página pedida (modo paginado)
+            per_page (int): Itens por página; None no modo de rolagem contínua
+            check: Função que levanta exceção se a busca ficou obsoleta
+
+        Returns:
+            SearchResult: Resultado com total, linhas e latência
+        """
+        inicio = time.perf_counter()
+        filters = dict(filters or {})
+        query = filters.pop('search_query', '') or ''
+        base_key = tuple(sorted(filters.items()))
+        consulta = dict(filters, search_query=query) if query else (filters or None)
+
+        self._check_data_version()
+        rows = self._from_cache(base_key, query)
+        source = 'cache' if rows is not None else 'banco'
+        page_rows = None
+
+        if rows is None:
+            if per_page:
+                resultado = self.history_manager.get_downloads_paginated(page, per_page, consulta)
+                total = resultado['pagination'].get('total_count', 0)
+                page_rows = resultado['downloads']
+                if total <= per_page and page == 1:
+                    rows = page_rows
+            else:
+                total = self.history_manager.get_total_downloads_count(consulta)
+
+            if rows is None and total <= self.materialize_limit:
+                if check:
+                    check()
+                rows = self.history_manager.get_downloads_window(consulta, limit=max(total, 1))
+        else:
+            total = len(rows)
+
+        if rows is not None:
+            self._store(base_key, query, rows)
+            total = len(rows)
+            if per_page and page_rows is None:
+                inicio_pagina = (page - 1) * per_page
+                page_rows = rows[inicio_pagina:inicio_pagina + per_page]
+
+        latencia = (time.perf_counter() - inicio) * 1000
+        with self._lock:
+            self._latencies.append(latencia)
+        if self.log_manager:
+            self.log_manager.log_event(
+                'busca_historico', consulta=query, fonte=source,
+                resultados=total, latencia_ms=f"{latencia:.1f}"
+            )
+
+        return SearchResult(query, consulta, total, rows, page_rows, latencia, source)
+
+    def invalidate(self):
+        """Descarta os resultados guardados (o histórico mudou)"""
+        with self._lock:
+            self._cache.clear()
+
+    def _check_data_version(self):
+        """Descarta os resultados guardados se o histórico foi gravado desde a última busca"""
+        versao = getattr(self.history_manager, 'data_version', None)
+        with self._lock:
+            if versao != self._data_version:
+                self._cache.clear()
+                self._data_version = versao
+
+    def get_latency_stats(self):
+        """
+        Estatísticas das latências de busca recentes
+
+        Returns:
+            dict: count, avg_ms, p95_ms e max_ms
+        """
+        with self._lock:
+            amostras = sorted(self._latencies)
+        if not amostras:
+            return {'count': 0, 'avg_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        return {
+            'count': len(amostras),
+            'avg_ms': sum(amostras) / len(amostras),
+            'p95_ms': amostras[min(len(amostras) - 1, int(len(amostras) * 0.95))],
+            'max_ms': amostras[-1]
+        }
+
+    def _from_cache(self, base_key, query):
+        """Linhas da busca a partir de uma busca anterior menos restritiva, se houver"""
+        with self._lock:
+            exato = self._cache.get((base_key, query))
+            if exato is not None:
+                self._cache.move_to_end((base_key, query))
+                return exato
+
+            melhor = None
+            for (chave, anterior), rows in self._cache.items():
+                if chave != base_key or not like_contains(query, anterior):
+                    continue
+                # Preferir a busca anterior mais longa (menos linhas para filtrar)
+                if melhor is None or len(anterior) > len(melhor[0]):
+                    melhor = (anterior, rows)
+
+        if melhor is None:
+            return None
+        return [row for row in melhor[1] if like_contains(row.get('title'), query)]
+
+    def _store(self, base_key, query, rows):
+        with self._lock:
+            self._cache[(base_key, query)] = rows
+            self._cache.move_to_end((base_key, query))
+            while len(self._cache) > SEARCH_CACHE_ENTRIES:
+                self._cache.popitem(last=False)
@@ -0,0 +1,168 @@
+import time
+import queue
+import sqlite3
+import threading
+from concurrent.futures import Future
+
+# Tempo máximo que uma gravação espera na fila antes de ir para o banco (s)
+WRITE_FLUSH_INTERVAL = 0.5
+
+# Gravações agrupadas em uma mesma transação, no máximo
+WRITE_MAX_BATCH = 200
+
+# Novas tentativas de um lote quando o banco está ocupado (ex.: manutenção em
+# andamento), com espera dobrando a cada tentativa a partir de WRITE_RETRY_DELAY (s)
+WRITE_RETRY_ATTEMPTS = 5
+WRITE_RETRY_DELAY = 0.2
+
+
+class HistoryWriteBuffer:
+    """
+    Fila de gravações do histórico com escrita em segundo plano.
+
+    Inserções de downloads e atualizações de velocidade são acumuladas e
+    gravadas juntas em uma única transação (um commit, um fsync) por uma
+    thread dedicada. Uma gravação nunca espera mais que `flush_interval`
+    segundos na fila, nem a fila passa de `max_batch` itens sem ser gravada.
+
+    `add_download` devolve um Future com o ID do download, resolvido quando
+    o lote que o contém é gravado. Se o banco estiver bloqueado
+    (sqlite3.OperationalError), o lote é tentado de novo antes de falhar.
+    """
+
+    def __init__(self, db_manager, log_manager=None, flush_interval=WRITE_FLUSH_INTERVAL, max_batch=WRITE_MAX_BATCH,
+                 retry_attempts=WRITE_RETRY_ATTEMPTS, retry_delay=WRITE_RETRY_DELAY):
+        """
+        Args:
+            db_manager: Instância do DatabaseManager
+            log_manager: Instância do LogManager (opcional)
+            flush_interval (float): Espera máxima de uma gravação na fila (s)
+            max_batch (int): Gravações por transação, no máximo
+            retry_attempts (int): Novas tentativas de um lote com o banco bloqueado
+            retry_delay (float): Espera antes da primeira nova tentativa (s)
+        """
+        self.db_manager = db_manager
+        self.log_manager = log_manager
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue()
+        self._closed = False
+        # Protege _closed e a fila: nada pode entrar na fila depois do sinal de encerramento
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="HistoryWriter", daemon=True)
+        self._thread.start()
+
+    def add_download(self, download_data):
+        """
+        Agenda a inserção de um download
+
+        Args:
+            download_data (dict): Dados no formato de DatabaseManager.add_download
+
+        Returns:
+            Future: Resolvido com o ID do download após a gravação
+        """
+        future = Future()
+        self._put(('download', download_data, future))
+        return future
+
+    def update_speed(self, download_id, avg_speed, peak_speed, duration):
+        """Agenda a gravação das estatísticas de velocidade de um download"""
+        self._put(('velocidade', (download_id, avg_speed, peak_speed, duration), None))
+
+    def flush(self, timeout=None):
+        """
+        Grava imediatamente o que estiver na fila
+
+        Returns:
+            bool: True se a fila foi gravada dentro do tempo limite
+        """
+        gravado = threading.Event()
+        with self._lock:
+            if self._closed:
+                return True
+            self._queue.put(('flush', gravado, None))
+        return gravado.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Grava o que estiver pendente e encerra a thread"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(('fechar', None, None))
+        self._thread.join(timeout)
+
+    def _put(self, item):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Fila de gravação do histórico já foi encerrada")
+            self._queue.put(item)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            lote = [item]
+            prazo = time.monotonic() + self.flush_interval
+
+            # Acumular até o prazo do primeiro item, o tamanho máximo ou um pedido de gravação
+            while lote[-1][0] in ('download', 'velocidade') and len(lote) < self.max_batch:
+                restante = prazo - time.monotonic()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self._queue.get(timeout=restante))
+                except queue.Empty:
+                    break
+
+            self._write(lote)
+
+            for tipo, valor, _ in lote:
+                if tipo == 'flush':
+                    valor.set()
+            if lote[-1][0] == 'fechar':
+                return
+
+    def _write(self, lote):
+        downloads = [(valor, future) for tipo, valor, future in lote if tipo == 'download']
+        velocidades = [valor for tipo, valor, _ in lote if tipo == 'velocidade']
+        if not downloads and not velocidades:
+            return
+
+        inicio = time.perf_counter()
+        try:
+            ids = self._write_with_retry([dados for dados, _ in downloads], velocidades)
+        except Exception as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro ao gravar lote do histórico")
+            for _, future in downloads:
+                future.set_exception(e)
+            return
+
+        for (_, future), download_id in zip(downloads, ids):
+            future.set_result(download_id)
+
+        if self.log_manager:
+            self.log_manager.log_event(
+                'gravacao_historico', downloads=len(downloads), velocidades=len(velocidades),
+                ms=f"{(time.perf_counter() - inicio) * 1000:.1f}"
+            )
+
+    def _write_with_retry(self, downloads, velocidades):
+        """Grava o lote, tentando de novo com espera crescente enquanto o banco estiver bloqueado"""
+        espera = self.retry_delay
+        for tentativa in range(self.retry_attempts + 1):
+            try:
+                return self.db_manager.add_downloads_bulk(downloads, velocidades)
+            except sqlite3.OperationalError as e:
+                if tentativa == self.retry_attempts:
+                    raise
+                if self.log_manager:
+                    self.log_manager.log_event(
+                        'gravacao_historico_repetida', tentativa=tentativa + 1,
+                        espera_s=f"{espera:.1f}", erro=e
+                    )
+                time.sleep(espera)
+                espera *= 2
@@ -1,13 +1,105 @@
 import os
+import lzma
 import logging
-import py7zr
+import logging.handlers
+import threading
+import time
+from collections import deque
 from datetime import datetime, timedelta
 import glob
 
+# Tamanho dos blocos lidos durante a compressão em streaming
+COMPRESSION_CHUNK_SIZE = 1024 * 1024
+
+class SizeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Handler que rotaciona o log por tamanho durante a execução.
+    
+    A rotação apenas renomeia o arquivo atual e reabre um arquivo novo, o que é
+    instantâneo; a compressão do arquivo antigo é delegada ao callback
+    `on_rotated`, executado fora da thread que está registrando o log.
+    """
+    
+    def __init__(self, filename, max_bytes, on_rotated=None, encoding='utf-8'):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=0, encoding=encoding)
+        self.on_rotated = on_rotated
+    
+    def doRollover(self):
+        """Move o log atual para um arquivo pendente e continua em um arquivo novo"""
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        
+        arquivo_pendente = None
+        if os.path.exists(self.baseFilename):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            arquivo_pendente = f"{self.baseFilename}.{timestamp}.pending"
+            os.replace(self.baseFilename, arquivo_pendente)
+        
+        if not self.delay:
+            self.stream = self._open()
+        
+        if arquivo_pendente and self.on_rotated:
+            self.on_rotated(arquivo_pendente)
+
+class LogRecordCounter(logging.Handler):
+    """
+    Handler que apenas conta os registros emitidos, por nível e por segundo.
+    
+    Mantém uma janela deslizante de contagens por segundo para calcular a taxa
+    de registros emitidos pela aplicação sem armazenar os registros em si.
+    """
+    
+    def __init__(self, window_seconds=60):
+        super().__init__(level=logging.NOTSET)
+        self.window_seconds = window_seconds
+        self.reset()
+    
+    def reset(self):
+        """Zera todos os contadores"""
+        with self.lock:
+            self.total = 0
+            self.by_level = {}
+            self._buckets = deque()
+            self._started = time.time()
+    
+    def emit(self, record):
+        segundo = int(record.created)
+        self.total += 1
+        self.by_level[record.levelname] = self.by_level.get(record.levelname, 0) + 1
+        if self._buckets and self._buckets[-1][0] == segundo:
+            self._buckets[-1][1] += 1
+        else:
+            self._buckets.append([segundo, 1])
+        self._descartar_antigos(segundo)
+    
+    def _descartar_antigos(self, agora):
+        limite = agora - self.window_seconds
+        while self._buckets and self._buckets[0][0] <= limite:
+            self._buckets.popleft()
+    
+    def snapshot(self):
+        """Retorna um dicionário com os contadores atuais"""
+        self.acquire()
+        try:
+            agora = time.time()
+            self._descartar_antigos(int(agora))
+            na_janela = sum(contagem for _, contagem in self._buckets)
+            janela = max(1.0, min(self.window_seconds, agora - self._started))
+            return {
+                'total': self.total,
+                'by_level': dict(self.by_level),
+                'records_in_window': na_janela,
+                'window_seconds': self.window_seconds,
+                'records_per_second': round(na_janela / janela, 2)
+            }
+        finally:
+            self.release()
+
 class LogManager:
     """Gerenciador centralizado do sistema de logging com rotação automática"""
     
-    def __init__(self, log_dir="logs", log_file="youtube_downloader.log", max_size_mb=250):
+    def __init__(self, log_dir="logs", log_file="youtube_downloader.log", max_size_mb=250, level=logging.INFO):
         """
         Inicializa o gerenciador de logs
         
@@ -15,11 +107,22 @@ class LogManager:
             log_dir (str): Diretório dos logs
             log_file (str): Nome do arquivo de log
             max_size_mb (int): Tamanho máximo do log em MB antes da rotação
+            level (int): Nível mínimo dos registros (DEBUG habilita o detalhe por formato)
         """
         self.log_dir = log_dir
         self.log_file = log_file
         self.max_size_mb = max_size_mb
         self.log_path = os.path.join(log_dir, log_file)
+        self.level = level
+        self.file_handler = None
+        
+        # Threads de compressão em andamento e arquivos .pending que elas estão comprimindo
+        self._compression_threads = []
+        self._compressing = set()
+        self._compression_lock = threading.Lock()
+        
+        # Contador de registros emitidos (registros/segundo, por nível)
+        self.record_counter = LogRecordCounter()
         
         # Garantir que a pasta logs existe
         self._ensure_log_directory()
@@ -27,7 +130,10 @@ class LogManager:
         # Configurar logging
         self._setup_logging()
         
-        # Verificar se precisa rotacionar
+        # Nenhuma compressão deste processo começou ainda: temporários são de execuções interrompidas
+        self._remover_temporarios_orfaos()
+        
+        # Verificar se precisa rotacionar (não bloqueia: a compressão roda em segundo plano)
         if self.verificar_tamanho_log():
             self.comprimir_e_rotacionar_log()
     
@@ -37,19 +143,96 @@ class LogManager:
             os.makedirs(self.log_dir)
     
     def _setup_logging(self):
-        """Configura o sistema de logging"""
-        logging.basicConfig(
-            filename=self.log_path,
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            encoding='utf-8'
+        """Configura o sistema de logging com rotação por tamanho em tempo de execução"""
+        root_logger = logging.getLogger()
+        
+        # Substituir handler anterior deste gerenciador (se houver)
+        if self.file_handler is not None:
+            root_logger.removeHandler(self.file_handler)
+            self.file_handler.close()
+        
+        self.file_handler = SizeRotatingFileHandler(
+            self.log_path,
+            max_bytes=int(self.max_size_mb * 1024 * 1024),
+            on_rotated=self._comprimir_em_segundo_plano
         )
+        self.file_handler.setFormatter(
+            logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        )
+        
+        root_logger.addHandler(self.file_handler)
+        if self.record_counter not in root_logger.handlers:
+            root_logger.addHandler(self.record_counter)
+        root_logger.setLevel(self.level)
+    
+    def set_level(self, level):
+        """
+        Define o nível mínimo dos registros (ex.: logging.DEBUG ou "DEBUG")
+        
+        Args:
+            level (int|str): Nível do módulo logging
+        """
+        if isinstance(level, str):
+            level = logging.getLevelName(level.upper())
+            if not isinstance(level, int):
+                level = logging.INFO
+        self.level = level
+        logging.getLogger().setLevel(level)
+    
+    def is_debug_enabled(self):
+        """Indica se registros de DEBUG estão habilitados"""
+        return logging.getLogger().isEnabledFor(logging.DEBUG)
+    
+    def log_debug(self, message):
+        """Log de detalhes verbosos, descartado quando o nível é superior a DEBUG"""
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(message)
     
     def log_info(self, message):
         """Log informações importantes"""
         logging.info(message)
         print(f"[INFO] {message}")
     
+    def log_warning(self, message):
+        """Log avisos"""
+        logging.warning(message)
+        print(f"[AVISO] {message}")
+    
+    def log_event(self, evento, level=logging.INFO, **campos):
+        """
+        Registra um evento estruturado no formato `evento chave=valor ...`
+        
+        Args:
+            evento (str): Nome do evento
+            level (int): Nível do registro
+            **campos: Pares chave/valor anexados ao evento
+        """
+        if not logging.getLogger().isEnabledFor(level):
+            return
+        partes = [f"evento={evento}"]
+        for chave, valor in campos.items():
+            valor = str(valor)
+            if not valor or any(c.isspace() for c in valor) or '"' in valor:
+                valor = '"' + valor.replace('"', '\\"') + '"'
+            partes.append(f"{chave}={valor}")
+        mensagem = " ".join(partes)
+        logging.log(level, mensagem)
+        if level >= logging.INFO:
+            print(f"[{logging.getLevelName(level)}] {mensagem}")
+    
+    def get_record_counters(self):
+        """
+        Retorna os contadores de registros emitidos pela aplicação
+        
+        Returns:
+            dict: total, por nível e taxa de registros por segundo na janela recente
+        """
+        return self.record_counter.snapshot()
+    
+    def reset_record_counters(self):
+        """Zera os contadores de registros"""
+        self.record_counter.reset()
+    
     def log_error(self, error, context=""):
         """Log erros com contexto"""
         error_msg = f"{context}: {str(error)}" if context else str(error)
@@ -81,54 +264,159 @@ class LogManager:
         return False
     
     def comprimir_e_rotacionar_log(self):
-        """Comprime o log atual em 7z e cria um novo arquivo de log"""
+        """
+        Rotaciona o log atual e agenda sua compressão em segundo plano
+        
+        O logging continua imediatamente em um arquivo novo; a compressão
+        do arquivo antigo (LZMA em streaming, formato .xz) não bloqueia a
+        inicialização nem os downloads.
+        
+        Returns:
+            bool: True se a rotação foi iniciada
+        """
         try:
             if not os.path.exists(self.log_path):
                 return False
             
-            # Gerar nome do arquivo comprimido com timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            arquivo_7z = os.path.join(self.log_dir, f"log_backup_{timestamp}.7z")
+            self.file_handler.acquire()
+            try:
+                self.file_handler.doRollover()
+            finally:
+                self.file_handler.release()
             
-            # Comprimir o arquivo de log
-            with py7zr.SevenZipFile(arquivo_7z, 'w') as archive:
-                archive.write(self.log_path, os.path.basename(self.log_path))
-            
-            # Verificar se a compressão foi bem-sucedida
-            if os.path.exists(arquivo_7z):
-                tamanho_original = os.path.getsize(self.log_path) / (1024 * 1024)
-                tamanho_comprimido = os.path.getsize(arquivo_7z) / (1024 * 1024)
-                taxa_compressao = ((tamanho_original - tamanho_comprimido) / tamanho_original) * 100
-                
-                # Remover o arquivo de log original
-                os.remove(self.log_path)
-                
-                # Reconfigurar o logging para criar um novo arquivo
-                for handler in logging.root.handlers[:]:
-                    logging.root.removeHandler(handler)
-                
-                self._setup_logging()
-                
-                # Log da rotação no novo arquivo
-                self.log_info(f"Rotação de log realizada: {arquivo_7z}")
-                self.log_info(f"Tamanho original: {tamanho_original:.2f}MB")
-                self.log_info(f"Tamanho comprimido: {tamanho_comprimido:.2f}MB")
-                self.log_info(f"Taxa de compressão: {taxa_compressao:.1f}%")
-                
-                return True
-            else:
-                self.log_error("Falha na compressão do arquivo de log", "Rotação de log")
-                return False
+            return True
                 
         except Exception as e:
             self.log_error(e, "Erro durante rotação de log")
             return False
     
+    def comprimir_logs_pendentes(self):
+        """
+        Agenda a compressão de logs rotacionados que ficaram pendentes (ex: app encerrado durante compressão)
+        
+        Arquivos que já estão sendo comprimidos (ex.: a rotação feita ao criar o
+        LogManager) são ignorados.
+        
+        Returns:
+            int: Quantidade de compressões agendadas
+        """
+        agendados = 0
+        for arquivo in glob.glob(f"{self.log_path}.*.pending"):
+            if self._comprimir_em_segundo_plano(arquivo):
+                agendados += 1
+        return agendados
+    
+    def _remover_temporarios_orfaos(self):
+        """Remove .xz.tmp deixados por compressões interrompidas (o .pending de origem é mantido)"""
+        for arquivo in glob.glob(os.path.join(self.log_dir, "log_backup_*.xz.tmp")):
+            try:
+                os.remove(arquivo)
+            except OSError as e:
+                self.log_error(e, f"Erro ao remover temporário de compressão {arquivo}")
+    
+    def aguardar_compressoes(self, timeout=None):
+        """
+        Aguarda as compressões em andamento terminarem
+        
+        Args:
+            timeout (float): Tempo máximo de espera por compressão em segundos
+        """
+        with self._compression_lock:
+            threads = list(self._compression_threads)
+        
+        for thread in threads:
+            thread.join(timeout)
+    
+    def _comprimir_em_segundo_plano(self, arquivo_pendente):
+        """
+        Inicia a compressão de um arquivo de log rotacionado em uma thread separada
+        
+        Returns:
+            bool: False se o arquivo já está sendo comprimido ou não existe mais
+        """
+        arquivo_pendente = os.path.abspath(arquivo_pendente)
+        thread = threading.Thread(
+            target=self._compress_worker,
+            args=(arquivo_pendente,),
+            name="LogCompression",
+            daemon=True
+        )
+        
+        with self._compression_lock:
+            # O worker remove o .pending antes de sair do conjunto: ausente e fora do conjunto = já comprimido
+            if arquivo_pendente in self._compressing or not os.path.exists(arquivo_pendente):
+                return False
+            self._compressing.add(arquivo_pendente)
+            self._compression_threads = [t for t in self._compression_threads if t.is_alive()]
+            self._compression_threads.append(thread)
+        
+        thread.start()
+        return True
+    
+    def _reservar_arquivo_backup(self):
+        """Escolhe um nome de backup livre e cria seu .tmp (exclusivo); retorna (arquivo_xz, tmp_aberto)"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        sufixo = 0
+        while True:
+            nome = f"log_backup_{timestamp}.xz" if sufixo == 0 else f"log_backup_{timestamp}_{sufixo}.xz"
+            arquivo_xz = os.path.join(self.log_dir, nome)
+            sufixo += 1
+            # Evitar sobrescrever backups gerados no mesmo segundo
+            if os.path.exists(arquivo_xz):
+                continue
+            try:
+                return arquivo_xz, open(f"{arquivo_xz}.tmp", 'xb')
+            except FileExistsError:
+                continue
+    
+    def _compress_worker(self, arquivo_pendente):
+        """Worker que comprime o log rotacionado em blocos e remove o arquivo original"""
+        arquivo_temporario = None
+        try:
+            arquivo_xz, temporario = self._reservar_arquivo_backup()
+            arquivo_temporario = temporario.name
+            with temporario, open(arquivo_pendente, 'rb') as origem, lzma.open(temporario, 'wb', preset=6) as destino:
+                while True:
+                    bloco = origem.read(COMPRESSION_CHUNK_SIZE)
+                    if not bloco:
+                        break
+                    destino.write(bloco)
+            
+            os.replace(arquivo_temporario, arquivo_xz)
+            
+            tamanho_original = os.path.getsize(arquivo_pendente) / (1024 * 1024)
+            tamanho_comprimido = os.path.getsize(arquivo_xz) / (1024 * 1024)
+            taxa_compressao = 0
+            if tamanho_original > 0:
+                taxa_compressao = ((tamanho_original - tamanho_comprimido) / tamanho_original) * 100
+            
+            # Remover o arquivo de log original
+            os.remove(arquivo_pendente)
+            
+            # Log da rotação no novo arquivo
+            self.log_info(f"Rotação de log realizada: {arquivo_xz}")
+            self.log_info(f"Tamanho original: {tamanho_original:.2f}MB")
+            self.log_info(f"Tamanho comprimido: {tamanho_comprimido:.2f}MB")
+            self.log_info(f"Taxa de compressão: {taxa_compressao:.1f}%")
+            
+        except Exception as e:
+            self.log_error(e, f"Erro ao comprimir log rotacionado {arquivo_pendente}")
+            if arquivo_temporario and os.path.exists(arquivo_temporario):
+                os.remove(arquivo_temporario)
+        finally:
+            with self._compression_lock:
+                self._compressing.discard(arquivo_pendente)
+    
+    def _listar_backups(self):
+        """Lista backups comprimidos (formato atual .xz e legado .7z)"""
+        return (glob.glob(os.path.join(self.log_dir, "log_backup_*.xz")) +
+                glob.glob(os.path.join(self.log_dir, "log_backup_*.7z")))
+    
     def limpar_logs_antigos(self, dias_manter=30):
         """Remove arquivos de log comprimidos mais antigos que X dias"""
         try:
             # Buscar todos os arquivos de backup de log
-            arquivos_backup = glob.glob(os.path.join(self.log_dir, "log_backup_*.7z"))
+            arquivos_backup = self._listar_backups()
             data_limite = datetime.now() - timedelta(days=dias_manter)
             
             removidos = 0
@@ -136,8 +424,8 @@ class LogManager:
                 try:
                     # Extrair timestamp do nome do arquivo
                     nome_arquivo = os.path.basename(arquivo)
-                    timestamp_str = nome_arquivo.replace("log_backup_", "").replace(".7z", "")
-                    data_arquivo = datetime.strptime(timestamp_str, "%Y%m%d_%H%M%S")
+                    timestamp_str = os.path.splitext(nome_arquivo)[0].replace("log_backup_", "")
+                    data_arquivo = datetime.strptime(timestamp_str[:15], "%Y%m%d_%H%M%S")
                     
                     if data_arquivo < data_limite:
                         os.remove(arquivo)
@@ -165,7 +453,7 @@ class LogManager:
             stats['tamanho_atual_mb'] = os.path.getsize(self.log_path) / (1024 * 1024)
         
         # Contar backups
-        arquivos_backup = glob.glob(os.path.join(self.log_dir, "log_backup_*.7z"))
+        arquivos_backup = self._listar_backups()
         stats['backups_count'] = len(arquivos_backup)
         
         for arquivo in arquivos_backup:
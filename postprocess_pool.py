@@ -0,0 +1,192 @@
+import os
+import ctypes
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from format_policy import (
+    POSTPROCESS_NONE, POSTPROCESS_MERGE, POSTPROCESS_REMUX,
+    POSTPROCESS_TRANSCODE, POSTPROCESS_EXTRACT_AUDIO
+)
+
+# Nome de cada modo como aparece nos eventos de pós-processamento (mesmos nomes do yt-dlp,
+# para que a interface continue reconhecendo as etapas)
+POSTPROCESSOR_NAMES = {
+    POSTPROCESS_MERGE: 'FFmpegMerger',
+    POSTPROCESS_REMUX: 'FFmpegVideoRemuxer',
+    POSTPROCESS_TRANSCODE: 'FFmpegVideoConvertor',
+    POSTPROCESS_EXTRACT_AUDIO: 'FFmpegExtractAudio',
+    POSTPROCESS_NONE: 'MoveFiles',
+}
+
+# Sem janela de console para cada ffmpeg no Windows
+SUBPROCESS_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def _windows_process_cpu_seconds(processo):
+    """CPU (usuário + sistema) de um processo encerrado, lido do handle mantido pelo Popen no Windows"""
+    handle = getattr(processo, '_handle', None)
+    if handle is None:
+        return None
+    from ctypes import wintypes
+    criacao, saida, sistema, usuario = (wintypes.FILETIME() for _ in range(4))
+    ok = ctypes.windll.kernel32.GetProcessTimes(
+        wintypes.HANDLE(int(handle)), ctypes.byref(criacao), ctypes.byref(saida),
+        ctypes.byref(sistema), ctypes.byref(usuario)
+    )
+    if not ok:
+        return None
+    # FILETIME em unidades de 100 ns
+    return sum((t.dwHighDateTime << 32 | t.dwLowDateTime) for t in (sistema, usuario)) / 1e7
+
+
+class PostprocessPool:
+    """
+    Estágio de pós-processamento (ffmpeg) separado do estágio de rede.
+
+    O estágio de rede baixa os streams sem pós-processar e entrega os arquivos
+    a este pool, que executa os processos ffmpeg em paralelo (no máximo um por
+    núcleo). A fila é limitada: se o CPU ficar para trás, `submit` bloqueia o
+    download seguinte em vez de acumular arquivos brutos no disco.
+    """
+
+    def __init__(self, log_manager, ffmpeg_path, hook=None, max_workers=None, max_pending=None):
+        """
+        Args:
+            log_manager: Instância do LogManager
+            ffmpeg_path (str): Caminho do executável do ffmpeg
+            hook: Função chamada com eventos no formato dos postprocessor_hooks do yt-dlp
+            max_workers (int): Processos ffmpeg simultâneos (padrão: núcleos de CPU)
+            max_pending (int): Trabalhos aceitos antes de bloquear o estágio de rede
+        """
+        self.log_manager = log_manager
+        self.ffmpeg_path = ffmpeg_path
+        self.hook = hook
+        self.max_workers = max_workers or os.cpu_count() or 2
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="PosProcessamento"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending or self.max_workers * 2)
+
+    def submit(self, inputs, output, mode, info_dict=None, audio_quality='192', download_seconds=0.0):
+        """
+        Enfileira o pós-processamento de um vídeo
+
+        Args:
+            inputs (list): Arquivos baixados (vídeo e/ou áudio)
+            output (str): Arquivo final
+            mode (str): Um dos modos POSTPROCESS_* de format_policy
+            info_dict (dict): Informações do vídeo repassadas nos eventos
+            audio_quality (str): Bitrate (kbps) para extração de áudio
+            download_seconds (float): Tempo gasto no estágio de rede
+
+        Returns:
+            Future: Resolve para o caminho do arquivo final
+        """
+        self._slots.acquire()
+        enfileirado = time.perf_counter()
+        try:
+            future = self._executor.submit(
+                self._run, list(inputs), output, mode, info_dict or {},
+                audio_quality, download_seconds, enfileirado
+            )
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait=True):
+        """Aguarda (opcionalmente) os trabalhos pendentes e encerra o pool"""
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, inputs, output, mode, info_dict, audio_quality, download_seconds, enfileirado):
+        inicio = time.perf_counter()
+        timing = {
+            'download_seconds': download_seconds,
+            'queue_seconds': inicio - enfileirado,
+            'postprocess_seconds': None,
+            'cpu_seconds': None,
+        }
+        nome = POSTPROCESSOR_NAMES.get(mode, mode)
+        self._emit('started', nome, info_dict, timing)
+
+        if mode == POSTPROCESS_NONE and len(inputs) == 1:
+            os.replace(inputs[0], output)
+            cpu = 0.0
+        else:
+            cpu = self._run_ffmpeg(self._build_command(inputs, output, mode, audio_quality))
+            for arquivo in inputs:
+                if os.path.abspath(arquivo) != os.path.abspath(output) and os.path.exists(arquivo):
+                    os.remove(arquivo)
+
+        timing['postprocess_seconds'] = time.perf_counter() - inicio
+        timing['cpu_seconds'] = cpu
+        info_dict = dict(info_dict, filepath=output)
+        self._emit('finished', nome, info_dict, timing)
+        return output
+
+    def _emit(self, status, postprocessor, info_dict, timing):
+        if not self.hook:
+            return
+        try:
+            self.hook({
+                'status': status,
+                'postprocessor': postprocessor,
+                'info_dict': info_dict,
+                'stage': 'postprocess',
+                'stage_timing': dict(timing),
+            })
+        except Exception as e:
+            self.log_manager.log_error(e, "Erro no hook de pós-processamento")
+
+    def _build_command(self, inputs, output, mode, audio_quality):
+        """Monta a linha de comando do ffmpeg para o modo pedido"""
+        cmd = [self.ffmpeg_path, '-y', '-hide_banner', '-loglevel', 'error']
+        for arquivo in inputs:
+            cmd += ['-i', arquivo]
+
+        if mode == POSTPROCESS_EXTRACT_AUDIO:
+            qualidade = audio_quality if audio_quality and audio_quality != 'best' else '192'
+            cmd += ['-vn', '-c:a', 'libmp3lame', '-b:a', f'{qualidade}k']
+        else:
+            if len(inputs) > 1:
+                cmd += ['-map', '0:v:0', '-map', '1:a:0']
+            if mode == POSTPROCESS_TRANSCODE:
+                cmd += ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '20', '-c:a', 'aac', '-b:a', '192k']
+            else:
+                cmd += ['-c', 'copy']
+            cmd += ['-movflags', '+faststart']
+
+        cmd.append(output)
+        return cmd
+
+    @staticmethod
+    def _run_ffmpeg(cmd):
+        """
+        Executa o ffmpeg e retorna o tempo de CPU do processo
+
+        O CPU é medido só para este subprocesso: os.wait4 no Linux/macOS e
+        GetProcessTimes no Windows. Onde nenhum dos dois funciona, retorna
+        None (registrado como N/A).
+        """
+        processo = subprocess.Popen(
+            cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, creationflags=SUBPROCESS_FLAGS
+        )
+        if hasattr(os, 'wait4'):
+            erros = processo.stderr.read()
+            processo.stderr.close()
+            _, status, uso = os.wait4(processo.pid, 0)
+            processo.returncode = os.waitstatus_to_exitcode(status)
+            cpu = uso.ru_utime + uso.ru_stime
+        else:
+            _, erros = processo.communicate()
+            try:
+                cpu = _windows_process_cpu_seconds(processo)
+            except (AttributeError, OSError, ValueError):
+                cpu = None
+
+        if processo.returncode != 0:
+            mensagem = erros.decode('utf-8', errors='replace').strip()
+            raise RuntimeError(f"ffmpeg falhou ({processo.returncode}): {mensagem[-500:]}")
+        return cpu
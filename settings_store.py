@@ -0,0 +1,154 @@
+import threading
+
+# Espera após a última alteração antes de gravar no banco (s); alterações
+# feitas nesse intervalo são agrupadas em uma única transação
+SETTINGS_FLUSH_DELAY = 0.5
+
+
+class SettingsStore:
+    """
+    Configurações mantidas em memória.
+
+    A tabela `settings` é lida inteira uma única vez; leituras vêm do
+    dicionário. Gravações atualizam o dicionário na hora e vão para o banco
+    depois de SETTINGS_FLUSH_DELAY, agrupadas (várias chaves em uma transação)
+    e aglutinadas (só o último valor de cada chave é gravado). Observadores
+    são avisados quando o valor de uma chave muda.
+    """
+
+    def __init__(self, db_manager, log_manager=None, flush_delay=SETTINGS_FLUSH_DELAY):
+        """
+        Args:
+            db_manager: Instância do DatabaseManager
+            log_manager: Instância do LogManager (opcional)
+            flush_delay (float): Espera antes de gravar as alterações (s)
+        """
+        self.db_manager = db_manager
+        self.log_manager = log_manager
+        self.flush_delay = flush_delay
+        self._values = None
+        self._pending = {}
+        self._observers = []
+        self._timer = None
+        self._lock = threading.RLock()
+
+    def load(self):
+        """(Re)carrega todas as configurações do banco"""
+        valores = self.db_manager.get_all_settings()
+        with self._lock:
+            # Alterações ainda não gravadas prevalecem sobre o banco
+            valores.update(self._pending)
+            self._values = valores
+
+    def get(self, key, default=None):
+        """Valor de uma configuração (sem acessar o banco)"""
+        with self._lock:
+            if self._values is None:
+                self.load()
+            return self._values.get(key, default)
+
+    def get_all(self):
+        """Cópia de todas as configurações"""
+        with self._lock:
+            if self._values is None:
+                self.load()
+            return dict(self._values)
+
+    def set(self, key, value):
+        """
+        Altera uma configuração
+
+        Returns:
+            bool: True se o valor mudou (e será gravado)
+        """
+        return bool(self.set_many({key: value}))
+
+    def set_many(self, values):
+        """
+        Altera várias configurações de uma vez
+
+        Returns:
+            list: Chaves cujo valor mudou
+        """
+        alteradas = []
+        with self._lock:
+            if self._values is None:
+                self.load()
+            for key, value in values.items():
+                value = str(value)
+                anterior = self._values.get(key)
+                if anterior == value:
+                    continue
+                self._values[key] = value
+                self._pending[key] = value
+                alteradas.append((key, value, anterior))
+            if alteradas:
+                self._schedule_flush()
+
+        for key, value, anterior in alteradas:
+            self._notify(key, value, anterior)
+        return [key for key, _, _ in alteradas]
+
+    def subscribe(self, callback, key=None):
+        """
+        Registra um observador
+
+        Args:
+            callback: Função callback(key, value, old_value)
+            key (str): Só avisar sobre esta chave (padrão: todas)
+
+        Returns:
+            tuple: Identificador para unsubscribe
+        """
+        registro = (key, callback)
+        with self._lock:
+            self._observers.append(registro)
+        return registro
+
+    def unsubscribe(self, registro):
+        """Remove um observador registrado com subscribe"""
+        with self._lock:
+            if registro in self._observers:
+                self._observers.remove(registro)
+
+    def flush(self):
+        """Grava imediatamente as alterações pendentes"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pendentes, self._pending = self._pending, {}
+        if not pendentes:
+            return True
+        try:
+            self.db_manager.set_settings(pendentes)
+            return True
+        except Exception as e:
+            # Manter para a próxima tentativa, sem sobrescrever alterações mais novas
+            with self._lock:
+                for key, value in pendentes.items():
+                    self._pending.setdefault(key, value)
+            if self.log_manager:
+                self.log_manager.log_error(e, "Erro ao gravar configurações")
+            return False
+
+    def close(self):
+        """Grava o que estiver pendente (chamar ao encerrar a aplicação)"""
+        self.flush()
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            return
+        self._timer = threading.Timer(self.flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _notify(self, key, value, anterior):
+        with self._lock:
+            observadores = [callback for chave, callback in self._observers if chave is None or chave == key]
+        for callback in observadores:
+            try:
+                callback(key, value, anterior)
+            except Exception as e:
+                if self.log_manager:
+                    self.log_manager.log_error(e, f"Erro no observador da configuração '{key}'")
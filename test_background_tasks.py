@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do BackgroundTasks: pedidos mais novos com a mesma chave cancelam ou
+tornam obsoletos os anteriores, e só o resultado mais recente é entregue
+"""
+
+import sys
+import os
+import time
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from background_tasks import BackgroundTasks, TaskCancelled
+
+
+class _LogSilencioso:
+    def __init__(self):
+        self.erros = []
+
+    def log_error(self, error, context=""):
+        self.erros.append(error)
+
+
+class _Widget:
+    """Guarda os callbacks agendados, como o loop do Tk, até o teste executá-los"""
+
+    def __init__(self):
+        self.agendados = []
+        self._lock = threading.Lock()
+
+    def after(self, atraso, funcao):
+        with self._lock:
+            self.agendados.append(funcao)
+
+    def executar(self, quantidade, timeout=5):
+        limite = time.monotonic() + timeout
+        while len(self.agendados) < quantidade:
+            assert time.monotonic() < limite, "entrega da tarefa não chegou"
+            time.sleep(0.01)
+        with self._lock:
+            agendados, self.agendados = self.agendados, []
+        for funcao in agendados:
+            funcao()
+
+
+def test_pedido_mais_novo_substitui_o_anterior():
+    widget = _Widget()
+    tasks = BackgroundTasks(widget, _LogSilencioso())
+    try:
+        iniciou = threading.Event()
+        liberar = threading.Event()
+        abortadas = []
+        entregues = []
+
+        def lenta(check):
+            iniciou.set()
+            liberar.wait(5)
+            try:
+                check()
+            except TaskCancelled:
+                abortadas.append('primeira')
+                raise
+            return 'primeira'
+
+        primeira = tasks.submit('grafico', lenta, entregues.append)
+        assert iniciou.wait(5)
+
+        # Com uma única thread a segunda fica na fila e é cancelada pela terceira
+        segunda = tasks.submit('grafico', lambda check: 'segunda', entregues.append)
+        terceira = tasks.submit('grafico', lambda check: 'terceira', entregues.append)
+        assert segunda.cancelled()
+
+        # A que já estava rodando descobre pelo check() que ficou obsoleta
+        liberar.set()
+        assert terceira.result(timeout=5) == 'terceira'
+        try:
+            primeira.result(timeout=5)
+            assert False, "a primeira tarefa deveria ter sido abortada"
+        except TaskCancelled:
+            pass
+        assert abortadas == ['primeira']
+
+        widget.executar(2)
+        assert entregues == ['terceira']
+    finally:
+        tasks.shutdown()
+
+
+def test_resultado_obsoleto_descartado():
+    widget = _Widget()
+    log = _LogSilencioso()
+    tasks = BackgroundTasks(widget, log, max_workers=2)
+    try:
+        entregues = []
+        erros = []
+
+        # Resultado pronto mas ainda não entregue quando chega um pedido mais novo
+        antiga = tasks.submit('dashboard', lambda check: 'antiga', entregues.append)
+        antiga.result(timeout=5)
+        tasks.submit('dashboard', lambda check: 'nova', entregues.append)
+        widget.executar(2)
+        assert entregues == ['nova']
+
+        # Chaves diferentes não interferem entre si
+        tasks.submit('a', lambda check: 1, entregues.append)
+        tasks.submit('b', lambda check: 2, entregues.append)
+        widget.executar(2)
+        assert sorted(entregues[1:]) == [1, 2]
+
+        # cancel() descarta o pedido em andamento
+        tasks.submit('dashboard', lambda check: 'cancelada', entregues.append).result(timeout=5)
+        tasks.cancel('dashboard')
+        widget.executar(1)
+        assert 'cancelada' not in entregues
+
+        # Erro do pedido mais recente vai para o error_callback e para o log
+        def falha(check):
+            raise ValueError("consulta falhou")
+
+        tasks.submit('dashboard', falha, entregues.append, erros.append)
+        widget.executar(1)
+        assert [str(e) for e in erros] == ["consulta falhou"]
+        assert len(log.erros) == 1
+    finally:
+        tasks.shutdown()
+
+
+if __name__ == "__main__":
+    test_pedido_mais_novo_substitui_o_anterior()
+    test_resultado_obsoleto_descartado()
+    print("OK")
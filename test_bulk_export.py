@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da exportação em massa (JSON Lines comprimido e marcas d'água incrementais)
+"""
+
+import sys
+import os
+import gzip
+import json
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from bulk_export import BulkExporter
+
+
+def _inserir(db_manager, inicio, quantidade):
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.executemany(
+        "INSERT INTO downloads (url, title, status, avg_speed_mbps) VALUES (?, ?, ?, ?)",
+        [(f"https://youtu.be/{i}", f"Vídeo {i}", "completed", i / 10) for i in range(inicio, inicio + quantidade)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _ler_jsonl(caminho):
+    with gzip.open(caminho, 'rt', encoding='utf-8') as f:
+        return [json.loads(linha) for linha in f]
+
+
+def test_export_jsonl_incremental():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+        db_manager.initialize()
+        _inserir(db_manager, 0, 250)
+
+        exporter = BulkExporter(db_manager, chunk_size=100)
+        assert exporter.format_for_path("dados.jsonl.gz") == 'jsonl'
+        assert exporter.format_for_path("dados.parquet") == 'parquet'
+
+        primeiro = os.path.join(pasta, "primeiro.jsonl.gz")
+        progresso = []
+        sucesso, stats = exporter.export(primeiro, since_last='noturno',
+                                         progress=lambda feitas, total: progresso.append((feitas, total)))
+        assert sucesso, stats
+        assert stats['rows'] == 250
+        assert progresso == [(100, 250), (200, 250), (250, 250)]
+
+        linhas = _ler_jsonl(primeiro)
+        assert len(linhas) == 250
+        # Todas as colunas, inclusive as de velocidade
+        assert linhas[0]['title'] == "Vídeo 0"
+        assert linhas[3]['avg_speed_mbps'] == 0.3
+        assert exporter.get_watermark('noturno') == linhas[-1]['id']
+
+        # Só as linhas novas na exportação seguinte
+        _inserir(db_manager, 250, 30)
+        segundo = os.path.join(pasta, "segundo.jsonl.gz")
+        sucesso, stats = exporter.export(segundo, since_last='noturno')
+        assert sucesso, stats
+        linhas_novas = _ler_jsonl(segundo)
+        assert stats['rows'] == len(linhas_novas) == 30
+        assert linhas_novas[0]['title'] == "Vídeo 250"
+
+        # Nada novo: arquivo vazio e marca d'água mantida
+        sucesso, stats = exporter.export(os.path.join(pasta, "vazio.jsonl.gz"), since_last='noturno')
+        assert sucesso and stats['rows'] == 0
+        assert exporter.get_watermark('noturno') == linhas_novas[-1]['id']
+
+        exporter.reset_watermark('noturno')
+        assert exporter.get_watermark('noturno') == 0
+
+
+def test_export_cancelado_mantem_marca():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+        db_manager.initialize()
+        _inserir(db_manager, 0, 50)
+
+        cancelar = threading.Event()
+        cancelar.set()
+
+        destino = os.path.join(pasta, "dados.jsonl")
+        exporter = BulkExporter(db_manager, chunk_size=10)
+        sucesso, mensagem = exporter.export(destino, since_last='noturno', cancel_event=cancelar)
+        assert not sucesso and mensagem == "Exportação cancelada"
+        assert not os.path.exists(destino) and not os.path.exists(destino + ".part")
+        assert exporter.get_watermark('noturno') == 0
+
+
+if __name__ == "__main__":
+    test_export_jsonl_incremental()
+    test_export_cancelado_mantem_marca()
+    print("OK")
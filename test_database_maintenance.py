@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da manutenção do banco (backup online, compactação incremental, conversão
+explícita de bancos antigos e integridade)
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from database_maintenance import DatabaseMaintenance, BACKUP_KEEP
+
+
+def _criar_banco(pasta, linhas=3000, legado=False):
+    caminho = os.path.join(pasta, "historico.db")
+    if legado and not os.path.exists(caminho):
+        # Banco criado antes do auto_vacuum incremental: já tem tabelas ao inicializar
+        conn = sqlite3.connect(caminho)
+        conn.execute("CREATE TABLE legado (id INTEGER)")
+        conn.close()
+    db_manager = DatabaseManager(caminho)
+    db_manager.initialize()
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.executemany(
+        "INSERT INTO downloads (url, title, description) VALUES (?, ?, ?)",
+        [(f"https://youtu.be/{i}", f"Vídeo {i}", "descrição " * 100) for i in range(linhas)]
+    )
+    conn.commit()
+    conn.close()
+    return db_manager
+
+
+def test_backup_online():
+    with tempfile.TemporaryDirectory() as pasta:
+        maintenance = DatabaseMaintenance(_criar_banco(pasta))
+
+        progresso = []
+        sucesso, mensagem = maintenance.backup(progress=lambda feitas, total: progresso.append((feitas, total)))
+        assert sucesso, mensagem
+        assert progresso and progresso[-1][0] == progresso[-1][1]
+
+        backups = maintenance.list_backups()
+        assert len(backups) == 1
+        conn = sqlite3.connect(backups[0])
+        assert conn.execute("SELECT COUNT(*) FROM downloads").fetchone()[0] == 3000
+        conn.close()
+
+        cancelar = threading.Event()
+        cancelar.set()
+        destino = os.path.join(pasta, "cancelado.db")
+        sucesso, mensagem = maintenance.backup(destino, cancel_event=cancelar)
+        assert not sucesso and mensagem == "Backup cancelado"
+        assert not os.path.exists(destino) and not os.path.exists(destino + ".part")
+
+        # Pasta de backups não cresce sem limite
+        for i in range(BACKUP_KEEP + 2):
+            open(os.path.join(maintenance.backup_dir, f"backup_20000101_0000{i:02d}.db"), 'w').close()
+        maintenance._rotate_backups()
+        assert maintenance.list_backups()[0] == backups[0]
+        assert len(maintenance.list_backups()) == BACKUP_KEEP
+
+
+def test_compactacao_e_integridade():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = _criar_banco(pasta)
+        maintenance = DatabaseMaintenance(db_manager)
+
+        # Bancos novos já nascem no modo incremental
+        assert maintenance.is_incremental_vacuum()
+
+        db_manager.clear_history()
+        antes = maintenance.get_stats()
+        assert antes['freelist_count'] > 0
+
+        sucesso, mensagem = maintenance.compact()
+        assert sucesso, mensagem
+        depois = maintenance.get_stats()
+        assert depois['auto_vacuum'] == 'incremental'
+        assert depois['freelist_count'] == 0
+        assert depois['size_bytes'] < antes['size_bytes']
+        assert not maintenance.enable_incremental_vacuum()
+
+        assert maintenance.integrity_check() == (True, "Banco de dados íntegro")
+        assert maintenance.integrity_check(quick=False)[0]
+
+
+def test_conversao_somente_a_pedido():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = _criar_banco(pasta, legado=True)
+        maintenance = DatabaseMaintenance(db_manager, backup_dir=os.path.join(pasta, "backups"))
+        db_manager.clear_history()
+        antes = maintenance.get_stats()
+        assert antes['auto_vacuum'] == 'none' and antes['freelist_count'] > 0
+
+        # A manutenção automática não faz o VACUUM completo da conversão
+        sucesso, mensagem = maintenance.run_maintenance()
+        assert sucesso, mensagem
+        assert "Compactação ignorada" in mensagem
+        assert maintenance.get_stats()['auto_vacuum'] == 'none'
+        assert maintenance.get_stats()['freelist_count'] == antes['freelist_count']
+
+        # Conversão pedida pelo usuário
+        sucesso, mensagem = maintenance.compact(convert=True)
+        assert sucesso, mensagem
+        depois = maintenance.get_stats()
+        assert depois['auto_vacuum'] == 'incremental' and depois['freelist_count'] == 0
+
+        # Já convertido: a compactação seguinte é só incremental
+        _criar_banco(pasta, linhas=500)
+        db_manager.clear_history()
+        assert maintenance.get_stats()['freelist_count'] > 0
+        sucesso, _ = maintenance.compact()
+        assert sucesso and maintenance.get_stats()['freelist_count'] == 0
+
+if __name__ == "__main__":
+    test_backup_online()
+    test_compactacao_e_integridade()
+    test_conversao_somente_a_pedido()
+    print("OK")
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da divisão de descrições longas em trechos e blocos de inserção
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from ui.description_renderer import split_link_segments, plan_chunks
+
+
+def test_split_link_segments():
+    texto = "Veja https://exemplo.com/a e http://b.org/x?y=1\nfim"
+    assert split_link_segments(texto) == [
+        ("Veja ", False),
+        ("https://exemplo.com/a", True),
+        (" e ", False),
+        ("http://b.org/x?y=1", True),
+        ("\nfim", False),
+    ]
+    assert split_link_segments("sem links") == [("sem links", False)]
+    assert split_link_segments("") == []
+
+
+def test_plan_chunks():
+    link = "https://exemplo.com/" + "x" * 30
+    texto = ("a" * 94 + " " + link + " " + "b" * 300) * 20
+    segmentos = split_link_segments(texto)
+
+    blocos = plan_chunks(segmentos, first_chunk=100, chunk=250)
+
+    # Nada se perde nem muda de ordem
+    assert "".join(trecho for bloco in blocos for trecho, _ in bloco) == texto
+
+    # Primeiro bloco pequeno (primeira tela); links inteiros, mesmo no limite de um bloco
+    assert sum(len(trecho) for trecho, _ in blocos[0]) <= 100 + len(link)
+    assert blocos[0][-1] == (link, True)
+    assert all(trecho == link for bloco in blocos for trecho, e_link in bloco if e_link)
+    assert sum(1 for bloco in blocos for _, e_link in bloco if e_link) == 20
+    assert all(sum(len(trecho) for trecho, _ in bloco) <= 250 + len(link) for bloco in blocos[1:])
+
+    assert plan_chunks([]) == []
+
+
+if __name__ == "__main__":
+    test_split_link_segments()
+    test_plan_chunks()
+    print("OK")
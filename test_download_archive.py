@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste das camadas do histórico (detalhes compactados e arquivo de downloads antigos)
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from database_maintenance import DatabaseMaintenance
+from database_schema import DatabaseSchema
+
+
+DESCRICAO = "Descrição longa com link https://exemplo.com/video. " * 1000
+
+
+def _criar_banco(pasta):
+    db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+    db_manager.initialize()
+    return db_manager
+
+
+def _envelhecer(db_manager, ids, dias):
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.executemany(
+        "UPDATE downloads SET download_date = datetime('now', ?) WHERE id = ?",
+        [(f"-{dias} days", download_id) for download_id in ids]
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_detalhes_compactados():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = _criar_banco(pasta)
+        download_id = db_manager.add_download({
+            'url': 'https://youtu.be/a', 'title': 'Vídeo A',
+            'description': DESCRICAO, 'thumbnail_url': 'https://i.ytimg.com/a.jpg'
+        })
+
+        conn = sqlite3.connect(db_manager.db_path)
+        principal = conn.execute("SELECT description, thumbnail_url FROM downloads WHERE id = ?",
+                                 (download_id,)).fetchone()
+        compactada = conn.execute("SELECT description FROM download_details WHERE download_id = ?",
+                                  (download_id,)).fetchone()[0]
+        conn.close()
+        assert principal == (None, None)
+        assert isinstance(compactada, bytes) and len(compactada) < len(DESCRICAO) // 10
+
+        download = db_manager.get_downloads_paginated(fields=('id', 'description', 'thumbnail_url'))['downloads'][0]
+        assert download['description'] == DESCRICAO
+        assert download['thumbnail_url'] == 'https://i.ytimg.com/a.jpg'
+
+        periodo = db_manager.get_downloads_by_period(30)
+        assert len(periodo) == 1 and periodo[0].description is None
+
+
+def test_migracao_move_detalhes():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_path = os.path.join(pasta, "historico.db")
+        schema = DatabaseSchema(db_path)
+        schema.current_version = 4
+        schema.initialize_database()
+
+        conn = sqlite3.connect(db_path)
+        conn.executemany(
+            "INSERT INTO downloads (url, title, description, thumbnail_url) VALUES (?, ?, ?, ?)",
+            [(f"https://youtu.be/{i}", f"Vídeo {i}", f"descrição {i}", f"https://i.ytimg.com/{i}.jpg")
+             for i in range(1500)]
+        )
+        conn.commit()
+        conn.close()
+
+        db_manager = DatabaseManager(db_path)
+        db_manager.initialize()
+
+        conn = sqlite3.connect(db_path)
+        restantes = conn.execute(
+            "SELECT COUNT(*) FROM downloads WHERE description IS NOT NULL OR thumbnail_url IS NOT NULL"
+        ).fetchone()[0]
+        detalhes = conn.execute("SELECT COUNT(*) FROM download_details").fetchone()[0]
+        conn.close()
+        assert restantes == 0
+        assert detalhes == 1500
+
+        pagina = db_manager.select_downloads(('id', 'description'), limit=5)
+        assert all(d['description'] == f"descrição {d['id'] - 1}" for d in pagina)
+
+
+def test_arquivamento():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = _criar_banco(pasta)
+        ids = db_manager.add_downloads_bulk([
+            {'url': f'https://youtu.be/{i}', 'title': f'Vídeo {i}', 'description': f'descrição {i}'}
+            for i in range(1200)
+        ])
+        antigos = ids[:1100]
+        _envelhecer(db_manager, antigos, 400)
+
+        maintenance = DatabaseMaintenance(db_manager)
+        assert maintenance.archive_old_downloads() == (True, "Arquivamento desativado")
+
+        db_manager.set_setting('archive_after_days', '365')
+        progresso = []
+        sucesso, mensagem = maintenance.archive_old_downloads(
+            progress=lambda feitos, total: progresso.append((feitos, total))
+        )
+        assert sucesso, mensagem
+        assert progresso[-1] == (1100, 1100) and len(progresso) == 3
+
+        # Só a tabela principal por padrão; o arquivo entra quando pedido
+        assert db_manager.get_total_downloads_count() == 100
+        assert db_manager.get_total_downloads_count({'include_archive': True}) == 1200
+        janela = db_manager.get_downloads_window({'include_archive': True}, limit=2000)
+        assert len(janela) == 1200
+        assert len(db_manager.get_downloads_by_period(1000)) == 100
+        assert len(db_manager.get_downloads_by_period(1000, include_archive=True)) == 1200
+
+        # Arquivados continuam acessíveis por ID, com os detalhes
+        assert db_manager.get_download_by_id(antigos[0])['title'] == 'Vídeo 0'
+        pagina = db_manager.select_downloads(('id', 'description'), {'include_archive': True})
+        assert {d['description'] for d in pagina} == {f'descrição {i}' for i in range(1200)}
+
+        # Novos IDs não colidem com os arquivados
+        novo = db_manager.add_download({'url': 'https://youtu.be/novo', 'title': 'Novo'})
+        assert novo > ids[-1]
+
+        assert db_manager.remove_download(antigos[0])
+        assert db_manager.get_download_by_id(antigos[0]) is None
+
+
+if __name__ == "__main__":
+    test_detalhes_compactados()
+    test_migracao_move_detalhes()
+    test_arquivamento()
+    print("OK")
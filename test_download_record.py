@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do DownloadRecord (campos formatados sob demanda e memória por registro)
+
+Executado diretamente, mostra os bytes por registro com 100 mil linhas no
+formato antigo (dicionário copiado com os campos *_formatted) e no novo.
+"""
+
+import sys
+import os
+import sqlite3
+import tracemalloc
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from download_record import DownloadRecord
+from utils import AppUtils
+
+LINHAS_BENCHMARK = 100_000
+
+
+def _linhas(quantidade):
+    """Linhas no formato da lista do histórico, como sqlite3.Row"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    linhas = conn.execute("""
+        WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?)
+        SELECT i AS id, 'Vídeo número ' || i AS title, '1080p' AS resolution,
+               '2024-05-01 12:30:00' AS timestamp, 'completed' AS status
+        FROM n
+    """, (quantidade,)).fetchall()
+    conn.close()
+    return linhas
+
+
+def _formato_antigo(row):
+    """Formatação anterior: cópia em dicionário com os campos formatados na hora"""
+    formatted = dict(row)
+    dt = datetime.fromisoformat(formatted['timestamp'].replace('Z', '+00:00'))
+    formatted['date_formatted'] = dt.strftime('%d/%m/%Y %H:%M')
+    formatted['title_short'] = AppUtils.truncate_text(formatted['title'], 50)
+    return formatted
+
+
+def medir(converter, linhas):
+    """Bytes alocados por registro ao converter todas as linhas"""
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    registros = [converter(row) for row in linhas]
+    usado = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    del registros
+    return usado / len(linhas)
+
+
+def test_campos_formatados():
+    row = _linhas(1)[0]
+    registro = DownloadRecord.from_row(row)
+
+    assert registro.id == 1 and registro['title'] == 'Vídeo número 1'
+    assert registro.get('date_formatted') == '01/05/2024 12:30'
+    assert registro.get('title_short', registro.get('title')) == 'Vídeo número 1'
+    assert registro.get('inexistente', 'padrão') == 'padrão'
+    assert registro.duration_formatted == "Não disponível"
+
+    # Calculado uma vez e guardado
+    assert registro._date_formatted == '01/05/2024 12:30'
+    assert not hasattr(registro, '__dict__')
+
+    legado = DownloadRecord.from_row({'id': 2, 'download_path': '/tmp/v.mp4', 'download_date': 'x'})
+    assert legado.file_path == '/tmp/v.mp4' and legado['download_path'] == '/tmp/v.mp4'
+    assert legado.date_formatted == 'x'
+
+
+def test_memoria_por_registro():
+    linhas = _linhas(10_000)
+    antes = medir(_formato_antigo, linhas)
+    depois = medir(DownloadRecord.from_row, linhas)
+    assert depois < antes
+
+
+if __name__ == "__main__":
+    test_campos_formatados()
+    test_memoria_por_registro()
+
+    linhas = _linhas(LINHAS_BENCHMARK)
+    antes = medir(_formato_antigo, linhas)
+    depois = medir(DownloadRecord.from_row, linhas)
+    print(f"{LINHAS_BENCHMARK} registros: dicionário {antes:.0f} bytes/registro, "
+          f"DownloadRecord {depois:.0f} bytes/registro ({(1 - depois / antes) * 100:.0f}% menos)")
+    print("OK")
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do agendador de downloads (janelas de horário e fila)
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from download_scheduler import DownloadScheduler, parse_hours, format_hours
+from database_manager import DatabaseManager
+from analytics_manager import AnalyticsManager, RecommendationEngine
+from log_manager import LogManager
+
+
+def _agendador(hora, liberados, **kwargs):
+    """Agendador com relógio fixo que anota os trabalhos liberados"""
+    relogio = {'agora': datetime(2024, 5, 1, hora, 30)}
+    evento = threading.Event()
+
+    def launcher(job):
+        liberados.append(job.label)
+        evento.set()
+
+    scheduler = DownloadScheduler(launcher, clock=lambda: relogio['agora'], check_interval=0.05, **kwargs)
+    return scheduler, relogio, evento
+
+
+def test_parse_format_hours():
+    assert parse_hours("22-2") == {22, 23, 0, 1}
+    assert parse_hours("13, 9-11") == {9, 10, 13}
+    assert parse_hours("0-24") == set(range(24))
+    assert parse_hours("") == set()
+
+    for invalido in ("25", "3-3", "x", "10-30"):
+        try:
+            parse_hours(invalido)
+            assert False, invalido
+        except ValueError:
+            pass
+
+    assert format_hours({22, 23, 0, 1}) == "22-2"
+    assert format_hours({9, 10, 13}) == "9-11, 13"
+    assert format_hours({23, 0}) == "23-1"
+    assert format_hours(range(24)) == ""
+    assert parse_hours(format_hours({1, 2, 5, 20, 21, 23})) == {1, 2, 5, 20, 21, 23}
+
+
+def test_janelas():
+    scheduler = DownloadScheduler(lambda job: None, hours=parse_hours("22-6"))
+    assert scheduler.is_open(datetime(2024, 5, 1, 23, 10))
+    assert scheduler.is_open(datetime(2024, 5, 1, 5, 59))
+    assert not scheduler.is_open(datetime(2024, 5, 1, 6, 0))
+    assert scheduler.seconds_until_open(datetime(2024, 5, 1, 21, 30)) == 1800
+    assert scheduler.seconds_until_open(datetime(2024, 5, 1, 12, 0)) == 10 * 3600
+
+    scheduler.set_hours(None)
+    assert scheduler.is_open(datetime(2024, 5, 1, 12, 0))
+
+
+def test_liberacao_na_janela():
+    liberados = []
+    scheduler, relogio, evento = _agendador(12, liberados, hours={22, 23})
+    scheduler.enqueue("A", {})
+    scheduler.enqueue("B", {})
+    scheduler.start()
+    try:
+        assert not evento.wait(0.3) and liberados == []
+
+        # Janela abre: um trabalho por vez
+        relogio['agora'] = datetime(2024, 5, 1, 22, 0)
+        assert evento.wait(2) and liberados == ["A"]
+        evento.clear()
+        assert not evento.wait(0.3)
+        assert scheduler.running.label == "A" and len(scheduler.pending()) == 1
+
+        scheduler.job_finished(success=True)
+        assert evento.wait(2) and liberados == ["A", "B"]
+        evento.clear()
+
+        # Devolvido à fila: liberado de novo
+        scheduler.job_finished(retry=True)
+        assert evento.wait(2) and liberados == ["A", "B", "B"]
+    finally:
+        scheduler.stop()
+
+
+def test_cancelar():
+    scheduler = DownloadScheduler(lambda job: None)
+    job = scheduler.enqueue("A", {})
+    assert scheduler.cancel(job.id) and job.status == 'cancelado'
+    assert not scheduler.cancel(job.id)
+    assert scheduler.pending() == []
+
+
+def test_janelas_pela_velocidade():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+        db_manager.initialize()
+        log_manager = LogManager()
+        analytics = AnalyticsManager(db_manager, log_manager)
+        engine = RecommendationEngine(analytics, db_manager, log_manager)
+
+        # Sem medições: horários de menor uso
+        assert engine.get_download_window_hours(count=5) == [22, 23, 0, 1, 2]
+
+        # Três downloads medidos em cada hora local de 0 a 7; mais rápido quanto mais tarde
+        medidos = [
+            (10.0 + hora, f"+{hora} hours", db_manager.add_download({'url': f'https://youtu.be/{hora}-{i}', 'title': 'V'}))
+            for hora in range(8) for i in range(3)
+        ]
+        conn = sqlite3.connect(db_manager.db_path)
+        conn.executemany(
+            "UPDATE downloads SET avg_speed_mbps = ?, "
+            "download_date = datetime('now', 'localtime', 'start of day', ?, 'utc') WHERE id = ?",
+            medidos
+        )
+        conn.commit()
+        conn.close()
+        analytics.clear_cache()
+
+        assert engine.get_download_window_hours(count=3) == [7, 6, 5]
+
+        liberados = []
+        scheduler, relogio, evento = _agendador(12, liberados, hours_provider=lambda: engine.get_download_window_hours(count=3))
+        scheduler.enqueue("A", {})
+        scheduler.start()
+        try:
+            assert not evento.wait(0.3)
+            assert scheduler.hours == {5, 6, 7}
+            relogio['agora'] = datetime(2024, 5, 1, 6, 0)
+            assert evento.wait(2) and liberados == ["A"]
+        finally:
+            scheduler.stop()
+
+
+if __name__ == "__main__":
+    test_parse_format_hours()
+    test_janelas()
+    test_liberacao_na_janela()
+    test_cancelar()
+    test_janelas_pela_velocidade()
+    print("OK")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Script de teste para o índice de formatos usado na seleção de resolução
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from format_index import FormatIndex
+from format_policy import (
+    FormatPolicyEngine, ResolutionPolicy, SizeBudgetPolicy, ThroughputPolicy, policy_from_settings
+)
+
+FORMATOS = [
+    {'format_id': '140', 'resolution': 'audio only', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'abr': 129, 'filesize': 4_000_000},
+    {'format_id': '251', 'resolution': 'audio only', 'vcodec': 'none', 'acodec': 'opus', 'abr': 140, 'filesize': 4_200_000},
+    {'format_id': '18', 'resolution': '640x360', 'height': 360, 'vcodec': 'avc1.42001E', 'acodec': 'mp4a.40.2', 'tbr': 500, 'filesize': 15_000_000},
+    {'format_id': '134', 'resolution': '640x360', 'height': 360, 'vcodec': 'avc1.4d401e', 'acodec': 'none', 'tbr': 400, 'filesize': 12_000_000},
+    {'format_id': '137', 'resolution': '1920x1080', 'height': 1080, 'vcodec': 'avc1.640028', 'acodec': 'none', 'tbr': 4400, 'filesize': 130_000_000},
+    {'format_id': '248', 'resolution': '1920x1080', 'height': 1080, 'vcodec': 'vp9', 'acodec': 'none', 'tbr': 2600, 'filesize': 80_000_000},
+    {'format_id': '399', 'resolution': '1920x1080', 'height': 1080, 'vcodec': 'av01.0.08M.08', 'acodec': 'none', 'tbr': 2000, 'filesize_approx': 60_000_000},
+    {'format_id': '136', 'resolution': '1280x720', 'height': 720, 'vcodec': 'avc1.4d401f', 'acodec': 'none', 'tbr': 2500},
+]
+
+
+def test_format_index():
+    """Testa a construção e as consultas do índice de formatos"""
+    index = FormatIndex(FORMATOS, duration=240)
+
+    assert index.resolutions == ['640x360', '1280x720', '1920x1080']
+    assert index.video_format_count == 6
+
+    # Vídeo puro antes de muxado; h264 preferido por compatibilidade
+    assert index.best_for_resolution('640x360')['format_id'] == '134'
+    assert index.best_for_resolution('1920x1080')['format_id'] == '137'
+    assert index.best_for_resolution('9999x9999') is None
+
+    # Altura por format_id ou por resolução
+    assert index.height_for('137') == 1080
+    assert index.height_for('1280x720') == 720
+    assert index.height_for('desconhecido') == 1080
+    assert index.height_for(137) == 1080
+    assert index.height_for(999, default=480) == 480
+
+    # Tamanho estimado: filesize, filesize_approx e tbr x duração
+    assert index.estimated_size(index.get('399')) == 60_000_000
+    assert index.estimated_size(index.get('136')) == 2500 * 1000 // 8 * 240
+
+    # Orçamento de tamanho prefere o codec mais eficiente na maior resolução possível
+    video, audio, total = index.best_under_size(100_000_000)
+    assert video['format_id'] == '399'
+    assert audio['format_id'] == '251'
+    assert total == 64_200_000
+
+    video, audio, total = index.best_under_size(50_000_000)
+    assert video['format_id'] == '134'
+
+    video, audio, total = index.best_under_size(1_000)
+    assert video is None and total is None
+
+    print("Índice de formatos OK")
+
+
+class _LogSilencioso:
+    def log_info(self, message):
+        pass
+
+
+def test_format_policy():
+    """Testa as decisões das políticas de formato"""
+    index = FormatIndex(FORMATOS, duration=240)
+    engine = FormatPolicyEngine(_LogSilencioso(), ResolutionPolicy())
+
+    # h264 + m4a: par compatível com mp4, entregue por merge sem recodificar
+    decision = engine.decide(index, '1920x1080')
+    assert decision.format_ids == ['137', '140']
+    assert decision.selector.startswith('137+140/')
+    assert decision.selector.endswith('best[height<=1080]/best')
+    assert decision.expected_bytes == 134_000_000
+    assert decision.eta_seconds is None
+    assert decision.postprocess == 'merge'
+
+    # Resolução inexistente cai para a maior altura inferior
+    assert engine.decide(index, '720p').format_ids == ['136', '140']
+
+    # Sem preferência por remux o melhor áudio (opus) exige recodificação
+    engine.prefer_remux = False
+    decision = engine.decide(index, '1920x1080')
+    assert decision.format_ids == ['137', '251']
+    assert decision.postprocess == 'transcodificar'
+    engine.prefer_remux = True
+
+    # Orçamento de bytes e ETA com a vazão observada
+    engine.update_throughput(1_000_000)
+    engine.set_policy(SizeBudgetPolicy(70_000_000))
+    decision = engine.decide(index, '1920x1080')
+    assert decision.format_ids == ['399', '140']
+    assert decision.eta_seconds == 64
+
+    # Janela de tempo: 20 s a 1 MB/s
+    engine.set_policy(ThroughputPolicy(20))
+    assert engine.decide(index, '1920x1080').format_ids == ['134', '140']
+
+    # Sem espaço em disco suficiente
+    decision.free_bytes = 1_000
+    assert not decision.fits_disk
+
+    print("Políticas de formato OK")
+
+
+def test_policy_from_settings():
+    """Testa a criação da política a partir das configurações salvas"""
+    assert isinstance(policy_from_settings(None), ResolutionPolicy)
+    assert isinstance(policy_from_settings('resolucao', max_mb='abc'), ResolutionPolicy)
+
+    orcamento = policy_from_settings('orcamento', max_mb='500')
+    assert isinstance(orcamento, SizeBudgetPolicy) and orcamento.max_bytes == 500 * 1024 * 1024
+
+    vazao = policy_from_settings('vazao', max_minutes='2.5')
+    assert isinstance(vazao, ThroughputPolicy) and vazao.max_seconds == 150
+
+    for nome, mb, minutos in (('orcamento', None, None), ('orcamento', '0', None),
+                              ('vazao', None, 'x'), ('qualidade', None, None)):
+        try:
+            policy_from_settings(nome, mb, minutos)
+            assert False, nome
+        except ValueError:
+            pass
+
+    print("Política pelas configurações OK")
+
+
+if __name__ == "__main__":
+    test_format_index()
+    test_format_policy()
+    test_policy_from_settings()
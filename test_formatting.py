@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste dos formatadores com cache (datas, durações, contagens e textos)
+"""
+
+import sys
+import os
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import formatting
+from utils import AppUtils
+
+
+def _formatar_sem_cache(valor):
+    return datetime.fromisoformat(valor.replace('Z', '+00:00')).strftime('%d/%m/%Y %H:%M')
+
+
+def test_format_timestamp():
+    formatting.clear_caches()
+    assert formatting.format_timestamp('2024-05-01 12:30:45') == '01/05/2024 12:30'
+    assert formatting.format_timestamp('2024-05-01T12:30:00Z') == '01/05/2024 12:30'
+    assert formatting.format_timestamp('2024-05-01') == '01/05/2024 00:00'
+    assert formatting.format_timestamp('ontem') == 'ontem'
+    assert formatting.format_timestamp(None) == 'N/A'
+    assert formatting.format_timestamp('') == 'N/A'
+
+    # Mesmo minuto: uma única conversão
+    valores = [f'2024-05-01 12:30:{s:02d}' for s in range(60)]
+    assert formatting.format_timestamps(valores) == ['01/05/2024 12:30'] * 60
+    assert formatting.cache_info()['timestamp'].hits >= 59
+
+    for valor in ('2023-12-31 23:59:59', '2000-01-01 00:00:00', '2024-02-29 08:05:00'):
+        assert formatting.format_timestamp(valor) == _formatar_sem_cache(valor)
+
+
+def test_formatadores_app_utils():
+    assert AppUtils.format_duration(125) == "2:05"
+    assert AppUtils.format_duration(None) == "Não disponível"
+    assert AppUtils.format_duration("abc") == "abc"
+    assert AppUtils.format_view_count(1234567) == "1,234,567"
+    assert AppUtils.format_view_count('N/A') == "Não disponível"
+    assert AppUtils.truncate_text("abcdef", 3) == "abc..."
+    assert AppUtils.truncate_text(None) == "Não disponível"
+
+    # Textos longos não entram no cache
+    longo = "x" * 60000
+    antes = formatting.cache_info()['truncate'].currsize
+    assert AppUtils.truncate_text(longo) == "x" * 50000 + "..."
+    assert formatting.cache_info()['truncate'].currsize == antes
+
+
+def test_desempenho_exportacao():
+    # 100 mil linhas em 500 minutos distintos
+    valores = [f'2024-05-{1 + i % 28:02d} {i % 24:02d}:{i % 60:02d}:{i % 7:02d}' for i in range(100_000)]
+
+    inicio = time.perf_counter()
+    esperado = [_formatar_sem_cache(valor) for valor in valores]
+    sem_cache = time.perf_counter() - inicio
+
+    formatting.clear_caches()
+    inicio = time.perf_counter()
+    obtido = formatting.format_timestamps(valores)
+    com_cache = time.perf_counter() - inicio
+
+    assert obtido == esperado
+    assert com_cache < sem_cache
+
+
+if __name__ == "__main__":
+    test_format_timestamp()
+    test_formatadores_app_utils()
+    test_desempenho_exportacao()
+    print("OK")
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da exportação do histórico em fluxo contínuo (CSV em blocos, cancelamento
+e falha do banco no meio da leitura)
+"""
+
+import sys
+import os
+import csv
+import sqlite3
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from history_manager import HistoryManager
+from history_exporter import HistoryExporter
+
+TOTAL_LINHAS = 2500
+
+
+def _criar_banco(pasta):
+    db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+    db_manager.initialize()
+
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.executemany(
+        "INSERT INTO downloads (url, title, resolution, status, download_path, download_date) VALUES (?, ?, ?, ?, ?, ?)",
+        [
+            (f"https://youtu.be/{i}", f"Vídeo, \"especial\" {i}", "720p", "completed", f"/videos/{i}.mp4",
+             f"2024-03-{1 + (i % 28):02d} 08:00:00")
+            for i in range(TOTAL_LINHAS)
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return db_manager
+
+
+class _CursorQueFalha:
+    """Cursor que falha no segundo fetchmany, como um banco bloqueado no meio da leitura"""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.leituras = 0
+
+    def fetchmany(self, tamanho):
+        self.leituras += 1
+        if self.leituras == 2:
+            raise sqlite3.OperationalError("database is locked")
+        return self.cursor.fetchmany(tamanho)
+
+
+class _ConexaoQueFalha:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, *args):
+        return _CursorQueFalha(self.conn.execute(*args))
+
+    def close(self):
+        self.conn.close()
+
+
+class BancoQueFalha(DatabaseManager):
+    def _connect_rows(self):
+        return _ConexaoQueFalha(super()._connect_rows())
+
+
+def test_export_csv_streaming():
+    with tempfile.TemporaryDirectory() as pasta:
+        exporter = HistoryExporter(HistoryManager(_criar_banco(pasta)), chunk_size=400)
+        destino = os.path.join(pasta, "historico.csv")
+
+        progresso = []
+        sucesso, mensagem = exporter.export_csv(destino, progress=lambda feitas, total: progresso.append((feitas, total)))
+        assert sucesso, mensagem
+
+        # Um aviso de progresso por bloco lido do cursor
+        assert progresso[-1] == (TOTAL_LINHAS, TOTAL_LINHAS)
+        assert len(progresso) == (TOTAL_LINHAS + 399) // 400
+
+        with open(destino, newline='', encoding='utf-8') as f:
+            linhas = list(csv.reader(f))
+        assert len(linhas) == TOTAL_LINHAS + 1
+        assert linhas[1][1].startswith('Vídeo, "especial"')
+        assert not os.path.exists(destino + ".part")
+
+        # Filtro de busca também procura na URL
+        assert exporter.count({'search_query': 'youtu.be/42'}) == len(
+            [i for i in range(TOTAL_LINHAS) if str(i).startswith('42')]
+        )
+
+
+def test_export_cancel():
+    with tempfile.TemporaryDirectory() as pasta:
+        exporter = HistoryExporter(HistoryManager(_criar_banco(pasta)), chunk_size=500)
+        destino = os.path.join(pasta, "cancelado.csv")
+        cancelar = threading.Event()
+
+        def progresso(feitas, total):
+            if feitas >= 1000:
+                cancelar.set()
+
+        sucesso, mensagem = exporter.export_csv(destino, progress=progresso, cancel_event=cancelar)
+        assert not sucesso
+        assert mensagem == "Exportação cancelada"
+        assert not os.path.exists(destino)
+        assert not os.path.exists(destino + ".part")
+
+
+def test_export_falha_no_meio():
+    with tempfile.TemporaryDirectory() as pasta:
+        _criar_banco(pasta)
+        db_manager = BancoQueFalha(os.path.join(pasta, "historico.db"))
+        exporter = HistoryExporter(HistoryManager(db_manager), chunk_size=1000)
+        destino = os.path.join(pasta, "historico.csv")
+        with open(destino, 'w', encoding='utf-8') as f:
+            f.write("exportacao anterior\n")
+
+        sucesso, mensagem = exporter.export_csv(destino)
+        assert not sucesso
+        assert "database is locked" in mensagem
+        # Destino anterior intacto e nenhum arquivo parcial
+        assert open(destino, encoding='utf-8').read() == "exportacao anterior\n"
+        assert not os.path.exists(destino + ".part")
+
+        # A lista completa também não é entregue truncada
+        try:
+            db_manager.get_all_downloads_filtered()
+            assert False, "falha do banco deveria ser repassada"
+        except sqlite3.OperationalError:
+            pass
+
+
+if __name__ == "__main__":
+    test_export_csv_streaming()
+    test_export_cancel()
+    test_export_falha_no_meio()
+    print("OK")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da busca do histórico: buscas mais restritas reaproveitam o resultado
+anterior e devem retornar exatamente as mesmas linhas que a consulta no banco.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from history_manager import HistoryManager
+from history_search import HistorySearch, like_contains
+
+TITULOS = ["Gato pulando", "GATOS fofos", "gatinho", "Cachorro e gato", "Ópera", "ópera ao vivo", "Tutorial Python"]
+
+
+def _criar_banco(pasta):
+    db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+    db_manager.initialize()
+
+    conn = sqlite3.connect(db_manager.db_path)
+    conn.executemany(
+        "INSERT INTO downloads (url, title, resolution, status, download_date) VALUES (?, ?, ?, ?, ?)",
+        [
+            (f"https://youtu.be/{i}", f"{TITULOS[i % len(TITULOS)]} {i}", "720p" if i % 3 else "1080p",
+             "completed", f"2024-02-{1 + (i % 28):02d} 12:00:00")
+            for i in range(700)
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return db_manager
+
+
+def test_like_contains():
+    # Mesma semântica do LIKE do SQLite: sem distinção de caixa apenas em ASCII
+    assert like_contains("GATOS fofos", "gato")
+    assert like_contains("Ópera", "ópera") is False
+    assert like_contains("ópera ao vivo", "ópera")
+    assert like_contains(None, "x") is False
+    assert like_contains("qualquer", "")
+
+
+def test_history_search_reuses_prefix():
+    with tempfile.TemporaryDirectory() as pasta:
+        history_manager = HistoryManager(_criar_banco(pasta))
+        busca = HistorySearch(history_manager)
+
+        primeira = busca.search({'search_query': 'ga', 'resolution': '720p'}, page=1, per_page=50)
+        assert primeira.source == 'banco'
+        assert primeira.rows is not None
+
+        for consulta in ('gat', 'gato', 'GATOS', 'ópera'):
+            filtros = {'search_query': consulta, 'resolution': '720p'}
+            resultado = busca.search(filtros, page=1, per_page=50)
+            esperado = history_manager.get_total_downloads_count(filtros)
+
+            if consulta == 'ópera':
+                # Não contém a busca anterior: precisa consultar o banco
+                assert resultado.source == 'banco'
+            else:
+                assert resultado.source == 'cache'
+            assert resultado.total == esperado
+            assert [d['id'] for d in resultado.page_rows] == [d['id'] for d in resultado.rows[:50]]
+            assert sorted(d['id'] for d in resultado.rows) == sorted(
+                d['id'] for d in history_manager.get_downloads_window(filtros, limit=1000)
+            )
+
+        # Filtros diferentes não reaproveitam o resultado
+        assert busca.search({'search_query': 'gato', 'resolution': '1080p'}).source == 'banco'
+
+        # Após invalidar, a busca volta ao banco
+        busca.invalidate()
+        assert busca.search({'search_query': 'gato', 'resolution': '720p'}).source == 'banco'
+
+        stats = busca.get_latency_stats()
+        assert stats['count'] == 7
+        assert stats['max_ms'] >= stats['p95_ms'] >= 0
+
+
+def test_history_search_sees_new_downloads():
+    with tempfile.TemporaryDirectory() as pasta:
+        history_manager = HistoryManager(_criar_banco(pasta))
+        busca = HistorySearch(history_manager)
+
+        antes = busca.search({}, page=1, per_page=50)
+        assert busca.search({}, page=1, per_page=50).source == 'cache'
+
+        sucesso, _ = history_manager.add_download_to_history({'url': 'https://youtu.be/novo', 'title': 'Gato novo'})
+        assert sucesso
+        depois = busca.search({}, page=1, per_page=50)
+        assert depois.source == 'banco'
+        assert depois.total == antes.total + 1 == history_manager.get_total_downloads_count()
+
+        # Também pela fila de gravação em lote
+        busca.search({'search_query': 'gato'})
+        history_manager.queue_download_to_history({'url': 'https://youtu.be/lote', 'title': 'Gato em lote'})
+        history_manager.flush_pending_writes()
+        resultado = busca.search({'search_query': 'gato n'})
+        assert resultado.source == 'banco'
+        assert resultado.total == history_manager.get_total_downloads_count({'search_query': 'gato n'})
+        history_manager.close()
+
+
+def test_history_search_wildcards():
+    with tempfile.TemporaryDirectory() as pasta:
+        history_manager = HistoryManager(_criar_banco(pasta))
+        history_manager.add_downloads_bulk([
+            {'url': 'https://youtu.be/p', 'title': 'Desconto 100% real'},
+            {'url': 'https://youtu.be/s', 'title': 'meu_video'},
+        ])
+        busca = HistorySearch(history_manager)
+
+        # % e _ são literais, no banco e na filtragem em memória
+        busca.search({'search_query': '1'})
+        for consulta in ('100%', '0% ', 'u_v'):
+            resultado = busca.search({'search_query': consulta})
+            assert resultado.total == history_manager.get_total_downloads_count({'search_query': consulta}) == 1
+        assert busca.search({'search_query': '_'}).total == 1
+        assert history_manager.get_total_downloads_count({'search_query': 'G_to'}) == 0
+
+
+if __name__ == "__main__":
+    test_like_contains()
+    test_history_search_reuses_prefix()
+    test_history_search_sees_new_downloads()
+    test_history_search_wildcards()
+    print("OK")
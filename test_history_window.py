@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da leitura em blocos do histórico (lista virtualizada):
+paginação por chave deve retornar as mesmas linhas, na mesma ordem, que o OFFSET.
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from history_manager import HistoryManager
+
+TOTAL_LINHAS = 1000
+
+
+def _criar_banco(pasta):
+    db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+    db_manager.initialize()
+
+    conn = sqlite3.connect(db_manager.db_path)
+    # Várias linhas com a mesma data para exercitar o desempate por id
+    conn.executemany(
+        "INSERT INTO downloads (url, title, resolution, status, download_date) VALUES (?, ?, ?, ?, ?)",
+        [
+            (f"https://youtu.be/{i}", f"Vídeo {i}", "1080p" if i % 2 else "720p", "completed",
+             f"2024-01-{1 + (i // 100):02d} 10:00:00")
+            for i in range(TOTAL_LINHAS)
+        ]
+    )
+    conn.commit()
+    conn.close()
+    return db_manager
+
+
+def test_history_window():
+    with tempfile.TemporaryDirectory() as pasta:
+        history_manager = HistoryManager(_criar_banco(pasta))
+
+        assert history_manager.get_total_downloads_count() == TOTAL_LINHAS
+
+        # Percorrer tudo continuando da última linha de cada bloco
+        por_chave = []
+        after = None
+        while True:
+            bloco = history_manager.get_downloads_window(limit=128, after=after)
+            if not bloco:
+                break
+            por_chave.extend(d['id'] for d in bloco)
+            after = (bloco[-1]['timestamp'], bloco[-1]['id'])
+
+        por_offset = []
+        for inicio in range(0, TOTAL_LINHAS, 128):
+            por_offset.extend(d['id'] for d in history_manager.get_downloads_window(limit=128, offset=inicio))
+
+        assert len(por_chave) == TOTAL_LINHAS
+        assert por_chave == por_offset
+        assert len(set(por_chave)) == TOTAL_LINHAS
+
+        # Linhas já formatadas para exibição
+        primeira = history_manager.get_downloads_window(limit=1)[0]
+        assert primeira['date_formatted'] == "10/01/2024 10:00"
+        assert primeira['title_short'].startswith("Vídeo")
+
+        # Filtros (incluindo período) valem para a contagem e para os blocos
+        filtros = {'resolution': '720p'}
+        assert history_manager.get_total_downloads_count(filtros) == TOTAL_LINHAS // 2
+        bloco = history_manager.get_downloads_window(filtros, limit=TOTAL_LINHAS)
+        assert len(bloco) == TOTAL_LINHAS // 2
+        assert all(d['resolution'] == '720p' for d in bloco)
+
+        assert history_manager.get_total_downloads_count({'period': 'Hoje'}) == 0
+
+
+if __name__ == "__main__":
+    test_history_window()
+    print("OK")
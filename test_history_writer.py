@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da gravação do histórico em lote (add_downloads_bulk e fila de gravação)
+"""
+
+import sys
+import os
+import time
+import sqlite3
+import queue
+import tempfile
+import threading
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from history_manager import HistoryManager
+from history_writer import HistoryWriteBuffer
+from bandwidth_tracker import BandwidthTracker
+
+
+class ContadorDeLotes(DatabaseManager):
+    """DatabaseManager que conta as transações de gravação em lote"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.lotes = []
+
+    def add_downloads_bulk(self, downloads, speed_updates=None):
+        self.lotes.append((len(downloads), len(speed_updates or [])))
+        return super().add_downloads_bulk(downloads, speed_updates)
+
+
+class BancoOcupado(ContadorDeLotes):
+    """DatabaseManager cujas primeiras gravações em lote encontram o banco bloqueado"""
+
+    def __init__(self, db_path, falhas):
+        super().__init__(db_path)
+        self.falhas = falhas
+
+    def add_downloads_bulk(self, downloads, speed_updates=None):
+        if self.falhas > 0:
+            self.falhas -= 1
+            raise sqlite3.OperationalError("database is locked")
+        return super().add_downloads_bulk(downloads, speed_updates)
+
+
+def _video(i):
+    return {'url': f"https://youtu.be/{i}", 'title': f"Vídeo {i}", 'resolution': '720p'}
+
+
+def test_add_downloads_bulk():
+    with tempfile.TemporaryDirectory() as pasta:
+        history = HistoryManager(DatabaseManager(os.path.join(pasta, "historico.db")))
+        history.db_manager.initialize()
+
+        sucesso, ids = history.add_downloads_bulk([_video(i) for i in range(20)])
+        assert sucesso, ids
+        assert ids == list(range(ids[0], ids[0] + 20))
+        assert history.get_last_download_id() == ids[-1]
+        assert history.db_manager.get_download_by_id(ids[3])['title'] == "Vídeo 3"
+
+        sucesso, erro = history.add_downloads_bulk([_video(1), {'title': 'sem url'}])
+        assert not sucesso and erro == "URL é obrigatória"
+
+
+def test_write_buffer_agrupa_gravacoes():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = ContadorDeLotes(os.path.join(pasta, "historico.db"))
+        db_manager.initialize()
+        buffer = HistoryWriteBuffer(db_manager, flush_interval=0.2)
+
+        inicio = time.monotonic()
+        futures = [buffer.add_download(_video(i)) for i in range(30)]
+        ids = [future.result(timeout=5) for future in futures]
+        # Gravados juntos, dentro do prazo máximo de espera
+        assert time.monotonic() - inicio < 2
+        assert db_manager.lotes == [(30, 0)]
+
+        # Velocidades vão no mesmo lote das inserções seguintes
+        tracker = BandwidthTracker(db_manager, buffer)
+        tracker._save_bandwidth_data(ids[0], 12.5, 20.0, 42.7)
+        buffer.add_download(_video(99))
+        assert buffer.flush(timeout=5)
+        assert db_manager.lotes[-1] == (1, 1)
+
+        conn = sqlite3.connect(db_manager.db_path)
+        linha = conn.execute(
+            "SELECT avg_speed_mbps, peak_speed_mbps, download_duration_seconds FROM downloads WHERE id = ?",
+            (ids[0],)
+        ).fetchone()
+        conn.close()
+        assert linha == (12.5, 20.0, 42)
+
+        buffer.close()
+        try:
+            buffer.add_download(_video(100))
+            assert False, "fila encerrada deveria recusar gravações"
+        except RuntimeError:
+            pass
+
+
+def test_history_manager_mantem_ordem():
+    with tempfile.TemporaryDirectory() as pasta:
+        history = HistoryManager(DatabaseManager(os.path.join(pasta, "historico.db")))
+        history.db_manager.initialize()
+
+        agendados = [history.queue_download_to_history(_video(i))[1] for i in range(5)]
+        # Uma inclusão imediata grava antes o que estava na fila
+        sucesso, download_id = history.add_download_to_history(_video(5))
+        assert sucesso
+        assert [future.result(timeout=5) for future in agendados] == list(range(download_id - 5, download_id))
+        history.close()
+
+
+def test_write_buffer_repete_com_banco_bloqueado():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = BancoOcupado(os.path.join(pasta, "historico.db"), falhas=1)
+        db_manager.initialize()
+        buffer = HistoryWriteBuffer(db_manager, flush_interval=0.05, retry_delay=0.01)
+
+        futures = [buffer.add_download(_video(i)) for i in range(3)]
+        ids = [future.result(timeout=5) for future in futures]
+        assert db_manager.falhas == 0 and db_manager.lotes == [(3, 0)]
+        assert db_manager.get_download_by_id(ids[2])['title'] == "Vídeo 2"
+
+        # Bloqueado além das novas tentativas: o lote falha com o erro do banco
+        db_manager.falhas = 10
+        future = buffer.add_download(_video(3))
+        try:
+            future.result(timeout=5)
+            assert False, "lote deveria falhar após esgotar as tentativas"
+        except sqlite3.OperationalError:
+            pass
+        buffer.close()
+
+
+class FilaLenta(queue.Queue):
+    """Fila que pausa dentro do put de um download até ser liberada"""
+
+    def __init__(self):
+        super().__init__()
+        self.dentro = threading.Event()
+        self.liberar = threading.Event()
+
+    def put(self, item, *args, **kwargs):
+        if item[0] == 'download':
+            self.dentro.set()
+            self.liberar.wait(5)
+        super().put(item, *args, **kwargs)
+
+
+def test_close_concorrente_resolve_todos():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+        db_manager.initialize()
+        buffer = HistoryWriteBuffer(db_manager, flush_interval=0.01)
+        antiga, fila = buffer._queue, FilaLenta()
+        buffer._queue = fila
+        # Acorda a thread de gravação, parada no get() da fila antiga
+        acordou = threading.Event()
+        antiga.put(('flush', acordou, None))
+        assert acordou.wait(5)
+
+        # add_download já passou da verificação de encerramento quando close() é chamado
+        futures = []
+        produtor = threading.Thread(target=lambda: futures.append(buffer.add_download(_video(1))))
+        produtor.start()
+        assert fila.dentro.wait(5)
+        encerramento = threading.Thread(target=buffer.close)
+        encerramento.start()
+        time.sleep(0.1)
+        fila.liberar.set()
+        produtor.join(5)
+        encerramento.join(5)
+
+        # A gravação aceita entra na fila antes do sinal de encerramento e é gravada
+        assert db_manager.get_download_by_id(futures[0].result(timeout=5))['title'] == "Vídeo 1"
+        try:
+            buffer.add_download(_video(2))
+            assert False, "fila encerrada deveria recusar novas gravações"
+        except RuntimeError:
+            pass
+
+if __name__ == "__main__":
+    test_add_downloads_bulk()
+    test_write_buffer_agrupa_gravacoes()
+    test_history_manager_mantem_ordem()
+    test_write_buffer_repete_com_banco_bloqueado()
+    test_close_concorrente_resolve_todos()
+    print("OK")
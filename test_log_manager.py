@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do LogManager: rotação com compressão em segundo plano, retomada de
+logs pendentes na inicialização, eventos estruturados, contadores de
+registros e nível mínimo
+"""
+
+import sys
+import os
+import glob
+import logging
+import lzma
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from log_manager import LogManager, LogRecordCounter
+
+
+def _criar_log_manager(pasta, **kwargs):
+    return LogManager(log_dir=pasta, **kwargs)
+
+
+def _encerrar(log_manager):
+    """Tira os handlers do LogManager do logger raiz e restaura o nível padrão"""
+    log_manager.aguardar_compressoes(timeout=30)
+    raiz = logging.getLogger()
+    raiz.removeHandler(log_manager.file_handler)
+    raiz.removeHandler(log_manager.record_counter)
+    raiz.setLevel(logging.WARNING)
+    log_manager.file_handler.close()
+
+
+class _Mensagens(logging.Handler):
+    """Guarda as mensagens formatadas que chegam ao logger raiz"""
+
+    def __init__(self):
+        super().__init__(level=logging.NOTSET)
+        self.mensagens = []
+
+    def emit(self, record):
+        self.mensagens.append(record.getMessage())
+
+
+def _registro(nivel, criado):
+    registro = logging.LogRecord("teste", nivel, __file__, 0, "mensagem", None, None)
+    registro.created = criado
+    return registro
+
+
+def test_rotacao_e_retomada_na_inicializacao():
+    with tempfile.TemporaryDirectory() as pasta:
+        conteudo_atual = b"linha do log atual\n" * 200_000
+        conteudo_antigo = b"linha de uma execucao anterior\n" * 1000
+
+        # Log grande, rotação interrompida e temporário órfão de uma execução anterior
+        with open(os.path.join(pasta, "youtube_downloader.log"), 'wb') as arquivo:
+            arquivo.write(conteudo_atual)
+        with open(os.path.join(pasta, "youtube_downloader.log.20240101_000000_000000.pending"), 'wb') as arquivo:
+            arquivo.write(conteudo_antigo)
+        orfao = os.path.join(pasta, "log_backup_20240101_000000.xz.tmp")
+        with open(orfao, 'wb') as arquivo:
+            arquivo.write(b"incompleto")
+
+        log_manager = _criar_log_manager(pasta, max_size_mb=1)
+        try:
+            # A rotação do __init__ pode já estar gravando o próprio temporário
+            assert not os.path.exists(orfao)
+
+            # Mesma sequência de perform_startup_tasks: o .pending da rotação do __init__ não é comprimido de novo
+            assert log_manager.comprimir_logs_pendentes() == 1
+            assert log_manager.comprimir_logs_pendentes() == 0
+            log_manager.aguardar_compressoes(timeout=30)
+
+            assert glob.glob(os.path.join(pasta, "*.pending")) == []
+            assert glob.glob(os.path.join(pasta, "*.tmp")) == []
+            backups = glob.glob(os.path.join(pasta, "log_backup_*.xz"))
+            assert len(backups) == 2
+            conteudos = sorted(lzma.open(backup).read() for backup in backups)
+            assert conteudos == sorted([conteudo_atual, conteudo_antigo])
+            assert log_manager.get_record_counters()['by_level'].get('ERROR', 0) == 0
+        finally:
+            _encerrar(log_manager)
+
+
+def test_compressao_nao_duplicada():
+    with tempfile.TemporaryDirectory() as pasta:
+        log_manager = _criar_log_manager(pasta)
+        try:
+            pendente = os.path.join(pasta, "youtube_downloader.log.20240101_000000_000000.pending")
+            with open(pendente, 'wb') as arquivo:
+                arquivo.write(b"x" * 1000)
+
+            with log_manager._compression_lock:
+                log_manager._compressing.add(os.path.abspath(pendente))
+            assert log_manager.comprimir_logs_pendentes() == 0
+            with log_manager._compression_lock:
+                log_manager._compressing.clear()
+
+            assert log_manager.comprimir_logs_pendentes() == 1
+            log_manager.aguardar_compressoes(timeout=30)
+            assert not os.path.exists(pendente)
+
+            # Já comprimido: nada a fazer
+            assert log_manager._comprimir_em_segundo_plano(pendente) is False
+            assert len(glob.glob(os.path.join(pasta, "log_backup_*.xz"))) == 1
+        finally:
+            _encerrar(log_manager)
+
+
+def test_log_event_aspas():
+    with tempfile.TemporaryDirectory() as pasta:
+        log_manager = _criar_log_manager(pasta)
+        mensagens = _Mensagens()
+        logging.getLogger().addHandler(mensagens)
+        try:
+            log_manager.log_event("download_concluido", id=42, titulo='Meu vídeo "final"', vazio="", url="https://youtu.be/x")
+            assert mensagens.mensagens == [
+                'evento=download_concluido id=42 titulo="Meu vídeo \\"final\\"" vazio="" url=https://youtu.be/x'
+            ]
+        finally:
+            logging.getLogger().removeHandler(mensagens)
+            _encerrar(log_manager)
+
+
+def test_contador_taxa_na_janela():
+    contador = LogRecordCounter(window_seconds=10)
+    agora = time.time()
+    contador._started = agora - 100
+
+    # Registros de 20 s atrás saem da janela de 10 s; só os recentes entram na taxa
+    for _ in range(5):
+        contador.handle(_registro(logging.INFO, agora - 20))
+    for _ in range(15):
+        contador.handle(_registro(logging.INFO, agora - 2))
+    for _ in range(5):
+        contador.handle(_registro(logging.ERROR, agora - 1))
+
+    snapshot = contador.snapshot()
+    assert snapshot['total'] == 25
+    assert snapshot['by_level'] == {'INFO': 20, 'ERROR': 5}
+    assert snapshot['records_in_window'] == 20
+    assert snapshot['window_seconds'] == 10
+    assert snapshot['records_per_second'] == 2.0
+
+    # Recém-iniciado: a taxa é dividida por pelo menos 1 s, não pela janela inteira
+    contador.reset()
+    for _ in range(3):
+        contador.handle(_registro(logging.INFO, time.time()))
+    assert contador.snapshot()['records_per_second'] == 3.0
+
+
+def test_set_level_suprime_registros():
+    with tempfile.TemporaryDirectory() as pasta:
+        log_manager = _criar_log_manager(pasta)
+        mensagens = _Mensagens()
+        logging.getLogger().addHandler(mensagens)
+        try:
+            log_manager.set_level("warning")
+            log_manager.reset_record_counters()
+            log_manager.log_event("ignorado", id=1)
+            log_manager.log_debug("detalhe ignorado")
+            log_manager.log_event("aviso", level=logging.WARNING, id=2)
+            assert mensagens.mensagens == ["evento=aviso id=2"]
+            assert log_manager.get_record_counters()['by_level'] == {'WARNING': 1}
+            assert not log_manager.is_debug_enabled()
+
+            log_manager.set_level("DEBUG")
+            assert log_manager.is_debug_enabled()
+            log_manager.log_debug("detalhe")
+            assert mensagens.mensagens[-1] == "detalhe"
+
+            # Nome desconhecido volta para INFO
+            log_manager.set_level("detalhado")
+            assert log_manager.level == logging.INFO
+            assert logging.getLogger().level == logging.INFO
+        finally:
+            logging.getLogger().removeHandler(mensagens)
+            _encerrar(log_manager)
+
+
+if __name__ == "__main__":
+    test_rotacao_e_retomada_na_inicializacao()
+    test_compressao_nao_duplicada()
+    test_log_event_aspas()
+    test_contador_taxa_na_janela()
+    test_set_level_suprime_registros()
+    print("OK")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do executor de migrações (transações, backfill retomável e duração registrada)
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_schema import DatabaseSchema, Backfill
+
+
+class SchemaComBackfill(DatabaseSchema):
+    """Schema com uma migração v6 de teste que preenche uma coluna em lotes"""
+
+    def __init__(self, db_path, falhar_apos=None):
+        super().__init__(db_path)
+        self.current_version = 6
+        self.falhar_apos = falhar_apos
+        self.lotes = []
+
+    def get_migrations(self):
+        return super().get_migrations() + [
+            (6, "Coluna de teste", [
+                "ALTER TABLE downloads ADD COLUMN title_length INTEGER",
+                Backfill("title_length", "downloads", self.preencher, batch_size=100),
+                "CREATE INDEX IF NOT EXISTS idx_downloads_title_length ON downloads(title_length)",
+            ])
+        ]
+
+    def preencher(self, conn, primeiro_id, ultimo_id):
+        if self.falhar_apos is not None and len(self.lotes) >= self.falhar_apos:
+            raise RuntimeError("interrompido")
+        self.lotes.append((primeiro_id, ultimo_id))
+        conn.execute("UPDATE downloads SET title_length = LENGTH(title) WHERE id BETWEEN ? AND ?",
+                     (primeiro_id, ultimo_id))
+
+
+def _versoes(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT version, duration_ms FROM schema_version ORDER BY version").fetchall()
+    finally:
+        conn.close()
+
+
+def test_initialize_database():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_path = os.path.join(pasta, "schema.db")
+        schema = DatabaseSchema(db_path)
+        schema.initialize_database()
+        schema.initialize_database()
+
+        versoes = _versoes(db_path)
+        assert [v for v, _ in versoes] == [1, 2, 3, 4, 5]
+        assert all(duracao is not None and duracao >= 0 for _, duracao in versoes)
+        assert schema.get_db_version() == 5
+
+
+def test_backfill_retomado():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_path = os.path.join(pasta, "schema.db")
+        DatabaseSchema(db_path).initialize_database()
+
+        conn = sqlite3.connect(db_path)
+        conn.executemany("INSERT INTO downloads (url, title) VALUES (?, ?)",
+                         [(f"https://youtu.be/{i}", "x" * (i % 50)) for i in range(450)])
+        conn.commit()
+        conn.close()
+
+        # Interrompido no terceiro lote: os dois primeiros ficam gravados
+        interrompido = SchemaComBackfill(db_path, falhar_apos=2)
+        try:
+            interrompido.initialize_database()
+            assert False, "a migração deveria ter falhado"
+        except RuntimeError:
+            pass
+        assert interrompido.get_db_version() == 5
+
+        retomado = SchemaComBackfill(db_path)
+        retomado.initialize_database()
+        assert retomado.lotes == [(201, 300), (301, 400), (401, 450)]
+        assert retomado.get_db_version() == 6
+
+        conn = sqlite3.connect(db_path)
+        pendentes = conn.execute("SELECT COUNT(*) FROM downloads WHERE title_length IS NULL").fetchone()[0]
+        progresso = conn.execute("SELECT COUNT(*) FROM migration_progress").fetchone()[0]
+        conn.close()
+        assert pendentes == 0
+        assert progresso == 0
+        assert [v for v, _ in _versoes(db_path)] == [1, 2, 3, 4, 5, 6]
+
+
+def test_schema_version_legado():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_path = os.path.join(pasta, "schema.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE schema_version (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                version INTEGER NOT NULL,
+                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                description TEXT
+            )
+        """)
+        conn.commit()
+        conn.close()
+
+        DatabaseSchema(db_path).initialize_database()
+        assert [v for v, _ in _versoes(db_path)] == [1, 2, 3, 4, 5]
+
+
+if __name__ == "__main__":
+    test_initialize_database()
+    test_backfill_retomado()
+    test_schema_version_legado()
+    print("OK")
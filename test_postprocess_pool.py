@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do PostprocessPool com um ffmpeg falso: limite de processos
+simultâneos, fila limitada, comandos por modo e nomes dos arquivos finais
+"""
+
+import sys
+import os
+import stat
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from postprocess_pool import PostprocessPool
+from download_manager import DownloadManager
+from format_policy import (
+    FormatDecision, POSTPROCESS_MERGE, POSTPROCESS_REMUX,
+    POSTPROCESS_TRANSCODE, POSTPROCESS_EXTRACT_AUDIO, POSTPROCESS_NONE
+)
+
+# Registra início/fim de cada execução, junta as entradas na saída e falha se
+# uma entrada se chamar "falha"
+FFMPEG_FALSO = r'''#!{python}
+import os, sys, time
+args = sys.argv[1:]
+entradas = [args[i + 1] for i, a in enumerate(args) if a == '-i']
+saida = args[-1]
+with open(os.path.join({pasta!r}, "execucoes.log"), "a") as log:
+    log.write(f"inicio {{time.monotonic()}}\n")
+if any(os.path.basename(e) == "falha" for e in entradas):
+    sys.stderr.write("entrada invalida\n")
+    sys.exit(1)
+time.sleep(0.3)
+with open(saida, "wb") as destino:
+    for entrada in entradas:
+        destino.write(open(entrada, "rb").read())
+with open(os.path.join({pasta!r}, "execucoes.log"), "a") as log:
+    log.write(f"fim {{time.monotonic()}}\n")
+'''
+
+
+class _LogSilencioso:
+    def log_error(self, error, context=""):
+        raise AssertionError(f"{context}: {error}")
+
+
+def _ffmpeg_falso(pasta):
+    caminho = os.path.join(pasta, "ffmpeg")
+    with open(caminho, "w") as arquivo:
+        arquivo.write(FFMPEG_FALSO.format(python=sys.executable, pasta=pasta))
+    os.chmod(caminho, os.stat(caminho).st_mode | stat.S_IEXEC)
+    return caminho
+
+
+def _entradas(pasta, nome, conteudos):
+    arquivos = []
+    for i, conteudo in enumerate(conteudos):
+        caminho = os.path.join(pasta, f"{nome}.f{i}.part")
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(conteudo)
+        arquivos.append(caminho)
+    return arquivos
+
+
+def _maximo_simultaneo(pasta):
+    eventos = []
+    with open(os.path.join(pasta, "execucoes.log")) as log:
+        for linha in log:
+            tipo, instante = linha.split()
+            eventos.append((float(instante), 1 if tipo == "inicio" else -1))
+    ativos = maximo = 0
+    for _, delta in sorted(eventos, key=lambda e: (e[0], e[1])):
+        ativos += delta
+        maximo = max(maximo, ativos)
+    return maximo
+
+
+def test_limite_de_processos_e_fila():
+    if os.name == 'nt':
+        return
+    with tempfile.TemporaryDirectory() as pasta:
+        eventos = []
+        pool = PostprocessPool(_LogSilencioso(), _ffmpeg_falso(pasta), hook=eventos.append, max_workers=2, max_pending=3)
+
+        futures = []
+        inicio = time.monotonic()
+        for i in range(3):
+            futures.append(pool.submit(_entradas(pasta, f"v{i}", [b"video", b"audio"]),
+                                       os.path.join(pasta, f"v{i}.mp4"), POSTPROCESS_MERGE,
+                                       info_dict={'id': f"v{i}"}))
+        # Fila cheia: o quarto envio espera um trabalho terminar
+        assert time.monotonic() - inicio < 0.2
+        futures.append(pool.submit(_entradas(pasta, "v3", [b"video"]), os.path.join(pasta, "v3.mp4"), POSTPROCESS_REMUX))
+        assert time.monotonic() - inicio >= 0.25
+
+        resultados = [future.result(timeout=10) for future in futures]
+        pool.shutdown()
+
+        assert resultados == [os.path.join(pasta, f"v{i}.mp4") for i in range(4)]
+        assert open(resultados[0], "rb").read() == b"videoaudio"
+        # Entradas removidas após o pós-processamento
+        assert not [nome for nome in os.listdir(pasta) if nome.endswith(".part")]
+        assert _maximo_simultaneo(pasta) <= 2
+
+        concluidos = [e for e in eventos if e['status'] == 'finished']
+        assert len(concluidos) == 4
+        assert concluidos[0]['postprocessor'] in ('FFmpegMerger', 'FFmpegVideoRemuxer')
+        assert all(e['stage_timing']['postprocess_seconds'] >= 0.3 for e in concluidos)
+        assert all(e['stage_timing']['cpu_seconds'] is not None for e in concluidos)
+
+
+def test_falha_do_ffmpeg():
+    if os.name == 'nt':
+        return
+    with tempfile.TemporaryDirectory() as pasta:
+        pool = PostprocessPool(_LogSilencioso(), _ffmpeg_falso(pasta), max_workers=1)
+        entrada = os.path.join(pasta, "falha")
+        open(entrada, "wb").close()
+        future = pool.submit([entrada], os.path.join(pasta, "saida.mp4"), POSTPROCESS_TRANSCODE)
+        try:
+            future.result(timeout=10)
+            assert False, "ffmpeg com erro deveria falhar o trabalho"
+        except RuntimeError as e:
+            assert "entrada invalida" in str(e)
+        pool.shutdown()
+
+
+def test_comandos_e_nomes_finais():
+    pool = PostprocessPool(_LogSilencioso(), "ffmpeg", max_workers=1)
+    try:
+        transcode = pool._build_command(["v.f1.webm", "v.f2.webm"], "v.mp4", POSTPROCESS_TRANSCODE, '192')
+        assert transcode[:1] == ["ffmpeg"] and transcode[-1] == "v.mp4"
+        assert "libx264" in transcode and transcode[9:13] == ["-map", "0:v:0", "-map", "1:a:0"]
+        assert "copy" in pool._build_command(["v.mkv"], "v.mp4", POSTPROCESS_REMUX, '192')
+        audio = pool._build_command(["a.webm"], "a.mp3", POSTPROCESS_EXTRACT_AUDIO, 'best')
+        assert "-vn" in audio and "192k" in audio
+    finally:
+        pool.shutdown()
+
+    video = FormatDecision("137+140", "resolucao", postprocess=POSTPROCESS_MERGE)
+    assert DownloadManager._final_output_path("/p/Vídeo.f137.mp4", "137", video) == "/p/Vídeo.mp4"
+    assert DownloadManager._final_output_path("/p/Nome.final.webm", "137", video) == "/p/Nome.final.mp4"
+    audio = FormatDecision("bestaudio", "resolucao", postprocess=POSTPROCESS_EXTRACT_AUDIO)
+    assert DownloadManager._final_output_path("/p/Música.f251.webm", "251", audio) == "/p/Música.mp3"
+    nenhum = FormatDecision("18", "resolucao", postprocess=POSTPROCESS_NONE)
+    assert DownloadManager._final_output_path("/p/a.f18.mp4", "18", nenhum) == "/p/a.mp4"
+
+
+if __name__ == "__main__":
+    test_limite_de_processos_e_fila()
+    test_falha_do_ffmpeg()
+    test_comandos_e_nomes_finais()
+    print("OK")
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do pós-processamento das playlists no DownloadManager: escolha entre
+remux e recodificação e medição do tempo (parede e CPU, "N/A" quando não medido)
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from download_manager import DownloadManager
+from format_index import FormatIndex
+from format_policy import FormatPolicyEngine, FormatDecision, ResolutionPolicy, POSTPROCESS_EXTRACT_AUDIO
+
+FORMATOS = [
+    {'format_id': '140', 'ext': 'm4a', 'resolution': 'audio only', 'vcodec': 'none', 'acodec': 'mp4a.40.2', 'abr': 129, 'filesize': 4_000_000},
+    {'format_id': '251', 'ext': 'webm', 'resolution': 'audio only', 'vcodec': 'none', 'acodec': 'opus', 'abr': 140, 'filesize': 4_200_000},
+    {'format_id': '18', 'ext': 'mp4', 'resolution': '640x360', 'height': 360, 'vcodec': 'avc1.42001E', 'acodec': 'mp4a.40.2', 'tbr': 500, 'filesize': 15_000_000},
+    {'format_id': '43', 'ext': 'webm', 'resolution': '640x360', 'height': 360, 'vcodec': 'vp8', 'acodec': 'vorbis', 'tbr': 600, 'filesize': 16_000_000},
+    {'format_id': '137', 'ext': 'mp4', 'resolution': '1920x1080', 'height': 1080, 'vcodec': 'avc1.640028', 'acodec': 'none', 'tbr': 4400, 'filesize': 130_000_000},
+    {'format_id': '248', 'ext': 'webm', 'resolution': '1920x1080', 'height': 1080, 'vcodec': 'vp9', 'acodec': 'none', 'tbr': 2600, 'filesize': 80_000_000},
+]
+
+
+class _Log:
+    """Guarda os eventos estruturados registrados"""
+
+    def __init__(self):
+        self.eventos = []
+
+    def log_event(self, evento, level=None, **campos):
+        self.eventos.append((evento, campos))
+
+    def log_info(self, message):
+        pass
+
+
+def _manager(cpu=()):
+    """DownloadManager com o CPU dos processos filhos lido de uma sequência fixa"""
+    manager = DownloadManager(_Log())
+    leituras = iter(cpu)
+    manager._children_cpu_seconds = lambda: next(leituras)
+    return manager
+
+
+def _evento(status, etapa, video_id="v1", stage_timing=None):
+    d = {'status': status, 'postprocessor': etapa, 'info_dict': {'id': video_id, 'filepath': f"/p/{video_id}.mp4"}}
+    if stage_timing is not None:
+        d['stage_timing'] = stage_timing
+    return d
+
+
+def test_opcoes_por_modo():
+    manager = DownloadManager(_Log())
+    index = FormatIndex(FORMATOS, duration=240)
+    engine = FormatPolicyEngine(_Log(), ResolutionPolicy())
+
+    # h264 + m4a: merge para mp4 com cópia de streams e remuxer (sem recodificar)
+    decision = engine.decide(index, '1920x1080')
+    assert decision.format_ids == ['137', '140'] and decision.postprocess == 'merge'
+    opcoes, postprocessors = manager._playlist_postprocess_options(decision)
+    assert opcoes == {'merge_output_format': 'mp4'}
+    assert [p['key'] for p in postprocessors] == ['FFmpegVideoRemuxer']
+
+    # Formato muxado já em mp4: nenhum postprocessor
+    decision = engine.decide(index, '640x360')
+    assert decision.format_ids == ['18'] and decision.postprocess == 'nenhum'
+    assert manager._playlist_postprocess_options(decision) == ({'merge_output_format': 'mp4'}, [])
+
+    # vp9 + opus: merge em mkv e uma única recodificação para mp4
+    engine.prefer_remux = False
+    decision = engine.decide(index, '1920x1080')
+    assert decision.format_ids == ['137', '251'] and decision.postprocess == 'transcodificar'
+    opcoes, postprocessors = manager._playlist_postprocess_options(decision)
+    assert opcoes == {'merge_output_format': 'mkv'}
+    assert postprocessors == [{'key': 'FFmpegVideoConvertor', 'preferedformat': 'mp4'}]
+
+    # Apenas áudio: extração em mp3, qualidade 'best' vira 192 kbps
+    audio = FormatDecision('bestaudio/best', 'audio', postprocess=POSTPROCESS_EXTRACT_AUDIO)
+    opcoes, postprocessors = manager._playlist_postprocess_options(audio)
+    assert opcoes == {}
+    assert postprocessors[0]['key'] == 'FFmpegExtractAudio' and postprocessors[0]['preferredquality'] == '192'
+    assert manager._playlist_postprocess_options(audio, '128')[1][0]['preferredquality'] == '128'
+
+
+def test_cpu_medido_pelos_processos_filhos():
+    manager = _manager(cpu=[1.0, 1.75])
+    manager._postprocessor_hook(_evento('started', 'FFmpegMerger'))
+    manager._postprocessor_hook(_evento('finished', 'FFmpegMerger'))
+
+    stats = manager.get_postprocess_stats('v1')
+    assert stats['cpu_seconds'] == 0.75
+    assert stats['etapas'][0]['cpu_seconds'] == 0.75
+    evento, campos = manager.log_manager.eventos[-1]
+    assert evento == 'pos_processamento' and campos['cpu_s'] == '0.75' and campos['arquivo'] == 'v1.mp4'
+
+
+def test_cpu_nao_medido_fica_none():
+    # Sistema sem contador de processos filhos (Windows)
+    manager = _manager(cpu=[None, None])
+    manager._postprocessor_hook(_evento('started', 'FFmpegMerger'))
+    manager._postprocessor_hook(_evento('finished', 'FFmpegMerger'))
+    stats = manager.get_postprocess_stats('v1')
+    assert stats['cpu_seconds'] is None and stats['wall_seconds'] >= 0
+    assert manager.log_manager.eventos[-1][1]['cpu_s'] == 'N/A'
+
+    # Etapas simultâneas dividem o mesmo contador: nenhuma delas é atribuída
+    manager = _manager(cpu=[1.0, 1.2, 2.0, 3.0])
+    manager._postprocessor_hook(_evento('started', 'FFmpegMerger', 'a'))
+    manager._postprocessor_hook(_evento('started', 'FFmpegMerger', 'b'))
+    manager._postprocessor_hook(_evento('finished', 'FFmpegMerger', 'a'))
+    manager._postprocessor_hook(_evento('finished', 'FFmpegMerger', 'b'))
+    assert manager.get_postprocess_stats('a')['cpu_seconds'] is None
+    assert manager.get_postprocess_stats('b')['cpu_seconds'] is None
+    assert [campos['cpu_s'] for _, campos in manager.log_manager.eventos] == ['N/A', 'N/A']
+
+    # Eventos do PostprocessPool trazem a própria medição, inclusive sem CPU
+    manager = _manager(cpu=[5.0, 5.0, 5.0])
+    manager._postprocessor_hook(_evento('finished', 'FFmpegMerger', 'c', {
+        'postprocess_seconds': 2.0, 'cpu_seconds': None, 'download_seconds': 3.0, 'queue_seconds': 0.5
+    }))
+    manager._postprocessor_hook(_evento('finished', 'FFmpegVideoRemuxer', 'c', {
+        'postprocess_seconds': 1.0, 'cpu_seconds': 0.4
+    }))
+    stats = manager.get_postprocess_stats('c')
+    assert stats['wall_seconds'] == 3.0 and stats['cpu_seconds'] == 0.4
+    assert [etapa['cpu_seconds'] for etapa in stats['etapas']] == [None, 0.4]
+    primeiro = manager.log_manager.eventos[0][1]
+    assert primeiro['cpu_s'] == 'N/A' and primeiro['download_s'] == '3.00' and primeiro['fila_s'] == '0.50'
+
+
+def test_contador_real_de_cpu():
+    cpu = DownloadManager._children_cpu_seconds()
+    if os.name == 'nt':
+        assert cpu is None
+    else:
+        assert isinstance(cpu, float) and cpu >= 0
+
+
+if __name__ == "__main__":
+    test_opcoes_por_modo()
+    test_cpu_medido_pelos_processos_filhos()
+    test_cpu_nao_medido_fica_none()
+    test_contador_real_de_cpu()
+    print("OK")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste das consultas com projeção (só os campos pedidos, em sqlite3.Row)
+"""
+
+import sys
+import os
+import sqlite3
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from history_manager import HistoryManager
+
+
+def _criar_banco(pasta, linhas=2500):
+    db_manager = DatabaseManager(os.path.join(pasta, "historico.db"))
+    db_manager.initialize()
+    db_manager.add_downloads_bulk([
+        {'url': f'https://youtu.be/{i}', 'title': f'Vídeo {i}', 'resolution': '720p' if i % 2 else '1080p',
+         'description': 'descrição ' * 500}
+        for i in range(linhas)
+    ])
+    return db_manager
+
+
+def test_select_downloads():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = _criar_banco(pasta)
+
+        linhas = db_manager.select_downloads(('id', 'title'), {'resolution': '720p'}, limit=10)
+        assert len(linhas) == 10
+        assert isinstance(linhas[0], sqlite3.Row)
+        assert linhas[0].keys() == ['id', 'title']
+
+        # A lista do histórico não lê a descrição
+        pagina = db_manager.get_downloads_paginated(page=2, per_page=100)
+        assert pagina['pagination']['total_count'] == 2500
+        assert pagina['downloads'][0].keys() == list(DatabaseManager.HISTORY_LIST_FIELDS)
+
+        try:
+            db_manager.select_downloads(('id', 'title; DROP TABLE downloads'))
+            assert False, "campo desconhecido deveria ser recusado"
+        except ValueError:
+            pass
+
+
+def test_iter_downloads():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = _criar_banco(pasta)
+
+        ids = [row['id'] for row in db_manager.iter_downloads(('id',), chunk_size=300)]
+        assert len(ids) == 2500
+        assert ids == sorted(ids, reverse=True)
+
+        blocos = list(db_manager.iter_downloads_filtered({'search_query': 'youtu.be/1'}, chunk_size=100))
+        assert all(len(bloco) <= 100 for bloco in blocos)
+        assert all(row['url'].startswith('https://youtu.be/1') for bloco in blocos for row in bloco)
+
+        horas = db_manager.query_rows("SELECT resolution, COUNT(*) AS count FROM downloads GROUP BY resolution")
+        assert {row['resolution']: row['count'] for row in horas} == {'720p': 1250, '1080p': 1250}
+
+
+def test_formatacao_historico():
+    with tempfile.TemporaryDirectory() as pasta:
+        history_manager = HistoryManager(_criar_banco(pasta, linhas=10))
+        pagina = history_manager.get_downloads_paginated(per_page=5)
+        assert len(pagina['downloads']) == 5
+        assert all(d['title_short'].startswith('Vídeo') for d in pagina['downloads'])
+
+
+if __name__ == "__main__":
+    test_select_downloads()
+    test_iter_downloads()
+    test_formatacao_historico()
+    print("OK")
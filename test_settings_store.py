@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste das configurações em memória (leitura única, gravação em lote e observadores)
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from database_manager import DatabaseManager
+from settings_store import SettingsStore
+from config_manager import ConfigManager
+
+
+class ContadorDeAcessos(DatabaseManager):
+    """DatabaseManager que conta leituras e gravações da tabela de configurações"""
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.leituras = 0
+        self.gravacoes = []
+
+    def get_all_settings(self):
+        self.leituras += 1
+        return super().get_all_settings()
+
+    def set_settings(self, values):
+        self.gravacoes.append(dict(values))
+        return super().set_settings(values)
+
+
+def test_settings_store():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = ContadorDeAcessos(os.path.join(pasta, "config.db"))
+        db_manager.initialize()
+        store = SettingsStore(db_manager, flush_delay=60)
+
+        # Padrões da migração v2, lidos uma única vez
+        assert store.get('theme') == 'light'
+        assert store.get('default_resolution') == '1080p'
+        assert store.get('inexistente', 'padrao') == 'padrao'
+        assert db_manager.leituras == 1
+
+        avisos = []
+        store.subscribe(lambda key, value, old: avisos.append((key, value, old)), key='theme')
+
+        assert store.set('theme', 'dark')
+        assert store.set('last_download_directory', '/videos')
+        assert store.set('theme', 'light')
+        assert not store.set('theme', 'light')
+        assert avisos == [('theme', 'dark', 'light'), ('theme', 'light', 'dark')]
+
+        # Nada gravado até o flush; depois, uma transação com o último valor de cada chave
+        assert db_manager.gravacoes == []
+        assert store.get('last_download_directory') == '/videos'
+        store.flush()
+        assert db_manager.gravacoes == [{'theme': 'light', 'last_download_directory': '/videos'}]
+        assert db_manager.get_setting('last_download_directory') == '/videos'
+        assert db_manager.leituras == 1
+
+
+def test_config_manager_usa_memoria():
+    with tempfile.TemporaryDirectory() as pasta:
+        db_manager = ContadorDeAcessos(os.path.join(pasta, "config.db"))
+        db_manager.initialize()
+        config = ConfigManager(db_manager)
+
+        assert config.save_theme('dark')
+        assert config.get_theme() == 'dark'
+        assert config.save_auto_open_folder(True)
+        assert config.should_auto_open_folder()
+        config.set_setting('last_download_directory', '/downloads')
+        assert config.get_setting('last_download_directory') == '/downloads'
+        config.close()
+
+        # Uma nova instância vê os valores gravados
+        assert ConfigManager(DatabaseManager(db_manager.db_path)).get_theme() == 'dark'
+        assert len(db_manager.gravacoes) == 1
+
+
+if __name__ == "__main__":
+    test_settings_store()
+    test_config_manager_usa_memoria()
+    print("OK")
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark de inicialização: tempo de importação (python -X importtime) e tempo até o
+primeiro frame da janela. Falha se a inicialização a frio regredir.
+"""
+
+import sys
+import os
+import subprocess
+import pytest
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+# Orçamentos da inicialização a frio (segundos)
+IMPORT_BUDGET_S = 1.0
+FIRST_FRAME_BUDGET_S = 2.0
+
+# Módulos que só devem ser carregados no primeiro uso (aba de análise, exportação, download)
+HEAVY_MODULES = ('matplotlib', 'numpy', 'pandas', 'reportlab', 'PIL', 'requests', 'yt_dlp')
+
+FIRST_FRAME_SCRIPT = r"""
+import os, sys, tempfile, time
+inicio = time.perf_counter()
+os.chdir(tempfile.mkdtemp())
+from log_manager import LogManager
+from database_manager import DatabaseManager
+from download_manager import DownloadManager
+from config_manager import ConfigManager
+from history_manager import HistoryManager
+from ui_components import MainApplication
+
+db_manager = DatabaseManager()
+db_manager.initialize()
+log_manager = LogManager()
+app = MainApplication(
+    download_manager=DownloadManager(log_manager),
+    config_manager=ConfigManager(db_manager),
+    history_manager=HistoryManager(db_manager, log_manager),
+    log_manager=log_manager
+)
+app.root.update()
+print(f"FIRST_FRAME={time.perf_counter() - inicio:.3f}")
+print("HEAVY=" + ",".join(m for m in %r if m in sys.modules))
+app.root.destroy()
+"""
+
+
+def _python(*args, code):
+    """Executa um interpretador novo (inicialização a frio) na raiz do projeto"""
+    env = dict(os.environ, PYTHONPATH=RAIZ, PYTHONDONTWRITEBYTECODE='1')
+    return subprocess.run(
+        [sys.executable, *args, '-c', code],
+        cwd=RAIZ, env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+def _cumulative_import_seconds(stderr, module):
+    """Tempo cumulativo de importação de `module` na saída de -X importtime"""
+    for linha in stderr.splitlines():
+        if not linha.startswith('import time:'):
+            continue
+        partes = [p.strip() for p in linha[len('import time:'):].split('|')]
+        if len(partes) == 3 and partes[2] == module:
+            return int(partes[1]) / 1_000_000
+    return None
+
+
+def _has_display():
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def test_startup_imports():
+    """Importar a aplicação não deve carregar módulos pesados e deve caber no orçamento"""
+    resultado = _python(
+        '-X', 'importtime',
+        code=f"import sys, yt_refactored; print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    assert resultado.returncode == 0, resultado.stderr[-2000:]
+
+    carregados = resultado.stdout.strip()
+    assert not carregados, f"Módulos pesados carregados na inicialização: {carregados}"
+
+    segundos = _cumulative_import_seconds(resultado.stderr, 'yt_refactored')
+    assert segundos is not None, "Saída do -X importtime não encontrada"
+    print(f"Importação de yt_refactored: {segundos:.3f}s (orçamento {IMPORT_BUDGET_S}s)")
+    assert segundos < IMPORT_BUDGET_S, f"Importação levou {segundos:.3f}s (orçamento {IMPORT_BUDGET_S}s)"
+
+
+def test_time_to_first_frame():
+    """A janela principal deve desenhar o primeiro frame dentro do orçamento"""
+    if not _has_display():
+        # Aparece como "skipped" no resultado, e não como um teste aprovado
+        pytest.skip("Sem display disponível; tempo até o primeiro frame não medido")
+
+    resultado = _python(code=FIRST_FRAME_SCRIPT % (HEAVY_MODULES,))
+    assert resultado.returncode == 0, resultado.stderr[-2000:]
+
+    valores = dict(
+        linha.split('=', 1) for linha in resultado.stdout.splitlines()
+        if linha.startswith(('FIRST_FRAME=', 'HEAVY='))
+    )
+    segundos = float(valores['FIRST_FRAME'])
+    print(f"Tempo até o primeiro frame: {segundos:.3f}s (orçamento {FIRST_FRAME_BUDGET_S}s)")
+    assert not valores.get('HEAVY'), f"Módulos pesados carregados antes do primeiro frame: {valores['HEAVY']}"
+    assert segundos < FIRST_FRAME_BUDGET_S, f"Primeiro frame levou {segundos:.3f}s (orçamento {FIRST_FRAME_BUDGET_S}s)"
+
+
+if __name__ == "__main__":
+    test_startup_imports()
+    try:
+        test_time_to_first_frame()
+    except pytest.skip.Exception as e:
+        print(f"Ignorado: {e}")
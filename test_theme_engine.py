@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste da troca de tema por estilos (ttk.Style + registro de widgets Tk clássicos)
+"""
+
+import sys
+import os
+import tkinter as tk
+from tkinter import ttk
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from theme_engine import ThemeEngine
+from utils import UIConstants
+
+
+def _has_display():
+    if sys.platform.startswith('win') or sys.platform == 'darwin':
+        return True
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def test_theme_switch():
+    if not _has_display():
+        print("Sem display disponível; troca de tema não testada")
+        return
+
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        engine = ThemeEngine(root)
+        label = tk.Label(root, text="clássico")
+        texto = tk.Text(root)
+        ttk.Label(root, text="ttk")
+        ttk.Treeview(root)
+
+        # Só a janela e os widgets clássicos entram no registro
+        assert engine.register_tree(root) == 3
+
+        escuro = UIConstants.THEME_DARK
+        assert engine.apply('dark') == 3
+        assert label.cget('background') == escuro['bg']
+        assert texto.cget('background') == escuro['field_bg']
+        assert engine.style.lookup('TLabel', 'background') == escuro['bg']
+        assert engine.style.lookup('Treeview', 'fieldbackground') == escuro['field_bg']
+
+        # Widgets clássicos criados depois já nascem com as cores do tema
+        novo = tk.Label(root, text="novo")
+        assert novo.cget('background') == escuro['bg']
+
+        # Widgets destruídos saem do registro
+        texto.destroy()
+        assert engine.apply('light') == 2
+        assert label.cget('background') == UIConstants.THEME_LIGHT['bg']
+    finally:
+        root.destroy()
+
+
+if __name__ == "__main__":
+    test_theme_switch()
+    print("OK")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Teste do ThumbnailService: cache em disco (acerto e limite de tamanho), LRU de
+PhotoImages, descarte de pedidos obsoletos e cancelamento do download
+"""
+
+import sys
+import os
+import time
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from thumbnail_service import ThumbnailService
+
+
+class _LogSilencioso:
+    def log_debug(self, message):
+        pass
+
+    def log_error(self, error, context=""):
+        raise AssertionError(f"{context}: {error}")
+
+
+class _Widget:
+    """Guarda os callbacks agendados, como o loop do Tk, até o teste executá-los"""
+
+    def __init__(self):
+        self.agendados = []
+
+    def after(self, atraso, funcao):
+        self.agendados.append(funcao)
+
+    def executar(self, quantidade, timeout=5):
+        limite = time.monotonic() + timeout
+        while len(self.agendados) < quantidade:
+            assert time.monotonic() < limite, "entrega da thumbnail não chegou"
+            time.sleep(0.01)
+        agendados, self.agendados = self.agendados, []
+        for funcao in agendados:
+            funcao()
+
+
+class ServicoSemTk(ThumbnailService):
+    """PhotoImage substituído pelos próprios bytes PNG (sem display no teste)"""
+
+    @staticmethod
+    def _create_photo(png):
+        return png
+
+
+def _no_cache(servico, video_id, conteudo=None):
+    os.makedirs(servico.cache_dir, exist_ok=True)
+    caminho = servico._cache_path(video_id)
+    with open(caminho, 'wb') as f:
+        f.write(conteudo or f"png {video_id}".encode())
+    return caminho
+
+
+def test_acerto_no_disco_e_lru():
+    with tempfile.TemporaryDirectory() as pasta:
+        servico = ServicoSemTk(_LogSilencioso(), cache_dir=pasta)
+        widget = _Widget()
+        try:
+            caminho = _no_cache(servico, "abc")
+            os.utime(caminho, (1, 1))
+
+            recebidas = []
+            servico.request(widget, "player", "https://img/abc.jpg", "abc", recebidas.append)
+            widget.executar(1)
+            assert recebidas == [b"png abc"]
+            # Acerto no disco atualiza o mtime (último uso)
+            assert os.path.getmtime(caminho) > 1
+
+            # Acerto na memória: entregue na hora, sem passar pelo disco
+            os.remove(caminho)
+            servico.request(widget, "player", "https://img/abc.jpg", "abc", recebidas.append)
+            assert recebidas == [b"png abc", b"png abc"] and widget.agendados == []
+
+            # LRU limitado a 64 PhotoImages
+            for i in range(70):
+                _no_cache(servico, f"v{i}")
+                servico.request(widget, f"dono{i}", f"https://img/v{i}.jpg", f"v{i}")
+                widget.executar(1)
+            assert servico.memory_items == 64
+            assert len(servico._photos) == 64
+            assert "abc" not in servico._photos and "v5" not in servico._photos
+            assert list(servico._photos)[-1] == "v69"
+        finally:
+            servico.shutdown()
+
+
+def test_pedido_obsoleto_descartado():
+    with tempfile.TemporaryDirectory() as pasta:
+        servico = ServicoSemTk(_LogSilencioso(), cache_dir=pasta)
+        widget = _Widget()
+        try:
+            _no_cache(servico, "antigo")
+            _no_cache(servico, "novo")
+
+            recebidas = []
+            servico.request(widget, "player", "https://img/antigo.jpg", "antigo", recebidas.append)
+            servico.request(widget, "player", "https://img/novo.jpg", "novo", recebidas.append)
+            widget.executar(2)
+            # Só o pedido mais recente do dono é entregue
+            assert recebidas == [b"png novo"]
+
+            # Cancelado antes da entrega
+            _no_cache(servico, "novo_2")
+            servico.request(widget, "player", "https://img/x.jpg", "novo_2", recebidas.append)
+            servico.cancel("player")
+            widget.executar(1)
+            assert recebidas == [b"png novo"]
+        finally:
+            servico.shutdown()
+
+
+class _Resposta:
+    def __init__(self, blocos, ao_ler=None):
+        self.blocos = blocos
+        self.ao_ler = ao_ler
+        self.fechada = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, tamanho):
+        for i, bloco in enumerate(self.blocos):
+            if self.ao_ler:
+                self.ao_ler(i)
+            yield bloco
+
+    def close(self):
+        self.fechada = True
+
+
+class _Sessao:
+    def __init__(self, resposta):
+        self.resposta = resposta
+        self.pedidos = []
+
+    def get(self, url, timeout=None, stream=False):
+        self.pedidos.append(url)
+        return self.resposta
+
+    def close(self):
+        pass
+
+
+def test_download_interrompido_quando_obsoleto():
+    with tempfile.TemporaryDirectory() as pasta:
+        servico = ServicoSemTk(_LogSilencioso(), cache_dir=pasta)
+        try:
+            geracao = servico._next_generation("player")
+            resposta = _Resposta([b"a", b"b"])
+            servico._session = _Sessao(resposta)
+            assert servico._download("https://img/a.jpg", "player", geracao) == b"ab"
+            assert resposta.fechada
+
+            # Pedido mais novo do mesmo dono durante o download: o antigo é abortado
+            resposta = _Resposta([b"a", b"b", b"c"], ao_ler=lambda i: i == 1 and servico.cancel("player"))
+            servico._session = _Sessao(resposta)
+            assert servico._download("https://img/a.jpg", "player", geracao) is None
+            assert resposta.fechada
+
+            # Pedido já obsoleto nem chega à rede
+            assert servico._load_png("sem_cache", "https://img/b.jpg", "player", geracao) is None
+            assert servico._session.pedidos == ["https://img/a.jpg"]
+        finally:
+            servico.shutdown()
+
+
+def test_limite_do_cache_em_disco():
+    with tempfile.TemporaryDirectory() as pasta:
+        servico = ServicoSemTk(_LogSilencioso(), cache_dir=pasta, disk_max_bytes=10_000)
+        try:
+            for i in range(8):
+                caminho = _no_cache(servico, f"v{i}", b"x" * 1000)
+                os.utime(caminho, (1000 + i, 1000 + i))
+            # v0 foi usada depois de todas
+            os.utime(servico._cache_path("v0"), (2000, 2000))
+
+            # Gravação que passa do limite: removidas as usadas há mais tempo até 90% do limite
+            caminho = _no_cache(servico, "v8", b"x" * 3000)
+            os.utime(caminho, (1500, 1500))
+            servico._account_disk_cache(3000)
+
+            restantes = sorted(nome.split('_')[0] for nome in os.listdir(pasta))
+            assert restantes == ["v0", "v3", "v4", "v5", "v6", "v7", "v8"]
+            assert servico._disk_bytes == 9000
+
+            # Abaixo do limite nada é removido
+            _no_cache(servico, "v9", b"x" * 500)
+            servico._account_disk_cache(500)
+            assert len(os.listdir(pasta)) == 8
+        finally:
+            servico.shutdown()
+
+
+if __name__ == "__main__":
+    test_acerto_no_disco_e_lru()
+    test_pedido_obsoleto_descartado()
+    test_download_interrompido_quando_obsoleto()
+    test_limite_do_cache_em_disco()
+    print("OK")
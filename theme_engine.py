@@ -0,0 +1,147 @@
+import tkinter as tk
+from tkinter import ttk
+from utils import UIConstants
+
+# Estilos ttk reconfigurados a cada troca de tema; widgets ttk herdam do
+# estilo da sua classe, então nenhum widget precisa ser tocado individualmente
+TTK_STYLES = (
+    '.', 'TFrame', 'TLabel', 'TLabelframe', 'TLabelframe.Label', 'TButton',
+    'TCheckbutton', 'TRadiobutton', 'TNotebook', 'TNotebook.Tab', 'TEntry',
+    'TCombobox', 'TSpinbox', 'Treeview', 'Treeview.Heading', 'TScrollbar', 'TProgressbar'
+)
+
+# Opções de cor de cada classe de widget Tk clássico -> chave da paleta
+CLASSIC_OPTIONS = {
+    'Tk': {'background': 'bg'},
+    'Frame': {'background': 'bg'},
+    'Toplevel': {'background': 'bg'},
+    'Canvas': {'background': 'bg'},
+    'Labelframe': {'background': 'bg', 'foreground': 'fg'},
+    'Label': {'background': 'bg', 'foreground': 'fg'},
+    'Button': {'background': 'bg', 'foreground': 'fg', 'activebackground': 'active_bg', 'activeforeground': 'fg'},
+    'Checkbutton': {'background': 'bg', 'foreground': 'fg', 'activebackground': 'active_bg',
+                    'activeforeground': 'fg', 'selectcolor': 'field_bg'},
+    'Radiobutton': {'background': 'bg', 'foreground': 'fg', 'activebackground': 'active_bg',
+                    'activeforeground': 'fg', 'selectcolor': 'field_bg'},
+    'Scale': {'background': 'bg', 'foreground': 'fg', 'troughcolor': 'field_bg'},
+    'Text': {'background': 'field_bg', 'foreground': 'fg', 'insertbackground': 'fg',
+             'selectbackground': 'select_bg', 'selectforeground': 'select_fg'},
+    'Listbox': {'background': 'field_bg', 'foreground': 'fg',
+                'selectbackground': 'select_bg', 'selectforeground': 'select_fg'},
+    'Entry': {'background': 'field_bg', 'foreground': 'fg', 'insertbackground': 'fg',
+              'selectbackground': 'select_bg', 'selectforeground': 'select_fg'},
+    'Spinbox': {'background': 'field_bg', 'foreground': 'fg', 'insertbackground': 'fg',
+                'selectbackground': 'select_bg', 'selectforeground': 'select_fg'},
+}
+
+
+class ThemeEngine:
+    """
+    Troca de tema baseada em estilos.
+
+    Widgets ttk são coloridos pelos estilos nomeados do ttk.Style, e widgets Tk
+    clássicos criados depois da troca recebem as cores pelo banco de opções do
+    Tk. Os widgets clássicos já existentes ficam em um registro (preenchido
+    com register_tree ao construir cada parte da interface), e só eles são
+    reconfigurados; a árvore de widgets não é percorrida a cada troca.
+    """
+
+    def __init__(self, root, log_manager=None):
+        """
+        Args:
+            root: Janela principal (tk.Tk)
+            log_manager: Instância do LogManager (opcional)
+        """
+        self.root = root
+        self.log_manager = log_manager
+        self.style = ttk.Style(root)
+        self.theme = None
+        self.colors = None
+        self._classic = {}
+
+    @staticmethod
+    def palette(theme):
+        """Paleta de cores do tema ('light' ou 'dark')"""
+        return dict(UIConstants.THEME_DARK if theme == 'dark' else UIConstants.THEME_LIGHT)
+
+    def apply(self, theme):
+        """
+        Aplica o tema: estilos ttk, banco de opções e widgets clássicos registrados
+
+        Returns:
+            int: Quantidade de widgets clássicos reconfigurados
+        """
+        self.theme = theme
+        self.colors = self.palette(theme)
+        self._configure_styles(self.colors)
+        self._configure_option_database(self.colors)
+
+        reconfigurados = 0
+        for nome, widget in list(self._classic.items()):
+            if not self._configure_classic(widget):
+                # Widget destruído desde o registro
+                del self._classic[nome]
+            else:
+                reconfigurados += 1
+        return reconfigurados
+
+    def register(self, widget):
+        """Registra um widget Tk clássico para ser recolorido nas trocas de tema"""
+        if isinstance(widget, ttk.Widget) or widget.winfo_class() not in CLASSIC_OPTIONS:
+            return False
+        self._classic[str(widget)] = widget
+        if self.colors is not None:
+            self._configure_classic(widget)
+        return True
+
+    def register_tree(self, parent):
+        """
+        Registra os widgets Tk clássicos de uma parte recém-construída da interface
+
+        Returns:
+            int: Quantidade de widgets registrados
+        """
+        registrados = 0
+        pendentes = [parent]
+        while pendentes:
+            widget = pendentes.pop()
+            if self.register(widget):
+                registrados += 1
+            pendentes.extend(widget.winfo_children())
+        return registrados
+
+    def _configure_styles(self, colors):
+        bg, fg = colors['bg'], colors['fg']
+        field_bg = colors['field_bg']
+        for style in TTK_STYLES:
+            self.style.configure(style, background=bg, foreground=fg)
+        for style in ('TEntry', 'TCombobox', 'TSpinbox', 'Treeview'):
+            self.style.configure(style, fieldbackground=field_bg, insertcolor=fg)
+        self.style.configure('Treeview', background=field_bg)
+        self.style.configure('Treeview.Heading', background=colors['active_bg'])
+        self.style.configure('TButton', background=colors['active_bg'])
+
+        selecao = [('selected', colors['select_bg'])]
+        self.style.map('Treeview', background=selecao, foreground=[('selected', colors['select_fg'])])
+        self.style.map('TNotebook.Tab', background=[('selected', bg), ('!selected', colors['active_bg'])])
+        self.style.map('TButton', background=[('active', colors['select_bg'])])
+        self.style.map('TCombobox', fieldbackground=[('readonly', field_bg)],
+                       selectbackground=selecao, selectforeground=[('selected', colors['select_fg'])])
+
+    def _configure_option_database(self, colors):
+        """Cores padrão dos widgets Tk clássicos criados a partir de agora"""
+        for classe, opcoes in CLASSIC_OPTIONS.items():
+            for opcao, chave in opcoes.items():
+                self.root.option_add(f"*{classe}.{opcao}", colors[chave])
+
+    def _configure_classic(self, widget):
+        try:
+            if not widget.winfo_exists():
+                return False
+            opcoes = CLASSIC_OPTIONS[widget.winfo_class()]
+            widget.configure(**{opcao: self.colors[chave] for opcao, chave in opcoes.items()})
+            return True
+        except tk.TclError as e:
+            if self.log_manager:
+                self.log_manager.log_error(e, f"Erro ao aplicar tema ao widget {widget}")
+            return False
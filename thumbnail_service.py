@@ -0,0 +1,278 @@
+import os
+import base64
+import hashlib
+import threading
+import tkinter as tk
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from utils import UIConstants
+
+# Bytes lidos por vez no download; entre blocos verifica-se se o pedido foi cancelado
+THUMBNAIL_CHUNK_SIZE = 16 * 1024
+
+THUMBNAIL_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# Tamanho máximo do cache em disco; ao passar dele as thumbnails usadas há mais
+# tempo (mtime) são removidas até o cache voltar a THUMBNAIL_CACHE_PRUNE_RATIO do limite
+THUMBNAIL_CACHE_MAX_BYTES = 50 * 1024 * 1024
+THUMBNAIL_CACHE_PRUNE_RATIO = 0.9
+
+
+class ThumbnailService:
+    """
+    Serviço de thumbnails do mini-player.
+
+    - Uma única `requests.Session` (conexões reaproveitadas) para todos os downloads
+    - Cache em disco das imagens já redimensionadas (PNG 160x90), chaveado pelo ID do vídeo
+      e limitado em tamanho (as usadas há mais tempo são removidas primeiro)
+    - LRU em memória de `PhotoImage`s, criados sempre na thread principal do Tk
+    - Cancelamento de pedidos obsoletos: cada dono (ex.: um mini-player) só recebe
+      a resposta do seu pedido mais recente; downloads antigos são interrompidos
+    """
+
+    def __init__(self, log_manager, cache_dir=os.path.join("cache", "thumbnails"),
+                 size=None, memory_items=64, max_workers=2, disk_max_bytes=THUMBNAIL_CACHE_MAX_BYTES):
+        """
+        Args:
+            log_manager: Instância do LogManager
+            cache_dir (str): Diretório do cache em disco
+            size (tuple): (largura, altura) das thumbnails
+            memory_items (int): Quantidade de PhotoImages mantidos em memória
+            max_workers (int): Downloads simultâneos
+            disk_max_bytes (int): Tamanho máximo do cache em disco
+        """
+        self.log_manager = log_manager
+        self.cache_dir = cache_dir
+        self.size = size or (UIConstants.MINI_PLAYER_THUMBNAIL_WIDTH, UIConstants.MINI_PLAYER_THUMBNAIL_HEIGHT)
+        self.memory_items = memory_items
+        self.disk_max_bytes = disk_max_bytes
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Thumbnail")
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._photos = OrderedDict()
+        self._generations = {}
+        self._generations_lock = threading.Lock()
+        # Bytes ocupados pelo cache em disco (medido na primeira gravação)
+        self._disk_bytes = None
+        self._disk_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # API pública (thread principal)
+    # ------------------------------------------------------------------
+
+    def request(self, widget, owner, url, video_id=None, callback=None):
+        """
+        Pede a thumbnail de um vídeo
+
+        O callback recebe o PhotoImage na thread principal, e só é chamado se
+        este ainda for o pedido mais recente de `owner`.
+
+        Args:
+            widget: Widget Tk usado para agendar a entrega na thread principal
+            owner (str): Identificador de quem exibe a imagem (ex.: 'download_tab')
+            url (str): URL da thumbnail
+            video_id (str): ID do vídeo (chave do cache); se ausente, usa hash da URL
+            callback: Função callback(photo)
+        """
+        if not url:
+            return
+        geracao = self._next_generation(owner)
+        chave = self._cache_key(video_id, url)
+
+        photo = self._photos.get(chave)
+        if photo is not None:
+            self._photos.move_to_end(chave)
+            if callback:
+                callback(photo)
+            return
+
+        future = self._executor.submit(self._load_png, chave, url, owner, geracao)
+
+        def entregar(f):
+            try:
+                widget.after(0, lambda: self._deliver(owner, geracao, chave, f, callback))
+            except (RuntimeError, tk.TclError):
+                # Janela já destruída
+                pass
+
+        future.add_done_callback(entregar)
+
+    def cancel(self, owner):
+        """Descarta qualquer pedido em andamento de `owner`"""
+        self._next_generation(owner)
+
+    def shutdown(self):
+        """Encerra os downloads e fecha as conexões"""
+        with self._generations_lock:
+            for owner in self._generations:
+                self._generations[owner] += 1
+        self._executor.shutdown(wait=False)
+        if self._session is not None:
+            self._session.close()
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _next_generation(self, owner):
+        with self._generations_lock:
+            geracao = self._generations.get(owner, 0) + 1
+            self._generations[owner] = geracao
+            return geracao
+
+    def _is_current(self, owner, geracao):
+        with self._generations_lock:
+            return self._generations.get(owner) == geracao
+
+    @staticmethod
+    def _cache_key(video_id, url):
+        if video_id:
+            return "".join(c for c in str(video_id) if c.isalnum() or c in ('-', '_'))
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _cache_path(self, chave):
+        largura, altura = self.size
+        return os.path.join(self.cache_dir, f"{chave}_{largura}x{altura}.png")
+
+    def _get_session(self):
+        """Sessão HTTP compartilhada (criada sob demanda)"""
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers['User-Agent'] = THUMBNAIL_USER_AGENT
+                self._session = session
+            return self._session
+
+    def _load_png(self, chave, url, owner, geracao):
+        """Worker: retorna os bytes PNG já redimensionados (cache em disco ou rede)"""
+        caminho = self._cache_path(chave)
+        if os.path.exists(caminho):
+            with open(caminho, 'rb') as f:
+                png = f.read()
+            # mtime marca o último uso: a limpeza do cache remove primeiro as mais antigas
+            try:
+                os.utime(caminho)
+            except OSError:
+                pass
+            return png
+
+        if not self._is_current(owner, geracao):
+            return None
+
+        conteudo = self._download(url, owner, geracao)
+        if conteudo is None:
+            return None
+
+        from PIL import Image
+        image = Image.open(BytesIO(conteudo)).convert('RGB')
+        image = image.resize(self.size, Image.Resampling.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, format='PNG')
+        png = buffer.getvalue()
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temporario = f"{caminho}.{threading.get_ident()}.tmp"
+            with open(temporario, 'wb') as f:
+                f.write(png)
+            os.replace(temporario, caminho)
+            self._account_disk_cache(len(png))
+        except OSError as e:
+            self.log_manager.log_error(e, "Erro ao gravar thumbnail no cache")
+
+        return png
+
+    def _disk_entries(self):
+        """(mtime, tamanho, caminho) de cada thumbnail do cache em disco"""
+        try:
+            nomes = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        entradas = []
+        for nome in nomes:
+            if not nome.endswith('.png'):
+                continue
+            caminho = os.path.join(self.cache_dir, nome)
+            try:
+                info = os.stat(caminho)
+            except OSError:
+                continue
+            entradas.append((info.st_mtime, info.st_size, caminho))
+        return entradas
+
+    def _account_disk_cache(self, novos_bytes):
+        """Soma uma gravação ao tamanho do cache e limpa o cache se passar do limite"""
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(tamanho for _, tamanho, _ in self._disk_entries())
+            else:
+                self._disk_bytes += novos_bytes
+            if self._disk_bytes > self.disk_max_bytes:
+                self._prune_disk_cache()
+
+    def _prune_disk_cache(self):
+        """Remove as thumbnails usadas há mais tempo (chamar com _disk_lock)"""
+        entradas = sorted(self._disk_entries())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        alvo = self.disk_max_bytes * THUMBNAIL_CACHE_PRUNE_RATIO
+        removidas = 0
+        for _, tamanho, caminho in entradas:
+            if total <= alvo:
+                break
+            try:
+                os.remove(caminho)
+            except OSError:
+                continue
+            total -= tamanho
+            removidas += 1
+        self._disk_bytes = total
+        if removidas:
+            self.log_manager.log_debug(f"Cache de thumbnails limpo: {removidas} arquivo(s) removido(s)")
+
+    def _download(self, url, owner, geracao):
+        """Baixa a imagem original, abortando se o pedido ficar obsoleto"""
+        resposta = self._get_session().get(url, timeout=15, stream=True)
+        try:
+            resposta.raise_for_status()
+            partes = []
+            for bloco in resposta.iter_content(THUMBNAIL_CHUNK_SIZE):
+                if not self._is_current(owner, geracao):
+                    self.log_manager.log_debug(f"Download de thumbnail cancelado: {url[:80]}")
+                    return None
+                partes.append(bloco)
+            return b"".join(partes)
+        finally:
+            resposta.close()
+
+    def _deliver(self, owner, geracao, chave, future, callback):
+        """Thread principal: cria o PhotoImage, guarda no LRU e entrega ao dono"""
+        try:
+            png = future.result()
+        except Exception as e:
+            self.log_manager.log_error(e, "Erro ao carregar thumbnail")
+            return
+
+        if png is None:
+            return
+
+        photo = self._photos.get(chave)
+        if photo is None:
+            photo = self._create_photo(png)
+            self._photos[chave] = photo
+            while len(self._photos) > self.memory_items:
+                self._photos.popitem(last=False)
+        self._photos.move_to_end(chave)
+
+        if callback and self._is_current(owner, geracao):
+            callback(photo)
+
+    @staticmethod
+    def _create_photo(png):
+        return tk.PhotoImage(data=base64.b64encode(png))
@@ -0,0 +1,1091 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+import csv
+import base64
+from io import BytesIO
+from datetime import datetime
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import numpy as np
+from analytics_manager import AnalyticsManager, RecommendationEngine
+from background_tasks import BackgroundTasks
+from bulk_export import BulkExporter
+from ui.export_dialog import ExportProgressDialog
+
+# Tamanho usado enquanto a área do gráfico ainda não foi desenhada
+CHART_DEFAULT_SIZE = (800, 600)
+CHART_DPI = 100
+
+class AnalyticsTab:
+    """Aba de análise e estatísticas de downloads"""
+    
+    def __init__(self, parent, history_manager, log_manager):
+        """
+        Inicializa a aba de análise
+        
+        Args:
+            parent: Widget pai
+            history_manager: Instância do HistoryManager
+            log_manager: Instância do LogManager
+        """
+        self.parent = parent
+        self.history_manager = history_manager
+        self.log_manager = log_manager
+        
+        # Inicializar gerenciadores de análise
+        self.analytics_manager = AnalyticsManager(
+            self.history_manager.db_manager,
+            self.log_manager
+        )
+        self.recommendation_engine = RecommendationEngine(
+            self.analytics_manager,
+            self.history_manager.db_manager,
+            self.log_manager
+        )
+        
+        # Configurar matplotlib para tema escuro
+        matplotlib.style.use('dark_background')
+        
+        # Consultas e renderização dos gráficos rodam fora da thread principal;
+        # um pedido novo (ex.: troca de período) torna o anterior obsoleto
+        self.tasks = BackgroundTasks(parent, log_manager)
+        self.chart_images = {}
+        self._resize_job = None
+        
+        # Seções e gráficos com dados desatualizados; cada um só é carregado
+        # quando estiver visível, em passos separados do loop do Tk
+        self.stale_sections = set()
+        self.stale_charts = set()
+        self._render_job = None
+        
+        self.create_widgets()
+        self.setup_layout()
+        
+        # Carregar os dados depois que a aba for desenhada
+        self.frame.after_idle(self.load_analytics_data)
+    
+    def create_widgets(self):
+        """Cria os widgets da aba de análise"""
+        # Frame principal
+        self.frame = ttk.Frame(self.parent)
+        
+        # Criar notebook para sub-abas
+        self.analytics_notebook = ttk.Notebook(self.frame)
+        
+        # Criar sub-abas
+        self.create_dashboard_tab()
+        self.create_charts_tab()
+        self.create_reports_tab()
+        self.create_recommendations_tab()
+        
+        # Carregamento de cada sub-aba (frame -> função)
+        self.section_loaders = {
+            str(self.dashboard_frame): self.update_dashboard_stats,
+            str(self.charts_frame): self.render_visible_chart,
+            str(self.reports_frame): self.generate_report,
+            str(self.recommendations_frame): self.update_recommendations
+        }
+        self.analytics_notebook.bind('<<NotebookTabChanged>>', self.on_section_changed)
+        
+        # Botão de atualização
+        self.refresh_button = ttk.Button(
+            self.frame,
+            text="🔄 Atualizar Dados",
+            command=self.refresh_analytics
+        )
+    
+    def create_dashboard_tab(self):
+        """Cria a aba do dashboard principal"""
+        self.dashboard_frame = ttk.Frame(self.analytics_notebook)
+        self.analytics_notebook.add(self.dashboard_frame, text="📊 Dashboard")
+        
+        # Frame para estatísticas gerais
+        stats_frame = ttk.LabelFrame(self.dashboard_frame, text="Estatísticas Gerais")
+        stats_frame.pack(fill='x', padx=10, pady=5)
+        
+        # Grid para estatísticas
+        self.stats_labels = {}
+        stats_data = [
+            ('total_downloads', 'Total de Downloads'),
+            ('successful_downloads', 'Downloads Concluídos'),
+            ('success_rate', 'Taxa de Sucesso (%)'),
+            ('total_size_gb', 'Tamanho Total (GB)'),
+            ('unique_channels', 'Canais Únicos'),
+            ('avg_size_mb', 'Tamanho Médio (MB)')
+        ]
+        
+        for i, (key, label) in enumerate(stats_data):
+            row = i // 3
+            col = (i % 3) * 2
+            
+            ttk.Label(stats_frame, text=f"{label}:").grid(
+                row=row, column=col, sticky='w', padx=5, pady=2
+            )
+            
+            value_label = ttk.Label(stats_frame, text="0", font=('Arial', 10, 'bold'))
+            value_label.grid(row=row, column=col+1, sticky='w', padx=5, pady=2)
+            self.stats_labels[key] = value_label
+        
+        # Frame para top canais
+        channels_frame = ttk.LabelFrame(self.dashboard_frame, text="Top 5 Canais")
+        channels_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Treeview para canais
+        self.channels_tree = ttk.Treeview(
+            channels_frame,
+            columns=('downloads', 'size'),
+            show='tree headings',
+            height=6
+        )
+        self.channels_tree.heading('#0', text='Canal')
+        self.channels_tree.heading('downloads', text='Downloads')
+        self.channels_tree.heading('size', text='Tamanho (MB)')
+        
+        self.channels_tree.column('#0', width=300)
+        self.channels_tree.column('downloads', width=100)
+        self.channels_tree.column('size', width=100)
+        
+        # Scrollbar para canais
+        channels_scrollbar = ttk.Scrollbar(channels_frame, orient='vertical', command=self.channels_tree.yview)
+        self.channels_tree.configure(yscrollcommand=channels_scrollbar.set)
+        
+        self.channels_tree.pack(side='left', fill='both', expand=True)
+        channels_scrollbar.pack(side='right', fill='y')
+    
+    def create_charts_tab(self):
+        """Cria a aba de gráficos"""
+        self.charts_frame = ttk.Frame(self.analytics_notebook)
+        self.analytics_notebook.add(self.charts_frame, text="📈 Gráficos")
+        
+        # Frame de controles
+        controls_frame = ttk.Frame(self.charts_frame)
+        controls_frame.pack(fill='x', padx=10, pady=5)
+        
+        # Seletor de período
+        ttk.Label(controls_frame, text="Período:").pack(side='left', padx=5)
+        self.period_var = tk.StringVar(value="30")
+        period_combo = ttk.Combobox(
+            controls_frame,
+            textvariable=self.period_var,
+            values=["7", "30", "90", "365"],
+            state="readonly",
+            width=10
+        )
+        period_combo.pack(side='left', padx=5)
+        period_combo.bind('<<ComboboxSelected>>', self.on_period_change)
+        
+        # Botão para atualizar gráficos
+        ttk.Button(
+            controls_frame,
+            text="Atualizar Gráficos",
+            command=self.update_charts
+        ).pack(side='left', padx=10)
+        
+        # Notebook para diferentes gráficos
+        self.charts_notebook = ttk.Notebook(self.charts_frame)
+        self.charts_notebook.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Criar frames para gráficos
+        self.chart_labels = {}
+        self.create_resolution_chart()
+        self.create_trend_chart()
+        self.create_hourly_chart()
+        self.create_storage_chart()
+        self.create_bandwidth_chart()
+        
+        # Desenho de cada gráfico (frame -> função que recebe a figura e o período)
+        self.chart_updaters = {
+            str(self.resolution_frame): self.update_resolution_chart,
+            str(self.trend_frame): self.update_trend_chart,
+            str(self.hourly_frame): self.update_hourly_chart,
+            str(self.storage_frame): lambda fig, period_days: self.update_storage_chart(fig),
+            str(self.bandwidth_frame): self.update_bandwidth_chart
+        }
+        self.charts_notebook.bind('<<NotebookTabChanged>>', self.on_chart_tab_changed)
+        self.charts_notebook.bind('<Configure>', self.on_charts_resize)
+    
+    def create_chart_frame(self, text):
+        """
+        Cria a sub-aba de um gráfico
+        
+        O gráfico é renderizado fora da thread principal como PNG e exibido
+        em um Label, em vez de um canvas matplotlib desenhado no loop do Tk.
+        """
+        frame = ttk.Frame(self.charts_notebook)
+        self.charts_notebook.add(frame, text=text)
+        
+        label = ttk.Label(frame, text="Carregando gráfico...", anchor='center')
+        label.pack(fill='both', expand=True)
+        self.chart_labels[str(frame)] = label
+        return frame
+    
+    def create_resolution_chart(self):
+        """Cria gráfico de distribuição por resolução"""
+        self.resolution_frame = self.create_chart_frame("Resoluções")
+    
+    def create_trend_chart(self):
+        """Cria gráfico de tendência temporal"""
+        self.trend_frame = self.create_chart_frame("Tendência")
+    
+    def create_hourly_chart(self):
+        """Cria gráfico de distribuição por hora"""
+        self.hourly_frame = self.create_chart_frame("Por Hora")
+    
+    def create_storage_chart(self):
+        """Cria gráfico de análise de armazenamento"""
+        self.storage_frame = self.create_chart_frame("Armazenamento")
+    
+    def create_bandwidth_chart(self):
+        """Cria gráfico de análise de uso de banda"""
+        self.bandwidth_frame = self.create_chart_frame("Uso de Banda")
+    
+    def create_reports_tab(self):
+        """Cria a aba de relatórios"""
+        self.reports_frame = ttk.Frame(self.analytics_notebook)
+        self.analytics_notebook.add(self.reports_frame, text="📋 Relatórios")
+        
+        # Frame de controles
+        controls_frame = ttk.Frame(self.reports_frame)
+        controls_frame.pack(fill='x', padx=10, pady=5)
+        
+        # Seletor de tipo de relatório
+        ttk.Label(controls_frame, text="Tipo de Relatório:").pack(side='left', padx=5)
+        self.report_type_var = tk.StringVar(value="summary")
+        report_combo = ttk.Combobox(
+            controls_frame,
+            textvariable=self.report_type_var,
+            values=["summary", "detailed", "channels", "resolutions"],
+            state="readonly",
+            width=15
+        )
+        report_combo.pack(side='left', padx=5)
+        
+        # Botões de ação
+        ttk.Button(
+            controls_frame,
+            text="Gerar Relatório",
+            command=self.generate_report
+        ).pack(side='left', padx=10)
+        
+        ttk.Button(
+            controls_frame,
+            text="Exportar PDF",
+            command=self.export_report_pdf
+        ).pack(side='left', padx=5)
+        
+        ttk.Button(
+            controls_frame,
+            text="Exportar CSV",
+            command=self.export_report_csv
+        ).pack(side='left', padx=5)
+        
+        ttk.Button(
+            controls_frame,
+            text="Exportar Dados",
+            command=self.export_bulk_data
+        ).pack(side='left', padx=5)
+        
+        # Área de texto para relatório
+        text_frame = ttk.Frame(self.reports_frame)
+        text_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        self.report_text = tk.Text(
+            text_frame,
+            wrap='word',
+            font=('Consolas', 10)
+        )
+        
+        report_scrollbar = ttk.Scrollbar(text_frame, orient='vertical', command=self.report_text.yview)
+        self.report_text.configure(yscrollcommand=report_scrollbar.set)
+        
+        self.report_text.pack(side='left', fill='both', expand=True)
+        report_scrollbar.pack(side='right', fill='y')
+    
+    def create_recommendations_tab(self):
+        """Cria a aba de recomendações"""
+        self.recommendations_frame = ttk.Frame(self.analytics_notebook)
+        self.analytics_notebook.add(self.recommendations_frame, text="💡 Recomendações")
+        
+        # Frame para recomendações de resolução
+        resolution_rec_frame = ttk.LabelFrame(
+            self.recommendations_frame,
+            text="Recomendação de Resolução"
+        )
+        resolution_rec_frame.pack(fill='x', padx=10, pady=5)
+        
+        self.resolution_rec_label = ttk.Label(
+            resolution_rec_frame,
+            text="Analisando padrões...",
+            font=('Arial', 10)
+        )
+        self.resolution_rec_label.pack(padx=10, pady=5)
+        
+        # Frame para recomendações de horário
+        time_rec_frame = ttk.LabelFrame(
+            self.recommendations_frame,
+            text="Melhor Horário para Downloads"
+        )
+        time_rec_frame.pack(fill='x', padx=10, pady=5)
+        
+        self.time_rec_label = ttk.Label(
+            time_rec_frame,
+            text="Analisando padrões...",
+            font=('Arial', 10)
+        )
+        self.time_rec_label.pack(padx=10, pady=5)
+        
+        # Frame para recomendações de armazenamento
+        storage_rec_frame = ttk.LabelFrame(
+            self.recommendations_frame,
+            text="Gerenciamento de Armazenamento"
+        )
+        storage_rec_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Listbox para recomendações de armazenamento
+        self.storage_rec_listbox = tk.Listbox(
+            storage_rec_frame,
+            font=('Arial', 9),
+            height=8
+        )
+        
+        storage_rec_scrollbar = ttk.Scrollbar(
+            storage_rec_frame,
+            orient='vertical',
+            command=self.storage_rec_listbox.yview
+        )
+        self.storage_rec_listbox.configure(yscrollcommand=storage_rec_scrollbar.set)
+        
+        self.storage_rec_listbox.pack(side='left', fill='both', expand=True, padx=5, pady=5)
+        storage_rec_scrollbar.pack(side='right', fill='y', pady=5)
+    
+    def setup_layout(self):
+        """Configura o layout da aba"""
+        self.analytics_notebook.pack(fill='both', expand=True, padx=5, pady=5)
+        self.refresh_button.pack(pady=5)
+    
+    def load_analytics_data(self):
+        """
+        Carrega os dados de análise
+        
+        Todas as sub-abas são marcadas como desatualizadas, mas apenas a visível
+        é carregada agora; as demais carregam na primeira vez que forem abertas.
+        """
+        self.stale_sections = set(self.section_loaders)
+        self.stale_charts = set(self.chart_updaters)
+        self.schedule_render()
+    
+    def schedule_render(self):
+        """Agenda o carregamento da sub-aba visível para o próximo ciclo ocioso do Tk"""
+        if self._render_job is None:
+            self._render_job = self.frame.after_idle(self.render_visible_section)
+    
+    def render_visible_section(self):
+        """Carrega a sub-aba visível, se os dados dela estiverem desatualizados"""
+        self._render_job = None
+        try:
+            section = self.analytics_notebook.select()
+            if section not in self.stale_sections:
+                return
+            self.stale_sections.discard(section)
+            self.section_loaders[section]()
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao carregar dados de análise: {e}")
+            messagebox.showerror("Erro", f"Erro ao carregar dados de análise: {e}")
+    
+    def on_section_changed(self, event=None):
+        """Carrega a sub-aba selecionada na primeira vez que ela for aberta"""
+        self.schedule_render()
+    
+    def on_chart_tab_changed(self, event=None):
+        """Desenha o gráfico selecionado se ele estiver desatualizado"""
+        if str(self.charts_frame) not in self.stale_sections:
+            self.frame.after_idle(self.render_visible_chart)
+    
+    def update_dashboard_stats(self):
+        """Atualiza as estatísticas do dashboard (consultas em segundo plano)"""
+        def load(check):
+            stats = self.analytics_manager.get_download_statistics()
+            check()
+            return stats, self.analytics_manager.get_top_channels(limit=5)
+        
+        self.tasks.submit('dashboard', load, self.show_dashboard_stats)
+    
+    def show_dashboard_stats(self, result):
+        """Thread principal: exibe as estatísticas do dashboard"""
+        try:
+            stats, top_channels = result
+            
+            for key, label_widget in self.stats_labels.items():
+                value = stats.get(key, 0)
+                if isinstance(value, float):
+                    value = f"{value:.2f}"
+                label_widget.config(text=str(value))
+            
+            # Atualizar top canais
+            self.update_top_channels(top_channels)
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar estatísticas: {e}")
+    
+    def update_top_channels(self, top_channels):
+        """Atualiza a lista de top canais"""
+        try:
+            # Limpar árvore
+            self.channels_tree.delete(*self.channels_tree.get_children())
+            
+            for channel, count in top_channels:
+                # Calcular tamanho aproximado (placeholder)
+                size_mb = count * 50  # Estimativa
+                
+                self.channels_tree.insert(
+                    '',
+                    'end',
+                    text=channel,
+                    values=(count, f"{size_mb:.1f}")
+                )
+                
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar top canais: {e}")
+    
+    def update_charts(self):
+        """Atualiza os gráficos: o visível agora, os demais quando forem abertos"""
+        self.stale_charts = set(self.chart_updaters)
+        self.render_visible_chart()
+    
+    def render_visible_chart(self):
+        """Renderiza em segundo plano apenas o gráfico visível, se estiver desatualizado"""
+        try:
+            chart = self.charts_notebook.select()
+            if chart not in self.stale_charts:
+                return
+            self.stale_charts.discard(chart)
+            period_days = int(self.period_var.get())
+            update_chart = self.chart_updaters[chart]
+            
+            label = self.chart_labels[chart]
+            width, height = label.winfo_width(), label.winfo_height()
+            if width <= 1 or height <= 1:
+                width, height = CHART_DEFAULT_SIZE
+            
+            def render(check):
+                fig = Figure(figsize=(width / CHART_DPI, height / CHART_DPI), dpi=CHART_DPI)
+                update_chart(fig, period_days)
+                check()
+                return self.figure_to_png(fig)
+            
+            self.tasks.submit(
+                f"grafico:{chart}",
+                render,
+                lambda png: self.show_chart(chart, png),
+                lambda error: label.config(image='', text=f"Erro ao gerar gráfico: {error}")
+            )
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar gráficos: {e}")
+    
+    @staticmethod
+    def figure_to_png(fig):
+        """Renderiza a figura com o backend Agg (sem Tk) e retorna os bytes PNG"""
+        buffer = BytesIO()
+        FigureCanvasAgg(fig).print_png(buffer)
+        return buffer.getvalue()
+    
+    def show_chart(self, chart, png):
+        """Thread principal: exibe o PNG renderizado na sub-aba do gráfico"""
+        photo = tk.PhotoImage(data=base64.b64encode(png))
+        self.chart_images[chart] = photo
+        self.chart_labels[chart].config(image=photo, text='')
+    
+    def on_charts_resize(self, event=None):
+        """Renderiza os gráficos novamente no novo tamanho (após o redimensionamento parar)"""
+        if self._resize_job is not None:
+            self.frame.after_cancel(self._resize_job)
+        self._resize_job = self.frame.after(300, self.on_charts_resized)
+    
+    def on_charts_resized(self):
+        self._resize_job = None
+        if self.chart_images:
+            self.update_charts()
+    
+    def update_resolution_chart(self, fig, period_days):
+        """Atualiza o gráfico de distribuição por resolução"""
+        try:
+            ax = fig.add_subplot(111)
+            
+            distribution = self.analytics_manager.get_resolution_distribution(period_days)
+            
+            if distribution:
+                resolutions = list(distribution.keys())
+                counts = list(distribution.values())
+                
+                colors_list = matplotlib.colormaps['Set3'](np.linspace(0, 1, len(resolutions)))
+                
+                wedges, texts, autotexts = ax.pie(
+                    counts,
+                    labels=resolutions,
+                    autopct='%1.1f%%',
+                    colors=colors_list,
+                    startangle=90
+                )
+                
+                ax.set_title(f'Distribuição por Resolução ({period_days} dias)', fontsize=12, color='white')
+                
+                # Configurar cores do texto
+                for text in texts:
+                    text.set_color('white')
+                for autotext in autotexts:
+                    autotext.set_color('black')
+                    autotext.set_fontweight('bold')
+            else:
+                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
+                       horizontalalignment='center', verticalalignment='center',
+                       transform=ax.transAxes, fontsize=12, color='white')
+            
+            fig.patch.set_facecolor('#2e2e2e')
+            ax.set_facecolor('#2e2e2e')
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar gráfico de resolução: {e}")
+    
+    def update_trend_chart(self, fig, period_days):
+        """Atualiza o gráfico de tendência temporal"""
+        try:
+            ax = fig.add_subplot(111)
+            
+            trend_data = self.analytics_manager.get_daily_download_trend(period_days)
+            
+            if trend_data['dates'] and trend_data['counts']:
+                dates = [datetime.strptime(date, '%Y-%m-%d') for date in trend_data['dates']]
+                counts = trend_data['counts']
+                
+                ax.plot(dates, counts, marker='o', linewidth=2, markersize=4, color='#00ff88')
+                ax.fill_between(dates, counts, alpha=0.3, color='#00ff88')
+                
+                ax.set_title(f'Tendência de Downloads ({period_days} dias)', fontsize=12, color='white')
+                ax.set_xlabel('Data', color='white')
+                ax.set_ylabel('Número de Downloads', color='white')
+                
+                # Configurar cores dos eixos
+                ax.tick_params(colors='white')
+                ax.spines['bottom'].set_color('white')
+                ax.spines['top'].set_color('white')
+                ax.spines['right'].set_color('white')
+                ax.spines['left'].set_color('white')
+                
+                # Rotacionar labels das datas
+                ax.tick_params(axis='x', labelrotation=45)
+            else:
+                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
+                       horizontalalignment='center', verticalalignment='center',
+                       transform=ax.transAxes, fontsize=12, color='white')
+            
+            fig.patch.set_facecolor('#2e2e2e')
+            ax.set_facecolor('#2e2e2e')
+            fig.tight_layout()
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar gráfico de tendência: {e}")
+    
+    def update_hourly_chart(self, fig, period_days):
+        """Atualiza o gráfico de distribuição por hora"""
+        try:
+            ax = fig.add_subplot(111)
+            
+            hourly_dist = self.analytics_manager.get_hourly_distribution(period_days)
+            
+            if hourly_dist:
+                hours = list(range(24))
+                counts = [hourly_dist.get(hour, 0) for hour in hours]
+                
+                bars = ax.bar(hours, counts, color='#ff6b6b', alpha=0.7)
+                
+                # Destacar hora de pico
+                max_hour = max(hourly_dist.items(), key=lambda x: x[1])[0] if hourly_dist else 0
+                if max_hour < len(bars):
+                    bars[max_hour].set_color('#ff3333')
+                
+                ax.set_title(f'Downloads por Hora do Dia ({period_days} dias)', fontsize=12, color='white')
+                ax.set_xlabel('Hora do Dia', color='white')
+                ax.set_ylabel('Número de Downloads', color='white')
+                ax.set_xticks(range(0, 24, 2))
+                
+                # Configurar cores
+                ax.tick_params(colors='white')
+                ax.spines['bottom'].set_color('white')
+                ax.spines['top'].set_color('white')
+                ax.spines['right'].set_color('white')
+                ax.spines['left'].set_color('white')
+            else:
+                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
+                       horizontalalignment='center', verticalalignment='center',
+                       transform=ax.transAxes, fontsize=12, color='white')
+            
+            fig.patch.set_facecolor('#2e2e2e')
+            ax.set_facecolor('#2e2e2e')
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar gráfico por hora: {e}")
+    
+    def update_storage_chart(self, fig):
+        """Atualiza o gráfico de análise de armazenamento"""
+        try:
+            ax = fig.add_subplot(111)
+            
+            storage_analysis = self.analytics_manager.get_storage_analysis()
+            
+            if storage_analysis['by_resolution']:
+                resolutions = [item['resolution'] for item in storage_analysis['by_resolution']]
+                sizes = [item['total_size_mb'] for item in storage_analysis['by_resolution']]
+                
+                colors_list = matplotlib.colormaps['viridis'](np.linspace(0, 1, len(resolutions)))
+                
+                bars = ax.bar(resolutions, sizes, color=colors_list)
+                
+                ax.set_title('Uso de Armazenamento por Resolução', fontsize=12, color='white')
+                ax.set_xlabel('Resolução', color='white')
+                ax.set_ylabel('Tamanho Total (MB)', color='white')
+                
+                # Rotacionar labels
+                ax.tick_params(axis='x', labelrotation=45)
+                
+                # Configurar cores
+                ax.tick_params(colors='white')
+                ax.spines['bottom'].set_color('white')
+                ax.spines['top'].set_color('white')
+                ax.spines['right'].set_color('white')
+                ax.spines['left'].set_color('white')
+            else:
+                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
+                       horizontalalignment='center', verticalalignment='center',
+                       transform=ax.transAxes, fontsize=12, color='white')
+            
+            fig.patch.set_facecolor('#2e2e2e')
+            ax.set_facecolor('#2e2e2e')
+            fig.tight_layout()
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar gráfico de armazenamento: {e}")
+    
+    def update_bandwidth_chart(self, fig, period_days):
+        """Atualiza o gráfico de uso de banda"""
+        try:
+            ax = fig.add_subplot(111)
+            
+            # Obter dados de velocidade do banco de dados
+            from datetime import datetime, timedelta
+            end_date = datetime.now()
+            start_date = end_date - timedelta(days=period_days)
+            
+            # Consultar dados de velocidade do banco de dados
+            import sqlite3
+            conn = sqlite3.connect(self.history_manager.db_manager.db_path)
+            cursor = conn.cursor()
+            
+            query = """
+                SELECT DATE(download_date) as date, 
+                       AVG(avg_speed_mbps) as avg_speed,
+                       MAX(peak_speed_mbps) as max_speed,
+                       MIN(avg_speed_mbps) as min_speed
+                FROM downloads 
+                WHERE download_date >= ? AND download_date <= ?
+                  AND avg_speed_mbps IS NOT NULL
+                GROUP BY DATE(download_date)
+                ORDER BY date
+            """
+            
+            cursor.execute(query, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
+            results = cursor.fetchall()
+            conn.close()
+            
+            if results:
+                dates = []
+                avg_speeds = []
+                max_speeds = []
+                min_speeds = []
+                
+                for row in results:
+                    dates.append(datetime.strptime(row[0], '%Y-%m-%d'))
+                    avg_speeds.append(row[1] if row[1] else 0)
+                    max_speeds.append(row[2] if row[2] else 0)
+                    min_speeds.append(row[3] if row[3] else 0)
+                
+                # Plotar gráfico de linha
+                ax.plot(dates, avg_speeds, label='Velocidade Média', color='#4CAF50', linewidth=2)
+                ax.plot(dates, max_speeds, label='Velocidade Máxima', color='#FF9800', linewidth=1, alpha=0.7)
+                ax.fill_between(dates, min_speeds, max_speeds, alpha=0.2, color='#2196F3')
+                
+                ax.set_title('Análise de Velocidade de Download', fontsize=12, color='white')
+                ax.set_xlabel('Data', color='white')
+                ax.set_ylabel('Velocidade (Mbps)', color='white')
+                ax.legend()
+                
+                # Formatar datas no eixo x
+                import matplotlib.dates as mdates
+                ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
+                ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, period_days // 10)))
+                ax.tick_params(axis='x', labelrotation=45)
+                
+                # Configurar cores
+                ax.tick_params(colors='white')
+                ax.spines['bottom'].set_color('white')
+                ax.spines['top'].set_color('white')
+                ax.spines['right'].set_color('white')
+                ax.spines['left'].set_color('white')
+                
+                # Configurar legenda
+                legend = ax.legend()
+                legend.get_frame().set_facecolor('#2e2e2e')
+                for text in legend.get_texts():
+                    text.set_color('white')
+            else:
+                ax.text(0.5, 0.5, 'Sem dados de velocidade disponíveis', 
+                       horizontalalignment='center', verticalalignment='center',
+                       transform=ax.transAxes, fontsize=12, color='white')
+            
+            fig.patch.set_facecolor('#2e2e2e')
+            ax.set_facecolor('#2e2e2e')
+            fig.tight_layout()
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar gráfico de banda: {e}")
+    
+    def update_recommendations(self):
+        """Atualiza as recomendações (consultas em segundo plano)"""
+        def load(check):
+            resolution_rec = self.recommendation_engine.get_resolution_recommendation()
+            check()
+            time_rec = self.recommendation_engine.get_optimal_download_time()
+            check()
+            return resolution_rec, time_rec, self.recommendation_engine.get_storage_recommendations()
+        
+        self.tasks.submit('recomendacoes', load, self.show_recommendations)
+    
+    def show_recommendations(self, result):
+        """Thread principal: exibe as recomendações"""
+        try:
+            resolution_rec, time_rec, storage_recs = result
+            
+            # Recomendação de resolução
+            resolution_text = f"Resolução recomendada: {resolution_rec['recommended_resolution']}\n"
+            resolution_text += f"Motivo: {resolution_rec['reason']}\n"
+            resolution_text += f"Confiança: {resolution_rec['confidence']*100:.1f}%"
+            self.resolution_rec_label.config(text=resolution_text)
+            
+            # Recomendação de horário
+            time_text = f"Melhores horários: {', '.join(map(str, time_rec['recommended_hours'][:3]))}h\n"
+            time_text += f"Horário de pico: {time_rec['peak_hour']}h\n"
+            time_text += f"Motivo: {time_rec['reason']}"
+            self.time_rec_label.config(text=time_text)
+            
+            # Recomendações de armazenamento
+            self.storage_rec_listbox.delete(0, tk.END)
+            
+            if storage_recs:
+                for rec in storage_recs:
+                    priority_icon = "🔴" if rec['priority'] == 'high' else "🟡" if rec['priority'] == 'medium' else "🟢"
+                    text = f"{priority_icon} {rec['title']}: {rec['description']}"
+                    self.storage_rec_listbox.insert(tk.END, text)
+            else:
+                self.storage_rec_listbox.insert(tk.END, "✅ Nenhuma recomendação no momento")
+                
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar recomendações: {e}")
+    
+    def generate_report(self):
+        """Gera relatório baseado no tipo selecionado (em segundo plano)"""
+        report_type = self.report_type_var.get()
+        
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(1.0, "Gerando relatório...")
+        
+        def build(check):
+            if report_type == "summary":
+                return self.generate_summary_report()
+            elif report_type == "detailed":
+                return self.generate_detailed_report()
+            elif report_type == "channels":
+                return self.generate_channels_report()
+            elif report_type == "resolutions":
+                return self.generate_resolutions_report()
+            return "Tipo de relatório não reconhecido."
+        
+        self.tasks.submit(
+            'relatorio',
+            build,
+            self.show_report,
+            lambda error: self.show_report(f"Erro ao gerar relatório: {error}")
+        )
+    
+    def show_report(self, report):
+        """Thread principal: exibe o texto do relatório"""
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(1.0, report)
+    
+    def generate_summary_report(self):
+        """Gera relatório resumido"""
+        stats = self.analytics_manager.get_download_statistics()
+        
+        report = f"""RELATÓRIO RESUMIDO DE DOWNLOADS
+{'='*50}
+Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
+
+ESTATÍSTICAS GERAIS (30 dias):
+{'-'*30}
+Total de Downloads: {stats.get('total_downloads', 0)}
+Downloads Concluídos: {stats.get('successful_downloads', 0)}
+Taxa de Sucesso: {stats.get('success_rate', 0):.2f}%
+Tamanho Total: {stats.get('total_size_gb', 0):.2f} GB
+Tamanho Médio: {stats.get('avg_size_mb', 0):.2f} MB
+Canais Únicos: {stats.get('unique_channels', 0)}
+Downloads de Áudio: {stats.get('audio_downloads', 0)}
+Downloads de Vídeo: {stats.get('video_downloads', 0)}
+
+TOP 5 CANAIS:
+{'-'*15}"""
+        
+        top_channels = self.analytics_manager.get_top_channels(limit=5)
+        for i, (channel, count) in enumerate(top_channels, 1):
+            report += f"\n{i}. {channel}: {count} downloads"
+        
+        return report
+    
+    def generate_detailed_report(self):
+        """Gera relatório detalhado"""
+        stats = self.analytics_manager.get_download_statistics()
+        resolution_dist = self.analytics_manager.get_resolution_distribution()
+        storage_analysis = self.analytics_manager.get_storage_analysis()
+        
+        report = f"""RELATÓRIO DETALHADO DE DOWNLOADS
+{'='*50}
+Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
+
+ESTATÍSTICAS GERAIS:
+{'-'*20}
+Período analisado: 30 dias
+Total de Downloads: {stats.get('total_downloads', 0)}
+Downloads Concluídos: {stats.get('successful_downloads', 0)}
+Downloads com Erro: {stats.get('failed_downloads', 0)}
+Taxa de Sucesso: {stats.get('success_rate', 0):.2f}%
+
+ARMAZENAMENTO:
+{'-'*15}
+Tamanho Total: {stats.get('total_size_gb', 0):.2f} GB
+Tamanho Médio por Download: {stats.get('avg_size_mb', 0):.2f} MB
+Total de Arquivos: {storage_analysis.get('total_files', 0)}
+
+DISTRIBUIÇÃO POR RESOLUÇÃO:
+{'-'*30}"""
+        
+        for resolution, count in resolution_dist.items():
+            percentage = (count / stats.get('total_downloads', 1)) * 100
+            report += f"\n{resolution}: {count} downloads ({percentage:.1f}%)"
+        
+        report += f"\n\nANÁLISE DE ARMAZENAMENTO POR RESOLUÇÃO:\n{'-'*40}"
+        for item in storage_analysis.get('by_resolution', []):
+            report += f"\n{item['resolution']}: {item['total_size_mb']:.1f} MB ({item['count']} arquivos)"
+        
+        return report
+    
+    def generate_channels_report(self):
+        """Gera relatório de canais"""
+        top_channels = self.analytics_manager.get_top_channels(limit=20)
+        
+        report = f"""RELATÓRIO DE CANAIS
+{'='*30}
+Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
+
+TOP 20 CANAIS MAIS BAIXADOS:
+{'-'*35}"""
+        
+        for i, (channel, count) in enumerate(top_channels, 1):
+            report += f"\n{i:2d}. {channel:<40} {count:>3d} downloads"
+        
+        return report
+    
+    def generate_resolutions_report(self):
+        """Gera relatório de resoluções"""
+        resolution_dist = self.analytics_manager.get_resolution_distribution()
+        storage_analysis = self.analytics_manager.get_storage_analysis()
+        
+        report = f"""RELATÓRIO DE RESOLUÇÕES
+{'='*35}
+Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
+
+DISTRIBUIÇÃO POR RESOLUÇÃO:
+{'-'*30}"""
+        
+        total_downloads = sum(resolution_dist.values()) if resolution_dist else 1
+        
+        for resolution, count in resolution_dist.items():
+            percentage = (count / total_downloads) * 100
+            report += f"\n{resolution:<15} {count:>4d} downloads ({percentage:>5.1f}%)"
+        
+        report += f"\n\nUSO DE ARMAZENAMENTO POR RESOLUÇÃO:\n{'-'*40}"
+        for item in storage_analysis.get('by_resolution', []):
+            avg_size = item['avg_size_mb']
+            report += f"\n{item['resolution']:<15} {item['total_size_mb']:>8.1f} MB (média: {avg_size:.1f} MB)"
+        
+        return report
+    
+    def export_report_pdf(self):
+        """Exporta relatório atual para PDF"""
+        try:
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".pdf",
+                filetypes=[("PDF files", "*.pdf")],
+                title="Salvar Relatório PDF"
+            )
+            
+            if filename:
+                # reportlab só é carregado quando o usuário exporta um PDF
+                from reportlab.lib.pagesizes import A4
+                from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+                from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+                
+                report_content = self.report_text.get(1.0, tk.END)
+                
+                doc = SimpleDocTemplate(filename, pagesize=A4)
+                styles = getSampleStyleSheet()
+                story = []
+                
+                # Título
+                title_style = ParagraphStyle(
+                    'CustomTitle',
+                    parent=styles['Heading1'],
+                    fontSize=16,
+                    spaceAfter=30,
+                    alignment=1  # Center
+                )
+                story.append(Paragraph("Relatório de Analytics - YouTube Downloader", title_style))
+                story.append(Spacer(1, 12))
+                
+                # Conteúdo
+                content_style = ParagraphStyle(
+                    'CustomContent',
+                    parent=styles['Normal'],
+                    fontSize=10,
+                    fontName='Courier'
+                )
+                
+                # Dividir conteúdo em linhas e criar parágrafos
+                lines = report_content.split('\n')
+                for line in lines:
+                    if line.strip():
+                        story.append(Paragraph(line, content_style))
+                    else:
+                        story.append(Spacer(1, 6))
+                
+                doc.build(story)
+                messagebox.showinfo("Sucesso", f"Relatório exportado para: {filename}")
+                
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao exportar PDF: {e}")
+            messagebox.showerror("Erro", f"Erro ao exportar PDF: {e}")
+    
+    def export_report_csv(self):
+        """Exporta dados para CSV"""
+        try:
+            filename = filedialog.asksaveasfilename(
+                defaultextension=".csv",
+                filetypes=[("CSV files", "*.csv")],
+                title="Salvar Dados CSV"
+            )
+            
+            if filename:
+                report_type = self.report_type_var.get()
+                
+                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.writer(csvfile)
+                    
+                    if report_type == "channels":
+                        writer.writerow(['Canal', 'Downloads'])
+                        top_channels = self.analytics_manager.get_top_channels(limit=50)
+                        for channel, count in top_channels:
+                            writer.writerow([channel, count])
+                    
+                    elif report_type == "resolutions":
+                        writer.writerow(['Resolução', 'Downloads', 'Tamanho Total (MB)', 'Tamanho Médio (MB)'])
+                        resolution_dist = self.analytics_manager.get_resolution_distribution()
+                        storage_analysis = self.analytics_manager.get_storage_analysis()
+                        
+                        storage_by_res = {item['resolution']: item for item in storage_analysis.get('by_resolution', [])}
+                        
+                        for resolution, count in resolution_dist.items():
+                            storage_info = storage_by_res.get(resolution, {})
+                            total_size = storage_info.get('total_size_mb', 0)
+                            avg_size = storage_info.get('avg_size_mb', 0)
+                            writer.writerow([resolution, count, total_size, avg_size])
+                    
+                    else:
+                        # Exportar estatísticas gerais
+                        stats = self.analytics_manager.get_download_statistics()
+                        writer.writerow(['Métrica', 'Valor'])
+                        for key, value in stats.items():
+                            writer.writerow([key.replace('_', ' ').title(), value])
+                
+                messagebox.showinfo("Sucesso", f"Dados exportados para: {filename}")
+                
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao exportar CSV: {e}")
+            messagebox.showerror("Erro", f"Erro ao exportar CSV: {e}")
+    
+    def export_bulk_data(self):
+        """Exporta a tabela de downloads completa (Parquet, Arrow ou JSON Lines)"""
+        try:
+            filetypes = [("JSON Lines (gzip)", "*.jsonl.gz"), ("JSON Lines", "*.jsonl")]
+            if 'parquet' in BulkExporter.available_formats():
+                filetypes = [("Parquet", "*.parquet"), ("Arrow IPC", "*.arrow")] + filetypes
+            
+            filename = filedialog.asksaveasfilename(
+                defaultextension=filetypes[0][1][1:],
+                filetypes=filetypes,
+                title="Exportar Dados de Downloads"
+            )
+            if not filename:
+                return
+            
+            exporter = BulkExporter(self.history_manager.db_manager, self.log_manager)
+            
+            def job(progress, cancel_event):
+                sucesso, resultado = exporter.export(filename, progress=progress, cancel_event=cancel_event)
+                if sucesso:
+                    resultado = f"{resultado['rows']} registro(s) exportado(s) para:\n{filename}"
+                return sucesso, resultado
+            
+            dialog = ExportProgressDialog(self.parent, "Exportando dados", self.log_manager)
+            dialog.start(job, self.on_bulk_export_finished)
+            
+        except Exception as e:
+            self.log_manager.log_error(e, "Erro ao exportar dados")
+            messagebox.showerror("Erro", f"Erro ao exportar dados: {e}")
+    
+    def on_bulk_export_finished(self, success, message):
+        """Informa o resultado da exportação de dados"""
+        if success or message == "Exportação cancelada":
+            messagebox.showinfo("Exportação", message)
+        else:
+            messagebox.showerror("Erro", message)
+    
+    def on_period_change(self, event=None):
+        """Callback para mudança de período"""
+        self.update_charts()
+    
+    def refresh_analytics(self):
+        """Atualiza todos os dados de análise"""
+        try:
+            # Limpar cache (na thread de trabalho, antes das novas consultas)
+            self.tasks.submit('cache', lambda check: self.analytics_manager.clear_cache())
+            
+            # Recarregar dados
+            self.load_analytics_data()
+            
+            messagebox.showinfo("Sucesso", "Dados de análise atualizados!")
+            
+        except Exception as e:
+            self.log_manager.log_error(f"Erro ao atualizar análise: {e}")
+            messagebox.showerror("Erro", f"Erro ao atualizar análise: {e}")
+    
+    def shutdown(self):
+        """Descarta os cálculos pendentes e encerra a thread de trabalho"""
+        self.tasks.shutdown()
@@ -0,0 +1,170 @@
+import re
+import tkinter as tk
+from collections import OrderedDict
+
+# Padrão para detectar URLs
+URL_PATTERN = re.compile(r'https?://[^\s<>"{}|\\^`\[\]]+')
+
+# Caracteres inseridos de imediato (primeira tela visível do painel)
+DESCRIPTION_FIRST_CHUNK = 4000
+
+# Caracteres inseridos por callback ocioso no restante do texto
+DESCRIPTION_CHUNK = 8000
+
+# Vídeos com a detecção de links guardada
+DESCRIPTION_CACHE_SIZE = 16
+
+
+def split_link_segments(text):
+    """
+    Divide o texto em trechos comuns e links
+
+    Returns:
+        list: Tuplas (trecho, é_link) na ordem do texto
+    """
+    segmentos = []
+    ultimo = 0
+    for match in URL_PATTERN.finditer(text):
+        inicio, fim = match.span()
+        if inicio > ultimo:
+            segmentos.append((text[ultimo:inicio], False))
+        segmentos.append((match.group(), True))
+        ultimo = fim
+    if ultimo < len(text):
+        segmentos.append((text[ultimo:], False))
+    return segmentos
+
+
+def plan_chunks(segmentos, first_chunk=DESCRIPTION_FIRST_CHUNK, chunk=DESCRIPTION_CHUNK):
+    """
+    Agrupa os trechos em blocos de inserção
+
+    O primeiro bloco tem até `first_chunk` caracteres e os demais até `chunk`.
+    Trechos comuns são cortados no limite do bloco; links nunca são cortados.
+
+    Returns:
+        list: Blocos, cada um uma lista de tuplas (trecho, é_link)
+    """
+    blocos = []
+    atual = []
+    limite = first_chunk
+    tamanho = 0
+    for trecho, link in segmentos:
+        while trecho:
+            espaco = limite - tamanho
+            if espaco <= 0:
+                blocos.append(atual)
+                atual, tamanho, limite = [], 0, chunk
+                continue
+            if link or len(trecho) <= espaco:
+                atual.append((trecho, link))
+                tamanho += len(trecho)
+                break
+            atual.append((trecho[:espaco], False))
+            tamanho += espaco
+            trecho = trecho[espaco:]
+    if atual:
+        blocos.append(atual)
+    return blocos
+
+
+class DescriptionRenderer:
+    """
+    Insere descrições longas em um tk.Text sem travar o loop principal.
+
+    O primeiro bloco (o que aparece na tela) é inserido na hora e o restante
+    é inserido em blocos nos callbacks ociosos do Tk. Cada bloco é um único
+    `insert` com os links já marcados com a tag. A detecção de links fica
+    guardada por vídeo, então reexibir um vídeo não repete a busca.
+    """
+
+    def __init__(self, text_widget, link_tag="link", first_chunk=DESCRIPTION_FIRST_CHUNK,
+                 chunk=DESCRIPTION_CHUNK, cache_size=DESCRIPTION_CACHE_SIZE):
+        """
+        Args:
+            text_widget: tk.Text de destino
+            link_tag (str): Tag aplicada aos links
+            first_chunk (int): Caracteres inseridos de imediato
+            chunk (int): Caracteres por callback ocioso
+            cache_size (int): Vídeos com a detecção de links guardada
+        """
+        self.text = text_widget
+        self.link_tag = link_tag
+        self.first_chunk = first_chunk
+        self.chunk = chunk
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._pending = []
+        self._after_id = None
+        self.link_count = 0
+
+    def render(self, text, cache_key=None):
+        """
+        Insere `text` no fim do widget, detectando links
+
+        Args:
+            text (str): Texto a inserir
+            cache_key: Identificador do vídeo, para reaproveitar a detecção de links
+        """
+        self.cancel()
+        segmentos = self._segments(text, cache_key)
+        self.link_count = sum(1 for _, link in segmentos if link)
+
+        blocos = plan_chunks(segmentos, self.first_chunk, self.chunk)
+        if not blocos:
+            return
+        self._insert(blocos[0])
+        self._pending = blocos[1:]
+        self._schedule()
+
+    def cancel(self):
+        """Interrompe a inserção em andamento (ex.: o texto foi apagado)"""
+        if self._after_id is not None:
+            try:
+                self.text.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+            self._after_id = None
+        self._pending = []
+
+    @property
+    def busy(self):
+        """True enquanto ainda há blocos a inserir"""
+        return bool(self._pending)
+
+    def _segments(self, text, cache_key):
+        if cache_key is None:
+            return split_link_segments(text)
+        chave = (cache_key, len(text))
+        segmentos = self._cache.get(chave)
+        if segmentos is None:
+            segmentos = split_link_segments(text)
+            self._cache[chave] = segmentos
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(chave)
+        return segmentos
+
+    def _insert(self, bloco):
+        # Um único insert com pares (trecho, tags)
+        argumentos = []
+        for trecho, link in bloco:
+            argumentos.extend((trecho, (self.link_tag,) if link else ()))
+        self.text.insert(tk.END, *argumentos)
+
+    def _schedule(self):
+        if self._pending:
+            self._after_id = self.text.after_idle(self._insert_next)
+
+    def _insert_next(self):
+        self._after_id = None
+        if not self._pending:
+            return
+        try:
+            self._insert(self._pending.pop(0))
+        except tk.TclError:
+            # Widget destruído
+            self._pending = []
+            return
+        self._schedule()
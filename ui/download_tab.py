@@ -5,16 +5,17 @@ import webbrowser
 import re
 import uuid
 import os
-from PIL import Image, ImageTk
-import io
-import requests
 
 from utils.app_utils import AppUtils
 from utils.ui_utils import UIConstants
+from thumbnail_service import ThumbnailService
 
 class DownloadTab:
     """Aba de download de vídeos"""
     
+    # Dono dos pedidos de thumbnail deste mini-player no ThumbnailService
+    THUMBNAIL_OWNER = 'download_tab'
+    
     def __init__(self, parent, download_manager, config_manager, history_manager, log_manager, main_app):
         self.parent = parent
         self.download_manager = download_manager
@@ -22,6 +23,7 @@ class DownloadTab:
         self.history_manager = history_manager
         self.log_manager = log_manager
         self.main_app = main_app
+        self.thumbnail_service = getattr(main_app, 'thumbnail_service', None) or ThumbnailService(log_manager)
         
         self.frame = tk.Frame(parent)
         self.current_resolutions = []
@@ -40,7 +42,7 @@ class DownloadTab:
     def load_last_directory(self):
         """Carrega o último diretório de download salvo"""
         try:
-            last_dir = self.config_manager.db_manager.get_setting('last_download_directory')
+            last_dir = self.config_manager.get_setting('last_download_directory')
             if last_dir and os.path.isdir(last_dir):
                 self.download_manager.set_download_directory(last_dir)
                 self.directory_label.config(text=f"Diretório: {last_dir}")
@@ -475,7 +477,6 @@ class DownloadTab:
             title = video_info.get('title', 'N/A')
             duration = video_info.get('duration', 0)
             uploader = video_info.get('uploader', 'N/A')
-            upload_date = video_info.get('upload_date', 'N/A')
             view_count = video_info.get('view_count', 0)
             like_count = video_info.get('like_count', 0)
             description = video_info.get('description', 'N/A')
@@ -489,18 +490,20 @@ class DownloadTab:
                 estimated_size = video_info['filesize']
             elif 'filesize_approx' in video_info and video_info['filesize_approx']:
                 estimated_size = video_info['filesize_approx']
-            self.history_manager.add_download_to_history(
-                title=title,
-                url=url,
-                resolution=resolution_for_history,
-                file_size=estimated_size,
-                duration=duration,
-                uploader=uploader,
-                upload_date=upload_date,
-                view_count=view_count,
-                like_count=like_count,
-                description=description
-            )
+            success, result = self.history_manager.queue_download_to_history({
+                'title': title,
+                'url': url,
+                'resolution': resolution_for_history,
+                'file_size': estimated_size,
+                'duration': duration,
+                'download_path': self.download_manager.download_directory,
+                'uploader': uploader,
+                'view_count': view_count,
+                'like_count': like_count,
+                'description': description
+            })
+            if not success:
+                self.log_manager.log_error(f"Erro ao adicionar vídeo da playlist ao histórico: {result}")
         except Exception as e:
             self.log_manager.log_error(f"Erro ao adicionar vídeo da playlist ao histórico: {str(e)}")
     
@@ -513,7 +516,7 @@ class DownloadTab:
                 self.directory_label.config(text=f"Diretório: {directory}")
                 self.enable_download_if_ready()
                 try:
-                    self.config_manager.db_manager.set_setting('last_download_directory', directory)
+                    self.config_manager.set_setting('last_download_directory', directory)
                     self.log_manager.log_info(f"Último diretório salvo: {directory}")
                 except Exception as e:
                     self.log_manager.log_error(str(e), "Erro ao salvar último diretório")
@@ -729,18 +732,22 @@ class DownloadTab:
                         if f.get('format_note') == resolution:
                             file_size = f.get('filesize', f.get('filesize_approx', 'N/A'))
                             break
-            return self.history_manager.add_download_to_history(
-                title=metadata.get('title', 'N/A'),
-                url=metadata.get('webpage_url', 'N/A'),
-                resolution=resolution,
-                file_size=file_size,
-                duration=metadata.get('duration', 0),
-                uploader=metadata.get('uploader', 'N/A'),
-                upload_date=metadata.get('upload_date', 'N/A'),
-                view_count=metadata.get('view_count', 0),
-                like_count=metadata.get('like_count', 0),
-                description=metadata.get('description', 'N/A')
-            )
+            success, result = self.history_manager.add_download_to_history({
+                'title': metadata.get('title', 'N/A'),
+                'url': metadata.get('webpage_url', 'N/A'),
+                'resolution': resolution,
+                'file_size': file_size,
+                'duration': metadata.get('duration', 0),
+                'download_path': self.download_manager.download_directory,
+                'uploader': metadata.get('uploader', 'N/A'),
+                'view_count': metadata.get('view_count', 0),
+                'like_count': metadata.get('like_count', 0),
+                'description': metadata.get('description', 'N/A')
+            })
+            if not success:
+                self.log_manager.log_error(f"Erro ao adicionar ao histórico: {result}")
+                return None
+            return result
         except Exception as e:
             self.log_manager.log_error(e, "Erro ao adicionar ao histórico")
             return None
@@ -770,21 +777,20 @@ class DownloadTab:
             return
         self.mini_player_title.config(text=title)
         self.mini_player_info.config(text=f"por {uploader}")
-        def load_image():
-            try:
-                response = requests.get(thumbnail_url, stream=True)
-                response.raise_for_status()
-                image_data = response.content
-                img = Image.open(io.BytesIO(image_data))
-                img.thumbnail((120, 90))
-                photo = ImageTk.PhotoImage(img)
-                self.thumbnail_label.config(image=photo)
-                self.thumbnail_label.image = photo
-                self.show_mini_player()
-            except Exception as e:
-                self.log_manager.log_error(f"Erro ao carregar thumbnail: {e}")
-                self.hide_mini_player()
-        threading.Thread(target=load_image, daemon=True).start()
+        
+        def show_image(photo):
+            self.thumbnail_label.config(image=photo)
+            self.thumbnail_label.image = photo
+            self.show_mini_player()
+        
+        # Sessão, cache em disco e LRU compartilhados; pedidos antigos são descartados
+        self.thumbnail_service.request(
+            self.thumbnail_label,
+            self.THUMBNAIL_OWNER,
+            thumbnail_url,
+            video_id=video_info.get('id'),
+            callback=show_image
+        )
     
     def show_mini_player(self):
         """Mostra o mini-player"""
@@ -795,6 +801,7 @@ class DownloadTab:
     
     def hide_mini_player(self):
         """Esconde o mini-player"""
+        self.thumbnail_service.cancel(self.THUMBNAIL_OWNER)
         self.mini_player_frame.grid_remove()
         self.thumbnail_label.pack_forget()
         self.mini_player_title.pack_forget()
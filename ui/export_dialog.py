@@ -0,0 +1,85 @@
+import threading
+import tkinter as tk
+from tkinter import ttk
+
+
+class ExportProgressDialog:
+    """
+    Janela de progresso de uma exportação executada em segundo plano.
+
+    O trabalho roda em uma thread própria e recebe uma função de progresso e
+    um `threading.Event` de cancelamento; o progresso volta para a thread
+    principal via `after`. O botão Cancelar (ou fechar a janela) sinaliza o
+    evento e o trabalho para no próximo bloco.
+    """
+
+    def __init__(self, parent, title, log_manager=None):
+        """
+        Args:
+            parent: Widget pai
+            title (str): Título da janela
+            log_manager: Instância do LogManager (opcional)
+        """
+        self.parent = parent
+        self.log_manager = log_manager
+        self.cancel_event = threading.Event()
+
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.resizable(False, False)
+        self.window.transient(parent.winfo_toplevel())
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.status_var = tk.StringVar(value="Preparando exportação...")
+        tk.Label(self.window, textvariable=self.status_var, width=45, anchor='w').pack(padx=15, pady=(15, 5))
+
+        self.progress_bar = ttk.Progressbar(self.window, mode='determinate', length=320, maximum=1)
+        self.progress_bar.pack(padx=15, pady=5)
+
+        self.cancel_button = tk.Button(self.window, text="Cancelar", command=self.cancel)
+        self.cancel_button.pack(pady=(5, 15))
+
+    def start(self, job, on_finish):
+        """
+        Inicia o trabalho em segundo plano
+
+        Args:
+            job: Função job(progress, cancel_event) que retorna (sucesso, mensagem)
+            on_finish: Função on_finish(sucesso, mensagem) chamada na thread principal
+        """
+        def run():
+            try:
+                resultado = job(self._progress_from_worker, self.cancel_event)
+            except Exception as e:
+                if self.log_manager:
+                    self.log_manager.log_error(e, "Erro na exportação")
+                resultado = (False, str(e))
+            self._call_in_main_thread(lambda: self._finish(resultado, on_finish))
+
+        threading.Thread(target=run, name="Exportacao", daemon=True).start()
+
+    def cancel(self):
+        """Pede o cancelamento; a janela fecha quando o trabalho parar"""
+        self.cancel_event.set()
+        self.status_var.set("Cancelando...")
+        self.cancel_button.config(state=tk.DISABLED)
+
+    def _progress_from_worker(self, done, total):
+        self._call_in_main_thread(lambda: self._show_progress(done, total))
+
+    def _call_in_main_thread(self, func):
+        try:
+            self.window.after(0, func)
+        except (RuntimeError, tk.TclError):
+            # Janela já destruída
+            pass
+
+    def _show_progress(self, done, total):
+        if self.cancel_event.is_set():
+            return
+        self.progress_bar.config(maximum=max(total, 1), value=done)
+        self.status_var.set(f"Exportando... {done} de {total} registros")
+
+    def _finish(self, resultado, on_finish):
+        self.window.destroy()
+        on_finish(*resultado)
@@ -1,13 +1,14 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import csv
-from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.units import inch
 from utils import AppUtils, UIConstants
+from ui.virtual_treeview import VirtualTreeview
+from history_search import HistorySearch
+from background_tasks import BackgroundTasks
+from history_exporter import HistoryExporter
+from ui.export_dialog import ExportProgressDialog
+
+# Espera após a última tecla antes de buscar (ms)
+SEARCH_DEBOUNCE_MS = 250
 
 class HistoryTab:
     """Aba de histórico de downloads"""
@@ -23,6 +24,18 @@ class HistoryTab:
         self.total_pages = 1
         self.total_count = 0
         
+        # Filtros usados pela lista virtualizada (rolagem contínua) e, se o
+        # resultado couber em memória, todas as suas linhas
+        self.virtual_filters = None
+        self.virtual_rows = None
+        
+        # Consultas rodam fora da thread principal; uma busca nova descarta a anterior
+        self.search = HistorySearch(history_manager, log_manager)
+        self.exporter = HistoryExporter(history_manager, log_manager)
+        self.tasks = BackgroundTasks(parent, log_manager, thread_name_prefix="Historico")
+        self._search_job = None
+        self._typed_text = ""
+        
         self.frame = tk.Frame(parent)
         self.create_widgets()
         self.setup_layout()
@@ -36,7 +49,7 @@ class HistoryTab:
         self.refresh_button = tk.Button(
             self.controls_frame,
             text="🔄 Atualizar",
-            command=self.update_history
+            command=self.refresh_history
         )
         
         self.clear_button = tk.Button(
@@ -54,6 +67,7 @@ class HistoryTab:
         self.search_entry = tk.Entry(self.search_frame, textvariable=self.search_var, width=30)
         self.search_entry.pack(side=tk.LEFT, padx=(0, 5))
         self.search_entry.bind('<Return>', self.on_search)
+        self.search_entry.bind('<KeyRelease>', self.on_search_typed)
         
         self.search_button = tk.Button(
             self.search_frame,
@@ -69,6 +83,11 @@ class HistoryTab:
         )
         self.clear_search_button.pack(side=tk.LEFT)
         
+        # Quantidade de resultados e tempo da última busca
+        self.search_status_var = tk.StringVar()
+        self.search_status_label = tk.Label(self.search_frame, textvariable=self.search_status_var)
+        self.search_status_label.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Frame de filtros avançados
         self.filters_frame = tk.Frame(self.frame)
         
@@ -114,6 +133,16 @@ class HistoryTab:
         self.period_combo.pack(side=tk.LEFT, padx=(0, 10))
         self.period_combo.bind('<<ComboboxSelected>>', self.on_filter_change)
         
+        # Downloads movidos para o arquivo só entram na busca se pedido
+        self.include_archive_var = tk.BooleanVar(value=False)
+        self.include_archive_check = tk.Checkbutton(
+            self.filters_frame,
+            text="Incluir arquivados",
+            variable=self.include_archive_var,
+            command=self.on_filter_change
+        )
+        self.include_archive_check.pack(side=tk.LEFT, padx=(0, 10))
+        
         # Botão para limpar filtros
         self.clear_filters_button = tk.Button(
             self.filters_frame,
@@ -145,6 +174,14 @@ class HistoryTab:
         self.tree_scrollbar = ttk.Scrollbar(self.tree_frame, orient=tk.VERTICAL, command=self.history_tree.yview)
         self.history_tree.configure(yscrollcommand=self.tree_scrollbar.set)
         
+        # Modo virtualizado: só as linhas visíveis existem no Treeview
+        self.virtual_list = VirtualTreeview(
+            self.history_tree,
+            self.tree_scrollbar,
+            self.fetch_history_block,
+            on_view_change=self.on_virtual_view_change
+        )
+        
         # Menu de contexto
         self.create_context_menu()
         
@@ -203,6 +240,16 @@ class HistoryTab:
         self.per_page_combo.pack(side=tk.LEFT)
         self.per_page_combo.bind('<<ComboboxSelected>>', self.on_per_page_change)
         
+        # Rolagem contínua (lista virtualizada, sem paginação)
+        self.virtual_mode_var = tk.BooleanVar(value=False)
+        self.virtual_mode_check = tk.Checkbutton(
+            self.pagination_frame,
+            text="Rolagem contínua",
+            variable=self.virtual_mode_var,
+            command=self.on_virtual_mode_change
+        )
+        self.virtual_mode_check.pack(side=tk.LEFT, padx=(10, 0))
+        
         # Botões de exportação
         tk.Label(self.pagination_frame, text="Exportar:").pack(side=tk.LEFT, padx=(20, 5))
         
@@ -259,43 +306,119 @@ class HistoryTab:
         self.pagination_frame.grid(row=4, column=0, sticky='ew', padx=UIConstants.PADDING, pady=UIConstants.PADDING)
     
     def update_history(self, reset_page=True):
-        """Atualiza lista do histórico"""
+        """Atualiza lista do histórico (consulta em segundo plano)"""
+        if self._search_job is not None:
+            self.frame.after_cancel(self._search_job)
+            self._search_job = None
+        
         if reset_page:
             self.current_page = 1
         
-        # Limpar itens existentes
-        for item in self.history_tree.get_children():
-            self.history_tree.delete(item)
-        
         # Obter filtros de busca
         filters = self.get_current_filters()
-        
-        # Obter downloads paginados
-        result = self.history_manager.get_downloads_paginated(
-            page=self.current_page,
-            per_page=self.per_page,
-            filters=filters
+        virtual = self.virtual_mode_var.get()
+        page = self.current_page
+        per_page = None if virtual else self.per_page
+        
+        self.tasks.submit(
+            'historico',
+            lambda check: self.search.search(filters, page, per_page, check),
+            lambda result: self.show_history_result(result, virtual)
         )
+    
+    def refresh_history(self):
+        """Recarrega o histórico descartando resultados de buscas anteriores"""
+        self.search.invalidate()
+        self.update_history()
+    
+    def show_history_result(self, result, virtual):
+        """Thread principal: exibe o resultado da consulta"""
+        self.total_count = result.total
         
-        downloads = result['downloads']
-        pagination = result['pagination']
+        if virtual:
+            self.show_virtual_history(result)
+        else:
+            # Limpar itens existentes
+            self.history_tree.delete(*self.history_tree.get_children())
+            
+            # Atualizar informações de paginação
+            self.total_pages = (result.total + self.per_page - 1) // self.per_page
+            
+            # Adicionar ao treeview
+            for download in result.page_rows or []:
+                self.history_tree.insert('', 'end', values=(
+                    download.get('id', ''),
+                    download.get('title_short', download.get('title', 'N/A')),
+                    download.get('resolution', 'N/A'),
+                    download.get('date_formatted', 'N/A'),
+                    download.get('status', 'N/A')
+                ))
+            
+            # Atualizar controles de paginação
+            self.update_pagination_controls()
         
-        # Atualizar informações de paginação
-        self.total_pages = pagination['total_pages']
-        self.total_count = pagination['total_count']
+        fonte = " (cache)" if result.source == 'cache' else ""
+        self.search_status_var.set(f"{result.total} resultado(s) em {result.latency_ms:.0f} ms{fonte}")
+    
+    def show_virtual_history(self, result):
+        """Recarrega a lista virtualizada com o resultado da consulta"""
+        self.virtual_filters = result.filters
+        self.virtual_rows = result.rows
         
-        # Adicionar ao treeview
-        for download in downloads:
-            self.history_tree.insert('', 'end', values=(
+        if self.virtual_list.enabled:
+            self.virtual_list.reset(result.total)
+        else:
+            self.history_tree.delete(*self.history_tree.get_children())
+            self.virtual_list.enable(result.total)
+    
+    def fetch_history_block(self, start, limit, previous_row):
+        """
+        Busca um bloco de linhas para a lista virtualizada
+        
+        Returns:
+            list: Linhas (valores exibidos, (timestamp, id)) - a chave permite
+            continuar a consulta a partir da última linha do bloco anterior
+        """
+        if self.virtual_rows is not None:
+            downloads = self.virtual_rows[start:start + limit]
+        else:
+            downloads = self.history_manager.get_downloads_window(
+                self.virtual_filters,
+                limit=limit,
+                after=previous_row,
+                offset=start
+            )
+        return [
+            ((
                 download.get('id', ''),
                 download.get('title_short', download.get('title', 'N/A')),
                 download.get('resolution', 'N/A'),
                 download.get('date_formatted', 'N/A'),
                 download.get('status', 'N/A')
-            ))
+            ), (download.get('timestamp'), download.get('id')))
+            for download in downloads
+        ]
+    
+    def on_virtual_view_change(self, first, last, total):
+        """Atualiza o indicador de posição da lista virtualizada"""
+        if total > 0:
+            self.page_info_var.set(f"Itens {first + 1}-{last} de {total}")
+        else:
+            self.page_info_var.set("Nenhum item encontrado")
+    
+    def on_virtual_mode_change(self):
+        """Alterna entre a lista paginada e a rolagem contínua"""
+        virtual = self.virtual_mode_var.get()
+        
+        if not virtual:
+            self.virtual_list.disable()
         
-        # Atualizar controles de paginação
-        self.update_pagination_controls()
+        pagination_state = tk.DISABLED if virtual else tk.NORMAL
+        self.per_page_combo.config(state=tk.DISABLED if virtual else "readonly")
+        for button in (self.first_button, self.prev_button, self.next_button, self.last_button):
+            button.config(state=pagination_state)
+        
+        self.update_history()
     
     def show_context_menu(self, event):
         """Mostra menu de contexto"""
@@ -348,7 +471,7 @@ class HistoryTab:
             if messagebox.askyesno("Confirmar", "Deseja remover este item do histórico?"):
                 success = self.history_manager.remove_download_from_history(download_id)
                 if success:
-                    self.update_history()
+                    self.refresh_history()
                 else:
                     AppUtils.show_error_message("Erro", "Não foi possível remover o item")
     
@@ -357,7 +480,7 @@ class HistoryTab:
         if messagebox.askyesno("Confirmar", "Deseja limpar todo o histórico? Esta ação não pode ser desfeita."):
             success = self.history_manager.clear_history()
             if success:
-                self.update_history()
+                self.refresh_history()
                 AppUtils.show_info_message("Sucesso", "Histórico limpo com sucesso")
             else:
                 AppUtils.show_error_message("Erro", "Não foi possível limpar o histórico")
@@ -386,6 +509,10 @@ class HistoryTab:
         if period and period != "Todos":
             filters['period'] = period
         
+        # Histórico arquivado
+        if self.include_archive_var.get():
+            filters['include_archive'] = True
+        
         return filters if filters else None
     
     def update_pagination_controls(self):
@@ -446,9 +573,20 @@ class HistoryTab:
             self.per_page_var.set(str(self.per_page))
     
     def on_search(self, event=None):
-        """Callback para busca"""
+        """Callback para busca (Enter ou botão): busca imediatamente"""
         self.update_history()
     
+    def on_search_typed(self, event=None):
+        """Busca conforme o usuário digita, depois de uma pausa na digitação"""
+        # Ignorar teclas que não mudam o texto (setas, Shift, Enter...)
+        search_text = self.search_var.get()
+        if search_text == self._typed_text:
+            return
+        self._typed_text = search_text
+        if self._search_job is not None:
+            self.frame.after_cancel(self._search_job)
+        self._search_job = self.frame.after(SEARCH_DEBOUNCE_MS, self.update_history)
+    
     def clear_search(self):
         """Limpa busca e atualiza histórico"""
         self.search_var.set("")
@@ -465,187 +603,65 @@ class HistoryTab:
         self.resolution_var.set("Todas")
         self.status_var.set("Todos")
         self.period_var.set("Todos")
+        self.include_archive_var.set(False)
         self.update_history()
     
     def export_to_csv(self):
-        """Exporta os dados filtrados para CSV"""
-        try:
-            # Obter todos os dados filtrados (sem paginação)
-            filters = self.get_current_filters()
-            all_downloads = self.history_manager.get_all_downloads_filtered(filters)
-            
-            if not all_downloads:
-                AppUtils.show_info_message("Exportação", "Não há dados para exportar.")
-                return
-            
-            # Solicitar local para salvar
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                title="Salvar arquivo CSV"
-            )
-            
-            if not filename:
-                return
-            
-            # Escrever dados no CSV
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Cabeçalho
-                writer.writerow(['ID', 'Título', 'URL', 'Resolução', 'Data', 'Status', 'Caminho do Arquivo'])
-                
-                # Dados
-                for download in all_downloads:
-                    writer.writerow([
-                        download['id'],
-                        download['title'],
-                        download['url'],
-                        download['resolution'],
-                        download['timestamp'],
-                        download['status'],
-                        download.get('file_path', '')
-                    ])
-            
-            AppUtils.show_info_message("Exportação", f"Dados exportados com sucesso para:\n{filename}")
-            
-        except Exception as e:
-            AppUtils.show_error_message("Erro na Exportação", f"Erro ao exportar para CSV: {str(e)}")
+        """Exporta os dados filtrados para CSV (em segundo plano)"""
+        self.start_export(
+            self.exporter.export_csv,
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Salvar arquivo CSV"
+        )
     
     def export_to_pdf(self):
-        """Exporta os dados filtrados para PDF"""
+        """Exporta os dados filtrados para PDF (em segundo plano)"""
+        self.start_export(
+            self.exporter.export_pdf,
+            defaultextension=".pdf",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
+            title="Salvar arquivo PDF"
+        )
+    
+    def start_export(self, export, **dialog_options):
+        """
+        Pede o arquivo de destino e executa a exportação em segundo plano
+        
+        Args:
+            export: Método do HistoryExporter (export_csv ou export_pdf)
+            **dialog_options: Opções do diálogo de salvar arquivo
+        """
         try:
-            # Obter todos os dados filtrados (sem paginação)
             filters = self.get_current_filters()
-            all_downloads = self.history_manager.get_all_downloads_filtered(filters)
             
-            if not all_downloads:
+            if self.exporter.count(filters) == 0:
                 AppUtils.show_info_message("Exportação", "Não há dados para exportar.")
                 return
             
             # Solicitar local para salvar
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")],
-                title="Salvar arquivo PDF"
-            )
-            
+            filename = filedialog.asksaveasfilename(**dialog_options)
             if not filename:
                 return
             
-            # Criar documento PDF
-            doc = SimpleDocTemplate(
-                filename,
-                pagesize=A4,
-                rightMargin=0.5*inch,
-                leftMargin=0.5*inch,
-                topMargin=0.5*inch,
-                bottomMargin=0.5*inch
+            dialog = ExportProgressDialog(self.frame, "Exportando histórico", self.log_manager)
+            dialog.start(
+                lambda progress, cancel_event: export(filename, filters, progress, cancel_event),
+                self.on_export_finished
             )
             
-            # Elementos do documento
-            elements = []
-            styles = getSampleStyleSheet()
-            
-            # Título
-            title_style = ParagraphStyle(
-                'CustomTitle',
-                parent=styles['Heading1'],
-                fontSize=16,
-                spaceAfter=30,
-                alignment=1  # Centralizado
-            )
-            
-            title = Paragraph("Relatório de Downloads - YouTube Downloader", title_style)
-            elements.append(title)
-            
-            # Data de geração
-            date_style = ParagraphStyle(
-                'DateStyle',
-                parent=styles['Normal'],
-                fontSize=10,
-                spaceAfter=20,
-                alignment=1  # Centralizado
-            )
-            
-            current_date = datetime.now().strftime("%d/%m/%Y %H:%M:%S")
-            date_para = Paragraph(f"Gerado em: {current_date}", date_style)
-            elements.append(date_para)
-            
-            # Informações dos filtros aplicados
-            if filters:
-                filter_info = "Filtros aplicados: "
-                filter_parts = []
-                
-                if 'search_query' in filters:
-                    filter_parts.append(f"Busca: '{filters['search_query']}'")
-                if 'resolution' in filters:
-                    filter_parts.append(f"Resolução: {filters['resolution']}")
-                if 'status' in filters:
-                    filter_parts.append(f"Status: {filters['status']}")
-                if 'period' in filters:
-                    filter_parts.append(f"Período: {filters['period']}")
-                
-                if filter_parts:
-                    filter_info += "; ".join(filter_parts)
-                    filter_para = Paragraph(filter_info, styles['Normal'])
-                    elements.append(filter_para)
-                    elements.append(Spacer(1, 12))
-            
-            # Preparar dados da tabela
-            table_data = [['ID', 'Título', 'Resolução', 'Data', 'Status']]
-            
-            for download in all_downloads:
-                # Truncar título se muito longo
-                title = download['title']
-                if len(title) > 50:
-                    title = title[:47] + "..."
-                
-                # Formatar data
-                try:
-                    date_obj = datetime.fromisoformat(download['timestamp'].replace('Z', '+00:00'))
-                    formatted_date = date_obj.strftime("%d/%m/%Y %H:%M")
-                except:
-                    formatted_date = download['timestamp']
-                
-                table_data.append([
-                    str(download['id']),
-                    title,
-                    download['resolution'],
-                    formatted_date,
-                    download['status']
-                ])
-            
-            # Criar tabela
-            table = Table(table_data, colWidths=[0.8*inch, 3.5*inch, 1*inch, 1.2*inch, 1*inch])
-            
-            # Estilo da tabela
-            table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey])
-            ]))
-            
-            elements.append(table)
-            
-            # Rodapé com total de registros
-            elements.append(Spacer(1, 20))
-            footer_para = Paragraph(f"Total de registros: {len(all_downloads)}", styles['Normal'])
-            elements.append(footer_para)
-            
-            # Gerar PDF
-            doc.build(elements)
-            
-            AppUtils.show_info_message("Exportação", f"Relatório PDF gerado com sucesso:\n{filename}")
-            
         except Exception as e:
-            AppUtils.show_error_message("Erro na Exportação", f"Erro ao gerar PDF: {str(e)}")
+            AppUtils.show_error_message("Erro na Exportação", f"Erro ao exportar: {str(e)}")
+    
+    def on_export_finished(self, success, message):
+        """Informa o resultado da exportação"""
+        if success:
+            AppUtils.show_info_message("Exportação", message)
+        elif message == "Exportação cancelada":
+            AppUtils.show_info_message("Exportação", message)
+        else:
+            AppUtils.show_error_message("Erro na Exportação", message)
+    
+    def shutdown(self):
+        """Descarta as consultas pendentes e encerra a thread de trabalho"""
+        self.tasks.shutdown()
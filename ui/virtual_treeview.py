@@ -0,0 +1,257 @@
+from tkinter import ttk
+from collections import OrderedDict
+
+# Linhas buscadas por vez no banco
+VIRTUAL_BLOCK_SIZE = 200
+
+# Blocos mantidos em memória (LRU)
+VIRTUAL_MAX_BLOCKS = 50
+
+# Altura de linha usada se o estilo do Treeview não informar uma
+DEFAULT_ROW_HEIGHT = 20
+
+
+class VirtualTreeview:
+    """
+    Modo virtualizado de um ttk.Treeview.
+
+    O Treeview mantém apenas as linhas visíveis (itens fixos que são
+    reaproveitados); a barra de rolagem representa o total de resultados.
+    As linhas vêm em blocos de `fetch_block` e ficam em um cache LRU já
+    formatadas, então rolar por áreas já vistas não consulta o banco.
+
+    `fetch_block(start, limit, previous_row)` deve retornar uma lista de
+    linhas `(values, key)`: `values` é a tupla exibida e `key` é repassada
+    como `previous_row` ao buscar o bloco seguinte, o que permite continuar a
+    consulta de onde o bloco anterior parou (paginação por chave).
+    """
+
+    def __init__(self, tree, scrollbar, fetch_block, block_size=VIRTUAL_BLOCK_SIZE,
+                 max_blocks=VIRTUAL_MAX_BLOCKS, on_view_change=None):
+        """
+        Args:
+            tree: ttk.Treeview a virtualizar
+            scrollbar: ttk.Scrollbar vertical do Treeview
+            fetch_block: Função fetch_block(start, limit, previous_row)
+            block_size (int): Linhas por bloco
+            max_blocks (int): Blocos mantidos no cache
+            on_view_change: Função on_view_change(first, last, total) chamada ao rolar
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.fetch_block = fetch_block
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self.on_view_change = on_view_change
+
+        self.enabled = False
+        self.total = 0
+        self.offset = 0
+        self.visible_rows = 1
+        self.selected_key = None
+        self._blocks = OrderedDict()
+        self._items = []
+
+        for sequence in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(sequence, self._on_mousewheel, add='+')
+        for sequence in ('<Up>', '<Down>', '<Prior>', '<Next>', '<Home>', '<End>'):
+            self.tree.bind(sequence, self._on_key, add='+')
+        self.tree.bind('<Configure>', self._on_configure, add='+')
+        self.tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+
+    # ------------------------------------------------------------------
+    # Ativação
+    # ------------------------------------------------------------------
+
+    def enable(self, total):
+        """Ativa o modo virtualizado com `total` linhas"""
+        self.enabled = True
+        self.visible_rows = self._rows_that_fit()
+        self.tree.configure(yscrollcommand='')
+        self.scrollbar.configure(command=self._on_scrollbar)
+        self.reset(total)
+
+    def disable(self):
+        """Volta ao Treeview comum (rolagem nativa)"""
+        self.enabled = False
+        self._clear_items()
+        self._blocks.clear()
+        self.tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.configure(command=self.tree.yview)
+
+    def reset(self, total):
+        """Descarta o cache (ex.: filtros mudaram) e volta ao topo"""
+        self._blocks.clear()
+        self.total = max(0, total)
+        self.offset = 0
+        self.selected_key = None
+        self.render()
+
+    # ------------------------------------------------------------------
+    # Rolagem
+    # ------------------------------------------------------------------
+
+    def scroll_to(self, offset):
+        """Posiciona a primeira linha visível em `offset`"""
+        maximo = max(0, self.total - self.visible_rows)
+        offset = min(max(0, int(offset)), maximo)
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def _on_scrollbar(self, *args):
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == 'scroll':
+            passo = int(args[1])
+            if args[2] == 'pages':
+                passo *= max(1, self.visible_rows - 1)
+            self.scroll_to(self.offset + passo)
+
+    def _on_mousewheel(self, event):
+        if not self.enabled:
+            return None
+        if event.num == 4:
+            passo = -3
+        elif event.num == 5:
+            passo = 3
+        else:
+            passo = -3 if event.delta > 0 else 3
+        self.scroll_to(self.offset + passo)
+        return "break"
+
+    def _on_key(self, event):
+        if not self.enabled or not self._items:
+            return None
+        atual = self._selected_position()
+        pagina = max(1, self.visible_rows - 1)
+        destino = {
+            'Up': atual - 1,
+            'Down': atual + 1,
+            'Prior': atual - pagina,
+            'Next': atual + pagina,
+            'Home': 0,
+            'End': self.total - 1,
+        }.get(event.keysym)
+        if destino is None:
+            return None
+        destino = min(max(0, destino), self.total - 1)
+
+        if destino < self.offset:
+            self.scroll_to(destino)
+        elif destino >= self.offset + self.visible_rows:
+            self.scroll_to(destino - self.visible_rows + 1)
+
+        indice = destino - self.offset
+        if 0 <= indice < len(self._items):
+            item = self._items[indice]
+            self.tree.selection_set(item)
+            self.tree.focus(item)
+        return "break"
+
+    def _on_configure(self, event=None):
+        if not self.enabled:
+            return
+        linhas = self._rows_that_fit()
+        if linhas != self.visible_rows:
+            self.visible_rows = linhas
+            self.scroll_to(self.offset)
+            self.render()
+
+    def _rows_that_fit(self):
+        altura_linha = ttk.Style().lookup('Treeview', 'rowheight')
+        try:
+            altura_linha = int(altura_linha) or DEFAULT_ROW_HEIGHT
+        except (TypeError, ValueError):
+            altura_linha = DEFAULT_ROW_HEIGHT
+        # Descontar a linha do cabeçalho
+        return max(1, self.tree.winfo_height() // altura_linha - 1)
+
+    # ------------------------------------------------------------------
+    # Seleção
+    # ------------------------------------------------------------------
+
+    def _on_select(self, event=None):
+        if not self.enabled:
+            return
+        selecao = self.tree.selection()
+        if selecao and selecao[0] in self._items:
+            linha = self.row_at(self.offset + self._items.index(selecao[0]))
+            self.selected_key = linha[1] if linha else None
+
+    def _selected_position(self):
+        selecao = self.tree.selection()
+        if selecao and selecao[0] in self._items:
+            return self.offset + self._items.index(selecao[0])
+        return self.offset - 1
+
+    # ------------------------------------------------------------------
+    # Dados
+    # ------------------------------------------------------------------
+
+    def row_at(self, position):
+        """Linha (values, key) na posição absoluta, buscando o bloco se necessário"""
+        if position < 0 or position >= self.total:
+            return None
+        bloco = self._get_block(position // self.block_size)
+        indice = position % self.block_size
+        return bloco[indice] if indice < len(bloco) else None
+
+    def _get_block(self, numero):
+        bloco = self._blocks.get(numero)
+        if bloco is not None:
+            self._blocks.move_to_end(numero)
+            return bloco
+
+        # Se o bloco anterior estiver no cache, continuar a partir da sua última linha
+        anterior = self._blocks.get(numero - 1)
+        previous_row = anterior[-1][1] if anterior else None
+        bloco = list(self.fetch_block(numero * self.block_size, self.block_size, previous_row))
+
+        self._blocks[numero] = bloco
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+        return bloco
+
+    def render(self):
+        """Preenche os itens visíveis com as linhas a partir de `offset`"""
+        if not self.enabled:
+            return
+        quantidade = max(0, min(self.visible_rows, self.total - self.offset))
+
+        # Reaproveitar os itens existentes; criar/remover só a diferença
+        while len(self._items) < quantidade:
+            self._items.append(self.tree.insert('', 'end', values=()))
+        while len(self._items) > quantidade:
+            self.tree.delete(self._items.pop())
+
+        selecionado = None
+        for indice, item in enumerate(self._items):
+            linha = self.row_at(self.offset + indice)
+            if linha is None:
+                self.tree.item(item, values=())
+                continue
+            self.tree.item(item, values=linha[0])
+            if self.selected_key is not None and linha[1] == self.selected_key:
+                selecionado = item
+
+        # Manter a seleção na mesma linha lógica ao rolar
+        if selecionado:
+            self.tree.selection_set(selecionado)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, (self.offset + quantidade) / self.total)
+        else:
+            self.scrollbar.set(0, 1)
+
+        if self.on_view_change:
+            self.on_view_change(self.offset, self.offset + quantidade, self.total)
+
+    def _clear_items(self):
+        if self._items:
+            self.tree.delete(*self._items)
+        self._items = []
@@ -3,24 +3,23 @@ from tkinter import messagebox, filedialog, ttk
 import threading
 import os
 import webbrowser
-import requests
-from PIL import Image, ImageTk
-from io import BytesIO
-import csv
-from datetime import datetime
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.units import inch
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.figure import Figure
-import numpy as np
 from utils import AppUtils, UIConstants, AppConstants
 from ui.history_tab import HistoryTab
-from analytics_manager import AnalyticsManager, RecommendationEngine
 from bandwidth_tracker import BandwidthTracker
+from thumbnail_service import ThumbnailService
+from theme_engine import ThemeEngine
+from ui.description_renderer import DescriptionRenderer
+from ui.export_dialog import ExportProgressDialog
+from database_maintenance import DatabaseMaintenance, MaintenanceScheduler, ARCHIVE_AFTER_DAYS_SETTING
+from analytics_manager import AnalyticsManager, RecommendationEngine
+from download_scheduler import (
+    DownloadScheduler, parse_hours, format_hours,
+    DOWNLOAD_WINDOWS_SETTING, DOWNLOAD_WINDOWS_ADAPTIVE_SETTING
+)
+from format_policy import (
+    ResolutionPolicy, SizeBudgetPolicy, ThroughputPolicy, policy_from_settings,
+    FORMAT_POLICY_SETTING, FORMAT_POLICY_MAX_MB_SETTING, FORMAT_POLICY_MAX_MINUTES_SETTING
+)
 
 class MainApplication:
     """Aplicação principal com interface gráfica"""
@@ -40,15 +39,36 @@ class MainApplication:
         self.history_manager = history_manager
         self.log_manager = log_manager
         
-        # Inicializar rastreamento de velocidade
-        self.bandwidth_tracker = BandwidthTracker(history_manager.db_manager)
+        # Inicializar rastreamento de velocidade (estatísticas gravadas em lote com o histórico)
+        self.bandwidth_tracker = BandwidthTracker(history_manager.db_manager, history_manager.write_buffer)
         self.current_download_id = None
         self.current_db_download_id = None
         self._pending_finish_tracking = None
         
+        # Manutenção do banco (backup online, compactação e integridade) em segundo plano
+        self.db_maintenance = DatabaseMaintenance(history_manager.db_manager, log_manager)
+        self.maintenance_scheduler = MaintenanceScheduler(self.db_maintenance, config_manager, log_manager)
+        
+        # Fila de downloads agendados, liberados nas janelas de horário configuradas
+        self.analytics_manager = AnalyticsManager(history_manager.db_manager, log_manager)
+        self.recommendation_engine = RecommendationEngine(self.analytics_manager, history_manager.db_manager, log_manager)
+        self.download_scheduler = DownloadScheduler(self.launch_scheduled_download, log_manager)
+        self.apply_download_windows()
+        config_manager.subscribe(self.apply_download_windows, key=DOWNLOAD_WINDOWS_SETTING)
+        config_manager.subscribe(self.apply_download_windows, key=DOWNLOAD_WINDOWS_ADAPTIVE_SETTING)
+        
+        # Política de seleção de formato (resolução, orçamento de tamanho ou janela de tempo)
+        self.apply_format_policy()
+        for key in (FORMAT_POLICY_SETTING, FORMAT_POLICY_MAX_MB_SETTING, FORMAT_POLICY_MAX_MINUTES_SETTING):
+            config_manager.subscribe(self.apply_format_policy, key=key)
+        
+        # Thumbnails do mini-player (sessão HTTP, cache em disco e LRU compartilhados)
+        self.thumbnail_service = ThumbnailService(log_manager)
+        
         # Configurar callbacks do download_manager
         self.download_manager.progress_callback = self.progress_hook
         self.download_manager.postprocessor_callback = self.postprocessor_hook
+        self.download_manager.decision_callback = self.decision_hook
         
         # Estado da aplicação
         self.current_resolutions = []
@@ -56,7 +76,10 @@ class MainApplication:
         # Criar interface
         self.setup_main_window()
         self.create_widgets()
+        self.theme_engine.register_tree(self.root)
         self.apply_initial_theme()
+        self.maintenance_scheduler.start()
+        self.download_scheduler.start()
         
         self.log_manager.log_info("Aplicação iniciada")
     
@@ -64,13 +87,22 @@ class MainApplication:
         """Configura a janela principal"""
         self.root = tk.Tk()
         self.root.title(UIConstants.APP_TITLE)
+        
+        # Tema por estilos ttk; widgets Tk clássicos ficam em um registro
+        self.theme_engine = ThemeEngine(self.root, self.log_manager)
         self.root.geometry(self.config_manager.get_window_geometry())
         
         min_width, min_height = self.config_manager.get_min_window_size()
         self.root.minsize(min_width, min_height)
         
         # Maximizar a janela ao iniciar
-        self.root.state('zoomed')  # Windows
+        try:
+            self.root.state('zoomed')  # Windows
+        except tk.TclError:
+            try:
+                self.root.attributes('-zoomed', True)  # Linux/X11
+            except tk.TclError:
+                pass
         
         # Configurar fechamento da aplicação
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -81,6 +113,10 @@ class MainApplication:
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=UIConstants.PADDING, pady=UIConstants.PADDING)
         
+        # Abas construídas sob demanda (espaço reservado -> construtor)
+        self.lazy_tabs = {}
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed, add='+')
+        
         # Criar abas
         self.create_download_tab()
         self.create_history_tab()
@@ -100,29 +136,84 @@ class MainApplication:
         self.notebook.add(self.download_frame.frame, text="📥 Download")
     
     def create_history_tab(self):
-        """Cria a aba de histórico"""
-        self.history_frame = HistoryTab(
-            self.notebook,
-            self.history_manager,
-            self.log_manager
-        )
-        self.notebook.add(self.history_frame.frame, text="📋 Histórico")
+        """Cria a aba de histórico (construída na primeira seleção)"""
+        self.add_lazy_tab('history_frame', "📋 Histórico", self.build_history_tab,
+                          loading_text="Carregando histórico...")
+    
+    def build_history_tab(self, parent):
+        """Constrói a aba de histórico dentro do espaço reservado"""
+        return HistoryTab(parent, self.history_manager, self.log_manager)
     
     def create_analytics_tab(self):
-        """Cria a aba de análise e estatísticas"""
-        self.analytics_frame = AnalyticsTab(
-            self.notebook,
-            self.history_manager,
-            self.log_manager
-        )
-        self.notebook.add(self.analytics_frame.frame, text="📊 Analytics")
+        """Cria a aba de análise e estatísticas (construída na primeira seleção)"""
+        self.add_lazy_tab('analytics_frame', "📊 Analytics", self.build_analytics_tab,
+                          loading_text="Carregando análises...")
+    
+    def build_analytics_tab(self, parent):
+        """Importa e constrói a aba de análise (matplotlib/numpy) dentro do espaço reservado"""
+        from ui.analytics_tab import AnalyticsTab
+        return AnalyticsTab(parent, self.history_manager, self.log_manager)
+    
+    def add_lazy_tab(self, attr, text, builder, loading_text="Carregando..."):
+        """
+        Adiciona uma aba construída sob demanda
+        
+        O notebook recebe apenas um espaço reservado com um aviso de carregamento;
+        `builder(parent)` só é chamado na primeira vez que a aba for selecionada,
+        e o objeto retornado é guardado em `self.<attr>`.
+        
+        Args:
+            attr (str): Atributo da aplicação que receberá a aba construída
+            text (str): Título da aba
+            builder: Função builder(parent) que retorna um objeto com `.frame`
+            loading_text (str): Texto exibido enquanto a aba não é construída
+        """
+        setattr(self, attr, None)
+        placeholder = ttk.Frame(self.notebook)
+        loading_label = ttk.Label(placeholder, text=loading_text)
+        loading_label.pack(expand=True)
+        self.notebook.add(placeholder, text=text)
+        self.lazy_tabs[str(placeholder)] = {
+            'attr': attr,
+            'builder': builder,
+            'placeholder': placeholder,
+            'loading_label': loading_label,
+            'scheduled': False
+        }
+    
+    def on_tab_changed(self, event=None):
+        """Agenda a construção da aba selecionada, se ela ainda não existir"""
+        lazy_tab = self.lazy_tabs.get(self.notebook.select())
+        if lazy_tab is None or lazy_tab['scheduled']:
+            return
+        lazy_tab['scheduled'] = True
+        # Construir depois que o aviso de carregamento for desenhado
+        self.root.after_idle(lambda: self.build_lazy_tab(lazy_tab))
+    
+    def build_lazy_tab(self, lazy_tab):
+        """Constrói uma aba adiada e a coloca no lugar do aviso de carregamento"""
+        placeholder = lazy_tab['placeholder']
+        try:
+            tab = lazy_tab['builder'](placeholder)
+            setattr(self, lazy_tab['attr'], tab)
+            lazy_tab['loading_label'].destroy()
+            tab.frame.pack(fill=tk.BOTH, expand=True)
+            self.lazy_tabs.pop(str(placeholder), None)
+            self.theme_engine.register_tree(placeholder)
+        except Exception as e:
+            lazy_tab['scheduled'] = False
+            self.log_manager.log_error(e, f"Erro ao carregar aba {lazy_tab['attr']}")
+            lazy_tab['loading_label'].config(text=f"Erro ao carregar aba: {e}")
     
     def create_config_tab(self):
         """Cria a aba de configurações"""
         self.config_frame = ConfigTab(
             self.notebook,
             self.config_manager,
-            self.apply_theme_callback
+            self.apply_theme_callback,
+            maintenance=self.db_maintenance,
+            log_manager=self.log_manager,
+            suggest_hours=self.recommendation_engine.get_download_window_hours
         )
         self.notebook.add(self.config_frame.frame, text="⚙️ Configurações")
     
@@ -133,7 +224,7 @@ class MainApplication:
     def apply_theme_callback(self, theme):
         """Callback para aplicar tema em toda a aplicação"""
         self.config_manager.save_theme(theme)
-        self.config_manager.apply_theme_to_children(self.root, theme)
+        self.theme_engine.apply(theme)
     
     def progress_hook(self, d):
         """Hook para progresso do download"""
@@ -180,6 +271,42 @@ class MainApplication:
         if hasattr(self.download_frame, 'update_postprocessor'):
             self.root.after(0, lambda: self.download_frame.update_postprocessor(d))
     
+    def decision_hook(self, decision):
+        """Hook chamado com a decisão de formato antes de cada download"""
+        if hasattr(self.download_frame, 'show_format_decision'):
+            self.root.after(0, lambda: self.download_frame.show_format_decision(decision))
+    
+    def apply_download_windows(self, *args):
+        """Aplica as janelas de horário configuradas ao agendador (também chamado a cada mudança)"""
+        try:
+            hours = parse_hours(self.config_manager.get_setting(DOWNLOAD_WINDOWS_SETTING, ''))
+        except ValueError as e:
+            self.log_manager.log_warning(f"Janelas de download inválidas, liberando a qualquer hora: {e}")
+            hours = set()
+        
+        adaptive = str(self.config_manager.get_setting(DOWNLOAD_WINDOWS_ADAPTIVE_SETTING, 'false')).lower() == 'true'
+        self.download_scheduler.set_hours(hours)
+        self.download_scheduler.set_hours_provider(
+            self.recommendation_engine.get_download_window_hours if adaptive else None
+        )
+    
+    def apply_format_policy(self, *args):
+        """Aplica a política de formato configurada ao download_manager (também chamado a cada mudança)"""
+        try:
+            policy = policy_from_settings(
+                self.config_manager.get_setting(FORMAT_POLICY_SETTING),
+                self.config_manager.get_setting(FORMAT_POLICY_MAX_MB_SETTING),
+                self.config_manager.get_setting(FORMAT_POLICY_MAX_MINUTES_SETTING)
+            )
+        except ValueError as e:
+            self.log_manager.log_warning(f"Política de formato inválida, usando a resolução escolhida: {e}")
+            policy = ResolutionPolicy()
+        self.download_manager.set_format_policy(policy)
+    
+    def launch_scheduled_download(self, job):
+        """Inicia um download liberado pelo agendador (chamado na thread do agendador)"""
+        self.root.after(0, lambda: self.download_frame.run_scheduled_download(job))
+    
     def on_closing(self):
         """Callback para fechamento da aplicação"""
         if self.download_manager.get_download_status()['is_downloading']:
@@ -196,6 +323,16 @@ class MainApplication:
         resposta = messagebox.askyesno("Confirmar Saída", "Deseja realmente sair da aplicação?")
         if resposta:
             self.log_manager.log_info("Aplicação encerrada pelo usuário")
+            self.thumbnail_service.shutdown()
+            self.maintenance_scheduler.stop()
+            self.download_scheduler.stop()
+            if self.history_frame is not None:
+                self.history_frame.shutdown()
+            if self.analytics_frame is not None:
+                self.analytics_frame.shutdown()
+            # Gravar o que ainda estiver na fila do histórico e das configurações
+            self.history_manager.close()
+            self.config_manager.close()
             self.root.quit()
             self.root.destroy()
     
@@ -206,14 +343,27 @@ class MainApplication:
 class DownloadTab:
     """Aba de download de vídeos"""
     
+    # Dono dos pedidos de thumbnail deste mini-player no ThumbnailService
+    THUMBNAIL_OWNER = 'download_tab'
+    
+    # Espera (ms) antes de tentar de novo um download agendado liberado durante outro download
+    SCHEDULED_RETRY_MS = 5000
+    
     def __init__(self, parent, download_manager, config_manager, history_manager, log_manager, main_app=None):
         """Inicializa a aba de download"""
         self.parent = parent
         self.main_app = main_app
+        self.thumbnail_service = getattr(main_app, 'thumbnail_service', None) or ThumbnailService(log_manager)
         self.download_manager = download_manager
         self.config_manager = config_manager
         self.history_manager = history_manager
         self.log_manager = log_manager
+        self.scheduler = getattr(main_app, 'download_scheduler', None)
+        self.active_request = None
+        self.scheduled_job = None
+        self._saved_video_state = None
+        # Incrementado a cada download iniciado (resets atrasados não atingem o download seguinte)
+        self._download_generation = 0
         self.frame = tk.Frame(parent)
         
         self.create_widgets()
@@ -313,6 +463,9 @@ class DownloadTab:
         self.metadata_text.tag_bind("link", "<Enter>", self.on_link_enter)
         self.metadata_text.tag_bind("link", "<Leave>", self.on_link_leave)
         
+        # Descrições longas são inseridas em blocos, sem travar o loop principal
+        self.description_renderer = DescriptionRenderer(self.metadata_text)
+        
         # Menu de contexto para copiar
         self.create_metadata_context_menu()
         
@@ -329,6 +482,14 @@ class DownloadTab:
             state=tk.DISABLED
         )
         
+        # Botão agendar (fila liberada nas janelas de horário das configurações)
+        self.schedule_button = tk.Button(
+            self.frame,
+            text="Agendar",
+            command=self.schedule_download,
+            state=tk.DISABLED
+        )
+        
         # Frame de progresso
         self.progress_frame = tk.Frame(self.frame)
         self.progress_bar = ttk.Progressbar(
@@ -465,16 +626,17 @@ class DownloadTab:
         self.thumbnail_frame.update_idletasks()
         
         # Log para debug
-        self.log_manager.log_info("Mini-player exibido com dimensões fixas (altura: 120px, thumbnail: 160x100px)")
+        self.log_manager.log_debug("Mini-player exibido com dimensões fixas (altura: 120px, thumbnail: 160x100px)")
     
     def hide_mini_player(self):
         """Oculta o mini-player"""
+        self.thumbnail_service.cancel(self.THUMBNAIL_OWNER)
         self.mini_player_frame.grid_remove()
     
     def update_mini_player(self, video_info):
         """Atualiza as informações do mini-player"""
         try:
-            self.log_manager.log_info("Iniciando atualização do mini-player")
+            self.log_manager.log_debug("Iniciando atualização do mini-player")
             
             # Verificar se video_info é válido
             if not video_info or not isinstance(video_info, dict):
@@ -487,7 +649,7 @@ class DownloadTab:
             if len(title) > UIConstants.MINI_PLAYER_MAX_TITLE_LENGTH:
                 title = title[:UIConstants.MINI_PLAYER_MAX_TITLE_LENGTH] + "..."
             self.video_title_label.config(text=title)
-            self.log_manager.log_info(f"Título do mini-player atualizado: {title[:30]}...")
+            self.log_manager.log_debug(f"Título do mini-player atualizado: {title[:30]}...")
             
             # Atualizar informações
             duration = AppUtils.format_duration(video_info.get('duration', 0))
@@ -503,71 +665,44 @@ class DownloadTab:
             # Tentar carregar thumbnail
             thumbnail_url = video_info.get('thumbnail')
             if thumbnail_url:
-                self.log_manager.log_info(f"Carregando thumbnail: {thumbnail_url[:50]}...")
-                self.load_thumbnail(thumbnail_url)
+                self.log_manager.log_debug(f"Carregando thumbnail: {thumbnail_url[:50]}...")
+                self.load_thumbnail(thumbnail_url, video_info.get('id'))
             else:
-                self.log_manager.log_info("Nenhuma thumbnail disponível")
+                self.thumbnail_service.cancel(self.THUMBNAIL_OWNER)
+                self.log_manager.log_debug("Nenhuma thumbnail disponível")
             
             # Exibir mini-player
             self.show_mini_player()
-            self.log_manager.log_info("Mini-player atualizado e exibido com sucesso")
+            self.log_manager.log_debug("Mini-player atualizado e exibido com sucesso")
             
         except Exception as e:
             self.log_manager.log_error(e, "Erro ao atualizar mini-player")
             print(f"Erro ao atualizar mini-player: {e}")
             self.hide_mini_player()
     
-    def load_thumbnail(self, thumbnail_url):
-        """Carrega e exibe a thumbnail do vídeo"""
+    def load_thumbnail(self, thumbnail_url, video_id=None):
+        """Carrega e exibe a thumbnail do vídeo (cache + sessão compartilhada)"""
         if not thumbnail_url:
-            self.log_manager.log_info("URL da thumbnail não fornecida")
+            self.log_manager.log_debug("URL da thumbnail não fornecida")
             return
-            
-        def download_and_display():
-            try:
-                self.log_manager.log_info(f"Iniciando download da thumbnail: {thumbnail_url[:100]}...")
-                
-                # Download da thumbnail
-                response = requests.get(thumbnail_url, timeout=15, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                response.raise_for_status()
-                
-                self.log_manager.log_info(f"Thumbnail baixada com sucesso. Tamanho: {len(response.content)} bytes")
-                
-                # Processar imagem
-                image = Image.open(BytesIO(response.content))
-                original_size = image.size
-                
-                image = image.resize(
-                    (UIConstants.MINI_PLAYER_THUMBNAIL_WIDTH, UIConstants.MINI_PLAYER_THUMBNAIL_HEIGHT),
-                    Image.Resampling.LANCZOS
-                )
-                
-                self.log_manager.log_info(f"Imagem redimensionada de {original_size} para {image.size}")
-                
-                # Converter para PhotoImage
-                photo = ImageTk.PhotoImage(image)
-                
-                # Atualizar label na thread principal usando after
-                def update_ui():
-                    try:
-                        self.thumbnail_label.config(image=photo, text="")
-                        self.thumbnail_label.image = photo  # Manter referência
-                        self.log_manager.log_info("Thumbnail exibida com sucesso no mini-player")
-                    except Exception as ui_error:
-                        self.log_manager.log_error(ui_error, "Erro ao atualizar UI da thumbnail")
-                
-                # Usar after para thread safety
-                self.thumbnail_label.after(0, update_ui)
-                
-            except requests.exceptions.Timeout:
-                self.log_manager.log_error("Timeout ao baixar thumbnail", "Mini-Player")
-            except requests.exceptions.RequestException as req_error:
-                self.log_manager.log_error(req_error, "Erro de rede ao baixar thumbnail")
-            except Exception as e:
-                self.log_manager.log_error(e, "Erro geral ao carregar thumbnail")
-                print(f"Erro ao carregar thumbnail: {e}")
+        
+        # Pedidos anteriores deste mini-player são descartados automaticamente
+        self.thumbnail_service.request(
+            self.thumbnail_label,
+            self.THUMBNAIL_OWNER,
+            thumbnail_url,
+            video_id=video_id,
+            callback=self._show_thumbnail
+        )
+    
+    def _show_thumbnail(self, photo):
+        """Exibe a thumbnail no mini-player (thread principal)"""
+        try:
+            self.thumbnail_label.config(image=photo, text="")
+            self.thumbnail_label.image = photo  # Manter referência
+            self.log_manager.log_debug("Thumbnail exibida com sucesso no mini-player")
+        except Exception as ui_error:
+            self.log_manager.log_error(ui_error, "Erro ao atualizar UI da thumbnail")
     
     def create_context_menu(self):
         """Cria menu de contexto para o campo URL"""
@@ -654,45 +789,15 @@ class DownloadTab:
         """Callback para mouse sair do link"""
         self.metadata_text.config(cursor="xterm")
     
-    def _insert_text_with_links(self, text):
-        """Insere texto detectando e formatando links automaticamente"""
-        import re
-        
-        # Padrão para detectar URLs
-        url_pattern = r'https?://[^\s<>"{}|\\^`\[\]]+'
-        
-        # Encontrar todas as URLs no texto
-        urls = list(re.finditer(url_pattern, text))
-        
-        if not urls:
-            # Nenhum link encontrado, inserir texto normal
-            self.metadata_text.insert(tk.END, text)
-            return
-        
-        # Processar texto com links
-        last_end = 0
-        
-        for match in urls:
-            start, end = match.span()
-            url = match.group()
-            
-            # Inserir texto antes do link
-            if start > last_end:
-                self.metadata_text.insert(tk.END, text[last_end:start])
-            
-            # Inserir link com formatação
-            link_start = self.metadata_text.index(tk.INSERT)
-            self.metadata_text.insert(tk.END, url)
-            link_end = self.metadata_text.index(tk.INSERT)
-            self.metadata_text.tag_add("link", link_start, link_end)
-            
-            last_end = end
-        
-        # Inserir texto restante após o último link
-        if last_end < len(text):
-            self.metadata_text.insert(tk.END, text[last_end:])
+    def _insert_text_with_links(self, text, cache_key=None):
+        """
+        Insere texto detectando e formatando links automaticamente
         
-        self.log_manager.log_info(f"Texto inserido com {len(urls)} links detectados")
+        A primeira tela é inserida na hora e o restante em blocos nos
+        callbacks ociosos; a detecção de links é guardada por `cache_key`.
+        """
+        self.description_renderer.render(text, cache_key)
+        self.log_manager.log_debug(f"Texto inserido com {self.description_renderer.link_count} links detectados")
     
     def setup_layout(self):
         """Configura layout da aba"""
@@ -744,7 +849,11 @@ class DownloadTab:
         self.metadata_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.metadata_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         
-        self.download_button.grid(row=5, column=0, columnspan=2, pady=UIConstants.BUTTON_PADDING)
+        if self.scheduler is not None:
+            self.download_button.grid(row=5, column=0, sticky='e', padx=5, pady=UIConstants.BUTTON_PADDING)
+            self.schedule_button.grid(row=5, column=1, sticky='w', padx=5, pady=UIConstants.BUTTON_PADDING)
+        else:
+            self.download_button.grid(row=5, column=0, columnspan=2, pady=UIConstants.BUTTON_PADDING)
         
         # Mini-player (row=6) - será posicionado dinamicamente
         # Progress frame (row=7) - será posicionado dinamicamente
@@ -796,7 +905,7 @@ class DownloadTab:
     def on_extraction_complete(self, success, data, resolutions):
         """Callback para conclusão da extração"""
         # Log do resultado da extração
-        self.log_manager.log_info(f"Extração concluída - Sucesso: {success}")
+        self.log_manager.log_debug(f"Extração concluída - Sucesso: {success}")
         
         # Reabilitar botão
         self.extract_button.config(state=tk.NORMAL, text="Extrair informações")
@@ -806,7 +915,7 @@ class DownloadTab:
             is_playlist = data and data.get('type') == 'playlist'
             
             if is_playlist:
-                self.log_manager.log_info(f"Playlist detectada: {data.get('title', 'N/A')[:50]}... ({data.get('video_count', 0)} vídeos)")
+                self.log_manager.log_debug(f"Playlist detectada: {data.get('title', 'N/A')[:50]}... ({data.get('video_count', 0)} vídeos)")
                 
                 # Atualizar indicador de tipo de conteúdo
                 self.content_type_label.config(text=f"📋 Playlist detectada ({data.get('video_count', 0)} vídeos)")
@@ -821,8 +930,8 @@ class DownloadTab:
                 self.update_metadata(data)
                 
             else:
-                self.log_manager.log_info(f"Vídeo individual: {data.get('title', 'N/A')[:50]}...")
-                self.log_manager.log_info(f"Resoluções recebidas: {len(resolutions)} itens - {resolutions}")
+                self.log_manager.log_debug(f"Vídeo individual: {data.get('title', 'N/A')[:50]}...")
+                self.log_manager.log_debug(f"Resoluções recebidas: {len(resolutions)} itens - {resolutions}")
                 
                 # Atualizar indicador de tipo de conteúdo
                 self.content_type_label.config(text="🎥 Vídeo individual")
@@ -842,7 +951,7 @@ class DownloadTab:
                     self.update_mini_player(data)
             
             self.enable_download_if_ready()
-            self.log_manager.log_info("Interface atualizada com sucesso após extração")
+            self.log_manager.log_debug("Interface atualizada com sucesso após extração")
         else:
             self.log_manager.log_error(f"Erro na extração: {data}", "Extração de Informações")
             AppUtils.show_error_message("Erro", data)
@@ -854,12 +963,13 @@ class DownloadTab:
             self.playlist_info_label.config(text="")
             self.hide_mini_player()
             self.resolutions_listbox.delete(0, tk.END)
+            self.description_renderer.cancel()
             self.metadata_text.delete("1.0", tk.END)
     
     def update_resolutions(self, resolutions):
         """Atualiza lista de resoluções"""
         # Log para debug
-        self.log_manager.log_info(f"Atualizando lista de resoluções: {resolutions}")
+        self.log_manager.log_debug(f"Atualizando lista de resoluções: {resolutions}")
         
         # Limpar lista atual
         self.resolutions_listbox.delete(0, tk.END)
@@ -872,19 +982,18 @@ class DownloadTab:
             return
         
         # Inserir resoluções na lista
-        for i, resolution in enumerate(resolutions):
-            self.resolutions_listbox.insert(tk.END, resolution)
-            self.log_manager.log_info(f"Resolução {i+1}: {resolution}")
+        self.resolutions_listbox.insert(tk.END, *resolutions)
         
         # Selecionar primeira resolução automaticamente se disponível
         if len(resolutions) > 0 and resolutions[0] != "Nenhuma resolução disponível":
             self.resolutions_listbox.selection_set(0)
-            self.log_manager.log_info(f"Primeira resolução selecionada automaticamente: {resolutions[0]}")
+            self.log_manager.log_debug(f"Primeira resolução selecionada automaticamente: {resolutions[0]}")
         
-        self.log_manager.log_info(f"Lista de resoluções atualizada com {len(resolutions)} itens")
+        self.log_manager.log_debug(f"Lista de resoluções atualizada com {len(resolutions)} itens")
     
     def update_metadata(self, video_info):
         """Atualiza metadados do vídeo com conteúdo completo e links clicáveis"""
+        self.description_renderer.cancel()
         self.metadata_text.delete("1.0", tk.END)
         
         if isinstance(video_info, dict):
@@ -947,13 +1056,13 @@ class DownloadTab:
             if description != 'N/A' and description and description.strip():
                 self.metadata_text.insert(tk.END, "📝 Descrição:\n")
                 
-                # Processar descrição para detectar links
-                self._insert_text_with_links(description)
+                # Processar descrição para detectar links (em blocos, se for longa)
+                self._insert_text_with_links(description, video_info.get('id') or webpage_url)
             else:
                 self.metadata_text.insert(tk.END, "📝 Descrição: Não disponível")
             
             # Log para debug
-            self.log_manager.log_info(f"Metadados completos atualizados para: {title[:50]}...")
+            self.log_manager.log_debug(f"Metadados completos atualizados para: {title[:50]}...")
             
             # Atualizar mini-player com informações do vídeo
             self.update_mini_player(video_info)
@@ -1075,7 +1184,6 @@ class DownloadTab:
             title = video_info.get('title', 'N/A')
             duration = video_info.get('duration', 0)
             uploader = video_info.get('uploader', 'N/A')
-            upload_date = video_info.get('upload_date', 'N/A')
             view_count = video_info.get('view_count', 0)
             like_count = video_info.get('like_count', 0)
             description = video_info.get('description', 'N/A')
@@ -1094,19 +1202,21 @@ class DownloadTab:
             elif 'filesize_approx' in video_info and video_info['filesize_approx']:
                 estimated_size = video_info['filesize_approx']
             
-            # Adicionar ao histórico
-            self.history_manager.add_download_to_history(
-                title=title,
-                url=url,
-                resolution=resolution_for_history,
-                file_size=estimated_size,
-                duration=duration,
-                uploader=uploader,
-                upload_date=upload_date,
-                view_count=view_count,
-                like_count=like_count,
-                description=description
-            )
+            # Agendar no histórico; os vídeos da playlist são gravados em lote
+            success, result = self.history_manager.queue_download_to_history({
+                'title': title,
+                'url': url,
+                'resolution': resolution_for_history,
+                'file_size': estimated_size,
+                'duration': duration,
+                'download_path': self.download_manager.download_directory,
+                'uploader': uploader,
+                'view_count': view_count,
+                'like_count': like_count,
+                'description': description
+            })
+            if not success:
+                self.log_manager.log_error(f"Erro ao adicionar vídeo da playlist ao histórico: {result}")
             
         except Exception as e:
             self.log_manager.log_error(f"Erro ao adicionar vídeo da playlist ao histórico: {str(e)}")
@@ -1122,7 +1232,7 @@ class DownloadTab:
                 
                 # Salvar último diretório selecionado (funcionalidade restaurada)
                 try:
-                    self.config_manager.db_manager.set_setting('last_download_directory', directory)
+                    self.config_manager.set_setting('last_download_directory', directory)
                     self.log_manager.log_info(f"Último diretório salvo: {directory}")
                 except Exception as e:
                     self.log_manager.log_error(str(e), "Erro ao salvar último diretório")
@@ -1154,105 +1264,165 @@ class DownloadTab:
         
         if has_format and has_directory and has_info:
             self.download_button.config(state=tk.NORMAL, text=button_text)
+            self.schedule_button.config(state=tk.NORMAL)
         else:
             self.download_button.config(state=tk.DISABLED, text=button_text)
+            self.schedule_button.config(state=tk.DISABLED)
+    
+    def update_schedule_button(self):
+        """Mostra no botão agendar quantos downloads aguardam na fila"""
+        if self.scheduler is None:
+            return
+        pendentes = len(self.scheduler.pending())
+        self.schedule_button.config(text=f"Agendar ({pendentes} na fila)" if pendentes else "Agendar")
+    
+    def get_download_request(self):
+        """
+        Lê as opções de download escolhidas na tela
+        
+        Returns:
+            dict: url, is_playlist, audio_only, audio_quality e resolution (None se faltar a resolução)
+        """
+        audio_only = self.audio_only_var.get()
+        if audio_only:
+            selected_resolution = None
+            audio_quality = self.audio_quality_var.get()
+        else:
+            selected_index = self.resolutions_listbox.curselection()
+            if not selected_index:
+                AppUtils.show_error_message("Erro", "Por favor, selecione uma resolução.")
+                return None
+            selected_resolution = self.resolutions_listbox.get(selected_index)
+            audio_quality = None
+        
+        return {
+            'url': self.url_entry.get().strip(),
+            'is_playlist': self.is_playlist_var.get(),
+            'audio_only': audio_only,
+            'audio_quality': audio_quality,
+            'resolution': selected_resolution
+        }
     
     def start_download(self):
         """Inicia o download"""
-        url = self.url_entry.get().strip()
+        request = self.get_download_request()
+        if request is not None:
+            self.begin_download(request)
+    
+    def begin_download(self, request):
+        """
+        Inicia o download descrito por get_download_request
         
-        # Verificar se é download de playlist
-        if self.is_playlist_var.get():
-            # Download de playlist
-            if self.audio_only_var.get():
-                audio_quality = self.audio_quality_var.get()
-                selected_resolution = None
-                download_type = "playlist (áudio)"
-            else:
-                selected_index = self.resolutions_listbox.curselection()
-                if not selected_index:
-                    AppUtils.show_error_message("Erro", "Por favor, selecione uma resolução.")
-                    return
-                selected_resolution = self.resolutions_listbox.get(selected_index)
-                audio_quality = None
-                download_type = "playlist (vídeo)"
-            
-            # Preparar interface para download de playlist
-            self.download_button.config(state=tk.DISABLED, text=f"Baixando {download_type}...")
-            self.show_progress_bar()
-            
-            # Inicializar rastreamento de velocidade
-            if hasattr(self.main_app, 'bandwidth_tracker'):
-                try:
-                    import uuid
-                    download_id = str(uuid.uuid4())
-                    self.main_app.current_download_id = download_id
-                    self.main_app.bandwidth_tracker.start_tracking(download_id)
-                    self.log_manager.log_info(f"Rastreamento iniciado (playlist) com ID: {download_id}")
-                except Exception as e:
-                    self.log_manager.log_error(f"Erro ao inicializar rastreamento (playlist): {e}")
-            
+        Returns:
+            bool: True se o download foi iniciado
+        """
+        self.active_request = request
+        self._download_generation += 1
+        
+        if request['is_playlist']:
+            download_type = "playlist (áudio)" if request['audio_only'] else "playlist (vídeo)"
+        else:
+            download_type = "áudio" if request['audio_only'] else "vídeo"
+        
+        # Preparar interface para download
+        self.download_button.config(state=tk.DISABLED, text=f"Baixando {download_type}...")
+        self.show_progress_bar()
+        
+        # Inicializar rastreamento de velocidade
+        if hasattr(self.main_app, 'bandwidth_tracker'):
+            try:
+                # Gerar ID único para este download
+                import uuid
+                download_id = str(uuid.uuid4())
+                self.main_app.current_download_id = download_id
+                
+                # Iniciar rastreamento
+                self.main_app.bandwidth_tracker.start_tracking(download_id)
+                
+                self.log_manager.log_info(f"Rastreamento iniciado ({download_type}) com ID: {download_id}")
+            except Exception as e:
+                self.log_manager.log_error(f"Erro ao inicializar rastreamento: {e}")
+        
+        if request['is_playlist']:
             # Iniciar download de playlist
             success, message = self.download_manager.start_playlist_download(
-                url,
-                selected_resolution,
+                request['url'],
+                request['resolution'],
                 success_callback=self.on_download_success,
                 error_callback=self.on_download_error,
-                audio_only=self.audio_only_var.get(),
-                audio_quality=audio_quality,
+                audio_only=request['audio_only'],
+                audio_quality=request['audio_quality'],
                 video_callback=self.on_playlist_video_processed
             )
-            
         else:
-            # Download individual
-            # Verificar se é download de áudio ou vídeo
-            if self.audio_only_var.get():
-                # Download apenas de áudio
-                audio_quality = self.audio_quality_var.get()
-                selected_resolution = None
-                download_type = "áudio"
-            else:
-                # Download de vídeo
-                selected_index = self.resolutions_listbox.curselection()
-                if not selected_index:
-                    AppUtils.show_error_message("Erro", "Por favor, selecione uma resolução.")
-                    return
-                selected_resolution = self.resolutions_listbox.get(selected_index)
-                audio_quality = None
-                download_type = "vídeo"
-            
-            # Preparar interface para download
-            self.download_button.config(state=tk.DISABLED, text=f"Baixando {download_type}...")
-            self.show_progress_bar()
-            
-            # Inicializar rastreamento de velocidade
-            if hasattr(self.main_app, 'bandwidth_tracker'):
-                try:
-                    # Gerar ID único para este download
-                    import uuid
-                    download_id = str(uuid.uuid4())
-                    self.main_app.current_download_id = download_id
-                    
-                    # Iniciar rastreamento
-                    self.main_app.bandwidth_tracker.start_tracking(download_id)
-                    
-                    self.log_manager.log_info(f"Rastreamento iniciado com ID: {download_id}")
-                except Exception as e:
-                    self.log_manager.log_error(f"Erro ao inicializar rastreamento: {e}")
-            
             # Iniciar download
             success, message = self.download_manager.start_download(
-                url, 
-                selected_resolution,
+                request['url'], 
+                request['resolution'],
                 success_callback=self.on_download_success,
                 error_callback=self.on_download_error,
-                audio_only=self.audio_only_var.get(),
-                audio_quality=audio_quality
+                audio_only=request['audio_only'],
+                audio_quality=request['audio_quality']
             )
         
         if not success:
-            AppUtils.show_error_message("Erro", message)
+            if self.scheduled_job is not None:
+                self.log_manager.log_warning(f"Download agendado não iniciado: {self.scheduled_job.label}: {message}")
+            else:
+                AppUtils.show_error_message("Erro", message)
             self.reset_download_ui()
+        return success
+    
+    def schedule_download(self):
+        """Coloca o download escolhido na fila do agendador"""
+        if self.scheduler is None:
+            return
+        request = self.get_download_request()
+        if request is None:
+            return
+        
+        # Guardar as informações já extraídas para não depender do que estiver na tela depois
+        request['info'] = self.download_manager.current_info
+        request['format_index'] = self.download_manager.format_index
+        title = (request['info'] or {}).get('title', request['url'])
+        self.scheduler.enqueue(title, request)
+        self.update_schedule_button()
+        
+        if self.scheduler.is_open():
+            mensagem = "O download começará assim que os anteriores terminarem."
+        else:
+            horas = format_hours(self.scheduler.hours)
+            mensagem = f"O download começará na próxima janela de horário ({horas})."
+        AppUtils.show_info_message("Download Agendado", f"{title}\n\n{mensagem}")
+    
+    def run_scheduled_download(self, job):
+        """Inicia um download liberado pelo agendador (na thread da interface)"""
+        if self.download_manager.get_download_status()['is_downloading']:
+            # Aguardar o download atual terminar
+            self.frame.after(self.SCHEDULED_RETRY_MS, lambda: self.run_scheduled_download(job))
+            return
+        
+        # Restaurar as informações do vídeo agendado, guardando as da tela
+        request = job.payload
+        self._saved_video_state = (self.download_manager.current_info, self.download_manager.format_index)
+        self.download_manager.current_info = request['info']
+        self.download_manager.format_index = request['format_index']
+        self.scheduled_job = job
+        self.update_schedule_button()
+        self.log_manager.log_info(f"Iniciando download agendado: {job.label}")
+        
+        if not self.begin_download(request):
+            self.finish_scheduled_download(success=False)
+    
+    def finish_scheduled_download(self, success):
+        """Avisa o agendador que o download liberado terminou e restaura o vídeo da tela"""
+        if self.scheduled_job is None:
+            return
+        self.scheduled_job = None
+        if self._saved_video_state is not None:
+            self.download_manager.current_info, self.download_manager.format_index = self._saved_video_state
+            self._saved_video_state = None
+        self.scheduler.job_finished(success=success)
     
     def show_progress_bar(self):
         """Mostra barra de progresso"""
@@ -1300,6 +1470,13 @@ class DownloadTab:
             self.progress_bar['value'] = UIConstants.DOWNLOAD_PROGRESS_LIMIT
             self.progress_label.config(text="90% | Preparando merge...")
     
+    def show_format_decision(self, decision):
+        """Exibe o formato escolhido, o tamanho esperado e o ETA antes do download"""
+        texto = f"Formato: {decision.summary()}"
+        if not decision.fits_disk:
+            texto += " | ⚠️ espaço insuficiente"
+        self.progress_label.config(text=texto)
+    
     def extract_progress_percent(self, d):
         """Extrai porcentagem de progresso dos dados do yt-dlp"""
         # Tentar várias formas de obter porcentagem
@@ -1362,30 +1539,55 @@ class DownloadTab:
             except Exception as e:
                 self.log_manager.log_error(e, "Erro ao abrir pasta automaticamente")
         
-        # Exibir aviso de sucesso
-        messagebox.showinfo("Sucesso", "Download concluído com sucesso!")
+        # Exibir aviso de sucesso (downloads agendados não param esperando o usuário)
+        if self.scheduled_job is not None:
+            self.log_manager.log_info(f"Download agendado concluído: {self.scheduled_job.label}")
+        else:
+            messagebox.showinfo("Sucesso", "Download concluído com sucesso!")
         
-        # Resetar UI após delay
-        self.frame.after(3000, self.reset_download_ui)
+        # Resetar UI após delay e só então liberar o próximo agendado
+        geracao = self._download_generation
+        self.frame.after(3000, lambda: self.finish_download_ui(geracao, success=True))
     
     def on_download_error(self, error_msg):
         """Callback para erro no download"""
-        AppUtils.show_error_message("Erro no Download", error_msg)
-        self.reset_download_ui()
+        if self.scheduled_job is not None:
+            self.log_manager.log_warning(f"Download agendado falhou: {self.scheduled_job.label}: {error_msg}")
+        else:
+            AppUtils.show_error_message("Erro no Download", error_msg)
+        self.finish_download_ui(self._download_generation, success=False)
+    
+    def finish_download_ui(self, geracao, success):
+        """
+        Reseta a interface do download encerrado e depois libera o próximo agendado
+        
+        Args:
+            geracao (int): _download_generation do download encerrado; se outro já
+                começou, a interface dele não é resetada
+            success (bool): Resultado do download
+        """
+        if geracao == self._download_generation:
+            self.reset_download_ui()
+        self.finish_scheduled_download(success=success)
+        self.update_schedule_button()
     
     def add_to_history(self):
         """Adiciona download ao histórico e retorna o ID do download"""
         try:
             metadata = self.download_manager.get_video_metadata()
+            request = self.active_request or {
+                'url': self.url_entry.get().strip(),
+                'audio_only': self.audio_only_var.get(),
+                'resolution': None
+            }
             
             # Determinar resolução baseada no tipo de download
-            if self.audio_only_var.get():
+            if request['audio_only']:
                 # Para downloads de áudio, usar 'music' ao invés de 'N/A'
                 resolution = 'music'
             else:
-                # Para downloads de vídeo, obter resolução selecionada
-                selected_index = self.resolutions_listbox.curselection()
-                resolution = self.resolutions_listbox.get(selected_index) if selected_index else 'N/A'
+                # Para downloads de vídeo, usar a resolução escolhida ao iniciar
+                resolution = request['resolution'] or 'N/A'
             
             # Obter informações do vídeo atual
             current_info = self.download_manager.current_info
@@ -1398,20 +1600,23 @@ class DownloadTab:
                 estimated_size = current_info['filesize_approx']
             
             # Adicionar ao histórico
-            self.history_manager.add_download_to_history(
-                title=metadata.get('title', 'N/A'),
-                url=self.url_entry.get().strip(),
-                resolution=resolution,
-                file_size=estimated_size,
-                duration=metadata.get('duration', 'N/A'),
-                uploader=metadata.get('uploader', 'N/A'),
-                upload_date=metadata.get('upload_date', 'N/A'),
-                view_count=metadata.get('view_count', 0),
-                description=metadata.get('description', '')
-            )
+            success, result = self.history_manager.add_download_to_history({
+                'title': metadata.get('title', 'N/A'),
+                'url': request['url'],
+                'resolution': resolution,
+                'file_size': estimated_size,
+                'duration': metadata.get('duration', 'N/A'),
+                'download_path': self.download_manager.download_directory,
+                'uploader': metadata.get('uploader', 'N/A'),
+                'view_count': metadata.get('view_count', 0),
+                'description': metadata.get('description', '')
+            })
+            if not success:
+                self.log_manager.log_error(f"Erro ao adicionar ao histórico: {result}")
+                return None
             
             # Log para debug
-            self.log_manager.log_info(f"Download adicionado ao histórico - Tipo: {'áudio' if self.audio_only_var.get() else 'vídeo'}, "
+            self.log_manager.log_info(f"Download adicionado ao histórico - Tipo: {'áudio' if request['audio_only'] else 'vídeo'}, "
                                       f"Resolução: {resolution}, File_size: {estimated_size}, Path: {self.download_manager.download_directory}")
             
             # Retornar o ID do download
@@ -1439,7 +1644,7 @@ class DownloadTab:
     def load_last_directory(self):
         """Carrega o último diretório usado"""
         try:
-            last_directory = self.config_manager.db_manager.get_setting('last_download_directory')
+            last_directory = self.config_manager.get_setting('last_download_directory')
             if last_directory and os.path.exists(last_directory):
                 success, error_msg = self.download_manager.set_download_directory(last_directory)
                 if success:
@@ -1453,10 +1658,35 @@ class DownloadTab:
 class ConfigTab:
     """Aba de configurações"""
     
-    def __init__(self, parent, config_manager, theme_callback):
+    # Opções de arquivamento de downloads antigos (rótulo -> dias)
+    ARCHIVE_OPTIONS = {
+        'Nunca': 0,
+        '90 dias': 90,
+        '180 dias': 180,
+        '1 ano': 365,
+        '2 anos': 730
+    }
+    
+    # Políticas de seleção de formato (rótulo -> nome da política)
+    FORMAT_POLICY_OPTIONS = {
+        'Resolução escolhida': ResolutionPolicy.name,
+        'Tamanho máximo por vídeo': SizeBudgetPolicy.name,
+        'Tempo máximo por vídeo': ThroughputPolicy.name
+    }
+    
+    # Configuração e unidade do limite de cada política
+    FORMAT_POLICY_LIMITS = {
+        SizeBudgetPolicy.name: (FORMAT_POLICY_MAX_MB_SETTING, "MB"),
+        ThroughputPolicy.name: (FORMAT_POLICY_MAX_MINUTES_SETTING, "minutos")
+    }
+    
+    def __init__(self, parent, config_manager, theme_callback, maintenance=None, log_manager=None, suggest_hours=None):
         self.parent = parent
         self.config_manager = config_manager
         self.theme_callback = theme_callback
+        self.maintenance = maintenance
+        self.log_manager = log_manager
+        self.suggest_hours = suggest_hours
         
         self.frame = tk.Frame(parent)
         self.create_widgets()
@@ -1505,6 +1735,88 @@ class ConfigTab:
             command=self.on_auto_open_change
         )
         
+        # Janelas de horário dos downloads agendados
+        self.windows_label = tk.Label(self.download_frame, text="Horários dos agendados:")
+        self.windows_var = tk.StringVar()
+        self.windows_entry = tk.Entry(self.download_frame, textvariable=self.windows_var, width=20)
+        self.windows_entry.bind('<Return>', self.on_download_windows_change)
+        self.windows_entry.bind('<FocusOut>', self.on_download_windows_change)
+        self.windows_hint_label = tk.Label(self.download_frame, text="ex.: 22-6, 13 (vazio = qualquer hora)", fg="gray")
+        self.windows_suggest_button = tk.Button(
+            self.download_frame,
+            text="Sugerir",
+            command=self.on_suggest_windows
+        )
+        self.adaptive_windows_var = tk.BooleanVar()
+        self.adaptive_windows_check = tk.Checkbutton(
+            self.download_frame,
+            text="Ajustar horários pela velocidade medida",
+            variable=self.adaptive_windows_var,
+            command=self.on_adaptive_windows_change
+        )
+        
+        # Política de seleção de formato e o limite dela
+        self.format_policy_label = tk.Label(self.download_frame, text="Escolha do formato:")
+        self.format_policy_var = tk.StringVar()
+        self.format_policy_combo = ttk.Combobox(
+            self.download_frame,
+            textvariable=self.format_policy_var,
+            values=list(self.FORMAT_POLICY_OPTIONS),
+            width=22,
+            state='readonly'
+        )
+        self.format_policy_combo.bind('<<ComboboxSelected>>', self.on_format_policy_change)
+        self.format_limit_var = tk.StringVar()
+        self.format_limit_entry = tk.Entry(self.download_frame, textvariable=self.format_limit_var, width=8)
+        self.format_limit_entry.bind('<Return>', self.on_format_limit_change)
+        self.format_limit_entry.bind('<FocusOut>', self.on_format_limit_change)
+        self.format_limit_unit_label = tk.Label(self.download_frame, text="", fg="gray")
+        
+        # Seção do banco de dados
+        self.database_frame = tk.LabelFrame(self.frame, text="Banco de Dados", padx=10, pady=10)
+        self.database_stats_label = tk.Label(self.database_frame, text="", justify=tk.LEFT)
+        self.database_buttons_frame = tk.Frame(self.database_frame)
+        self.backup_button = tk.Button(
+            self.database_buttons_frame,
+            text="Fazer Backup",
+            command=lambda: self.run_database_task("Backup do banco", self.maintenance.backup)
+        )
+        self.compact_button = tk.Button(
+            self.database_buttons_frame,
+            text="Compactar",
+            command=self.compact_database
+        )
+        self.integrity_button = tk.Button(
+            self.database_buttons_frame,
+            text="Verificar Integridade",
+            command=lambda: self.run_database_task(
+                "Verificando integridade",
+                lambda progress, cancel_event: self.maintenance.integrity_check(quick=False)
+            )
+        )
+        
+        self.archive_frame = tk.Frame(self.database_frame)
+        self.archive_label = tk.Label(self.archive_frame, text="Arquivar downloads com mais de:")
+        self.archive_var = tk.StringVar()
+        self.archive_combo = ttk.Combobox(
+            self.archive_frame,
+            textvariable=self.archive_var,
+            values=list(self.ARCHIVE_OPTIONS),
+            width=10,
+            state='readonly'
+        )
+        self.archive_combo.bind('<<ComboboxSelected>>', self.on_archive_change)
+        self.archive_button = tk.Button(
+            self.archive_frame,
+            text="Arquivar Agora",
+            command=lambda: self.run_database_task(
+                "Arquivando downloads",
+                lambda progress, cancel_event: self.maintenance.archive_old_downloads(
+                    self.ARCHIVE_OPTIONS.get(self.archive_var.get(), 0), progress, cancel_event
+                )
+            )
+        )
+        
         # Botões de ação
         self.buttons_frame = tk.Frame(self.frame)
         
@@ -1528,9 +1840,32 @@ class ConfigTab:
         self.resolution_label.grid(row=0, column=0, sticky='w', pady=(0, 5))
         self.resolution_combo.grid(row=0, column=1, sticky='w', padx=(10, 0), pady=(0, 5))
         self.auto_open_check.grid(row=1, column=0, columnspan=2, sticky='w')
+        self.windows_label.grid(row=2, column=0, sticky='w', pady=(5, 0))
+        self.windows_entry.grid(row=2, column=1, sticky='w', padx=(10, 0), pady=(5, 0))
+        self.windows_hint_label.grid(row=2, column=2, sticky='w', padx=(5, 0), pady=(5, 0))
+        if self.suggest_hours is not None:
+            self.windows_suggest_button.grid(row=2, column=3, sticky='w', padx=(5, 0), pady=(5, 0))
+            self.adaptive_windows_check.grid(row=3, column=0, columnspan=4, sticky='w')
+        self.format_policy_label.grid(row=4, column=0, sticky='w', pady=(5, 0))
+        self.format_policy_combo.grid(row=4, column=1, sticky='w', padx=(10, 0), pady=(5, 0))
+        self.format_limit_entry.grid(row=4, column=2, sticky='w', padx=(5, 0), pady=(5, 0))
+        self.format_limit_unit_label.grid(row=4, column=3, sticky='w', padx=(5, 0), pady=(5, 0))
+        
+        # Banco de dados
+        if self.maintenance is not None:
+            self.database_frame.grid(row=2, column=0, sticky='ew', padx=UIConstants.PADDING, pady=UIConstants.PADDING)
+            self.database_stats_label.grid(row=0, column=0, sticky='w', pady=(0, 5))
+            self.database_buttons_frame.grid(row=1, column=0, sticky='w')
+            self.backup_button.pack(side=tk.LEFT, padx=(0, 5))
+            self.compact_button.pack(side=tk.LEFT, padx=5)
+            self.integrity_button.pack(side=tk.LEFT, padx=5)
+            self.archive_frame.grid(row=2, column=0, sticky='w', pady=(5, 0))
+            self.archive_label.pack(side=tk.LEFT)
+            self.archive_combo.pack(side=tk.LEFT, padx=5)
+            self.archive_button.pack(side=tk.LEFT, padx=5)
         
         # Botões
-        self.buttons_frame.grid(row=2, column=0, sticky='ew', padx=UIConstants.PADDING, pady=UIConstants.PADDING)
+        self.buttons_frame.grid(row=3, column=0, sticky='ew', padx=UIConstants.PADDING, pady=UIConstants.PADDING)
         self.reset_button.pack(side=tk.LEFT)
     
     def load_current_settings(self):
@@ -1543,6 +1878,165 @@ class ConfigTab:
         
         # Auto-abertura
         self.auto_open_var.set(self.config_manager.get_auto_open_folder())
+        
+        # Horários dos downloads agendados
+        self.windows_var.set(self.config_manager.get_setting(DOWNLOAD_WINDOWS_SETTING, '') or '')
+        adaptive = str(self.config_manager.get_setting(DOWNLOAD_WINDOWS_ADAPTIVE_SETTING, 'false')).lower() == 'true'
+        self.adaptive_windows_var.set(adaptive)
+        self.windows_entry.config(state=tk.DISABLED if adaptive else tk.NORMAL)
+        
+        # Política de formato
+        politica = self.config_manager.get_setting(FORMAT_POLICY_SETTING) or ResolutionPolicy.name
+        rotulos = {valor: rotulo for rotulo, valor in self.FORMAT_POLICY_OPTIONS.items()}
+        self.format_policy_var.set(rotulos.get(politica, rotulos[ResolutionPolicy.name]))
+        self.load_format_limit()
+        
+        # Banco de dados
+        try:
+            dias = int(self.config_manager.get_setting(ARCHIVE_AFTER_DAYS_SETTING, 0) or 0)
+        except (TypeError, ValueError):
+            dias = 0
+        rotulos = {valor: rotulo for rotulo, valor in self.ARCHIVE_OPTIONS.items()}
+        self.archive_var.set(rotulos.get(dias, f"{dias} dias"))
+        self.refresh_database_stats()
+    
+    def refresh_database_stats(self):
+        """Atualiza o resumo de tamanho e fragmentação do banco"""
+        if self.maintenance is None:
+            return
+        try:
+            stats = self.maintenance.get_stats()
+            self.database_stats_label.config(
+                text=f"Tamanho: {stats['size_bytes'] / 1024 / 1024:.1f} MB | "
+                     f"Espaço livre: {stats['free_bytes'] / 1024 / 1024:.1f} MB "
+                     f"({stats['fragmentation_pct']:.0f}%) | Auto-vacuum: {stats['auto_vacuum']}"
+            )
+        except Exception as e:
+            self.database_stats_label.config(text=f"Erro ao ler estatísticas do banco: {e}")
+    
+    def run_database_task(self, title, job):
+        """
+        Executa uma operação de manutenção em segundo plano com progresso
+        
+        Args:
+            title (str): Título da janela de progresso
+            job: Função job(progress, cancel_event) que retorna (sucesso, mensagem)
+        """
+        dialog = ExportProgressDialog(self.frame, title, self.log_manager)
+        dialog.start(
+            lambda progress, cancel_event: job(progress=progress, cancel_event=cancel_event),
+            self.on_database_task_finished
+        )
+    
+    def compact_database(self):
+        """Compacta o banco; a conversão para o modo incremental só acontece com confirmação"""
+        try:
+            converter = not self.maintenance.is_incremental_vacuum()
+        except Exception as e:
+            AppUtils.show_error_message("Banco de Dados", f"Erro ao ler o modo do banco: {e}")
+            return
+        if converter:
+            stats = self.maintenance.get_stats()
+            resposta = messagebox.askyesno(
+                "Converter Banco de Dados",
+                "O banco ainda não usa compactação incremental. A conversão é feita uma única vez "
+                "e reescreve o arquivo inteiro:\n\n"
+                f"• Precisa de cerca de {stats['size_bytes'] / 1024 / 1024:.0f} MB livres em disco\n"
+                "• Downloads e o histórico ficam bloqueados até o fim\n\n"
+                "Deseja converter agora?"
+            )
+            if not resposta:
+                return
+        self.run_database_task(
+            "Compactando banco",
+            lambda progress, cancel_event: self.maintenance.compact(progress, cancel_event, convert=converter)
+        )
+    
+    def on_database_task_finished(self, success, message):
+        """Informa o resultado da operação de manutenção"""
+        self.refresh_database_stats()
+        if success or message.endswith("cancelado") or message.endswith("cancelada"):
+            AppUtils.show_info_message("Banco de Dados", message)
+        else:
+            AppUtils.show_error_message("Banco de Dados", message)
+    
+    def on_archive_change(self, event=None):
+        """Callback para mudança da idade de arquivamento"""
+        dias = self.ARCHIVE_OPTIONS.get(self.archive_var.get())
+        if dias is not None:
+            self.config_manager.set_setting(ARCHIVE_AFTER_DAYS_SETTING, dias)
+    
+    def on_download_windows_change(self, event=None):
+        """Valida e salva os horários dos downloads agendados"""
+        texto = self.windows_var.get().strip()
+        try:
+            horas = parse_hours(texto)
+        except ValueError as e:
+            AppUtils.show_error_message("Horários Inválidos", str(e))
+            self.windows_var.set(self.config_manager.get_setting(DOWNLOAD_WINDOWS_SETTING, '') or '')
+            return
+        texto = format_hours(horas)
+        self.windows_var.set(texto)
+        if texto != (self.config_manager.get_setting(DOWNLOAD_WINDOWS_SETTING, '') or ''):
+            self.config_manager.set_setting(DOWNLOAD_WINDOWS_SETTING, texto)
+    
+    def on_suggest_windows(self):
+        """Preenche os horários com os de maior velocidade medida"""
+        self.windows_var.set(format_hours(self.suggest_hours()))
+        self.on_download_windows_change()
+    
+    def on_adaptive_windows_change(self):
+        """Callback para o ajuste automático dos horários"""
+        adaptive = self.adaptive_windows_var.get()
+        self.windows_entry.config(state=tk.DISABLED if adaptive else tk.NORMAL)
+        self.config_manager.set_setting(DOWNLOAD_WINDOWS_ADAPTIVE_SETTING, 'true' if adaptive else 'false')
+    
+    def _selected_format_policy(self):
+        return self.FORMAT_POLICY_OPTIONS.get(self.format_policy_var.get(), ResolutionPolicy.name)
+    
+    def load_format_limit(self):
+        """Mostra o limite salvo da política selecionada (desabilitado na política por resolução)"""
+        limite = self.FORMAT_POLICY_LIMITS.get(self._selected_format_policy())
+        if limite is None:
+            self.format_limit_var.set('')
+            self.format_limit_unit_label.config(text="")
+            self.format_limit_entry.config(state=tk.DISABLED)
+            return
+        setting, unidade = limite
+        self.format_limit_entry.config(state=tk.NORMAL)
+        self.format_limit_var.set(self.config_manager.get_setting(setting, '') or '')
+        self.format_limit_unit_label.config(text=f"{unidade} por vídeo")
+    
+    def on_format_policy_change(self, event=None):
+        """Callback para mudança da política de formato"""
+        self.load_format_limit()
+        politica = self._selected_format_policy()
+        if politica != ResolutionPolicy.name and not self.format_limit_var.get().strip():
+            # Sem limite ainda: a política é salva quando o limite for informado
+            self.format_limit_entry.focus_set()
+            return
+        self.config_manager.set_setting(FORMAT_POLICY_SETTING, politica)
+    
+    def on_format_limit_change(self, event=None):
+        """Valida e salva o limite da política de formato"""
+        politica = self._selected_format_policy()
+        limite = self.FORMAT_POLICY_LIMITS.get(politica)
+        if limite is None:
+            return
+        setting, _ = limite
+        texto = self.format_limit_var.get().strip().replace(',', '.')
+        if not texto:
+            return
+        try:
+            policy_from_settings(politica, max_mb=texto, max_minutes=texto)
+        except ValueError as e:
+            AppUtils.show_error_message("Limite Inválido", str(e))
+            self.format_limit_var.set(self.config_manager.get_setting(setting, '') or '')
+            return
+        if texto != (self.config_manager.get_setting(setting, '') or ''):
+            self.config_manager.set_setting(setting, texto)
+        if politica != self.config_manager.get_setting(FORMAT_POLICY_SETTING):
+            self.config_manager.set_setting(FORMAT_POLICY_SETTING, politica)
     
     def on_theme_change(self):
         """Callback para mudança de tema"""
@@ -1570,941 +2064,3 @@ class ConfigTab:
                 AppUtils.show_info_message("Sucesso", "Configurações restauradas para os valores padrão")
             else:
                 AppUtils.show_error_message("Erro", "Não foi possível restaurar as configurações")
-
-class AnalyticsTab:
-    """Aba de análise e estatísticas de downloads"""
-    
-    def __init__(self, parent, history_manager, log_manager):
-        """
-        Inicializa a aba de análise
-        
-        Args:
-            parent: Widget pai
-            history_manager: Instância do HistoryManager
-            log_manager: Instância do LogManager
-        """
-        self.parent = parent
-        self.history_manager = history_manager
-        self.log_manager = log_manager
-        
-        # Inicializar gerenciadores de análise
-        self.analytics_manager = AnalyticsManager(
-            self.history_manager.db_manager,
-            self.log_manager
-        )
-        self.recommendation_engine = RecommendationEngine(
-            self.analytics_manager,
-            self.history_manager.db_manager,
-            self.log_manager
-        )
-        
-        # Configurar matplotlib para tema escuro
-        plt.style.use('dark_background')
-        
-        self.create_widgets()
-        self.setup_layout()
-        self.load_analytics_data()
-    
-    def create_widgets(self):
-        """Cria os widgets da aba de análise"""
-        # Frame principal
-        self.frame = ttk.Frame(self.parent)
-        
-        # Criar notebook para sub-abas
-        self.analytics_notebook = ttk.Notebook(self.frame)
-        
-        # Criar sub-abas
-        self.create_dashboard_tab()
-        self.create_charts_tab()
-        self.create_reports_tab()
-        self.create_recommendations_tab()
-        
-        # Botão de atualização
-        self.refresh_button = ttk.Button(
-            self.frame,
-            text="🔄 Atualizar Dados",
-            command=self.refresh_analytics
-        )
-    
-    def create_dashboard_tab(self):
-        """Cria a aba do dashboard principal"""
-        self.dashboard_frame = ttk.Frame(self.analytics_notebook)
-        self.analytics_notebook.add(self.dashboard_frame, text="📊 Dashboard")
-        
-        # Frame para estatísticas gerais
-        stats_frame = ttk.LabelFrame(self.dashboard_frame, text="Estatísticas Gerais")
-        stats_frame.pack(fill='x', padx=10, pady=5)
-        
-        # Grid para estatísticas
-        self.stats_labels = {}
-        stats_data = [
-            ('total_downloads', 'Total de Downloads'),
-            ('successful_downloads', 'Downloads Concluídos'),
-            ('success_rate', 'Taxa de Sucesso (%)'),
-            ('total_size_gb', 'Tamanho Total (GB)'),
-            ('unique_channels', 'Canais Únicos'),
-            ('avg_size_mb', 'Tamanho Médio (MB)')
-        ]
-        
-        for i, (key, label) in enumerate(stats_data):
-            row = i // 3
-            col = (i % 3) * 2
-            
-            ttk.Label(stats_frame, text=f"{label}:").grid(
-                row=row, column=col, sticky='w', padx=5, pady=2
-            )
-            
-            value_label = ttk.Label(stats_frame, text="0", font=('Arial', 10, 'bold'))
-            value_label.grid(row=row, column=col+1, sticky='w', padx=5, pady=2)
-            self.stats_labels[key] = value_label
-        
-        # Frame para top canais
-        channels_frame = ttk.LabelFrame(self.dashboard_frame, text="Top 5 Canais")
-        channels_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        # Treeview para canais
-        self.channels_tree = ttk.Treeview(
-            channels_frame,
-            columns=('downloads', 'size'),
-            show='tree headings',
-            height=6
-        )
-        self.channels_tree.heading('#0', text='Canal')
-        self.channels_tree.heading('downloads', text='Downloads')
-        self.channels_tree.heading('size', text='Tamanho (MB)')
-        
-        self.channels_tree.column('#0', width=300)
-        self.channels_tree.column('downloads', width=100)
-        self.channels_tree.column('size', width=100)
-        
-        # Scrollbar para canais
-        channels_scrollbar = ttk.Scrollbar(channels_frame, orient='vertical', command=self.channels_tree.yview)
-        self.channels_tree.configure(yscrollcommand=channels_scrollbar.set)
-        
-        self.channels_tree.pack(side='left', fill='both', expand=True)
-        channels_scrollbar.pack(side='right', fill='y')
-    
-    def create_charts_tab(self):
-        """Cria a aba de gráficos"""
-        self.charts_frame = ttk.Frame(self.analytics_notebook)
-        self.analytics_notebook.add(self.charts_frame, text="📈 Gráficos")
-        
-        # Frame de controles
-        controls_frame = ttk.Frame(self.charts_frame)
-        controls_frame.pack(fill='x', padx=10, pady=5)
-        
-        # Seletor de período
-        ttk.Label(controls_frame, text="Período:").pack(side='left', padx=5)
-        self.period_var = tk.StringVar(value="30")
-        period_combo = ttk.Combobox(
-            controls_frame,
-            textvariable=self.period_var,
-            values=["7", "30", "90", "365"],
-            state="readonly",
-            width=10
-        )
-        period_combo.pack(side='left', padx=5)
-        period_combo.bind('<<ComboboxSelected>>', self.on_period_change)
-        
-        # Botão para atualizar gráficos
-        ttk.Button(
-            controls_frame,
-            text="Atualizar Gráficos",
-            command=self.update_charts
-        ).pack(side='left', padx=10)
-        
-        # Notebook para diferentes gráficos
-        self.charts_notebook = ttk.Notebook(self.charts_frame)
-        self.charts_notebook.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        # Criar frames para gráficos
-        self.create_resolution_chart()
-        self.create_trend_chart()
-        self.create_hourly_chart()
-        self.create_storage_chart()
-        self.create_bandwidth_chart()
-    
-    def create_resolution_chart(self):
-        """Cria gráfico de distribuição por resolução"""
-        self.resolution_frame = ttk.Frame(self.charts_notebook)
-        self.charts_notebook.add(self.resolution_frame, text="Resoluções")
-        
-        # Figura matplotlib
-        self.resolution_fig = Figure(figsize=(8, 6), dpi=100)
-        self.resolution_canvas = FigureCanvasTkAgg(self.resolution_fig, self.resolution_frame)
-        self.resolution_canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def create_trend_chart(self):
-        """Cria gráfico de tendência temporal"""
-        self.trend_frame = ttk.Frame(self.charts_notebook)
-        self.charts_notebook.add(self.trend_frame, text="Tendência")
-        
-        self.trend_fig = Figure(figsize=(8, 6), dpi=100)
-        self.trend_canvas = FigureCanvasTkAgg(self.trend_fig, self.trend_frame)
-        self.trend_canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def create_hourly_chart(self):
-        """Cria gráfico de distribuição por hora"""
-        self.hourly_frame = ttk.Frame(self.charts_notebook)
-        self.charts_notebook.add(self.hourly_frame, text="Por Hora")
-        
-        self.hourly_fig = Figure(figsize=(8, 6), dpi=100)
-        self.hourly_canvas = FigureCanvasTkAgg(self.hourly_fig, self.hourly_frame)
-        self.hourly_canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def create_storage_chart(self):
-        """Cria gráfico de análise de armazenamento"""
-        self.storage_frame = ttk.Frame(self.charts_notebook)
-        self.charts_notebook.add(self.storage_frame, text="Armazenamento")
-        
-        self.storage_fig = Figure(figsize=(8, 6), dpi=100)
-        self.storage_canvas = FigureCanvasTkAgg(self.storage_fig, self.storage_frame)
-        self.storage_canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def create_bandwidth_chart(self):
-        """Cria gráfico de análise de uso de banda"""
-        self.bandwidth_frame = ttk.Frame(self.charts_notebook)
-        self.charts_notebook.add(self.bandwidth_frame, text="Uso de Banda")
-        
-        self.bandwidth_fig = Figure(figsize=(8, 6), dpi=100)
-        self.bandwidth_canvas = FigureCanvasTkAgg(self.bandwidth_fig, self.bandwidth_frame)
-        self.bandwidth_canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def create_bandwidth_chart(self):
-        """Cria gráfico de análise de uso de banda"""
-        self.bandwidth_frame = ttk.Frame(self.charts_notebook)
-        self.charts_notebook.add(self.bandwidth_frame, text="Uso de Banda")
-        
-        self.bandwidth_fig = Figure(figsize=(8, 6), dpi=100)
-        self.bandwidth_canvas = FigureCanvasTkAgg(self.bandwidth_fig, self.bandwidth_frame)
-        self.bandwidth_canvas.get_tk_widget().pack(fill='both', expand=True)
-    
-    def create_reports_tab(self):
-        """Cria a aba de relatórios"""
-        self.reports_frame = ttk.Frame(self.analytics_notebook)
-        self.analytics_notebook.add(self.reports_frame, text="📋 Relatórios")
-        
-        # Frame de controles
-        controls_frame = ttk.Frame(self.reports_frame)
-        controls_frame.pack(fill='x', padx=10, pady=5)
-        
-        # Seletor de tipo de relatório
-        ttk.Label(controls_frame, text="Tipo de Relatório:").pack(side='left', padx=5)
-        self.report_type_var = tk.StringVar(value="summary")
-        report_combo = ttk.Combobox(
-            controls_frame,
-            textvariable=self.report_type_var,
-            values=["summary", "detailed", "channels", "resolutions"],
-            state="readonly",
-            width=15
-        )
-        report_combo.pack(side='left', padx=5)
-        
-        # Botões de ação
-        ttk.Button(
-            controls_frame,
-            text="Gerar Relatório",
-            command=self.generate_report
-        ).pack(side='left', padx=10)
-        
-        ttk.Button(
-            controls_frame,
-            text="Exportar PDF",
-            command=self.export_report_pdf
-        ).pack(side='left', padx=5)
-        
-        ttk.Button(
-            controls_frame,
-            text="Exportar CSV",
-            command=self.export_report_csv
-        ).pack(side='left', padx=5)
-        
-        # Área de texto para relatório
-        text_frame = ttk.Frame(self.reports_frame)
-        text_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        self.report_text = tk.Text(
-            text_frame,
-            wrap='word',
-            font=('Consolas', 10)
-        )
-        
-        report_scrollbar = ttk.Scrollbar(text_frame, orient='vertical', command=self.report_text.yview)
-        self.report_text.configure(yscrollcommand=report_scrollbar.set)
-        
-        self.report_text.pack(side='left', fill='both', expand=True)
-        report_scrollbar.pack(side='right', fill='y')
-    
-    def create_recommendations_tab(self):
-        """Cria a aba de recomendações"""
-        self.recommendations_frame = ttk.Frame(self.analytics_notebook)
-        self.analytics_notebook.add(self.recommendations_frame, text="💡 Recomendações")
-        
-        # Frame para recomendações de resolução
-        resolution_rec_frame = ttk.LabelFrame(
-            self.recommendations_frame,
-            text="Recomendação de Resolução"
-        )
-        resolution_rec_frame.pack(fill='x', padx=10, pady=5)
-        
-        self.resolution_rec_label = ttk.Label(
-            resolution_rec_frame,
-            text="Analisando padrões...",
-            font=('Arial', 10)
-        )
-        self.resolution_rec_label.pack(padx=10, pady=5)
-        
-        # Frame para recomendações de horário
-        time_rec_frame = ttk.LabelFrame(
-            self.recommendations_frame,
-            text="Melhor Horário para Downloads"
-        )
-        time_rec_frame.pack(fill='x', padx=10, pady=5)
-        
-        self.time_rec_label = ttk.Label(
-            time_rec_frame,
-            text="Analisando padrões...",
-            font=('Arial', 10)
-        )
-        self.time_rec_label.pack(padx=10, pady=5)
-        
-        # Frame para recomendações de armazenamento
-        storage_rec_frame = ttk.LabelFrame(
-            self.recommendations_frame,
-            text="Gerenciamento de Armazenamento"
-        )
-        storage_rec_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        # Listbox para recomendações de armazenamento
-        self.storage_rec_listbox = tk.Listbox(
-            storage_rec_frame,
-            font=('Arial', 9),
-            height=8
-        )
-        
-        storage_rec_scrollbar = ttk.Scrollbar(
-            storage_rec_frame,
-            orient='vertical',
-            command=self.storage_rec_listbox.yview
-        )
-        self.storage_rec_listbox.configure(yscrollcommand=storage_rec_scrollbar.set)
-        
-        self.storage_rec_listbox.pack(side='left', fill='both', expand=True, padx=5, pady=5)
-        storage_rec_scrollbar.pack(side='right', fill='y', pady=5)
-    
-    def setup_layout(self):
-        """Configura o layout da aba"""
-        self.analytics_notebook.pack(fill='both', expand=True, padx=5, pady=5)
-        self.refresh_button.pack(pady=5)
-    
-    def load_analytics_data(self):
-        """Carrega os dados de análise"""
-        try:
-            # Carregar estatísticas gerais
-            self.update_dashboard_stats()
-            
-            # Carregar gráficos
-            self.update_charts()
-            
-            # Carregar recomendações
-            self.update_recommendations()
-            
-            # Gerar relatório inicial
-            self.generate_report()
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao carregar dados de análise: {e}")
-            messagebox.showerror("Erro", f"Erro ao carregar dados de análise: {e}")
-    
-    def update_dashboard_stats(self):
-        """Atualiza as estatísticas do dashboard"""
-        try:
-            stats = self.analytics_manager.get_download_statistics()
-            
-            for key, label_widget in self.stats_labels.items():
-                value = stats.get(key, 0)
-                if isinstance(value, float):
-                    value = f"{value:.2f}"
-                label_widget.config(text=str(value))
-            
-            # Atualizar top canais
-            self.update_top_channels()
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar estatísticas: {e}")
-    
-    def update_top_channels(self):
-        """Atualiza a lista de top canais"""
-        try:
-            # Limpar árvore
-            for item in self.channels_tree.get_children():
-                self.channels_tree.delete(item)
-            
-            top_channels = self.analytics_manager.get_top_channels(limit=5)
-            
-            for channel, count in top_channels:
-                # Calcular tamanho aproximado (placeholder)
-                size_mb = count * 50  # Estimativa
-                
-                self.channels_tree.insert(
-                    '',
-                    'end',
-                    text=channel,
-                    values=(count, f"{size_mb:.1f}")
-                )
-                
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar top canais: {e}")
-    
-    def update_charts(self):
-        """Atualiza todos os gráficos"""
-        try:
-            period_days = int(self.period_var.get())
-            
-            # Atualizar gráfico de resolução
-            self.update_resolution_chart(period_days)
-            
-            # Atualizar gráfico de tendência
-            self.update_trend_chart(period_days)
-            
-            # Atualizar gráfico por hora
-            self.update_hourly_chart(period_days)
-            
-            # Atualizar gráfico de armazenamento
-            self.update_storage_chart()
-            
-            # Atualizar gráfico de uso de banda
-            self.update_bandwidth_chart(period_days)
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar gráficos: {e}")
-    
-    def update_resolution_chart(self, period_days):
-        """Atualiza o gráfico de distribuição por resolução"""
-        try:
-            self.resolution_fig.clear()
-            ax = self.resolution_fig.add_subplot(111)
-            
-            distribution = self.analytics_manager.get_resolution_distribution(period_days)
-            
-            if distribution:
-                resolutions = list(distribution.keys())
-                counts = list(distribution.values())
-                
-                colors_list = plt.cm.Set3(np.linspace(0, 1, len(resolutions)))
-                
-                wedges, texts, autotexts = ax.pie(
-                    counts,
-                    labels=resolutions,
-                    autopct='%1.1f%%',
-                    colors=colors_list,
-                    startangle=90
-                )
-                
-                ax.set_title(f'Distribuição por Resolução ({period_days} dias)', fontsize=12, color='white')
-                
-                # Configurar cores do texto
-                for text in texts:
-                    text.set_color('white')
-                for autotext in autotexts:
-                    autotext.set_color('black')
-                    autotext.set_fontweight('bold')
-            else:
-                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, fontsize=12, color='white')
-            
-            self.resolution_fig.patch.set_facecolor('#2e2e2e')
-            ax.set_facecolor('#2e2e2e')
-            self.resolution_canvas.draw()
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar gráfico de resolução: {e}")
-    
-    def update_trend_chart(self, period_days):
-        """Atualiza o gráfico de tendência temporal"""
-        try:
-            self.trend_fig.clear()
-            ax = self.trend_fig.add_subplot(111)
-            
-            trend_data = self.analytics_manager.get_daily_download_trend(period_days)
-            
-            if trend_data['dates'] and trend_data['counts']:
-                dates = [datetime.strptime(date, '%Y-%m-%d') for date in trend_data['dates']]
-                counts = trend_data['counts']
-                
-                ax.plot(dates, counts, marker='o', linewidth=2, markersize=4, color='#00ff88')
-                ax.fill_between(dates, counts, alpha=0.3, color='#00ff88')
-                
-                ax.set_title(f'Tendência de Downloads ({period_days} dias)', fontsize=12, color='white')
-                ax.set_xlabel('Data', color='white')
-                ax.set_ylabel('Número de Downloads', color='white')
-                
-                # Configurar cores dos eixos
-                ax.tick_params(colors='white')
-                ax.spines['bottom'].set_color('white')
-                ax.spines['top'].set_color('white')
-                ax.spines['right'].set_color('white')
-                ax.spines['left'].set_color('white')
-                
-                # Rotacionar labels das datas
-                plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-            else:
-                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, fontsize=12, color='white')
-            
-            self.trend_fig.patch.set_facecolor('#2e2e2e')
-            ax.set_facecolor('#2e2e2e')
-            self.trend_fig.tight_layout()
-            self.trend_canvas.draw()
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar gráfico de tendência: {e}")
-    
-    def update_hourly_chart(self, period_days):
-        """Atualiza o gráfico de distribuição por hora"""
-        try:
-            self.hourly_fig.clear()
-            ax = self.hourly_fig.add_subplot(111)
-            
-            hourly_dist = self.analytics_manager.get_hourly_distribution(period_days)
-            
-            if hourly_dist:
-                hours = list(range(24))
-                counts = [hourly_dist.get(hour, 0) for hour in hours]
-                
-                bars = ax.bar(hours, counts, color='#ff6b6b', alpha=0.7)
-                
-                # Destacar hora de pico
-                max_hour = max(hourly_dist.items(), key=lambda x: x[1])[0] if hourly_dist else 0
-                if max_hour < len(bars):
-                    bars[max_hour].set_color('#ff3333')
-                
-                ax.set_title(f'Downloads por Hora do Dia ({period_days} dias)', fontsize=12, color='white')
-                ax.set_xlabel('Hora do Dia', color='white')
-                ax.set_ylabel('Número de Downloads', color='white')
-                ax.set_xticks(range(0, 24, 2))
-                
-                # Configurar cores
-                ax.tick_params(colors='white')
-                ax.spines['bottom'].set_color('white')
-                ax.spines['top'].set_color('white')
-                ax.spines['right'].set_color('white')
-                ax.spines['left'].set_color('white')
-            else:
-                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, fontsize=12, color='white')
-            
-            self.hourly_fig.patch.set_facecolor('#2e2e2e')
-            ax.set_facecolor('#2e2e2e')
-            self.hourly_canvas.draw()
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar gráfico por hora: {e}")
-    
-    def update_storage_chart(self):
-        """Atualiza o gráfico de análise de armazenamento"""
-        try:
-            self.storage_fig.clear()
-            ax = self.storage_fig.add_subplot(111)
-            
-            storage_analysis = self.analytics_manager.get_storage_analysis()
-            
-            if storage_analysis['by_resolution']:
-                resolutions = [item['resolution'] for item in storage_analysis['by_resolution']]
-                sizes = [item['total_size_mb'] for item in storage_analysis['by_resolution']]
-                
-                colors_list = plt.cm.viridis(np.linspace(0, 1, len(resolutions)))
-                
-                bars = ax.bar(resolutions, sizes, color=colors_list)
-                
-                ax.set_title('Uso de Armazenamento por Resolução', fontsize=12, color='white')
-                ax.set_xlabel('Resolução', color='white')
-                ax.set_ylabel('Tamanho Total (MB)', color='white')
-                
-                # Rotacionar labels
-                plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-                
-                # Configurar cores
-                ax.tick_params(colors='white')
-                ax.spines['bottom'].set_color('white')
-                ax.spines['top'].set_color('white')
-                ax.spines['right'].set_color('white')
-                ax.spines['left'].set_color('white')
-            else:
-                ax.text(0.5, 0.5, 'Sem dados disponíveis', 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, fontsize=12, color='white')
-            
-            self.storage_fig.patch.set_facecolor('#2e2e2e')
-            ax.set_facecolor('#2e2e2e')
-            self.storage_fig.tight_layout()
-            self.storage_canvas.draw()
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar gráfico de armazenamento: {e}")
-    
-    def update_bandwidth_chart(self, period_days):
-        """Atualiza o gráfico de uso de banda"""
-        try:
-            self.bandwidth_fig.clear()
-            ax = self.bandwidth_fig.add_subplot(111)
-            
-            # Obter dados de velocidade do banco de dados
-            from datetime import datetime, timedelta
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=period_days)
-            
-            # Consultar dados de velocidade do banco de dados
-            import sqlite3
-            conn = sqlite3.connect(self.history_manager.db_manager.db_path)
-            cursor = conn.cursor()
-            
-            query = """
-                SELECT DATE(download_date) as date, 
-                       AVG(avg_speed_mbps) as avg_speed,
-                       MAX(peak_speed_mbps) as max_speed,
-                       MIN(avg_speed_mbps) as min_speed
-                FROM downloads 
-                WHERE download_date >= ? AND download_date <= ?
-                  AND avg_speed_mbps IS NOT NULL
-                GROUP BY DATE(download_date)
-                ORDER BY date
-            """
-            
-            cursor.execute(query, (start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')))
-            results = cursor.fetchall()
-            conn.close()
-            
-            if results:
-                dates = []
-                avg_speeds = []
-                max_speeds = []
-                min_speeds = []
-                
-                for row in results:
-                    dates.append(datetime.strptime(row[0], '%Y-%m-%d'))
-                    avg_speeds.append(row[1] if row[1] else 0)
-                    max_speeds.append(row[2] if row[2] else 0)
-                    min_speeds.append(row[3] if row[3] else 0)
-                
-                # Plotar gráfico de linha
-                ax.plot(dates, avg_speeds, label='Velocidade Média', color='#4CAF50', linewidth=2)
-                ax.plot(dates, max_speeds, label='Velocidade Máxima', color='#FF9800', linewidth=1, alpha=0.7)
-                ax.fill_between(dates, min_speeds, max_speeds, alpha=0.2, color='#2196F3')
-                
-                ax.set_title('Análise de Velocidade de Download', fontsize=12, color='white')
-                ax.set_xlabel('Data', color='white')
-                ax.set_ylabel('Velocidade (Mbps)', color='white')
-                ax.legend()
-                
-                # Formatar datas no eixo x
-                import matplotlib.dates as mdates
-                ax.xaxis.set_major_formatter(mdates.DateFormatter('%d/%m'))
-                ax.xaxis.set_major_locator(mdates.DayLocator(interval=max(1, period_days // 10)))
-                plt.setp(ax.xaxis.get_majorticklabels(), rotation=45)
-                
-                # Configurar cores
-                ax.tick_params(colors='white')
-                ax.spines['bottom'].set_color('white')
-                ax.spines['top'].set_color('white')
-                ax.spines['right'].set_color('white')
-                ax.spines['left'].set_color('white')
-                
-                # Configurar legenda
-                legend = ax.legend()
-                legend.get_frame().set_facecolor('#2e2e2e')
-                for text in legend.get_texts():
-                    text.set_color('white')
-            else:
-                ax.text(0.5, 0.5, 'Sem dados de velocidade disponíveis', 
-                       horizontalalignment='center', verticalalignment='center',
-                       transform=ax.transAxes, fontsize=12, color='white')
-            
-            self.bandwidth_fig.patch.set_facecolor('#2e2e2e')
-            ax.set_facecolor('#2e2e2e')
-            self.bandwidth_fig.tight_layout()
-            self.bandwidth_canvas.draw()
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar gráfico de banda: {e}")
-    
-    def update_recommendations(self):
-        """Atualiza as recomendações"""
-        try:
-            # Recomendação de resolução
-            resolution_rec = self.recommendation_engine.get_resolution_recommendation()
-            resolution_text = f"Resolução recomendada: {resolution_rec['recommended_resolution']}\n"
-            resolution_text += f"Motivo: {resolution_rec['reason']}\n"
-            resolution_text += f"Confiança: {resolution_rec['confidence']*100:.1f}%"
-            self.resolution_rec_label.config(text=resolution_text)
-            
-            # Recomendação de horário
-            time_rec = self.recommendation_engine.get_optimal_download_time()
-            time_text = f"Melhores horários: {', '.join(map(str, time_rec['recommended_hours'][:3]))}h\n"
-            time_text += f"Horário de pico: {time_rec['peak_hour']}h\n"
-            time_text += f"Motivo: {time_rec['reason']}"
-            self.time_rec_label.config(text=time_text)
-            
-            # Recomendações de armazenamento
-            storage_recs = self.recommendation_engine.get_storage_recommendations()
-            self.storage_rec_listbox.delete(0, tk.END)
-            
-            if storage_recs:
-                for rec in storage_recs:
-                    priority_icon = "🔴" if rec['priority'] == 'high' else "🟡" if rec['priority'] == 'medium' else "🟢"
-                    text = f"{priority_icon} {rec['title']}: {rec['description']}"
-                    self.storage_rec_listbox.insert(tk.END, text)
-            else:
-                self.storage_rec_listbox.insert(tk.END, "✅ Nenhuma recomendação no momento")
-                
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar recomendações: {e}")
-    
-    def generate_report(self):
-        """Gera relatório baseado no tipo selecionado"""
-        try:
-            report_type = self.report_type_var.get()
-            
-            self.report_text.delete(1.0, tk.END)
-            
-            if report_type == "summary":
-                report = self.generate_summary_report()
-            elif report_type == "detailed":
-                report = self.generate_detailed_report()
-            elif report_type == "channels":
-                report = self.generate_channels_report()
-            elif report_type == "resolutions":
-                report = self.generate_resolutions_report()
-            else:
-                report = "Tipo de relatório não reconhecido."
-            
-            self.report_text.insert(1.0, report)
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao gerar relatório: {e}")
-            self.report_text.insert(1.0, f"Erro ao gerar relatório: {e}")
-    
-    def generate_summary_report(self):
-        """Gera relatório resumido"""
-        stats = self.analytics_manager.get_download_statistics()
-        
-        report = f"""RELATÓRIO RESUMIDO DE DOWNLOADS
-{'='*50}
-Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
-
-ESTATÍSTICAS GERAIS (30 dias):
-{'-'*30}
-Total de Downloads: {stats.get('total_downloads', 0)}
-Downloads Concluídos: {stats.get('successful_downloads', 0)}
-Taxa de Sucesso: {stats.get('success_rate', 0):.2f}%
-Tamanho Total: {stats.get('total_size_gb', 0):.2f} GB
-Tamanho Médio: {stats.get('avg_size_mb', 0):.2f} MB
-Canais Únicos: {stats.get('unique_channels', 0)}
-Downloads de Áudio: {stats.get('audio_downloads', 0)}
-Downloads de Vídeo: {stats.get('video_downloads', 0)}
-
-TOP 5 CANAIS:
-{'-'*15}"""
-        
-        top_channels = self.analytics_manager.get_top_channels(limit=5)
-        for i, (channel, count) in enumerate(top_channels, 1):
-            report += f"\n{i}. {channel}: {count} downloads"
-        
-        return report
-    
-    def generate_detailed_report(self):
-        """Gera relatório detalhado"""
-        stats = self.analytics_manager.get_download_statistics()
-        resolution_dist = self.analytics_manager.get_resolution_distribution()
-        storage_analysis = self.analytics_manager.get_storage_analysis()
-        
-        report = f"""RELATÓRIO DETALHADO DE DOWNLOADS
-{'='*50}
-Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
-
-ESTATÍSTICAS GERAIS:
-{'-'*20}
-Período analisado: 30 dias
-Total de Downloads: {stats.get('total_downloads', 0)}
-Downloads Concluídos: {stats.get('successful_downloads', 0)}
-Downloads com Erro: {stats.get('failed_downloads', 0)}
-Taxa de Sucesso: {stats.get('success_rate', 0):.2f}%
-
-ARMAZENAMENTO:
-{'-'*15}
-Tamanho Total: {stats.get('total_size_gb', 0):.2f} GB
-Tamanho Médio por Download: {stats.get('avg_size_mb', 0):.2f} MB
-Total de Arquivos: {storage_analysis.get('total_files', 0)}
-
-DISTRIBUIÇÃO POR RESOLUÇÃO:
-{'-'*30}"""
-        
-        for resolution, count in resolution_dist.items():
-            percentage = (count / stats.get('total_downloads', 1)) * 100
-            report += f"\n{resolution}: {count} downloads ({percentage:.1f}%)"
-        
-        report += f"\n\nANÁLISE DE ARMAZENAMENTO POR RESOLUÇÃO:\n{'-'*40}"
-        for item in storage_analysis.get('by_resolution', []):
-            report += f"\n{item['resolution']}: {item['total_size_mb']:.1f} MB ({item['count']} arquivos)"
-        
-        return report
-    
-    def generate_channels_report(self):
-        """Gera relatório de canais"""
-        top_channels = self.analytics_manager.get_top_channels(limit=20)
-        
-        report = f"""RELATÓRIO DE CANAIS
-{'='*30}
-Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
-
-TOP 20 CANAIS MAIS BAIXADOS:
-{'-'*35}"""
-        
-        for i, (channel, count) in enumerate(top_channels, 1):
-            report += f"\n{i:2d}. {channel:<40} {count:>3d} downloads"
-        
-        return report
-    
-    def generate_resolutions_report(self):
-        """Gera relatório de resoluções"""
-        resolution_dist = self.analytics_manager.get_resolution_distribution()
-        storage_analysis = self.analytics_manager.get_storage_analysis()
-        
-        report = f"""RELATÓRIO DE RESOLUÇÕES
-{'='*35}
-Data: {datetime.now().strftime('%d/%m/%Y %H:%M')}
-
-DISTRIBUIÇÃO POR RESOLUÇÃO:
-{'-'*30}"""
-        
-        total_downloads = sum(resolution_dist.values()) if resolution_dist else 1
-        
-        for resolution, count in resolution_dist.items():
-            percentage = (count / total_downloads) * 100
-            report += f"\n{resolution:<15} {count:>4d} downloads ({percentage:>5.1f}%)"
-        
-        report += f"\n\nUSO DE ARMAZENAMENTO POR RESOLUÇÃO:\n{'-'*40}"
-        for item in storage_analysis.get('by_resolution', []):
-            avg_size = item['avg_size_mb']
-            report += f"\n{item['resolution']:<15} {item['total_size_mb']:>8.1f} MB (média: {avg_size:.1f} MB)"
-        
-        return report
-    
-    def export_report_pdf(self):
-        """Exporta relatório atual para PDF"""
-        try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".pdf",
-                filetypes=[("PDF files", "*.pdf")],
-                title="Salvar Relatório PDF"
-            )
-            
-            if filename:
-                report_content = self.report_text.get(1.0, tk.END)
-                
-                doc = SimpleDocTemplate(filename, pagesize=A4)
-                styles = getSampleStyleSheet()
-                story = []
-                
-                # Título
-                title_style = ParagraphStyle(
-                    'CustomTitle',
-                    parent=styles['Heading1'],
-                    fontSize=16,
-                    spaceAfter=30,
-                    alignment=1  # Center
-                )
-                story.append(Paragraph("Relatório de Analytics - YouTube Downloader", title_style))
-                story.append(Spacer(1, 12))
-                
-                # Conteúdo
-                content_style = ParagraphStyle(
-                    'CustomContent',
-                    parent=styles['Normal'],
-                    fontSize=10,
-                    fontName='Courier'
-                )
-                
-                # Dividir conteúdo em linhas e criar parágrafos
-                lines = report_content.split('\n')
-                for line in lines:
-                    if line.strip():
-                        story.append(Paragraph(line, content_style))
-                    else:
-                        story.append(Spacer(1, 6))
-                
-                doc.build(story)
-                messagebox.showinfo("Sucesso", f"Relatório exportado para: {filename}")
-                
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao exportar PDF: {e}")
-            messagebox.showerror("Erro", f"Erro ao exportar PDF: {e}")
-    
-    def export_report_csv(self):
-        """Exporta dados para CSV"""
-        try:
-            filename = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv")],
-                title="Salvar Dados CSV"
-            )
-            
-            if filename:
-                report_type = self.report_type_var.get()
-                
-                with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    
-                    if report_type == "channels":
-                        writer.writerow(['Canal', 'Downloads'])
-                        top_channels = self.analytics_manager.get_top_channels(limit=50)
-                        for channel, count in top_channels:
-                            writer.writerow([channel, count])
-                    
-                    elif report_type == "resolutions":
-                        writer.writerow(['Resolução', 'Downloads', 'Tamanho Total (MB)', 'Tamanho Médio (MB)'])
-                        resolution_dist = self.analytics_manager.get_resolution_distribution()
-                        storage_analysis = self.analytics_manager.get_storage_analysis()
-                        
-                        storage_by_res = {item['resolution']: item for item in storage_analysis.get('by_resolution', [])}
-                        
-                        for resolution, count in resolution_dist.items():
-                            storage_info = storage_by_res.get(resolution, {})
-                            total_size = storage_info.get('total_size_mb', 0)
-                            avg_size = storage_info.get('avg_size_mb', 0)
-                            writer.writerow([resolution, count, total_size, avg_size])
-                    
-                    else:
-                        # Exportar estatísticas gerais
-                        stats = self.analytics_manager.get_download_statistics()
-                        writer.writerow(['Métrica', 'Valor'])
-                        for key, value in stats.items():
-                            writer.writerow([key.replace('_', ' ').title(), value])
-                
-                messagebox.showinfo("Sucesso", f"Dados exportados para: {filename}")
-                
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao exportar CSV: {e}")
-            messagebox.showerror("Erro", f"Erro ao exportar CSV: {e}")
-    
-    def on_period_change(self, event=None):
-        """Callback para mudança de período"""
-        self.update_charts()
-    
-    def refresh_analytics(self):
-        """Atualiza todos os dados de análise"""
-        try:
-            # Limpar cache
-            self.analytics_manager.clear_cache()
-            
-            # Recarregar dados
-            self.load_analytics_data()
-            
-            messagebox.showinfo("Sucesso", "Dados de análise atualizados!")
-            
-        except Exception as e:
-            self.log_manager.log_error(f"Erro ao atualizar análise: {e}")
-            messagebox.showerror("Erro", f"Erro ao atualizar análise: {e}")
\ No newline at end of file
@@ -2,6 +2,7 @@ import os
 import sys
 import tkinter as tk
 from tkinter import messagebox
+import formatting
 
 class AppUtils:
     """Classe com utilitários compartilhados da aplicação"""
@@ -49,38 +50,30 @@ class AppUtils:
     @staticmethod
     def format_duration(duration_seconds):
         """Formata duração em segundos para formato MM:SS"""
-        if not duration_seconds or duration_seconds == 'N/A':
-            return "Não disponível"
-        
-        try:
-            minutes = int(duration_seconds) // 60
-            seconds = int(duration_seconds) % 60
-            return f"{minutes}:{seconds:02d}"
-        except (ValueError, TypeError):
-            return str(duration_seconds)
+        return formatting.format_duration(duration_seconds)
     
     @staticmethod
     def format_view_count(view_count):
         """Formata número de visualizações com separadores de milhares"""
-        if not view_count or view_count == 'N/A':
-            return "Não disponível"
+        return formatting.format_view_count(view_count)
+    
+    @staticmethod
+    def format_bytes(num_bytes):
+        """Formata quantidade de bytes em unidade legível (KB, MB, GB)"""
+        if num_bytes is None:
+            return "N/A"
         
-        try:
-            return f"{int(view_count):,}"
-        except (ValueError, TypeError):
-            return str(view_count)
+        valor = float(num_bytes)
+        for unidade in ('B', 'KB', 'MB', 'GB'):
+            if abs(valor) < 1024:
+                return f"{valor:.1f} {unidade}" if unidade != 'B' else f"{int(valor)} B"
+            valor /= 1024
+        return f"{valor:.1f} TB"
     
     @staticmethod
     def truncate_text(text, max_length=50000):
         """Trunca texto se exceder o tamanho máximo"""
-        if not text or text == 'N/A':
-            return "Não disponível"
-        
-        text_str = str(text)
-        if len(text_str) > max_length:
-            return text_str[:max_length] + "..."
-        
-        return text_str
+        return formatting.truncate_text(text, max_length)
     
     @staticmethod
     def safe_get_clipboard():
@@ -159,14 +152,18 @@ class UIConstants:
         'bg': '#ffffff',
         'fg': '#000000',
         'select_bg': '#0078d4',
-        'select_fg': '#ffffff'
+        'select_fg': '#ffffff',
+        'field_bg': '#ffffff',
+        'active_bg': '#e5e5e5'
     }
     
     THEME_DARK = {
         'bg': '#2d2d2d',
         'fg': '#ffffff',
         'select_bg': '#404040',
-        'select_fg': '#ffffff'
+        'select_fg': '#ffffff',
+        'field_bg': '#1e1e1e',
+        'active_bg': '#3c3c3c'
     }
     
     # Dimensões da janela
@@ -11,6 +11,7 @@ Data: 2024
 
 import os
 import sys
+import importlib.util
 
 # Adicionar diretório atual ao path para importações
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -97,7 +98,10 @@ def perform_startup_tasks(log_manager):
         # Verificar e limpar logs antigos
         log_manager.limpar_logs_antigos()
         
-        # Verificar se precisa rotacionar logs
+        # Retomar compressões interrompidas em execuções anteriores
+        log_manager.comprimir_logs_pendentes()
+        
+        # Verificar se precisa rotacionar logs (compressão ocorre em segundo plano)
         if log_manager.verificar_tamanho_log():
             log_manager.comprimir_e_rotacionar_log()
         
@@ -164,16 +168,14 @@ def check_dependencies():
     """
     required_modules = [
         'yt_dlp',
-        'py7zr',
         'tkinter'
     ]
     
     missing_modules = []
     
+    # find_spec localiza o módulo sem importá-lo (o yt-dlp só é carregado no primeiro uso)
     for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
+        if importlib.util.find_spec(module) is None:
             missing_modules.append(module)
     
     if missing_modules: